@@ -44,9 +44,75 @@ class Settings(BaseSettings):
     # Azure OpenAI Timeout (Care Plan Generation)
     AZURE_OPENAI_TIMEOUT: int = 30  # seconds
 
+    # LLM Gateway (프로세스 공용 Azure OpenAI 클라이언트)
+    LLM_HTTP2: bool = True  # HTTP/2 사용 (h2 패키지 없으면 HTTP/1.1)
+    LLM_MAX_CONNECTIONS: int = 20  # 워커별 연결 풀 최대 연결 수 (keep-alive 유지 수 동일)
+    LLM_KEEPALIVE_SECONDS: float = 60.0  # 유휴 keep-alive 연결 유지 시간
+    LLM_MAX_CONCURRENCY: int = 8  # 배포별 기본 최대 동시 호출 수 (초과분은 대기)
+    LLM_DEPLOYMENT_CONCURRENCY: str = ""  # 배포별 최대 동시 호출 수 ("gpt-4o=8,gpt-4o-mini=16")
+    LLM_MAX_RETRIES: int = 2  # 429/5xx/연결 오류 재시도 횟수
+    LLM_RETRY_BASE_SECONDS: float = 0.5  # 재시도 지수 백오프 기본값 (full jitter)
+    LLM_RETRY_MAX_SECONDS: float = 8.0  # 재시도 대기 상한 (retry-after 헤더 포함)
+
     # XGBoost Model (Caregiver Matching)
     XGBOOST_MODEL_PATH: str = ""
     XGBOOST_MODEL_FALLBACK: bool = True
+    XGBOOST_INFERENCE_BACKEND: str = "xgboost"  # "xgboost" | "numpy" (JSON 부스터를 NumPy 배열로 평가) | "onnx" (onnxruntime)
+    ONNX_INTRA_OP_NUM_THREADS: int = 1  # onnx 백엔드 연산 내부 스레드 수 (0이면 onnxruntime 기본값 = 코어 수)
+
+    # Model Registry (Matching)
+    MATCHING_MODEL_DIR: str = ""  # 버전별 모델 디렉토리 (비어 있으면 backend/models)
+    MATCHING_MODEL_VERSION: str = "v2"  # ACTIVE_VERSION 파일이 없을 때 사용할 버전 (xgboost_<버전>.json)
+    MATCHING_MODEL_WATCH_SECONDS: int = 30  # ACTIVE_VERSION / 모델 파일 변경 감시 주기 (0이면 감시 안 함)
+    MODEL_ADMIN_TOKEN: str = ""  # 모델 교체 관리자 API 토큰 (X-Admin-Token 헤더, 비어 있으면 관리자 API 비활성화)
+    MATCHING_SHADOW_MODEL_VERSION: str = ""  # 요청 경로 밖에서 함께 점수를 계산해 비교할 버전 (비어 있으면 섀도 평가 안 함)
+    MATCHING_SHADOW_MAX_PENDING: int = 2  # 섀도 평가 대기 작업 최대 수 (초과분은 버림)
+    MATCHING_AB_MODEL_VERSION: str = ""  # A/B 후보 버전 (환자 ID 해시로 고정 분할)
+    MATCHING_AB_TRAFFIC_PERCENT: float = 0.0  # 후보 버전으로 점수를 계산할 환자 비율 (0~100)
+
+    # Caregiver Feature Store (Matching)
+    CAREGIVER_STORE_REFRESH_SECONDS: int = 60  # updated_at 기준 증분 갱신 주기
+    CAREGIVER_STORE_REFRESH_OVERLAP_SECONDS: int = 300  # 워터마크 이전부터 다시 조회하는 구간 (가장 긴 트랜잭션보다 길게)
+
+    # Precomputed Score Matrix (Matching)
+    SCORE_MATRIX_ENABLED: bool = True  # 야간 배치로 계산한 환자별 상위 간병인 점수 사용 (없거나 입력이 바뀌면 실시간 계산)
+    SCORE_MATRIX_PATH: str = ""  # 점수 행렬 .npz 경로 (비어 있으면 backend/models/score_matrix.npz)
+    SCORE_MATRIX_TOP_M: int = 200  # 환자별로 저장할 상위 간병인 수
+    SCORE_MATRIX_WORKERS: int = 0  # 배치 계산 프로세스 수 (0이면 CPU 코어 수)
+
+    # Score Invalidation (Matching)
+    SCORE_INVALIDATION_ENABLED: bool = True  # 성향/프로필 변경을 아웃박스에 기록하고 바뀐 환자/간병인 점수만 증분 재계산
+    SCORE_INVALIDATION_POLL_SECONDS: float = 5.0  # 워커별 아웃박스(score_invalidations) 폴링 주기
+    SCORE_INVALIDATION_RETENTION_HOURS: float = 24.0  # 아웃박스 행 보관 시간
+
+    # Recommendation Cache (Matching)
+    RECOMMENDATION_CACHE_TTL_SECONDS: int = 300  # 추천 결과 캐시 유효 시간
+    RECOMMENDATION_CACHE_MAX_ENTRIES: int = 1024  # 추천 결과 캐시 최대 항목 수 (LRU)
+
+    # AI Comment Generation (Matching)
+    AI_COMMENT_MAX_CONCURRENCY: int = 5  # 동시에 호출하는 Azure OpenAI 코멘트 요청 수
+    AI_COMMENT_DEADLINE_SECONDS: float = 8.0  # 요청당 코멘트 대기 시간 (초과 시 규칙 기반 코멘트)
+    AI_COMMENT_CACHE_PATH: str = "cache/ai_comments.sqlite3"  # 코멘트 캐시 SQLite 파일 (워커 간 공유)
+    AI_COMMENT_CACHE_MAX_ENTRIES: int = 10000  # 코멘트 캐시 최대 항목 수 (LRU)
+    AI_COMMENT_CACHE_TTL_SECONDS: int = 7 * 24 * 3600  # 코멘트 캐시 유효 시간
+    AI_COMMENT_CACHE_SCORE_BUCKET: float = 5.0  # 캐시 키의 매칭 점수 구간 크기
+
+    # Model Warm-up (Matching)
+    MODEL_WARMUP_ENABLED: bool = True  # 워커 시작 시 모델/캐시 워밍업 (완료 전까지 /ready 503)
+    MODEL_PRELOAD: bool = False  # 앱 import 시 모델/데이터 로드 (gunicorn --preload와 함께 사용 시 워커 간 공유)
+
+    # Care Plan Jobs (POST /api/care-plans/generate 백그라운드 작업)
+    CARE_PLAN_JOB_BACKEND: str = "memory"  # "memory" (프로세스 내 asyncio 큐) | "sqlite" (같은 호스트의 워커들이 공유하는 파일 큐)
+    CARE_PLAN_JOB_SQLITE_PATH: str = "cache/care_plan_jobs.sqlite3"  # sqlite 백엔드 파일
+    CARE_PLAN_JOB_WORKERS: int = 4  # 워커 프로세스당 동시에 실행하는 작업 수
+    CARE_PLAN_JOB_MAX_QUEUED: int = 100  # 최대 대기 작업 수 (초과 시 503)
+    CARE_PLAN_JOB_TTL_SECONDS: int = 3600  # 완료된 작업 상태 보관 시간
+    CARE_PLAN_JOB_STALE_SECONDS: int = 600  # 이 시간 동안 갱신이 없는 실행 중 작업은 실패 처리 (워커 종료 대비)
+    CARE_PLAN_STREAMING: bool = True  # 케어 플랜 스트리밍 생성 (하루 일정이 완성될 때마다 저장/전송)
+    CARE_PLAN_CACHE_ENABLED: bool = True  # 같은 돌봄 프로필(요양등급/질환/시간대/기간)의 LLM 플랜을 템플릿으로 재사용
+    CARE_PLAN_CACHE_PATH: str = "cache/care_plan_templates.sqlite3"  # 템플릿 캐시 SQLite 파일 (워커 간 공유)
+    CARE_PLAN_CACHE_MAX_ENTRIES: int = 2000  # 템플릿 캐시 최대 항목 수 (LRU)
+    CARE_PLAN_CACHE_TTL_SECONDS: int = 7 * 24 * 3600  # 템플릿 유효 시간
 
     # Logging
     LOG_LEVEL: str = "INFO"
@@ -0,0 +1,79 @@
+# ========================================
+# 늘봄케어 - 프로세스별 SQLite 연결
+# ========================================
+# 파일: sqlite.py
+# 설명: 워커 간 공유 SQLite 파일(AI 코멘트 캐시, 케어 플랜 템플릿 캐시, 작업 큐)의 연결을
+#       프로세스마다 따로 열어 관리 (gunicorn --preload로 fork된 워커 대응)
+
+import os
+import sqlite3
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+
+class ForkSafeSQLite:
+    """
+    fork에 안전한 SQLite 연결
+
+    SQLite 연결은 fork 간에 공유할 수 없으므로, fork된 자식 프로세스(gunicorn --preload 워커)에서는
+    부모에서 연 연결을 사용/종료하지 않고 참조만 유지한 채 새로 연결합니다.
+    스레드 간 동기화는 하지 않으므로 호출 측이 lock을 보유한 상태에서 사용합니다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        schema: Sequence[str] = (),
+        timeout: float = 5.0,
+        isolation_level: Optional[str] = ""
+    ):
+        """
+        Args:
+            path: SQLite 파일 경로 (":memory:"이면 프로세스 메모리)
+            schema: 연결할 때마다 실행할 DDL (CREATE TABLE/INDEX IF NOT EXISTS)
+            timeout: 잠금 대기 시간 (초)
+            isolation_level: sqlite3.connect의 isolation_level (None이면 autocommit)
+        """
+        self.path = path
+        self.schema = list(schema)
+        self.timeout = timeout
+        self.isolation_level = isolation_level
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        # fork 이전 프로세스에서 연 연결 (자식에서는 사용/종료하지 않고 참조만 유지)
+        self._inherited_conns: List[sqlite3.Connection] = []
+
+    def connect(self) -> sqlite3.Connection:
+        """
+        현재 프로세스의 연결 (처음이거나 fork 이후이면 새로 연결하고 schema 실행)
+
+        Raises:
+            sqlite3.Error / OSError: 파일을 열 수 없는 경우
+        """
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+        if self._conn is not None:
+            self._inherited_conns.append(self._conn)
+            self._conn = None
+
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        conn = sqlite3.connect(
+            self.path, timeout=self.timeout, check_same_thread=False, isolation_level=self.isolation_level
+        )
+        if self.path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+        for statement in self.schema:
+            conn.execute(statement)
+        conn.commit()
+
+        self._conn, self._pid = conn, os.getpid()
+        return conn
+
+    def close(self):
+        """현재 프로세스에서 연 연결 종료 (부모에서 상속한 연결은 닫지 않음)"""
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
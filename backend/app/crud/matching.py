@@ -2,7 +2,9 @@
 CRUD operations for Matching models (MatchingRequest, MatchingResult, CaregiverAvailability).
 """
 
-from typing import List, Optional
+import logging
+from typing import Dict, List, Optional
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from app.models.matching import MatchingRequest, MatchingResult, CaregiverAvailability
 from app.schemas.matching import (
@@ -14,6 +16,8 @@ from app.schemas.matching import (
     CaregiverAvailabilityUpdate,
 )
 
+logger = logging.getLogger(__name__)
+
 # ------------------- MatchingRequest CRUD -------------------
 
 def get_matching_request(db: Session, request_id: int) -> Optional[MatchingRequest]:
@@ -64,6 +68,37 @@ def create_matching_result(db: Session, obj_in: MatchingResultCreate) -> Matchin
     return db_obj
 
 
+def bulk_create_matching_results(db: Session, rows: List[Dict]) -> List[Optional[int]]:
+    """
+    MatchingResult 여러 건을 INSERT ... RETURNING matching_id 한 번으로 저장 (commit은 호출자가 수행)
+
+    일괄 저장이 실패하면 SAVEPOINT 안에서 행별로 다시 저장하여,
+    실패한 행만 None으로 반환하고 나머지는 저장합니다.
+
+    Returns:
+        List[Optional[int]]: rows 순서의 matching_id (실패한 행은 None)
+    """
+    if not rows:
+        return []
+
+    stmt = insert(MatchingResult).returning(MatchingResult.matching_id, sort_by_parameter_order=True)
+    try:
+        with db.begin_nested():
+            return list(db.scalars(stmt, rows).all())
+    except Exception as e:
+        logger.warning(f"[매칭 결과 일괄 저장 실패] 행별 저장으로 재시도: {e}")
+
+    matching_ids = []
+    for row in rows:
+        try:
+            with db.begin_nested():
+                matching_ids.append(db.scalars(stmt, [row]).one())
+        except Exception as e:
+            logger.error(f"[매칭 결과 저장 실패] caregiver_id={row.get('caregiver_id')}: {e}")
+            matching_ids.append(None)
+    return matching_ids
+
+
 def update_matching_result(db: Session, result: MatchingResult, obj_in: MatchingResultUpdate) -> MatchingResult:
     obj_data = obj_in.dict(exclude_unset=True)
     for field, value in obj_data.items():
@@ -2,8 +2,9 @@
 인증 의존성
 """
 
+import secrets
 from typing import Optional
-from fastapi import Depends, HTTPException, status, Request, Cookie
+from fastapi import Depends, HTTPException, status, Request, Cookie, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.core.security import verify_token
@@ -74,3 +75,27 @@ def get_current_user(
         )
     
     return user
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)) -> None:
+    """
+    운영 관리자 API 토큰 확인 (X-Admin-Token 헤더 = MODEL_ADMIN_TOKEN)
+
+    Raises:
+        HTTPException: 토큰이 설정되지 않았거나 일치하지 않는 경우
+    """
+    from app.core.config import get_settings
+
+    expected = get_settings().MODEL_ADMIN_TOKEN
+    if not expected:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리자 API가 비활성화되어 있습니다 (MODEL_ADMIN_TOKEN 미설정)"
+        )
+
+    # str끼리 비교하면 ASCII가 아닌 헤더 값에서 TypeError(500)가 나므로 bytes로 비교
+    if not x_admin_token or not secrets.compare_digest(x_admin_token.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리자 토큰이 유효하지 않습니다"
+        )
@@ -15,6 +15,7 @@ from app.models.matching import (
     MatchingRequest,
     MatchingResult,
     CaregiverAvailability,
+    ScoreInvalidation,
     GradeEnum,
     MatchingStatusEnum,
 )
@@ -48,6 +49,7 @@ __all__ = [
     "MatchingRequest",
     "MatchingResult",
     "CaregiverAvailability",
+    "ScoreInvalidation",
     # Review
     "Review",
     # Care execution
@@ -60,6 +60,7 @@ class CaregiverPersonality(Base):
         CheckConstraint("patience_score >= 0 AND patience_score <= 100", name="check_caregiver_patience"),
         CheckConstraint("independence_score >= 0 AND independence_score <= 100", name="check_caregiver_independence"),
         Index("idx_caregiver_personality", "caregiver_id"),
+        Index("idx_caregiver_personality_updated_at", "updated_at"),
     )
 
 
@@ -87,6 +87,7 @@ class MatchingResult(Base):
     total_score = Column(Float, nullable=False)
     grade = Column(SQLEnum(GradeEnum, name="grade_enum"), nullable=False)
     ai_comment = Column(Text, nullable=True)
+    model_version = Column(String(100), nullable=True)  # 점수를 계산한 매칭 모델 버전 (예: v2@1a2b3c4d5e6f)
     
     status = Column(SQLEnum(MatchingStatusEnum, name="matching_status_enum"), default=MatchingStatusEnum.recommended)
     
@@ -138,3 +139,20 @@ class CaregiverAvailability(Base):
         CheckConstraint("start_time < end_time", name="check_time_range"),
         Index("idx_caregiver_avail", "caregiver_id", "day_of_week", "is_available"),
     )
+
+
+class ScoreInvalidation(Base):
+    """매칭 점수 무효화 아웃박스 (성향/프로필 변경 시 같은 트랜잭션에서 기록, 워커별 증분 재계산)"""
+
+    __tablename__ = "score_invalidations"
+
+    invalidation_id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
+    entity_type = Column(String(20), nullable=False)  # patient / caregiver
+    entity_id = Column(BigInteger, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        CheckConstraint("entity_type IN ('patient', 'caregiver')", name="check_invalidation_entity_type"),
+        Index("idx_score_invalidations_created", "created_at"),
+    )
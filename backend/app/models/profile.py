@@ -4,8 +4,9 @@
 
 from sqlalchemy import Column, BigInteger, String, Integer, Date, Boolean, DateTime, Enum as SQLEnum, CheckConstraint, Index, ForeignKey, DECIMAL, Text, ARRAY
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from app.core.database import Base
+from app.utils.certifications import split_certifications
 import enum
 
 
@@ -120,6 +121,7 @@ class Caregiver(Base):
     # 경력 및 자격
     experience_years = Column(Integer, default=0)
     certifications = Column(String(255), nullable=True)
+    certification_list = Column(ARRAY(Text), nullable=True)  # certifications 정규화 (저장 시 자동 생성)
     specialties = Column(ARRAY(Text), nullable=True)
     
     # 서비스 지역
@@ -149,7 +151,15 @@ class Caregiver(Base):
         Index("idx_caregivers_user", "user_id"),
         Index("idx_caregivers_region", "service_region"),
         Index("idx_caregivers_rating", "avg_rating"),
+        Index("idx_caregivers_updated_at", "updated_at"),
+        Index("idx_caregivers_certification_list", "certification_list", postgresql_using="gin"),
     )
     
+    @validates("certifications")
+    def _normalize_certifications(self, key, value):
+        """certifications 저장 시 certification_list도 함께 갱신"""
+        self.certification_list = split_certifications(value)
+        return value
+    
     def __repr__(self):
         return f"<Caregiver(caregiver_id={self.caregiver_id}, user_id={self.user_id})>"
@@ -65,6 +65,7 @@ class User(Base):
         Index("idx_users_phone", "phone_number", postgresql_where=Column("phone_number").isnot(None)),
         Index("idx_users_type", "user_type"),
         Index("idx_users_active", "is_active", postgresql_where=Column("is_active") == True),
+        Index("idx_users_updated_at", "updated_at"),
     )
     
     def __repr__(self):
@@ -2,23 +2,24 @@
 케어 플랜 생성 API 라우트
 """
 
+import json
 import logging
-from datetime import datetime, timedelta, date
+from datetime import datetime, date
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.dependencies.database import get_db
 from app.models.profile import Patient, Caregiver, Guardian
 from app.models.user import User
-from app.models.care_execution import Schedule, CareLog, CareCategoryEnum, MealPlan
+from app.models.care_execution import Schedule
 from app.models.care_details import HealthCondition, Medication, DietaryPreference
 from app.models.matching import MatchingResult, MatchingRequest
-from app.services.care_plan_generation_service import CarePlanGenerationService
-from app.services.meal_recommendation import (
-    MealRecommendationService,
-    MealRecommendationConfig
-)
+from app.services.care_plan_cache import get_care_plan_cache
+from app.services.care_plan_jobs import get_care_plan_job_queue
+from app.services.job_queue import JOB_SUCCEEDED, JobQueueFullError
 
 logger = logging.getLogger(__name__)
 
@@ -123,11 +124,18 @@ async def generate_care_plan(
     db: Session = Depends(get_db),
 ):
     """
-    AI를 사용하여 케어 플랜을 생성합니다.
+    AI를 사용하여 케어 플랜을 생성합니다 (백그라운드 작업).
 
     환자 정보, 간병인 정보, 성격 점수, 돌봄 요구사항을 기반으로
     Azure OpenAI를 사용하여 맞춤형 케어 플랜을 생성합니다.
 
+    입력을 검증하고 작업을 등록한 뒤 바로 202와 job_id를 반환합니다.
+    생성·일정 저장·추천 식단 생성이 끝나면 `GET /api/care-plans/jobs/{job_id}`의
+    result에 기존 응답(data, saved_schedule_ids, matching_id, meal_plan)이 담깁니다.
+    진행 상황은 폴링하거나 `GET /api/care-plans/jobs/{job_id}/events`(NDJSON)로 구독합니다.
+    스트리밍 생성(CARE_PLAN_STREAMING)에서는 하루 일정이 완성되는 즉시 저장되고
+    `GET /api/care-plans/jobs/{job_id}/stream`(SSE)의 day 이벤트로 전달됩니다.
+
     ## 요청 예제
     ```json
     {
@@ -267,238 +275,50 @@ async def generate_care_plan(
             "hourly_rate": caregiver.hourly_rate or 0
         }
 
-        # AI 서비스를 사용하여 케어 플랜 생성
-        service = CarePlanGenerationService()
-        care_plan = service.generate_care_plan(
-            patient_info=patient_info,
-            caregiver_info=caregiver_info,
-            patient_personality=request.patient_personality,
-            care_requirements=request.care_requirements,
-            start_date=start_date_str,
-            end_date=end_date_str,
-            preferred_time_slots=preferred_time_slots
-        )
-
-        logger.info(f"[케어 플랜 생성 완료] 총 {len(care_plan.weekly_schedule)}일간의 일정 생성")
-
-        # DB에 저장
-        saved_schedule_ids = []
-        try:
-            logger.info("[케어 플랜 저장 시작] DB에 스케줄 및 케어 로그 저장 중...")
-            logger.info(f"📊 매칭 ID: {matching.matching_id if matching else 'None'}")
-
-            # 시작일 결정 (요청받은 시작일 or 오늘)
-            if start_date_str:
-                start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
-                logger.info(f"📅 요청받은 시작일 사용: {start_date}")
-            else:
-                start_date = datetime.now().date()
-                logger.info(f"📅 기본 시작일 사용 (오늘): {start_date}")
-
-            # 기존 pending_review 상태의 스케줄 삭제 (중복 방지)
-            existing_schedules = db.query(Schedule).filter(
-                Schedule.patient_id == request.patient_id,
-                Schedule.status == 'pending_review',
-                Schedule.care_date >= start_date
-            ).all()
-
-            if existing_schedules:
-                logger.info(f"🗑️ 기존 pending_review 스케줄 {len(existing_schedules)}개 삭제")
-                for sched in existing_schedules:
-                    db.delete(sched)
-                db.flush()
-
-            # weekly_schedule의 각 day에 대해 반복
-            for day_index, day_schedule in enumerate(care_plan.weekly_schedule):
-                care_date = start_date + timedelta(days=day_index)
-
-                # Schedule 생성 (매칭 ID 연결)
-                schedule = Schedule(
-                    patient_id=request.patient_id,
-                    matching_id=matching.matching_id if matching else None,
-                    care_date=care_date,
-                    is_ai_generated=True,
-                    status="pending_review"
-                )
-                db.add(schedule)
-                db.flush()  # schedule_id를 얻기 위해 flush
-                saved_schedule_ids.append(schedule.schedule_id)
-                logger.info(f"📅 Schedule 생성: ID={schedule.schedule_id}, date={care_date}")
-
-                # 각 activity에 대한 CareLog 생성
-                # day_schedule과 activity는 Pydantic 모델이므로 속성으로 접근
-                activities = day_schedule.activities if hasattr(day_schedule, 'activities') else []
-                failed_activities = []  # 실패한 활동 기록
-
-                for activity in activities:
-                    try:
-                        # activity의 시간 파싱 (HH:MM 형식)
-                        scheduled_time = None
-                        activity_time = activity.time if hasattr(activity, 'time') else None
-                        if activity_time:
-                            time_parts = activity_time.split(":")
-                            if len(time_parts) >= 2:
-                                scheduled_time = f"{time_parts[0]}:{time_parts[1]}:00"
-
-                        # 카테고리 결정 (기본값: "other")
-                        category = "other"
-                        activity_title = (activity.title if hasattr(activity, 'title') else "").lower()
-                        if "약" in activity_title or "medication" in activity_title:
-                            category = "medication"
-                        elif "식사" in activity_title or "meal" in activity_title:
-                            category = "meal"
-                        elif "운동" in activity_title or "exercise" in activity_title:
-                            category = "exercise"
-                        elif "체크" in activity_title or "vital" in activity_title:
-                            category = "vital_check"
-                        elif "위생" in activity_title or "hygiene" in activity_title:
-                            category = "hygiene"
-
-                        # CareLog 생성
-                        care_log = CareLog(
-                            schedule_id=schedule.schedule_id,
-                            category=category,
-                            task_name=activity.title if hasattr(activity, 'title') else "활동",
-                            scheduled_time=scheduled_time,
-                            is_completed=False,
-                            note=activity.note if hasattr(activity, 'note') else ""
-                        )
-                        db.add(care_log)
-
-                    except Exception as e:
-                        activity_title = activity.title if hasattr(activity, 'title') else "Unknown"
-                        logger.error(f"[CareLog 생성 실패] activity: {activity_title}, error: {str(e)}")
-                        failed_activities.append({
-                            "activity": activity_title,
-                            "error": str(e)
-                        })
-
-                # CareLog 생성 실패가 있으면 롤백
-                if failed_activities:
-                    db.rollback()
-                    logger.error(f"[케어 플랜 생성 실패] {len(failed_activities)}개 활동 생성 실패로 전체 롤백")
-                    raise HTTPException(
-                        status_code=500,
-                        detail={
-                            "message": "케어 플랜 생성 실패 - 일부 활동 생성 중 오류가 발생했습니다",
-                            "failed_count": len(failed_activities),
-                            "failed_activities": failed_activities
-                        }
-                    )
-
-            # 트랜잭션 커밋 (try-except로 감싸서 부분 커밋 방지)
-            try:
-                db.commit()
-                logger.info(f"✅ [케어 플랜 저장 완료] 총 {len(care_plan.weekly_schedule)}개 일정, Schedule IDs: {saved_schedule_ids}")
-            except Exception as commit_error:
-                db.rollback()
-                logger.error(f"❌ 트랜잭션 커밋 실패: {str(commit_error)}")
-                saved_schedule_ids = []  # 저장 실패 표시
-                raise HTTPException(
-                    status_code=500,
-                    detail="케어 플랜 저장 중 데이터베이스 오류가 발생했습니다"
-                )
-
-        except HTTPException:
-            raise
-        except Exception as e:
-            db.rollback()
-            logger.error(f"❌ 케어 플랜 DB 저장 실패: {e}")
-            saved_schedule_ids = []  # 저장 실패 표시
-            # DB 저장 실패 시 에러 발생 (프론트엔드에 알림)
-            raise HTTPException(
-                status_code=500,
-                detail=f"케어 플랜 DB 저장 실패: {str(e)}"
-            )
-
-        # ============================================
-        # 🍽️ 추천 식단 생성 (AI 기반)
-        # ============================================
-        meal_plan_data = None
-        try:
-            logger.info(f"[추천 식단 생성 시작] 환자 {request.patient_id}")
-
-            # 1. 환자 데이터 수집
-            data = collect_patient_data(request.patient_id, db)
-
-            # 2. AI 식단 생성 서비스 호출
-            config = MealRecommendationConfig()
-            meal_service = MealRecommendationService(config)
-
-            # 오늘 날짜의 점심 식단 생성
-            today = datetime.now().date()
-            meal_plan_result = meal_service.recommend_meal(
-                patient_id=request.patient_id,
-                patient_data=data["patient_data"],
-                health_conditions=data["health_conditions"],
-                medications=data["medications"],
-                dietary_prefs=data["dietary_prefs"],
-                meal_date=str(today),
-                meal_type="lunch"
-            )
-
-            if meal_plan_result:
-                # 3. DB 저장
-                # ingredients를 문자열로 변환
-                ingredients_str = (
-                    ', '.join(meal_plan_result['ingredients'])
-                    if isinstance(meal_plan_result['ingredients'], list)
-                    else meal_plan_result['ingredients']
-                )
-
-                new_meal = MealPlan(
-                    patient_id=request.patient_id,
-                    meal_date=today,
-                    meal_type="lunch",
-                    menu_name=meal_plan_result['menu_name'],
-                    ingredients=ingredients_str,
-                    nutrition_info=meal_plan_result['nutrition_info'],
-                    cooking_tips=meal_plan_result.get('cooking_tips'),
-                    created_at=datetime.now()
-                )
-
-                db.add(new_meal)
-                db.commit()
-                db.refresh(new_meal)
-
-                # 응답에 포함할 데이터 준비
-                meal_plan_data = {
-                    "plan_id": new_meal.plan_id,
-                    "menu_name": new_meal.menu_name,
-                    "ingredients": new_meal.ingredients,
-                    "nutrition_info": new_meal.nutrition_info,
-                    "cooking_tips": new_meal.cooking_tips,
-                    "meal_type": new_meal.meal_type.value if hasattr(new_meal.meal_type, 'value') else str(new_meal.meal_type),
-                    "meal_date": new_meal.meal_date.isoformat()
-                }
-
-                logger.info(f"✅ 추천 식단 생성 완료: {new_meal.menu_name}")
-            else:
-                logger.warning("⚠️ AI 식단 생성 결과가 없습니다")
-
-        except Exception as e:
-            logger.error(f"❌ 추천 식단 생성 실패: {e}")
-            # 식단 생성 실패해도 케어 플랜은 정상 반환
-            logger.warning("경고: 추천 식단 생성에 실패했으나 케어 플랜은 정상 반환합니다")
-
-        # 응답 반환
-        response_data = {
-            "success": True,
-            "data": care_plan.model_dump(),
-            "saved_schedule_ids": saved_schedule_ids,
+        # 케어 플랜 생성(LLM) → 일정 저장, 추천 식단 생성(동시 진행)은 백그라운드 작업으로 실행
+        job = await get_care_plan_job_queue().submit({
+            "patient_id": request.patient_id,
             "matching_id": matching.matching_id if matching else None,
-            "message": "케어 플랜이 생성되었습니다."
-        }
-
-        # 식단 데이터가 있으면 응답에 포함
-        if meal_plan_data:
-            response_data["meal_plan"] = meal_plan_data
-            response_data["message"] = "케어 플랜과 추천 식단이 생성되었습니다."
+            "stream": get_settings().CARE_PLAN_STREAMING,
+            "generation": {
+                "patient_info": patient_info,
+                "caregiver_info": caregiver_info,
+                "patient_personality": request.patient_personality,
+                "care_requirements": request.care_requirements,
+                "start_date": start_date_str,
+                "end_date": end_date_str,
+                "preferred_time_slots": preferred_time_slots
+            },
+            "meal": {
+                "patient_data": patient_details["patient_data"],
+                "health_conditions": patient_details["health_conditions"],
+                "medications": patient_details["medications"],
+                "dietary_prefs": patient_details["dietary_prefs"]
+            }
+        })
 
-        return response_data
+        return JSONResponse(
+            status_code=202,
+            content={
+                "success": True,
+                "job_id": job.job_id,
+                "status": job.status,
+                "status_url": f"/api/care-plans/jobs/{job.job_id}",
+                "events_url": f"/api/care-plans/jobs/{job.job_id}/events",
+                "stream_url": f"/api/care-plans/jobs/{job.job_id}/stream",
+                "message": "케어 플랜 생성 작업이 등록되었습니다."
+            }
+        )
 
     except HTTPException:
         raise
+    except JobQueueFullError as e:
+        logger.warning(f"⚠️ 케어 플랜 작업 대기열 가득 참: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail="케어 플랜 생성 요청이 많습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "10"}
+        )
     except Exception as e:
         logger.error(f"❌ 케어 플랜 생성 실패: {e}")
         raise HTTPException(
@@ -507,6 +327,108 @@ async def generate_care_plan(
         )
 
 
+@router.get("/jobs")
+async def get_care_plan_job_queue_status():
+    """케어 플랜 작업 큐 상태 (백엔드, 워커 수, 상태별 작업 수, 이 워커의 처리 건수, 템플릿 캐시 통계)"""
+    status = await get_care_plan_job_queue().get_status()
+    template_cache = get_care_plan_cache()
+    status["template_cache"] = (
+        {"enabled": True, **template_cache.get_stats()} if template_cache else {"enabled": False}
+    )
+    return status
+
+
+@router.get("/jobs/{job_id}")
+async def get_care_plan_job(job_id: str):
+    """
+    케어 플랜 생성 작업 상태 조회 (폴링)
+
+    - status: queued | running | succeeded | failed
+    - stage: generating (AI 생성, 추천 식단 동시 진행) | saving (일정 저장) | meal_plan (추천 식단 대기)
+    - result: succeeded일 때 생성 결과 (data, saved_schedule_ids, matching_id, days, meal_plan, message),
+      실행 중에는 지금까지 저장된 날들 ({"days": [...]}, 스트리밍 생성)
+    - error: failed일 때 오류 메시지
+    """
+    job = await get_care_plan_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다 (만료되었거나 잘못된 ID)")
+    return job.to_dict()
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_care_plan_job(job_id: str):
+    """
+    케어 플랜 생성 작업 상태 구독 (NDJSON 스트리밍)
+
+    상태/단계가 바뀔 때마다 작업 상태 한 줄을 보내고, succeeded/failed 후 종료합니다.
+
+    ```
+    {"job_id": "...", "status": "running", "stage": "generating", ...}
+    {"job_id": "...", "status": "running", "stage": "saving", ...}
+    {"job_id": "...", "status": "succeeded", "stage": "meal_plan", "result": {...}, ...}
+    ```
+    """
+    queue = get_care_plan_job_queue()
+    if await queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다 (만료되었거나 잘못된 ID)")
+
+    async def events():
+        async for job in queue.watch(job_id):
+            yield json.dumps(job.to_dict(), ensure_ascii=False, default=str) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+def _sse(event: str, data: dict) -> str:
+    """SSE 이벤트 한 건"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+@router.get("/jobs/{job_id}/stream")
+async def stream_care_plan_days(job_id: str):
+    """
+    케어 플랜 생성 작업 구독 (Server-Sent Events)
+
+    하루 일정이 저장될 때마다 day 이벤트를 보내므로 전체 생성을 기다리지 않고 첫째 날부터 표시할 수 있습니다.
+    늦게 구독해도 이미 저장된 날들을 먼저 보냅니다.
+
+    ```
+    event: status
+    data: {"status": "running", "stage": "generating"}
+
+    event: day
+    data: {"index": 0, "care_date": "2026-01-05", "schedule_id": 101, "day": {"day": "월요일", "activities": [...]}}
+
+    event: done
+    data: {"job_id": "...", "status": "succeeded", "result": {...}, ...}
+    ```
+    작업이 실패하면 마지막 이벤트는 failed (data는 작업 상태)입니다.
+    """
+    queue = get_care_plan_job_queue()
+    if await queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다 (만료되었거나 잘못된 ID)")
+
+    async def events():
+        sent_days = 0
+        last_status = None
+        async for job in queue.watch(job_id, poll_interval=0.25):
+            if (job.status, job.stage) != last_status:
+                last_status = (job.status, job.stage)
+                yield _sse("status", {"status": job.status, "stage": job.stage})
+            days = (job.result or {}).get("days") or []
+            for entry in days[sent_days:]:
+                yield _sse("day", entry)
+            sent_days = max(sent_days, len(days))
+            if job.is_done:
+                yield _sse("done" if job.status == JOB_SUCCEEDED else "failed", job.to_dict())
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # 스케줄 상태 전환 규칙 정의
 VALID_STATUS_TRANSITIONS = {
     'pending_review': ['under_review', 'confirmed'],  # 케어 플랜 요청 시 또는 바로 확정
@@ -518,6 +440,7 @@ VALID_STATUS_TRANSITIONS = {
     'cancelled': [],  # 최종 상태
 }
 
+
 def validate_status_transition(current_status: str, new_status: str) -> tuple[bool, str]:
     """
     상태 전환이 유효한지 검증합니다.
@@ -293,7 +293,7 @@ async def generate_ai_meal_plan(
     service = MealRecommendationService(config)
     
     try:
-        meal_plan_data = service.recommend_meal(
+        meal_plan_data = await service.recommend_meal(
             patient_id=patient_id,
             patient_data=data["patient_data"],
             health_conditions=data["health_conditions"],
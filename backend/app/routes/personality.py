@@ -3,16 +3,15 @@ Personality Test FastAPI router.
 """
 
 import json
-import os
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from openai import AzureOpenAI
 
 from app.dependencies.database import get_db
 from app.dependencies.auth import get_current_user
 from app.models.user import User
 from app.models.profile import Patient, Guardian, Caregiver
 from app.models.care_details import PatientPersonality, CaregiverPersonality
+from app.services.llm_gateway import get_llm_gateway
 from app.schemas.personality import (
     PersonalityTestRequest,
     PatientPersonalityResponse,
@@ -111,13 +110,7 @@ async def create_personality_test(
                 "independence_score": 50.0
             }
 
-        # Azure OpenAI로 분석 및 추천 생성
-        client = AzureOpenAI(
-            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-            api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview"),
-            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT")
-        )
-
+        # Azure OpenAI로 분석 및 추천 생성 (공용 게이트웨이, 이벤트 루프를 막지 않음)
         prompt = f"""
 당신은 간병인 성향 평가 전문가입니다. 다음은 사용자의 성향 검사 결과입니다.
 
@@ -140,17 +133,16 @@ async def create_personality_test(
 3. 추천 간병인 유형은 사용자의 높은 점수 차원들을 반영하여 작성
         """
 
-        response = client.chat.completions.create(
-            model=os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o"),
-            messages=[
+        response = await get_llm_gateway().acomplete(
+            [
                 {"role": "system", "content": "You are an expert caregiver profiling AI."},
                 {"role": "user", "content": prompt}
             ],
+            caller="personality",
             response_format={"type": "json_object"}
         )
 
-        result_content = response.choices[0].message.content
-        result = json.loads(result_content)
+        result = json.loads(response.content)
 
         # 정규화된 점수를 결과에 추가
         result["empathy_score"] = normalized_scores["empathy_score"]
@@ -7,8 +7,12 @@ P11 (간병인 찾기) → P12 (로딩) → P13 (결과 리스트)의 API 엔드
 """
 
 from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Optional
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime, date
+import json
 import logging
 import re
 
@@ -17,39 +21,27 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_
 
 from app.services.matching.nuelbom_predictor import get_nuelbom_predictor, NuelbomMatchingPredictor
+from app.services.matching.caregiver_store import CaregiverSnapshot, get_caregiver_store
+from app.services.matching.certification_index import CARE_TYPE_TO_CERTIFICATION
+from app.services.matching.recommendation_cache import CacheDependency, get_recommendation_cache
+from app.services.matching.comment_cache import get_comment_cache
+from app.services.matching.shared_memory import get_memory_stats
+from app.services.matching.model_registry import get_model_registry
+from app.services.matching.retrieval import StageTimer, filter_snapshot
+from app.services.matching.score_matrix import get_score_matrix_store
+from app.services.matching.score_invalidation import get_score_invalidation_consumer
+from app.services.llm_gateway import get_llm_gateway
 from app.dependencies.database import get_db
-from app.models.profile import Caregiver
+from app.dependencies.auth import require_admin_token
+from app.models.profile import Caregiver, Patient
 from app.models.user import User
-from app.models.care_details import CaregiverPersonality
+from app.models.care_details import CaregiverPersonality, HealthCondition
 from app.models.matching import MatchingRequest, MatchingResult
+from app.crud.matching import bulk_create_matching_results
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Care type to certification mapping
-CARE_TYPE_TO_CERTIFICATION = {
-    'nursing-aide': '요양보호사',      # matches 요양보호사 1급, 요양보호사 2급, etc.
-    'nursing-assistant': '간호조무사',  # matches 간호조무사
-    'nurse': '간호사'                  # matches 간호사
-}
-
-
-def extract_matching_job_title(certifications: str, cert_keyword: str) -> str:
-    """
-    자격증 문자열에서 매칭되는 직업을 추출합니다.
-    예: "요양보호사 1급|물리치료사" + "요양보호사" → "요양보호사 1급"
-    """
-    if not certifications:
-        return "케어기버"
-
-    # 파이프로 구분된 각 자격증을 확인
-    for cert in certifications.split('|'):
-        cert = cert.strip()
-        if cert_keyword in cert:
-            return cert
-
-    return "케어기버"
-
 
 def generate_matching_reason(
     caregiver_name: str,
@@ -152,6 +144,8 @@ class XGBoostMatchingRequest(BaseModel):
     care_start_date: Optional[date] = Field(None, description="간병 시작 날짜 (YYYY-MM-DD)")
     care_end_date: Optional[date] = Field(None, description="간병 종료 날짜 (YYYY-MM-DD)")
     top_k: int = Field(5, ge=1, le=20, description="반환할 최대 간병인 수")
+    region_filter: bool = Field(False, description="환자 지역(같은 시/도 또는 수도권) 간병인만 후보로 사용")
+    specialty_filter: bool = Field(False, description="환자 질병을 전문분야로 가진 간병인만 후보로 사용")
 
     @validator('care_end_date')
     def validate_care_dates(cls, v, values):
@@ -178,6 +172,15 @@ class CaregiverMatchResult(BaseModel):
     availability: List[str] = []
     matching_id: Optional[int] = None
     matching_reason: str = Field(..., description="매칭 근거 설명")
+    model_version: Optional[str] = Field(None, description="점수를 계산한 매칭 모델 버전")
+
+
+class RetrievalMetadata(BaseModel):
+    """후보 검색/점수 계산 메타데이터"""
+    pool_size: int = Field(..., description="간병인 전체 풀 크기")
+    candidates_scored: int = Field(..., description="필터를 통과해 점수를 계산한 간병인 수")
+    cache_hit: bool = Field(False, description="추천 결과 캐시 적중 여부")
+    stage_timings_ms: Dict[str, float] = Field(default_factory=dict, description="단계별 소요 시간 (ms)")
 
 
 class XGBoostMatchingResponse(BaseModel):
@@ -187,6 +190,249 @@ class XGBoostMatchingResponse(BaseModel):
     matches: List[CaregiverMatchResult]
     algorithm_version: str = "XGBoost_v3"
     timestamp: datetime
+    metadata: Optional[RetrievalMetadata] = None
+
+
+# ============================================================================
+# 추천 계산 / 저장
+# ============================================================================
+
+def _request_fingerprint(
+    request: "XGBoostMatchingRequest",
+    care_type: str,
+    model_version: Optional[str] = None
+) -> dict:
+    """추천 결과 캐시 키에 쓰는 환자 프로필/요구사항 fingerprint (model_version: 환자에게 배정된 모델 버전)"""
+    fingerprint = {
+        "patient_personality": request.patient_personality.dict(),
+        "care_type": care_type,
+        "preferred_days": sorted(request.preferred_days),
+        "preferred_time_slots": sorted(request.preferred_time_slots),
+        "top_k": request.top_k,
+        "region_filter": request.region_filter,
+        "specialty_filter": request.specialty_filter,
+    }
+    # 지역/전문분야 필터는 환자별 지역·질병을 사용하므로 환자 ID도 포함
+    if request.region_filter or request.specialty_filter:
+        fingerprint["patient_id"] = request.patient_id
+    # A/B 분할 시 같은 프로필이라도 환자마다 점수를 계산하는 버전이 다름
+    if model_version is not None:
+        fingerprint["model_version"] = model_version
+    return fingerprint
+
+
+def _compute_matches(
+    request: "XGBoostMatchingRequest",
+    db: Session,
+    snapshot: CaregiverSnapshot,
+    predictor: NuelbomMatchingPredictor,
+    cert_keyword: str,
+    timer: StageTimer,
+    ai_comments: bool = True
+) -> Tuple[List[dict], int]:
+    """
+    후보 검색 → 점수 계산 → 상위 top_k 선택 → 응답 항목 생성 (DB 저장 제외)
+
+    ai_comments가 False이면 규칙 기반 코멘트로 응답 항목을 만들고,
+    각 항목의 "_comment_request" 키에 AI 코멘트 요청을 남깁니다 (스트리밍 응답용).
+
+    Returns:
+        (matches, candidates_scored): 응답 항목 리스트와 점수를 계산한 후보 수
+    """
+    # 메모리의 간병인 특성 저장소에서 전체 풀 검색 (LIMIT 없이 조건에 맞는 간병인 모두 점수 계산)
+    # 예: 요양보호사 검색 시 "요양보호사 1급", "요양보호사 2급" 등 모두 매칭
+    with timer.stage("retrieval"):
+        patient_region = None
+        if request.region_filter:
+            patient = db.query(Patient.region_code).filter(Patient.patient_id == request.patient_id).first()
+            patient_region = patient.region_code if patient else None
+
+        patient_diseases = None
+        if request.specialty_filter:
+            patient_diseases = [
+                row.disease_name for row in
+                db.query(HealthCondition.disease_name).filter(HealthCondition.patient_id == request.patient_id)
+            ]
+
+        candidate_indices = filter_snapshot(
+            snapshot,
+            certification_keyword=cert_keyword,
+            patient_region=patient_region,
+            patient_diseases=patient_diseases,
+        )
+
+    logger.info(f"[XGBoost 추천] 후보 간병인 수: {len(candidate_indices)}/{len(snapshot)} (저장소 v{snapshot.version})")
+
+    if len(candidate_indices) == 0:
+        return [], 0
+
+    patient_personality = {
+        "empathy_score": request.patient_personality.empathy_score,
+        "activity_score": request.patient_personality.activity_score,
+        "patience_score": request.patient_personality.patience_score,
+        "independence_score": request.patient_personality.independence_score,
+    }
+
+    # 야간 배치로 미리 계산한 점수 (실시간 계산과 같은 결과를 보장할 수 있을 때만 사용)
+    precomputed = None
+    score_matrix_store = get_score_matrix_store()
+    score_matrix = score_matrix_store.get()
+    if score_matrix is not None:
+        with timer.stage("precomputed"):
+            model_version = predictor.current_model(request.patient_id)[1]
+            precomputed, reason = score_matrix.lookup(
+                request.patient_id, patient_personality, model_version,
+                snapshot, candidate_indices, request.top_k,
+            )
+        score_matrix_store.record(reason)
+
+    if precomputed is not None:
+        positions, scores = precomputed
+        recommendations = predictor.recommend_caregivers_from_scores(
+            patient_id=request.patient_id,
+            patient_personality=patient_personality,
+            snapshot=snapshot,
+            positions=positions,
+            scores=scores,
+            model_version=model_version,
+            timer=timer,
+            ai_comments=ai_comments,
+        )
+    else:
+        # 늘봄케어 XGBoost 매칭 추천 (R²=0.9159)
+        recommendations = predictor.recommend_caregivers_from_store(
+            patient_id=request.patient_id,
+            patient_personality=patient_personality,
+            snapshot=snapshot,
+            candidate_indices=candidate_indices,
+            top_n=request.top_k,
+            timer=timer,
+            ai_comments=ai_comments,
+        )
+
+    # 선택된 돌봄유형에 맞는 자격증 (자격증 역색인에서 사전 계산된 직업명)
+    certification_index = snapshot.certification_index
+    for rec in recommendations:
+        position = snapshot.positions[rec["caregiver_id"]]
+        rec["job_title"] = certification_index.job_title(position, cert_keyword)
+
+    # 응답 포맷 변환 (기존 API 스키마에 맞춤)
+    matches = []
+    for rec in recommendations:
+        # 매칭 근거 생성
+        matching_reason = generate_matching_reason(
+            caregiver_name=rec.get("caregiver_name", ""),
+            experience_years=rec.get("experience_years", 0),
+            specialties=rec.get("specialties", []),
+            match_score=rec.get("predicted_score", 0),
+            personality_analysis=rec.get("ai_comment", "")
+        )
+
+        match = {
+            "caregiver_id": rec["caregiver_id"],
+            "caregiver_name": rec.get("caregiver_name", ""),
+            "job_title": rec.get("job_title", ""),
+            "grade": rec.get("grade", "B"),
+            "match_score": rec.get("predicted_score", 0),
+            "experience_years": rec.get("experience_years", 0),
+            "hourly_rate": rec.get("hourly_rate", 0),
+            "avg_rating": rec.get("avg_rating", 0),
+            "profile_image_url": rec.get("profile_image_url", ""),
+            "personality_analysis": rec.get("ai_comment", ""),
+            "specialties": rec.get("specialties", []),
+            "availability": rec.get("availability", []),
+            "matching_reason": matching_reason,
+            "model_version": rec.get("model_version"),
+        }
+        if "_comment_request" in rec:
+            match["_comment_request"] = rec["_comment_request"]
+        matches.append(match)
+
+    logger.info(f"[XGBoost 추천] {len(matches)}명의 간병인 추천 완료")
+
+    return matches, len(candidate_indices)
+
+
+def _cache_dependency(
+    request: "XGBoostMatchingRequest",
+    matches: List[dict],
+    model_version: Optional[str]
+) -> CacheDependency:
+    """캐시 항목의 의존 정보 (간병인이 바뀌었을 때 이 항목만 다시 확인하기 위함)"""
+    return CacheDependency(
+        patient_id=request.patient_id,
+        patient_personality=request.patient_personality.dict(),
+        model_version=model_version,
+        caregiver_ids=frozenset(match["caregiver_id"] for match in matches),
+        kth_score=min(match["match_score"] for match in matches) if len(matches) >= request.top_k else None,
+    )
+
+
+def _scored_with(matches: List[dict], model_version: Optional[str]) -> bool:
+    """모든 항목이 캐시 키의 모델 버전으로 계산되었는지 (계산 중 모델이 교체되면 캐시하지 않음)"""
+    return all(match.get("model_version") == model_version for match in matches)
+
+
+def _save_matching(
+    db: Session,
+    request: "XGBoostMatchingRequest",
+    matches: List[dict]
+) -> List[dict]:
+    """
+    매칭 요청(MatchingRequest)과 매칭 결과(MatchingResult)를 한 트랜잭션으로 저장 (care period dates 포함)
+
+    Returns:
+        List[dict]: 저장에 성공한 매칭 항목 (matching_id 포함)
+    """
+    try:
+        matching_request = MatchingRequest(
+            patient_id=request.patient_id,
+            required_qualification=request.requirements.care_type if request.requirements else None,
+            preferred_regions=None,
+            preferred_days=request.preferred_days,
+            preferred_time_slots=request.preferred_time_slots,
+            care_start_date=request.care_start_date,
+            care_end_date=request.care_end_date,
+            additional_request=None,
+            is_active=True
+        )
+        db.add(matching_request)
+        db.flush()  # request_id 확보 (같은 트랜잭션)
+
+        # 매칭 결과(MatchingResult) 일괄 저장 (실패한 행은 SAVEPOINT로 제외하고 나머지는 저장)
+        matching_ids = bulk_create_matching_results(db, [
+            {
+                "request_id": matching_request.request_id,
+                "caregiver_id": match['caregiver_id'],
+                "status": "recommended",
+                "total_score": match['match_score'],
+                "grade": match['grade'],
+                "ai_comment": match['personality_analysis'],
+                "model_version": match.get('model_version'),
+            }
+            for match in matches
+        ])
+        db.commit()
+        logger.info(f"[매칭 요청 저장] request_id={matching_request.request_id}, patient_id={request.patient_id}, "
+                   f"care_period={request.care_start_date} ~ {request.care_end_date}, "
+                   f"results={sum(1 for mid in matching_ids if mid is not None)}/{len(matches)}")
+
+        # 응답 객체에 matching_id 설정 (저장에 성공한 매칭만 반환)
+        saved_matches = []
+        for match, matching_id in zip(matches, matching_ids):
+            if matching_id is None:
+                continue
+            match['matching_id'] = matching_id
+            saved_matches.append(match)
+
+        # matches 리스트 업데이트
+        matches = saved_matches
+    except Exception as e:
+        logger.error(f"[매칭 요청 저장 실패] {e}")
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"매칭 요청 저장 실패: {str(e)}")
+
+    return matches
 
 
 # ============================================================================
@@ -230,181 +476,66 @@ async def recommend_caregivers_xgboost(
         care_type = request.requirements.care_type if request.requirements else 'nursing-aide'
         cert_keyword = CARE_TYPE_TO_CERTIFICATION.get(care_type, '요양보호사')
 
-        # SQL LIKE 필터를 사용하여 실제 간병인 데이터 조회 (성격 정보 포함)
-        # 예: 요양보호사 검색 시 "요양보호사 1급", "요양보호사 2급" 등 모두 매칭
-        from sqlalchemy.orm import joinedload
-        caregivers = db.query(Caregiver)\
-            .join(User)\
-            .outerjoin(CaregiverPersonality)\
-            .options(joinedload(Caregiver.user))\
-            .filter(Caregiver.certifications.ilike(f'%{cert_keyword}%'))\
-            .limit(request.top_k * 2)\
-            .all()  # 필터링을 위해 더 많이 조회
-
-        logger.info(f"[XGBoost 추천] 조회된 간병인 수: {len(caregivers)}")
-        if caregivers:
-            first_caregiver = caregivers[0]
-            logger.info(f"[XGBoost 추천] 첫 번째 간병인: {first_caregiver.caregiver_id}")
-            logger.info(f"[XGBoost 추천] Specialties 칼럼값: {first_caregiver.specialties} (type: {type(first_caregiver.specialties)})")
-            if first_caregiver.specialties:
-                logger.info(f"[XGBoost 추천] Specialties 길이: {len(first_caregiver.specialties)}")
-
-        if not caregivers:
+        timer = StageTimer()
+
+        with timer.stage("snapshot"):
+            # 갱신 주기가 지났으면 DB 증분 조회가 일어나므로 스레드 풀에서 실행
+            snapshot = await run_in_threadpool(get_caregiver_store().get_snapshot, db)
+            predictor = get_nuelbom_predictor()
+
+        # 추천 결과 캐시 조회 (환자 프로필 fingerprint + 모델 버전, 간병인 변경은 항목별로 확인)
+        cache = get_recommendation_cache()
+        versions = (predictor.model_version, snapshot.version)
+        model_version = predictor.current_model(request.patient_id)[1]
+        with timer.stage("cache"):
+            cache_key = cache.make_key(_request_fingerprint(request, care_type, model_version), predictor.model_version)
+            cached = cache.get(cache_key, versions)
+
+        cache_hit = cached is not None
+        if cache_hit:
+            matches, candidates_scored = cached
+            logger.info(f"[XGBoost 추천] 캐시 적중 - {len(matches)}명 (저장소 v{snapshot.version})")
+        else:
+            # 점수 계산과 AI 코멘트 생성(블로킹 호출)은 스레드 풀에서 실행해 이벤트 루프를 막지 않음
+            matches, candidates_scored = await run_in_threadpool(
+                _compute_matches, request, db, snapshot, predictor, cert_keyword, timer
+            )
+            if _scored_with(matches, model_version):
+                cache.put(cache_key, (matches, candidates_scored), versions,
+                          _cache_dependency(request, matches, model_version))
+
+        if candidates_scored == 0:
             logger.warning(f"[XGBoost 추천] 조회된 간병인 없음")
             return XGBoostMatchingResponse(
                 patient_id=request.patient_id,
                 total_matches=0,
                 matches=[],
                 algorithm_version="XGBoost_v3",
-                timestamp=datetime.utcnow()
+                timestamp=datetime.utcnow(),
+                metadata=RetrievalMetadata(
+                    pool_size=len(snapshot),
+                    candidates_scored=0,
+                    cache_hit=cache_hit,
+                    stage_timings_ms=timer.timings,
+                )
             )
 
-        # 조회된 데이터를 처리
-        caregivers_with_personality = []
-        for caregiver in caregivers:
-            # 선택된 돌봄유형에 맞는 자격증만 추출
-            job_title = extract_matching_job_title(caregiver.certifications, cert_keyword)
-
-            # 실제 성격 정보 조회 (또는 기본값)
-            personality = caregiver.personality
-            empathy_score = personality.empathy_score if personality else 50
-            activity_score = personality.activity_score if personality else 50
-            patience_score = personality.patience_score if personality else 50
-            independence_score = personality.independence_score if personality else 50
-
-            # specialties 파싱: PostgreSQL ARRAY 타입을 처리
-            # DB에서 {항목1,항목2,항목3} 또는 [항목1, 항목2] 형태로 올 수 있음
-            specialties = []
-            if caregiver.specialties:
-                try:
-                    # 이미 리스트/튜플인 경우
-                    if isinstance(caregiver.specialties, (list, tuple)):
-                        specialties = [str(s).strip() for s in caregiver.specialties if s]
-                    else:
-                        # 문자열인 경우: {항목1,항목2} 형태
-                        specs_str = str(caregiver.specialties)
-                        if specs_str.startswith('{') and specs_str.endswith('}'):
-                            specs_str = specs_str[1:-1]  # {} 제거
-                        # 쉼표로 구분된 항목 파싱
-                        specialties = [s.strip() for s in specs_str.split(',') if s.strip()]
-                except Exception as e:
-                    logger.warning(f"[XGBoost] specialties 파싱 실패: {caregiver.caregiver_id}, error: {e}")
-                    specialties = []
-
-            caregivers_with_personality.append({
-                "caregiver_id": caregiver.caregiver_id,
-                "caregiver_name": caregiver.user.name if caregiver.user else "Unknown",
-                "job_title": job_title,
-                "experience_years": caregiver.experience_years or 0,
-                "empathy_score": empathy_score,
-                "activity_score": activity_score,
-                "patience_score": patience_score,
-                "independence_score": independence_score,
-                "hourly_rate": caregiver.hourly_rate or 25000,
-                "avg_rating": float(caregiver.avg_rating) if caregiver.avg_rating else 4.5,
-                "profile_image_url": (caregiver.user.profile_image_url or "") if caregiver.user else "",
-                "specialties": specialties,
-            })
-
-        # 늘봄케어 XGBoost 매칭 추천 (R²=0.9159)
-        predictor = get_nuelbom_predictor()
-        recommendations = predictor.recommend_caregivers_with_db_personality(
-            patient_id=request.patient_id,
-            patient_personality={
-                "empathy_score": request.patient_personality.empathy_score,
-                "activity_score": request.patient_personality.activity_score,
-                "patience_score": request.patient_personality.patience_score,
-                "independence_score": request.patient_personality.independence_score,
-            },
-            caregivers_with_personality=caregivers_with_personality,
-            top_n=request.top_k,
-        )
-
-        # 응답 포맷 변환 (기존 API 스키마에 맞춤)
-        matches = []
-        for rec in recommendations:
-            # 매칭 근거 생성
-            matching_reason = generate_matching_reason(
-                caregiver_name=rec.get("caregiver_name", ""),
-                experience_years=rec.get("experience_years", 0),
-                specialties=rec.get("specialties", []),
-                match_score=rec.get("predicted_score", 0),
-                personality_analysis=rec.get("ai_comment", "")
-            )
-
-            matches.append({
-                "caregiver_id": rec["caregiver_id"],
-                "caregiver_name": rec.get("caregiver_name", ""),
-                "job_title": rec.get("job_title", ""),
-                "grade": rec.get("grade", "B"),
-                "match_score": rec.get("predicted_score", 0),
-                "experience_years": rec.get("experience_years", 0),
-                "hourly_rate": rec.get("hourly_rate", 0),
-                "avg_rating": rec.get("avg_rating", 0),
-                "profile_image_url": rec.get("profile_image_url", ""),
-                "personality_analysis": rec.get("ai_comment", ""),
-                "specialties": rec.get("specialties", []),
-                "availability": rec.get("availability", []),
-                "matching_reason": matching_reason,
-            })
-
-        logger.info(f"[XGBoost 추천] {len(matches)}명의 간병인 추천 완료")
-
-        # 매칭 요청을 데이터베이스에 저장 (care period dates 포함)
-        try:
-            matching_request = MatchingRequest(
-                patient_id=request.patient_id,
-                required_qualification=request.requirements.care_type if request.requirements else None,
-                preferred_regions=None,
-                preferred_days=request.preferred_days,
-                preferred_time_slots=request.preferred_time_slots,
-                care_start_date=request.care_start_date,
-                care_end_date=request.care_end_date,
-                additional_request=None,
-                is_active=True
-            )
-            db.add(matching_request)
-            db.commit()
-            db.refresh(matching_request)
-            logger.info(f"[매칭 요청 저장] request_id={matching_request.request_id}, patient_id={request.patient_id}, "
-                       f"care_period={request.care_start_date} ~ {request.care_end_date}")
-
-            # 매칭 결과(MatchingResult) 저장
-            saved_matches = []
-            for match in matches:
-                try:
-                    matching_result = MatchingResult(
-                        request_id=matching_request.request_id,
-                        caregiver_id=match['caregiver_id'],
-                        status="recommended",
-                        total_score=match['match_score'],
-                        grade=match['grade'],
-                        ai_comment=match['personality_analysis']
-                    )
-                    db.add(matching_result)
-                    db.commit()
-                    db.refresh(matching_result)
-                    
-                    # 응답 객체에 matching_id 설정
-                    match['matching_id'] = matching_result.matching_id
-                    saved_matches.append(match)
-                except Exception as e:
-                    logger.error(f"[매칭 결과 저장 실패] caregiver_id={match.get('caregiver_id')}: {e}")
-                    # 실패해도 다른 매칭은 계속 저장 시도
-            
-            # matches 리스트 업데이트
-            matches = saved_matches
-        except Exception as e:
-            logger.error(f"[매칭 요청 저장 실패] {e}")
-            db.rollback()
-            raise HTTPException(status_code=500, detail=f"매칭 요청 저장 실패: {str(e)}")
+        # 매칭 요청을 데이터베이스에 저장 (캐시 적중 시에도 요청 기록)
+        with timer.stage("persist"):
+            matches = await run_in_threadpool(_save_matching, db, request, matches)
 
         return XGBoostMatchingResponse(
             patient_id=request.patient_id,
             total_matches=len(matches),
             matches=matches,
             algorithm_version="XGBoost_v3",
-            timestamp=datetime.utcnow()
+            timestamp=datetime.utcnow(),
+            metadata=RetrievalMetadata(
+                pool_size=len(snapshot),
+                candidates_scored=candidates_scored,
+                cache_hit=cache_hit,
+                stage_timings_ms=timer.timings,
+            )
         )
 
     except Exception as e:
@@ -412,6 +543,147 @@ async def recommend_caregivers_xgboost(
         raise HTTPException(status_code=500, detail=f"매칭 실패: {str(e)}")
 
 
+def _ndjson_event(event: str, payload: dict) -> str:
+    """스트리밍 응답의 NDJSON 한 줄 ({"event": ..., **payload})"""
+    return json.dumps({"event": event, **jsonable_encoder(payload)}, ensure_ascii=False) + "\n"
+
+
+async def _stream_matches(
+    request: XGBoostMatchingRequest,
+    db: Session
+) -> AsyncIterator[str]:
+    """
+    recommend-xgboost/stream 이벤트 생성
+
+    matches(점수/등급/규칙 기반 코멘트) → comment(Azure OpenAI 코멘트, 완료 순서) → complete(matching_id)
+    """
+    try:
+        care_type = request.requirements.care_type if request.requirements else 'nursing-aide'
+        cert_keyword = CARE_TYPE_TO_CERTIFICATION.get(care_type, '요양보호사')
+
+        timer = StageTimer()
+
+        with timer.stage("snapshot"):
+            # 갱신 주기가 지났으면 DB 증분 조회가 일어나므로 스레드 풀에서 실행
+            snapshot = await run_in_threadpool(get_caregiver_store().get_snapshot, db)
+            predictor = get_nuelbom_predictor()
+
+        # 추천 결과 캐시 조회 (캐시 적중 시 AI 코멘트가 이미 포함되어 있음)
+        cache = get_recommendation_cache()
+        versions = (predictor.model_version, snapshot.version)
+        model_version = predictor.current_model(request.patient_id)[1]
+        with timer.stage("cache"):
+            cache_key = cache.make_key(_request_fingerprint(request, care_type, model_version), predictor.model_version)
+            cached = cache.get(cache_key, versions)
+
+        cache_hit = cached is not None
+        if cache_hit:
+            matches, candidates_scored = cached
+        else:
+            # AI 코멘트 없이 점수/등급/규칙 기반 코멘트만 먼저 계산
+            matches, candidates_scored = await run_in_threadpool(
+                _compute_matches, request, db, snapshot, predictor, cert_keyword, timer, False
+            )
+        comment_requests = [match.pop("_comment_request", None) for match in matches]
+
+        yield _ndjson_event("matches", {
+            "patient_id": request.patient_id,
+            "total_matches": len(matches),
+            "matches": [CaregiverMatchResult(**match) for match in matches],
+            "algorithm_version": "XGBoost_v3",
+            "timestamp": datetime.utcnow(),
+            "metadata": RetrievalMetadata(
+                pool_size=len(snapshot),
+                candidates_scored=candidates_scored,
+                cache_hit=cache_hit,
+                stage_timings_ms=dict(timer.timings),
+            ),
+        })
+
+        if candidates_scored == 0:
+            logger.warning(f"[XGBoost 추천 스트림] 조회된 간병인 없음")
+            yield _ndjson_event("complete", {
+                "patient_id": request.patient_id,
+                "total_matches": 0,
+                "matching_ids": [],
+                "timestamp": datetime.utcnow(),
+            })
+            return
+
+        if not cache_hit:
+            # Azure OpenAI 코멘트를 완료되는 순서대로 전송 (기한 초과 항목은 규칙 기반 코멘트 유지)
+            with timer.stage("ai_comment_stream"):
+                comments = iterate_in_threadpool(predictor.iter_ai_comments(comment_requests))
+                async for i, comment_result in comments:
+                    if comment_result.get("source") == "rule_based":
+                        continue
+
+                    matches[i]["personality_analysis"] = comment_result.get("comment", "")
+                    yield _ndjson_event("comment", {
+                        "rank": i + 1,
+                        "caregiver_id": matches[i]["caregiver_id"],
+                        "personality_analysis": matches[i]["personality_analysis"],
+                        "comment_source": comment_result.get("source", "unknown"),
+                    })
+
+            if _scored_with(matches, model_version):
+                cache.put(cache_key, (matches, candidates_scored), versions,
+                          _cache_dependency(request, matches, model_version))
+
+        # 최종 코멘트로 매칭 요청/결과 저장 후 matching_id 전송
+        with timer.stage("persist"):
+            matches = await run_in_threadpool(_save_matching, db, request, matches)
+
+        yield _ndjson_event("complete", {
+            "patient_id": request.patient_id,
+            "total_matches": len(matches),
+            "matching_ids": [
+                {"caregiver_id": match["caregiver_id"], "matching_id": match["matching_id"]}
+                for match in matches
+            ],
+            "timestamp": datetime.utcnow(),
+            "metadata": RetrievalMetadata(
+                pool_size=len(snapshot),
+                candidates_scored=candidates_scored,
+                cache_hit=cache_hit,
+                stage_timings_ms=timer.timings,
+            ),
+        })
+
+    except Exception as e:
+        detail = e.detail if isinstance(e, HTTPException) else f"매칭 실패: {str(e)}"
+        logger.error(f"❌ XGBoost 스트리밍 매칭 실패: {e}")
+        yield _ndjson_event("error", {"detail": detail})
+
+
+@router.post("/recommend-xgboost/stream")
+async def recommend_caregivers_xgboost_stream(
+    request: XGBoostMatchingRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    XGBoost 기반 간병인 추천 - 스트리밍 (NDJSON)
+
+    점수/등급/규칙 기반 코멘트가 담긴 추천 목록을 먼저 보내고,
+    Azure OpenAI 코멘트는 완료되는 순서대로 보낸 뒤, 저장된 matching_id를 마지막에 보냅니다.
+    요청 형식은 /recommend-xgboost와 같습니다.
+
+    ## 응답 예제 (한 줄에 이벤트 하나)
+    ```
+    {"event": "matches", "patient_id": 1, "total_matches": 5, "matches": [...], "metadata": {...}}
+    {"event": "comment", "rank": 2, "caregiver_id": 12, "personality_analysis": "...", "comment_source": "azure_openai"}
+    {"event": "complete", "patient_id": 1, "total_matches": 5, "matching_ids": [{"caregiver_id": 12, "matching_id": 345}, ...]}
+    ```
+    오류 발생 시 {"event": "error", "detail": "..."} 이벤트로 종료합니다.
+    """
+    logger.info(f"[XGBoost 추천 스트림] 환자 {request.patient_id} 매칭 요청 - 돌봄유형: {request.requirements.care_type if request.requirements else 'N/A'}")
+
+    return StreamingResponse(
+        _stream_matches(request, db),
+        media_type="application/x-ndjson",
+    )
+
+
 @router.get("/health")
 async def health_check():
     """
@@ -436,7 +708,13 @@ async def health_check():
             "message": "늘봄케어 XGBoost 매칭 서비스 정상 (R²=0.9159)",
             "model_status": "loaded",
             "algorithm_version": "Nuelbom_XGBoost_v1",
+            "model_version": status.get("model_version"),
             "azure_openai_available": status.get("azure_openai_available", False),
+            "recommendation_cache": get_recommendation_cache().get_stats(),
+            "ai_comment_cache": get_comment_cache().get_stats(),
+            "llm_gateway": get_llm_gateway().get_stats(),
+            "score_matrix": get_score_matrix_store().get_stats(),
+            "score_invalidation": get_score_invalidation_consumer().get_status(),
             "timestamp": datetime.utcnow()
         }
 
@@ -449,6 +727,85 @@ async def health_check():
         }
 
 
+@router.get("/memory")
+async def memory_stats():
+    """
+    워커 메모리 사용량 확인
+
+    응답한 워커의 RSS/PSS/공유 메모리와, MODEL_PRELOAD로 마스터에서 모델을 로드한 경우
+    같은 마스터의 모든 워커 메모리 및 공유 절감량(RSS - PSS)을 반환합니다.
+    """
+    try:
+        return get_memory_stats()
+    except Exception as e:
+        logger.error(f"❌ 메모리 확인 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"메모리 확인 실패: {str(e)}")
+
+
+class ModelActivateRequest(BaseModel):
+    """매칭 모델 버전 활성화 요청"""
+    version: str = Field(..., description="활성화할 모델 버전 (models/xgboost_<버전>.json)")
+    persist: bool = Field(True, description="ACTIVE_VERSION 파일에 기록하여 모든 워커/재시작 후에도 적용")
+
+
+@router.get("/models")
+async def list_models():
+    """
+    매칭 모델 레지스트리 상태
+
+    응답한 워커의 활성 모델 버전(버전@모델 해시), 추론 백엔드, 학습 지표와
+    models/ 디렉토리의 버전 목록을 반환합니다.
+    """
+    try:
+        return get_model_registry().get_status()
+    except Exception as e:
+        logger.error(f"❌ 모델 레지스트리 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"모델 레지스트리 조회 실패: {str(e)}")
+
+
+@router.post("/models/activate")
+async def activate_model(
+    request: ModelActivateRequest,
+    _: None = Depends(require_admin_token),
+):
+    """
+    매칭 모델 버전 활성화 (무중단 교체, X-Admin-Token 헤더 필요)
+
+    새 버전을 로드하고 특성 순서·합성 예측을 검증한 뒤 활성 모델 참조를 교체합니다.
+    검증에 실패하면 400을 반환하고 기존 버전을 계속 사용합니다. 처리 중인 요청은 이전 버전으로 끝까지 계산되며,
+    persist=true이면 다른 워커도 MATCHING_MODEL_WATCH_SECONDS 이내에 같은 버전으로 전환합니다.
+    """
+    registry = get_model_registry()
+    try:
+        served = await run_in_threadpool(registry.activate, request.version, request.persist)
+    except (FileNotFoundError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"❌ 모델 활성화 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"모델 활성화 실패: {str(e)}")
+
+    return {"status": "activated", "model": served.to_dict()}
+
+
+@router.post("/models/reload")
+async def reload_model(_: None = Depends(require_admin_token)):
+    """
+    활성 버전을 디스크에서 다시 로드 (X-Admin-Token 헤더 필요)
+
+    같은 버전 이름으로 모델 파일을 덮어쓴 경우 감시 주기를 기다리지 않고 즉시 반영합니다.
+    """
+    registry = get_model_registry()
+    try:
+        served = await run_in_threadpool(registry.reload)
+    except (FileNotFoundError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"❌ 모델 재로드 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"모델 재로드 실패: {str(e)}")
+
+    return {"status": "reloaded", "model": served.to_dict()}
+
+
 @router.post("/test-prediction")
 async def test_prediction(
     patient_personality: PersonalityScores,
@@ -496,7 +853,8 @@ async def test_prediction(
         )
 
         # 예측 (단일 간병인 추천)
-        recommendations = predictor.recommend_caregivers_with_db_personality(
+        recommendations = await run_in_threadpool(
+            predictor.recommend_caregivers_with_db_personality,
             patient_id=0,  # 테스트용
             patient_personality=patient_dict,
             caregivers_with_personality=[{
@@ -518,10 +876,12 @@ async def test_prediction(
             score = rec.get("predicted_score", 0)
             grade = rec.get("grade", "B")
             analysis = rec.get("ai_comment", "")
+            model_version = rec.get("model_version")
         else:
             score = 70.0
             grade = "B+"
             analysis = "테스트 분석 결과입니다."
+            model_version = predictor.model_version
 
         return {
             "patient_personality": patient_dict,
@@ -530,7 +890,7 @@ async def test_prediction(
             "grade": grade,
             "analysis": analysis,
             "features": {k: round(v, 2) for k, v in features.items()},
-            "model_version": "Nuelbom_XGBoost_v1"
+            "model_version": model_version
         }
 
     except Exception as e:
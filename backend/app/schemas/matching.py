@@ -88,6 +88,7 @@ class MatchingResultBase(BaseModel):
     total_score: float = Field(..., ge=0, le=100)
     grade: GradeEnum
     ai_comment: Optional[str] = None
+    model_version: Optional[str] = Field(None, description="점수를 계산한 매칭 모델 버전")
 
 
 class MatchingResultCreate(MatchingResultBase):
@@ -0,0 +1,422 @@
+# ========================================
+# 늘봄케어 - 케어 플랜 템플릿 캐시
+# ========================================
+# 파일: care_plan_cache.py
+# 설명: 같은 돌봄 프로필(요양등급, 질환, 시간대, 기간)의 LLM 케어 플랜을 템플릿으로 저장하고
+#       이름·약물만 바꿔 재사용 (SQLite 파일, TTL + LRU, 워커 간 공유)
+#
+# 캐시를 쓰는 생성 요청은 이름 대신 자리표시자로 프롬프트를 만들고 개인 정보를 쓰지 않도록 지시합니다.
+# 저장할 때 남은 환자/간병인 이름과 복용 약물 이름을 자리표시자로 바꾸고(to_template), 나이·연락처 등
+# 다른 환자에게 보이면 안 되는 정보가 남아 있으면 저장하지 않습니다(identifying_text).
+# 조회할 때 요청 환자/간병인 정보로 다시 채웁니다(personalize). 날짜는 저장 시 시작일 기준으로 붙습니다.
+
+import copy
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import logging
+
+from app.core.sqlite import ForkSafeSQLite
+from app.services.care_plan_jobs import activity_category
+
+logger = logging.getLogger(__name__)
+
+# 프롬프트/응답 형식이 바뀌면 올려서 기존 템플릿을 무효화
+TEMPLATE_VERSION = 2
+
+PATIENT_NAME = "{{patient_name}}"
+CAREGIVER_NAME = "{{caregiver_name}}"
+MEDICATIONS = "{{medications}}"
+
+# 이름 정보가 없을 때의 기본값 (일반 단어라 자리표시자로 바꾸지 않음)
+DEFAULT_NAMES = {"환자", "간병인", ""}
+
+# 공유 템플릿에 남으면 안 되는 개인 정보 (캐시 키에 없는 값이라 다른 환자에게 그대로 보임)
+IDENTIFYING_PATTERNS = [
+    ("나이", re.compile(r"(?<!\d)\d{2,3}\s?(?:세|살)(?!트)|만\s?\d{2,3}")),
+    ("성격 점수", re.compile(r"(?:공감도|활동성|인내심|자립성)\s*[:(]?\s*\d")),
+    ("간병인 경력", re.compile(r"경력\s*\d+\s*년")),
+    ("연락처", re.compile(r"01[016789][-.\s]?\d{3,4}[-.\s]?\d{4}|\d{2,3}-\d{3,4}-\d{4}")),
+    ("이메일", re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+")),
+]
+
+
+def medication_note(medications: List[str]) -> str:
+    """복용 약물 안내 문구 (최대 3개 표시)"""
+    if not medications:
+        return "⚠️ 처방된 약물 확인 필요"
+    note = f"⚠️ {', '.join(medications[:3])}"
+    if len(medications) > 3:
+        note += f" 외 {len(medications) - 3}개"
+    return note
+
+
+def _normalize_list(value: Any) -> List[str]:
+    """쉼표 구분 문자열 또는 리스트 → 공백 제거, 소문자, 중복 제거, 정렬된 리스트"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        items = value.split(",")
+    else:
+        try:
+            items = list(value)
+        except TypeError:
+            items = [value]
+    return sorted({str(item).strip().lower() for item in items if str(item).strip()})
+
+
+def _replace_strings(value: Any, replacements: List[tuple]) -> Any:
+    """dict/list 안의 모든 문자열에 치환 적용 (앞에서부터 순서대로)"""
+    if isinstance(value, str):
+        for old, new in replacements:
+            value = value.replace(old, new)
+        return value
+    if isinstance(value, list):
+        return [_replace_strings(item, replacements) for item in value]
+    if isinstance(value, dict):
+        return {key: _replace_strings(item, replacements) for key, item in value.items()}
+    return value
+
+
+def _name_replacements(patient_name: str, caregiver_name: str, to_placeholder: bool) -> List[tuple]:
+    """이름 ↔ 자리표시자 치환 목록 (긴 이름부터, 기본값 이름은 제외)"""
+    pairs = [(name, placeholder) for name, placeholder in
+             ((patient_name, PATIENT_NAME), (caregiver_name, CAREGIVER_NAME))
+             if name not in DEFAULT_NAMES]
+    pairs.sort(key=lambda pair: len(pair[0]), reverse=True)
+    return [(name, placeholder) if to_placeholder else (placeholder, name) for name, placeholder in pairs]
+
+
+def _iter_strings(value: Any):
+    """dict/list 안의 모든 문자열"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, list):
+        for item in value:
+            yield from _iter_strings(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_strings(item)
+
+
+def identifying_text(template: Dict[str, Any], patient_info: Dict[str, Any], caregiver_info: Dict[str, Any]) -> List[str]:
+    """
+    템플릿에 남은 개인 정보 종류 (비어 있어야 캐시에 저장)
+
+    이름/약물 이름은 to_template이 바꾸지만 자유 텍스트(제목, 메모, 피드백)에 LLM이 쓴
+    나이, 성격 점수, 경력, 연락처 등은 치환할 수 없으므로 발견되면 템플릿을 저장하지 않습니다.
+
+    Args:
+        template: to_template 결과
+        patient_info / caregiver_info: 플랜을 생성한 요청의 환자/간병인 정보
+
+    Returns:
+        List[str]: 발견된 개인 정보 종류 (예: ["나이", "연락처"])
+    """
+    text = "\n".join(_iter_strings(template))
+    found = []
+
+    names = [
+        ("환자 이름", str(patient_info.get("name") or "").strip()),
+        ("간병인 이름", str(caregiver_info.get("name") or "").strip()),
+    ]
+    names += [("약물 이름", str(m).strip()) for m in patient_info.get("medications") or []]
+    for label, value in names:
+        if value not in DEFAULT_NAMES and value in text and label not in found:
+            found.append(label)
+
+    found += [label for label, pattern in IDENTIFYING_PATTERNS if pattern.search(text)]
+    return found
+
+
+def to_template(plan: Dict[str, Any], patient_info: Dict[str, Any], caregiver_info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    케어 플랜(dict) → 템플릿 (이름/약물 이름을 자리표시자로)
+
+    Args:
+        plan: CarePlanResponse.model_dump()
+        patient_info / caregiver_info: 플랜을 생성한 요청의 환자/간병인 정보
+
+    Returns:
+        Dict: 자리표시자가 들어간 케어 플랜 (원본은 변경하지 않음)
+    """
+    patient_name = str(patient_info.get("name") or "").strip()
+    caregiver_name = str(caregiver_info.get("name") or "").strip()
+    replacements = _name_replacements(patient_name, caregiver_name, to_placeholder=True)
+    # 다른 활동 메모에 섞인 약물 이름은 일반 표현으로
+    replacements += [(name, "처방 약") for name in sorted(
+        {str(m).strip() for m in patient_info.get("medications", []) if str(m).strip()}, key=len, reverse=True
+    )]
+
+    template = _replace_strings(copy.deepcopy(plan), replacements)
+    template["patient_name"] = PATIENT_NAME
+    template["caregiver_name"] = CAREGIVER_NAME
+    for day in template.get("weekly_schedule", []):
+        for activity in day.get("activities", []):
+            if activity_category(activity.get("title", "")) == "medication":
+                activity["note"] = MEDICATIONS
+    return template
+
+
+def personalize(template: Dict[str, Any], patient_info: Dict[str, Any], caregiver_info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    템플릿 → 요청 환자/간병인의 케어 플랜(dict) (LLM 호출 없음)
+
+    Returns:
+        Dict: CarePlanResponse로 검증할 수 있는 케어 플랜
+    """
+    patient_name = str(patient_info.get("name") or "").strip() or "환자"
+    caregiver_name = str(caregiver_info.get("name") or "").strip() or "간병인"
+    replacements = [
+        (PATIENT_NAME, patient_name),
+        (CAREGIVER_NAME, caregiver_name),
+        (MEDICATIONS, medication_note(list(patient_info.get("medications") or []))),
+    ]
+    return _replace_strings(copy.deepcopy(template), replacements)
+
+
+class CarePlanTemplateCache:
+    """
+    케어 플랜 템플릿 캐시 (SQLite 파일, TTL + LRU)
+
+    키는 돌봄 프로필(요양등급, 질환 목록, 선호 시간대, 생성 일수, 돌봄 유형, 배포 모델)을
+    정규화한 값의 해시입니다. 이름, 나이, 성격 점수, 간병인 경력은 키에 넣지 않습니다.
+    따라서 같은 프로필의 환자는 첫 환자의 LLM 플랜을 이름·약물만 바꿔 받습니다.
+    """
+
+    def __init__(self, path: str, max_entries: int = 2000, ttl_seconds: float = 7 * 24 * 3600):
+        """
+        Args:
+            path: SQLite 파일 경로 (":memory:"이면 프로세스 메모리)
+            max_entries: 최대 템플릿 수 (초과 시 가장 오래 사용하지 않은 항목 제거)
+            ttl_seconds: 템플릿 유효 시간 (초)
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._db: Optional[ForkSafeSQLite] = ForkSafeSQLite(path, schema=[
+            """
+            CREATE TABLE IF NOT EXISTS care_plan_templates (
+                key TEXT PRIMARY KEY,
+                template TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_care_plan_templates_last_access "
+            "ON care_plan_templates (last_access)",
+        ])
+
+        self.hits = 0
+        self.misses = 0
+
+        with self._lock:
+            if self._connection() is not None:
+                logger.info(f"✅ 케어 플랜 템플릿 캐시 초기화: {self.path}")
+
+    @property
+    def is_available(self) -> bool:
+        return self._db is not None
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """현재 프로세스의 연결 (lock 보유 상태에서 호출, 열 수 없으면 캐시 비활성화 후 None)"""
+        if self._db is None:
+            return None
+        try:
+            return self._db.connect()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"케어 플랜 템플릿 캐시 초기화 실패 - 캐시 없이 동작: {e}")
+            self._db = None
+            return None
+
+    @staticmethod
+    def make_key(
+        patient_info: Dict[str, Any],
+        care_requirements: Dict[str, Any],
+        preferred_time_slots: Optional[List[str]],
+        days: int,
+        model: str = ""
+    ) -> str:
+        """
+        캐시 키 생성 (돌봄 프로필 정규화 → sha256)
+
+        Args:
+            patient_info: 환자 정보 (condition=요양등급, health_conditions/special_conditions=질환)
+            care_requirements: 돌봄 요구사항 (care_type)
+            preferred_time_slots: 선호 시간대
+            days: 생성 일수
+            model: 배포 모델 이름
+
+        Returns:
+            str: sha256 hex digest
+        """
+        payload = json.dumps(
+            {
+                "version": TEMPLATE_VERSION,
+                "model": model,
+                "care_level": str(patient_info.get("condition", "") or "").strip(),
+                # special_conditions는 프롬프트에 들어가는 질환 문자열 (보통 health_conditions를 합친 값)
+                "conditions": sorted(
+                    set(_normalize_list(patient_info.get("health_conditions", [])))
+                    | set(_normalize_list(patient_info.get("special_conditions", [])))
+                ),
+                "time_slots": _normalize_list(preferred_time_slots),
+                "days": int(days),
+                "care_type": str((care_requirements or {}).get("care_type", "") or "").strip(),
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        템플릿 조회 (없거나 만료 시 None)
+
+        Args:
+            key: make_key로 만든 키
+
+        Returns:
+            템플릿 dict 또는 None
+        """
+        if self._db is None:
+            return None
+
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT template, created_at FROM care_plan_templates WHERE key = ?", (key,)
+                ).fetchone()
+
+                if row is None:
+                    self.misses += 1
+                    return None
+
+                template, created_at = row
+                if created_at + self.ttl_seconds < now:
+                    conn.execute("DELETE FROM care_plan_templates WHERE key = ?", (key,))
+                    conn.commit()
+                    self.misses += 1
+                    return None
+
+                conn.execute(
+                    "UPDATE care_plan_templates SET last_access = ? WHERE key = ?", (now, key)
+                )
+                conn.commit()
+                self.hits += 1
+                return json.loads(template)
+            except (sqlite3.Error, json.JSONDecodeError) as e:
+                logger.warning(f"케어 플랜 템플릿 캐시 조회 실패: {e}")
+                self.misses += 1
+                return None
+
+    def put(self, key: str, template: Dict[str, Any]):
+        """
+        템플릿 저장 (최대 항목 수 초과 시 LRU 제거)
+
+        Args:
+            key: make_key로 만든 키
+            template: to_template 결과
+        """
+        if self._db is None:
+            return
+
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO care_plan_templates (key, template, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(template, ensure_ascii=False), now, now)
+                )
+                self._evict(conn, now)
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"케어 플랜 템플릿 캐시 저장 실패: {e}")
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        if self._db is None:
+            return
+
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return
+            conn.execute("DELETE FROM care_plan_templates")
+            conn.commit()
+
+    def get_stats(self) -> Dict:
+        """캐시 통계 (hits/misses/hit_rate는 이 워커 기준)"""
+        entries = 0
+        if self._db is not None:
+            with self._lock:
+                try:
+                    conn = self._connection()
+                    if conn is not None:
+                        entries = conn.execute("SELECT COUNT(*) FROM care_plan_templates").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+
+        total = self.hits + self.misses
+        return {
+            "available": self.is_available,
+            "path": self.path,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """만료 항목 및 최대 항목 수 초과분(가장 오래 사용하지 않은 항목) 삭제 (lock 보유 상태에서 호출)"""
+        conn.execute(
+            "DELETE FROM care_plan_templates WHERE created_at < ?", (now - self.ttl_seconds,)
+        )
+        conn.execute(
+            "DELETE FROM care_plan_templates WHERE key IN ("
+            "SELECT key FROM care_plan_templates ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+
+# 전역 인스턴스 (프로세스 공유)
+_care_plan_cache: Optional[CarePlanTemplateCache] = None
+_care_plan_cache_lock = threading.Lock()
+
+
+def get_care_plan_cache() -> Optional[CarePlanTemplateCache]:
+    """CarePlanTemplateCache 싱글톤 인스턴스 반환 (CARE_PLAN_CACHE_ENABLED=false이면 None)"""
+    global _care_plan_cache
+
+    if _care_plan_cache is None:
+        with _care_plan_cache_lock:
+            if _care_plan_cache is None:
+                from app.core.config import get_settings
+
+                settings = get_settings()
+                if not settings.CARE_PLAN_CACHE_ENABLED:
+                    return None
+                _care_plan_cache = CarePlanTemplateCache(
+                    path=settings.CARE_PLAN_CACHE_PATH,
+                    max_entries=settings.CARE_PLAN_CACHE_MAX_ENTRIES,
+                    ttl_seconds=settings.CARE_PLAN_CACHE_TTL_SECONDS,
+                )
+
+    return _care_plan_cache
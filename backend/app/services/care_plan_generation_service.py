@@ -3,13 +3,16 @@ Care Plan 생성 AI 서비스
 Azure OpenAI를 사용하여 환자 정보와 간병인 정보를 기반으로 케어 플랜을 생성합니다.
 """
 
+import asyncio
 import json
 import logging
-from typing import Optional, Dict, Any
-from openai import AzureOpenAI
+from datetime import datetime
+from typing import Optional, Dict, Any, AsyncIterator, Tuple, Union
 from pydantic import BaseModel
-import os
 from app.core.config import get_settings
+from app.services import care_plan_cache
+from app.services.json_stream import JSONArrayStreamParser
+from app.services.llm_gateway import get_llm_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -57,42 +60,24 @@ class CarePlanGenerationService:
     """Azure OpenAI를 사용한 케어 플랜 생성"""
 
     def __init__(self):
-        """Azure OpenAI 클라이언트 초기화"""
+        """공용 Azure OpenAI 게이트웨이 연결 (클라이언트/연결 풀은 프로세스 전체가 공유)"""
         settings = get_settings()
 
-        api_key = settings.AZURE_OPENAI_API_KEY
-        endpoint = settings.AZURE_OPENAI_ENDPOINT
-        deployment_name = settings.AZURE_OPENAI_DEPLOYMENT
-        api_version = settings.AZURE_OPENAI_API_VERSION
-        timeout = settings.AZURE_OPENAI_TIMEOUT
+        self.gateway = get_llm_gateway()
+        self.template_cache = care_plan_cache.get_care_plan_cache()
+        self.deployment_name = settings.AZURE_OPENAI_DEPLOYMENT
+        self.timeout = settings.AZURE_OPENAI_TIMEOUT
 
-        logger.info("=" * 80)
-        logger.info("[CarePlanGenerationService] 초기화 중...")
-        logger.info(f"API Key exists: {bool(api_key)}")
-        logger.info(f"Endpoint exists: {bool(endpoint)}")
-        logger.info(f"Endpoint value: {endpoint}")
-        logger.info(f"Deployment exists: {bool(deployment_name)}")
-        logger.info(f"Deployment value: {deployment_name}")
-        logger.info(f"API Version: {api_version}")
-        logger.info(f"Timeout: {timeout} seconds")
-        logger.info("=" * 80)
-
-        if not all([api_key, endpoint, deployment_name]):
+        if not (self.gateway.is_available and self.deployment_name):
             logger.warning("❌ Azure OpenAI credentials are not fully configured")
-            logger.warning(f"API Key: {bool(api_key)}, Endpoint: {bool(endpoint)}, Deployment: {bool(deployment_name)}")
-            self.client = None
-        else:
-            logger.info(f"✅ Azure OpenAI 클라이언트 초기화 성공 - Deployment: {deployment_name}")
-            self.client = AzureOpenAI(
-                api_key=api_key,
-                api_version=api_version,
-                azure_endpoint=endpoint,
-                timeout=timeout
+            logger.warning(
+                f"API Key: {bool(settings.AZURE_OPENAI_API_KEY)}, "
+                f"Endpoint: {bool(settings.AZURE_OPENAI_ENDPOINT)}, "
+                f"Deployment: {bool(self.deployment_name)}"
             )
-            self.deployment_name = deployment_name
-            self.timeout = timeout
+            self.gateway = None
 
-    def generate_care_plan(
+    async def generate_care_plan(
         self,
         patient_info: Dict[str, Any],
         caregiver_info: Dict[str, Any],
@@ -128,33 +113,23 @@ class CarePlanGenerationService:
         logger.info(f"Patient: {patient_info}")
         logger.info(f"Caregiver: {caregiver_info}")
         logger.info(f"Preferred time slots: {preferred_time_slots}")
-        logger.info(f"Client initialized: {self.client is not None}")
+        logger.info(f"Gateway available: {self.gateway is not None}")
         logger.info("=" * 80)
 
-        if self.client is None:
+        # 일수 계산
+        calculated_days = self._plan_days(start_date, end_date, days)
+
+        # 같은 돌봄 프로필의 템플릿이 있으면 LLM 호출 없이 사용
+        cache_key = self._cache_key(patient_info, care_requirements, preferred_time_slots, calculated_days)
+        cached_plan = await self._cached_plan(cache_key, patient_info, caregiver_info)
+        if cached_plan is not None:
+            return cached_plan
+
+        if self.gateway is None:
             logger.warning("❌ Using fallback care plan generation (Azure OpenAI not configured)")
             return self._generate_fallback_care_plan(patient_info, caregiver_info, preferred_time_slots)
 
         try:
-            # 일수 계산
-            from datetime import datetime
-            try:
-                if start_date and end_date:
-                    start = datetime.strptime(start_date, "%Y-%m-%d")
-                    end = datetime.strptime(end_date, "%Y-%m-%d")
-                    calculated_days = (end - start).days + 1  # 시작일 포함
-                    # 최대 7일로 제한
-                    calculated_days = min(calculated_days, 7)
-                elif days:
-                    calculated_days = min(days, 7)
-                else:
-                    calculated_days = 7  # 기본값
-            except ValueError as date_error:
-                logger.error(f"❌ Date parsing error: {str(date_error)}")
-                calculated_days = 7  # 기본값으로 폴백
-
-            logger.info(f"📅 케어 플랜 생성 기간: {calculated_days}일")
-
             # 프롬프트 구성
             try:
                 prompt = self._build_prompt(
@@ -163,47 +138,42 @@ class CarePlanGenerationService:
                     patient_personality,
                     care_requirements,
                     calculated_days,
-                    preferred_time_slots
+                    preferred_time_slots,
+                    template=cache_key is not None
                 )
             except Exception as prompt_error:
                 logger.error(f"❌ Prompt building error: {str(prompt_error)}")
                 raise
 
-            # Azure OpenAI 호출 (타임아웃 설정)
+            # Azure OpenAI 호출 (공용 게이트웨이, 타임아웃 설정)
             try:
-                response = self.client.chat.completions.create(
-                    model=self.deployment_name,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "당신은 전문적인 간병 플래너입니다. 환자와 간병인의 정보를 기반으로 최적의 케어 플랜을 생성합니다. 항상 유효한 JSON 형식으로 응답하세요."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
+                result = await self.gateway.acomplete(
+                    self._messages(prompt),
+                    caller="care_plan",
+                    deployment=self.deployment_name,
+                    timeout=self.timeout,
                     temperature=0.7,
-                    max_tokens=2000,
-                    timeout=30  # 30초 타임아웃
+                    max_tokens=2000
                 )
             except Exception as api_error:
                 logger.error(f"❌ Azure OpenAI API error: {str(api_error)}")
                 raise
 
-            # 응답 검증
-            if not response or not response.choices or len(response.choices) == 0:
-                logger.error("❌ Empty response from Azure OpenAI")
-                raise ValueError("Azure OpenAI returned empty response")
+            logger.info(
+                f"Azure OpenAI 응답 ({result.latency_ms:.0f}ms, 시도 {result.attempts}회, "
+                f"토큰 {result.prompt_tokens}+{result.completion_tokens})"
+            )
 
             # 응답 파싱
             try:
-                response_text = response.choices[0].message.content
+                response_text = result.content
                 if not response_text:
                     logger.error("❌ Response content is empty")
                     raise ValueError("Response content is empty")
 
-                care_plan_json = self._extract_json(response_text)
+                care_plan_json = self._personalized(
+                    cache_key, self._extract_json(response_text), patient_info, caregiver_info
+                )
             except (ValueError, json.JSONDecodeError) as parse_error:
                 logger.error(f"❌ Response parsing error: {str(parse_error)}")
                 raise
@@ -212,18 +182,230 @@ class CarePlanGenerationService:
             try:
                 care_plan = CarePlanResponse(**care_plan_json)
                 logger.info(f"✅ Care plan generated successfully for patient: {patient_info.get('name', 'Unknown')}")
-                return care_plan
             except Exception as validation_error:
                 logger.error(f"❌ CarePlanResponse validation error: {str(validation_error)}")
                 logger.error(f"❌ Invalid JSON structure: {care_plan_json}")
                 raise
 
+            await self._store_template(cache_key, care_plan, patient_info, caregiver_info)
+            return care_plan
+
         except Exception as e:
             logger.error(f"❌ Error generating care plan: {str(e)}")
             logger.warning("⚠️ Falling back to default care plan generation")
             # 폴백: 하드코딩된 케어 플랜 반환
             return self._generate_fallback_care_plan(patient_info, caregiver_info, preferred_time_slots)
 
+    async def stream_care_plan(
+        self,
+        patient_info: Dict[str, Any],
+        caregiver_info: Dict[str, Any],
+        patient_personality: Dict[str, float],
+        care_requirements: Dict[str, Any],
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        days: Optional[int] = None,
+        preferred_time_slots: Optional[list] = None
+    ) -> AsyncIterator[Tuple[str, Union[DaySchedule, CarePlanResponse]]]:
+        """
+        케어 플랜 스트리밍 생성 (인자는 generate_care_plan과 동일)
+
+        응답 토큰을 받는 대로 weekly_schedule 항목을 파싱해 하루 일정이 완성될 때마다 반환하고,
+        마지막에 전체 응답을 검증한 케어 플랜을 반환합니다.
+        생성/검증에 실패하면 이미 반환한 날은 그대로 두고 나머지 날을 폴백 플랜으로 채웁니다.
+
+        Yields:
+            ("day", DaySchedule): 완성된 하루 일정 (첫째 날부터 순서대로)
+            ("plan", CarePlanResponse): 전체 케어 플랜 (weekly_schedule은 반환한 날들과 같음)
+        """
+        if not preferred_time_slots:
+            preferred_time_slots = care_requirements.get('time_slots', ['morning', 'afternoon'])
+
+        logger.info(f"[stream_care_plan] 시작 - Patient: {patient_info.get('name', 'Unknown')}, "
+                    f"Gateway available: {self.gateway is not None}")
+
+        streamed = []
+        calculated_days = self._plan_days(start_date, end_date, days)
+
+        # 같은 돌봄 프로필의 템플릿이 있으면 LLM 호출 없이 바로 반환
+        cache_key = self._cache_key(patient_info, care_requirements, preferred_time_slots, calculated_days)
+        cached_plan = await self._cached_plan(cache_key, patient_info, caregiver_info)
+        if cached_plan is not None:
+            for day in cached_plan.weekly_schedule:
+                yield "day", day
+            yield "plan", cached_plan
+            return
+
+        try:
+            if self.gateway is None:
+                raise RuntimeError("Azure OpenAI not configured")
+
+            prompt = self._build_prompt(
+                patient_info,
+                caregiver_info,
+                patient_personality,
+                care_requirements,
+                calculated_days,
+                preferred_time_slots,
+                template=cache_key is not None
+            )
+            parser = JSONArrayStreamParser("weekly_schedule")
+            chunks = []
+            stream = self.gateway.astream(
+                self._messages(prompt),
+                caller="care_plan",
+                deployment=self.deployment_name,
+                timeout=self.timeout,
+                temperature=0.7,
+                max_tokens=2000
+            )
+            try:
+                async for text in stream:
+                    chunks.append(text)
+                    for item in parser.feed(text):
+                        try:
+                            day = DaySchedule(**self._personalized(
+                                cache_key, {"weekly_schedule": [item]}, patient_info, caregiver_info
+                            )["weekly_schedule"][0])
+                        except Exception as validation_error:
+                            logger.warning(f"⚠️ DaySchedule validation error: {str(validation_error)}")
+                            continue
+                        streamed.append(day)
+                        logger.info(f"📅 [{len(streamed)}일차 생성] {day.day} - 활동 {len(day.activities)}개")
+                        yield "day", day
+            finally:
+                await stream.aclose()
+
+            care_plan = CarePlanResponse(**self._personalized(
+                cache_key, self._extract_json("".join(chunks)), patient_info, caregiver_info
+            ))
+            if len(care_plan.weekly_schedule) == len(streamed):
+                # 스트리밍 중 건너뛴 날이 없을 때만 템플릿으로 저장
+                await self._store_template(cache_key, care_plan, patient_info, caregiver_info)
+        except Exception as e:
+            logger.error(f"❌ Error streaming care plan: {str(e)}")
+            logger.warning(f"⚠️ Falling back to default care plan for days after {len(streamed)}")
+            care_plan = self._generate_fallback_care_plan(patient_info, caregiver_info, preferred_time_slots)
+            if streamed:
+                # 일부 날짜를 이미 반환했으면 요청 기간까지만 폴백 일정으로 채움
+                care_plan.weekly_schedule = (
+                    streamed + care_plan.weekly_schedule[len(streamed):calculated_days]
+                )
+
+        # 스트리밍 중 건너뛴 항목 없이 검증되었으면 남는 날이 없음
+        for day in care_plan.weekly_schedule[len(streamed):]:
+            streamed.append(day)
+            yield "day", day
+
+        care_plan.weekly_schedule = streamed
+        logger.info(f"✅ Care plan streamed: {len(streamed)} days")
+        yield "plan", care_plan
+
+    def _cache_key(
+        self,
+        patient_info: Dict[str, Any],
+        care_requirements: Dict[str, Any],
+        preferred_time_slots: Optional[list],
+        days: int
+    ) -> Optional[str]:
+        """템플릿 캐시 키 (캐시 비활성화 시 None)"""
+        if self.template_cache is None:
+            return None
+        return self.template_cache.make_key(
+            patient_info, care_requirements, preferred_time_slots, days, model=self.deployment_name or ""
+        )
+
+    async def _cached_plan(
+        self,
+        cache_key: Optional[str],
+        patient_info: Dict[str, Any],
+        caregiver_info: Dict[str, Any]
+    ) -> Optional[CarePlanResponse]:
+        """템플릿 캐시 조회 → 요청 환자/간병인으로 채운 케어 플랜 (없거나 실패 시 None)"""
+        if cache_key is None:
+            return None
+        try:
+            template = await asyncio.to_thread(self.template_cache.get, cache_key)
+            if template is None:
+                return None
+            care_plan = CarePlanResponse(
+                **care_plan_cache.personalize(template, patient_info, caregiver_info)
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ 케어 플랜 템플릿 사용 실패 - LLM으로 생성: {str(e)}")
+            return None
+
+        logger.info(f"♻️ 케어 플랜 템플릿 캐시 사용 (LLM 호출 생략): {patient_info.get('name', 'Unknown')}")
+        return care_plan
+
+    @staticmethod
+    def _personalized(
+        cache_key: Optional[str],
+        plan: Dict[str, Any],
+        patient_info: Dict[str, Any],
+        caregiver_info: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """템플릿 프롬프트(자리표시자)로 생성한 응답 → 요청 환자/간병인으로 채운 플랜 (캐시 비활성화 시 그대로)"""
+        if cache_key is None:
+            return plan
+        template = care_plan_cache.to_template(plan, patient_info, caregiver_info)
+        return care_plan_cache.personalize(template, patient_info, caregiver_info)
+
+    async def _store_template(
+        self,
+        cache_key: Optional[str],
+        care_plan: CarePlanResponse,
+        patient_info: Dict[str, Any],
+        caregiver_info: Dict[str, Any]
+    ):
+        """LLM으로 생성한 케어 플랜을 템플릿으로 저장 (실패해도 생성 결과에는 영향 없음)"""
+        if cache_key is None:
+            return
+        try:
+            template = care_plan_cache.to_template(care_plan.model_dump(), patient_info, caregiver_info)
+            # 자유 텍스트에 남은 개인 정보는 치환할 수 없으므로 다른 환자에게 공유하지 않음
+            leaked = care_plan_cache.identifying_text(template, patient_info, caregiver_info)
+            if leaked:
+                logger.warning(f"⚠️ 케어 플랜에 개인 정보({', '.join(leaked)})가 있어 템플릿으로 저장하지 않음")
+                return
+            await asyncio.to_thread(self.template_cache.put, cache_key, template)
+        except Exception as e:
+            logger.warning(f"⚠️ 케어 플랜 템플릿 저장 실패: {str(e)}")
+
+    def _plan_days(self, start_date: Optional[str], end_date: Optional[str], days: Optional[int]) -> int:
+        """생성할 일수 (시작일~종료일 또는 days, 최대 7일, 기본 7일)"""
+        try:
+            if start_date and end_date:
+                start = datetime.strptime(start_date, "%Y-%m-%d")
+                end = datetime.strptime(end_date, "%Y-%m-%d")
+                calculated_days = (end - start).days + 1  # 시작일 포함
+                # 최대 7일로 제한
+                calculated_days = min(calculated_days, 7)
+            elif days:
+                calculated_days = min(days, 7)
+            else:
+                calculated_days = 7  # 기본값
+        except ValueError as date_error:
+            logger.error(f"❌ Date parsing error: {str(date_error)}")
+            calculated_days = 7  # 기본값으로 폴백
+
+        logger.info(f"📅 케어 플랜 생성 기간: {calculated_days}일")
+        return calculated_days
+
+    @staticmethod
+    def _messages(prompt: str) -> list:
+        """채팅 메시지 구성 (시스템 지시 + 프롬프트)"""
+        return [
+            {
+                "role": "system",
+                "content": "당신은 전문적인 간병 플래너입니다. 환자와 간병인의 정보를 기반으로 최적의 케어 플랜을 생성합니다. 항상 유효한 JSON 형식으로 응답하세요."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+
     def _build_prompt(
         self,
         patient_info: Dict[str, Any],
@@ -231,9 +413,23 @@ class CarePlanGenerationService:
         patient_personality: Dict[str, float],
         care_requirements: Dict[str, Any],
         days: int = 7,
-        preferred_time_slots: Optional[list] = None
+        preferred_time_slots: Optional[list] = None,
+        template: bool = False
     ) -> str:
-        """AI에게 전달할 프롬프트 구성"""
+        """
+        AI에게 전달할 프롬프트 구성
+
+        template=True이면 같은 돌봄 프로필의 다른 환자에게도 재사용할 플랜이므로
+        이름은 자리표시자로 넣고 나이는 넣지 않으며, 개인 정보를 쓰지 않도록 지시합니다.
+        """
+        if template:
+            patient_name = care_plan_cache.PATIENT_NAME
+            caregiver_name = care_plan_cache.CAREGIVER_NAME
+            age = "비공개"
+        else:
+            patient_name = patient_info.get('name', '환자')
+            caregiver_name = caregiver_info.get('name', '간병인')
+            age = patient_info.get('age', 'N/A')
 
         # 시간대 한글 변환
         time_slot_map = {
@@ -248,8 +444,8 @@ class CarePlanGenerationService:
 다음 환자와 간병인 정보를 기반으로 {days}일간의 상세한 케어 플랜을 생성하세요.
 
 ## 환자 정보
-- 이름: {patient_info.get('name', '환자')}
-- 나이: {patient_info.get('age', 'N/A')}
+- 이름: {patient_name}
+- 나이: {age}
 - 건강상태: {patient_info.get('condition', 'N/A')}
 - 특수질환: {patient_info.get('special_conditions', 'N/A')}
 
@@ -260,7 +456,7 @@ class CarePlanGenerationService:
 - 자립성: {patient_personality.get('independence_score', 50)}
 
 ## 간병인 정보
-- 이름: {caregiver_info.get('name', '간병인')}
+- 이름: {caregiver_name}
 - 경력: {caregiver_info.get('experience_years', 0)}년
 - 전문성: {caregiver_info.get('specialties', [])}
 
@@ -321,6 +517,12 @@ class CarePlanGenerationService:
 6. 반드시 유효한 JSON 형식으로만 응답
 
 응답은 JSON만 포함하고 다른 텍스트는 포함하지 마세요.
+"""
+        if template:
+            prompt += f"""
+이 케어 플랜은 같은 요양등급·질환의 다른 환자에게도 그대로 사용됩니다:
+- 이름은 {care_plan_cache.PATIENT_NAME}, {care_plan_cache.CAREGIVER_NAME} 자리표시자를 그대로 쓰세요.
+- 제목, 메모, 피드백에 나이, 성격 점수, 경력, 약물 이름, 연락처, 가족 관계 등 개인 정보를 쓰지 마세요.
 """
         return prompt
 
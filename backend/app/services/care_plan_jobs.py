@@ -0,0 +1,439 @@
+# ========================================
+# 늘봄케어 - 케어 플랜 생성 작업
+# ========================================
+# 파일: care_plan_jobs.py
+# 설명: 케어 플랜 생성(LLM) → 일정/케어 로그 저장, 추천 점심 식단 생성(동시 진행)을 백그라운드 작업으로 실행
+#       (스트리밍 모드는 하루 일정이 완성될 때마다 저장하고 작업 중간 결과로 공개)
+#       (POST /api/care-plans/generate는 입력 검증 후 작업 ID만 반환)
+
+import asyncio
+import logging
+import os
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from app.services.job_queue import Job, JobQueue, MemoryJobBackend, SQLiteJobBackend
+
+logger = logging.getLogger(__name__)
+
+CARE_PLAN_JOB_KIND = "care_plan"
+
+# 활동 제목 키워드 → CareLog 카테고리 (앞에서부터 처음 일치하는 항목, 없으면 "other")
+ACTIVITY_CATEGORIES = [
+    (("약", "medication"), "medication"),
+    (("식사", "meal"), "meal"),
+    (("운동", "exercise"), "exercise"),
+    (("체크", "vital"), "vital_check"),
+    (("위생", "hygiene"), "hygiene"),
+]
+
+
+class CarePlanSaveError(RuntimeError):
+    """케어 플랜 일정/케어 로그 저장 실패"""
+
+    def __init__(self, message: str, failed_activities: Optional[List[Dict[str, str]]] = None):
+        super().__init__(message)
+        self.failed_activities = failed_activities or []
+
+
+def activity_category(title: str) -> str:
+    """활동 제목 → CareLog 카테고리"""
+    title = (title or "").lower()
+    for keywords, category in ACTIVITY_CATEGORIES:
+        if any(keyword in title for keyword in keywords):
+            return category
+    return "other"
+
+
+def _delete_pending_schedules(db, patient_id: int, start_date: date):
+    """같은 환자의 start_date 이후 pending_review 일정 삭제 (중복 방지, 커밋은 호출 측)"""
+    from app.models.care_execution import Schedule
+
+    existing_schedules = db.query(Schedule).filter(
+        Schedule.patient_id == patient_id,
+        Schedule.status == 'pending_review',
+        Schedule.care_date >= start_date
+    ).all()
+
+    if existing_schedules:
+        logger.info(f"🗑️ 기존 pending_review 스케줄 {len(existing_schedules)}개 삭제")
+        for sched in existing_schedules:
+            db.delete(sched)
+        db.flush()
+
+
+def _add_schedule(db, patient_id: int, matching_id: Optional[int], care_date: date, day_schedule) -> int:
+    """
+    하루 일정을 Schedule 1건 + 활동별 CareLog로 추가 (커밋은 호출 측)
+
+    Returns:
+        int: schedule_id
+
+    Raises:
+        CarePlanSaveError: 활동 CareLog 생성 실패
+    """
+    from app.models.care_execution import CareLog, Schedule
+
+    # Schedule 생성 (매칭 ID 연결)
+    schedule = Schedule(
+        patient_id=patient_id,
+        matching_id=matching_id,
+        care_date=care_date,
+        is_ai_generated=True,
+        status="pending_review"
+    )
+    db.add(schedule)
+    db.flush()  # schedule_id를 얻기 위해 flush
+    logger.info(f"📅 Schedule 생성: ID={schedule.schedule_id}, date={care_date}")
+
+    # 각 activity에 대한 CareLog 생성
+    failed_activities = []  # 실패한 활동 기록
+    for activity in day_schedule.activities:
+        try:
+            # activity의 시간 파싱 (HH:MM 형식)
+            scheduled_time = None
+            time_parts = (activity.time or "").split(":")
+            if len(time_parts) >= 2:
+                scheduled_time = f"{time_parts[0]}:{time_parts[1]}:00"
+
+            db.add(CareLog(
+                schedule_id=schedule.schedule_id,
+                category=activity_category(activity.title),
+                task_name=activity.title or "활동",
+                scheduled_time=scheduled_time,
+                is_completed=False,
+                note=activity.note or ""
+            ))
+        except Exception as e:
+            logger.error(f"[CareLog 생성 실패] activity: {activity.title}, error: {str(e)}")
+            failed_activities.append({"activity": activity.title, "error": str(e)})
+
+    # CareLog 생성 실패가 있으면 롤백
+    if failed_activities:
+        raise CarePlanSaveError(
+            f"케어 플랜 생성 실패 - {len(failed_activities)}개 활동 생성 중 오류가 발생했습니다",
+            failed_activities
+        )
+    return schedule.schedule_id
+
+
+def _commit_or_rollback(db, fn: Callable, *args):
+    """fn(db, *args) 후 커밋, 실패 시 롤백하고 CarePlanSaveError로 전달"""
+    try:
+        result = fn(db, *args)
+        db.commit()
+        return result
+    except CarePlanSaveError:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ 케어 플랜 DB 저장 실패: {e}")
+        raise CarePlanSaveError(f"케어 플랜 DB 저장 실패: {str(e)}") from e
+
+
+def save_care_plan(
+    db,
+    patient_id: int,
+    matching_id: Optional[int],
+    start_date: date,
+    care_plan
+) -> List[int]:
+    """
+    케어 플랜을 Schedule(일자별) + CareLog(활동별)로 저장 (한 트랜잭션)
+
+    같은 환자의 start_date 이후 pending_review 일정은 지우고 새로 만듭니다.
+
+    Args:
+        db: DB 세션
+        patient_id: 환자 ID
+        matching_id: 연결할 매칭 ID (없으면 None)
+        start_date: 첫째 날 날짜
+        care_plan: CarePlanResponse
+
+    Returns:
+        List[int]: 저장한 schedule_id (일자 순)
+
+    Raises:
+        CarePlanSaveError: 활동 저장 또는 커밋 실패 (롤백됨)
+    """
+    def save(db) -> List[int]:
+        _delete_pending_schedules(db, patient_id, start_date)
+        return [
+            _add_schedule(db, patient_id, matching_id, start_date + timedelta(days=day_index), day_schedule)
+            for day_index, day_schedule in enumerate(care_plan.weekly_schedule)
+        ]
+
+    saved_schedule_ids = _commit_or_rollback(db, save)
+    logger.info(f"✅ [케어 플랜 저장 완료] 총 {len(saved_schedule_ids)}개 일정, Schedule IDs: {saved_schedule_ids}")
+    return saved_schedule_ids
+
+
+def clear_pending_schedules(db, patient_id: int, start_date: date):
+    """스트리밍 저장 시작 전 기존 pending_review 일정 삭제 (커밋)"""
+    _commit_or_rollback(db, _delete_pending_schedules, patient_id, start_date)
+
+
+def save_care_plan_day(db, patient_id: int, matching_id: Optional[int], care_date: date, day_schedule) -> int:
+    """
+    스트리밍으로 완성된 하루 일정을 바로 저장 (하루 단위 트랜잭션)
+
+    Returns:
+        int: schedule_id
+
+    Raises:
+        CarePlanSaveError: 활동 저장 또는 커밋 실패 (이 날만 롤백, 앞서 저장한 날은 유지)
+    """
+    return _commit_or_rollback(db, _add_schedule, patient_id, matching_id, care_date, day_schedule)
+
+
+def save_meal_plan(db, patient_id: int, meal_date: date, meal_plan_result: Dict[str, Any]) -> Dict[str, Any]:
+    """AI 식단 결과를 MealPlan으로 저장하고 응답용 dict 반환"""
+    from app.models.care_execution import MealPlan
+
+    # ingredients를 문자열로 변환
+    ingredients_str = (
+        ', '.join(meal_plan_result['ingredients'])
+        if isinstance(meal_plan_result['ingredients'], list)
+        else meal_plan_result['ingredients']
+    )
+
+    new_meal = MealPlan(
+        patient_id=patient_id,
+        meal_date=meal_date,
+        meal_type=meal_plan_result.get('meal_type', 'lunch'),
+        menu_name=meal_plan_result['menu_name'],
+        ingredients=ingredients_str,
+        nutrition_info=meal_plan_result['nutrition_info'],
+        cooking_tips=meal_plan_result.get('cooking_tips'),
+        created_at=datetime.now()
+    )
+
+    db.add(new_meal)
+    db.commit()
+    db.refresh(new_meal)
+
+    return {
+        "plan_id": new_meal.plan_id,
+        "menu_name": new_meal.menu_name,
+        "ingredients": new_meal.ingredients,
+        "nutrition_info": new_meal.nutrition_info,
+        "cooking_tips": new_meal.cooking_tips,
+        "meal_type": new_meal.meal_type.value if hasattr(new_meal.meal_type, 'value') else str(new_meal.meal_type),
+        "meal_date": new_meal.meal_date.isoformat()
+    }
+
+
+def _in_session(fn: Callable, *args):
+    """새 DB 세션으로 fn(db, *args) 실행 (스레드 풀에서 호출)"""
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return fn(db, *args)
+    finally:
+        db.close()
+
+
+async def recommend_lunch(patient_id: int, meal: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    추천 점심 식단 생성(LLM) → MealPlan 저장
+
+    실패해도 케어 플랜은 정상 반환해야 하므로 예외 대신 None을 반환합니다.
+    """
+    from app.services.meal_recommendation import MealRecommendationConfig, MealRecommendationService
+
+    try:
+        meal_date = datetime.now().date()
+        meal_plan_result = await MealRecommendationService(MealRecommendationConfig()).recommend_meal(
+            patient_id=patient_id,
+            meal_date=str(meal_date),
+            meal_type="lunch",
+            **meal
+        )
+        if not meal_plan_result:
+            logger.warning("⚠️ AI 식단 생성 결과가 없습니다")
+            return None
+
+        meal_plan_data = await asyncio.to_thread(
+            _in_session, save_meal_plan, patient_id, meal_date, meal_plan_result
+        )
+        logger.info(f"✅ 추천 식단 생성 완료: {meal_plan_data['menu_name']}")
+        return meal_plan_data
+    except Exception as e:
+        logger.error(f"❌ 추천 식단 생성 실패: {e}")
+        logger.warning("경고: 추천 식단 생성에 실패했으나 케어 플랜은 정상 반환합니다")
+        return None
+
+
+def _day_entry(index: int, care_date: date, schedule_id: int, day_schedule) -> Dict[str, Any]:
+    """작업 결과 days 항목 (저장된 하루 일정)"""
+    return {
+        "index": index,
+        "care_date": care_date.isoformat(),
+        "schedule_id": schedule_id,
+        "day": day_schedule.model_dump(),
+    }
+
+
+async def _stream_and_save(payload: Dict[str, Any], start_date: date, progress):
+    """
+    케어 플랜을 스트리밍으로 생성하면서 하루 일정이 완성될 때마다 저장하고 작업 중간 결과에 추가
+
+    Returns:
+        (CarePlanResponse, days): 전체 케어 플랜, 저장된 날별 항목 (_day_entry)
+    """
+    from app.services.care_plan_generation_service import CarePlanGenerationService
+
+    patient_id = payload["patient_id"]
+    matching_id = payload.get("matching_id")
+    await asyncio.to_thread(_in_session, clear_pending_schedules, patient_id, start_date)
+
+    care_plan = None
+    days: List[Dict[str, Any]] = []
+    stream = CarePlanGenerationService().stream_care_plan(**payload["generation"])
+    try:
+        async for kind, value in stream:
+            if kind == "plan":
+                care_plan = value
+                continue
+            care_date = start_date + timedelta(days=len(days))
+            schedule_id = await asyncio.to_thread(
+                _in_session, save_care_plan_day, patient_id, matching_id, care_date, value
+            )
+            days.append(_day_entry(len(days), care_date, schedule_id, value))
+            await progress("generating", {"days": list(days)})
+    finally:
+        await stream.aclose()
+
+    logger.info(f"✅ [케어 플랜 스트리밍 저장 완료] 총 {len(days)}개 일정")
+    return care_plan, days
+
+
+async def run_care_plan_job(job: Job, progress) -> Dict[str, Any]:
+    """
+    케어 플랜 생성 작업 실행
+
+    추천 식단은 케어 플랜과 무관하게 환자 데이터만 필요하므로 두 LLM 호출을 동시에 시작하고
+    케어 플랜 저장 후 합칩니다 (소요 시간 ≈ max(케어 플랜, 식단)).
+    케어 플랜 생성/저장이 실패하면 식단 생성은 취소합니다.
+
+    payload["stream"]이면 케어 플랜을 스트리밍으로 생성해 하루 일정이 완성될 때마다 저장하고,
+    실행 중에도 result.days로 저장된 날들을 조회할 수 있습니다 (첫째 날은 전체 생성을 기다리지 않음).
+    도중에 저장이 실패하면 앞서 저장한 날은 pending_review로 남고 다음 생성 때 지워집니다.
+
+    payload (라우트에서 DB 조회로 한 번만 구성):
+        patient_id, matching_id, stream, generation(generate_care_plan 인자), meal(recommend_meal 인자)
+
+    Returns:
+        Dict: 기존 /generate 응답 형식 (data, saved_schedule_ids, matching_id, meal_plan, message)
+              + days (날짜·schedule_id·일정)
+    """
+    from app.services.care_plan_generation_service import CarePlanGenerationService
+
+    payload = job.payload
+    patient_id = payload["patient_id"]
+    generation = payload["generation"]
+
+    # 추천 점심 식단은 케어 플랜 생성과 동시에 진행
+    meal_task = asyncio.create_task(recommend_lunch(patient_id, payload["meal"]))
+    try:
+        # 1. AI 케어 플랜 생성 (실패 시 서비스 내부에서 폴백 플랜)
+        await progress("generating")
+
+        # 시작일: 요청 기간 시작일 or 오늘
+        start_date = (
+            datetime.strptime(generation["start_date"], "%Y-%m-%d").date()
+            if generation.get("start_date") else datetime.now().date()
+        )
+
+        if payload.get("stream"):
+            # 1+2. 스트리밍 생성, 하루씩 저장
+            care_plan, days = await _stream_and_save(payload, start_date, progress)
+            saved_schedule_ids = [entry["schedule_id"] for entry in days]
+        else:
+            care_plan = await CarePlanGenerationService().generate_care_plan(**generation)
+            logger.info(f"[케어 플랜 생성 완료] 총 {len(care_plan.weekly_schedule)}일간의 일정 생성")
+
+            # 2. 일정/케어 로그 저장
+            await progress("saving")
+            saved_schedule_ids = await asyncio.to_thread(
+                _in_session, save_care_plan, patient_id, payload.get("matching_id"), start_date, care_plan
+            )
+            days = [
+                _day_entry(index, start_date + timedelta(days=index), schedule_id, day_schedule)
+                for index, (schedule_id, day_schedule) in enumerate(zip(saved_schedule_ids, care_plan.weekly_schedule))
+            ]
+    except BaseException:
+        meal_task.cancel()
+        raise
+
+    # 3. 추천 점심 식단 합류 (아직 진행 중일 때만 단계 갱신)
+    if not meal_task.done():
+        await progress("meal_plan", {"days": days})
+    meal_plan_data = await meal_task
+
+    result = {
+        "success": True,
+        "data": care_plan.model_dump(),
+        "saved_schedule_ids": saved_schedule_ids,
+        "matching_id": payload.get("matching_id"),
+        "days": days,
+        "message": "케어 플랜이 생성되었습니다."
+    }
+    if meal_plan_data:
+        result["meal_plan"] = meal_plan_data
+        result["message"] = "케어 플랜과 추천 식단이 생성되었습니다."
+    return result
+
+
+# 싱글톤 인스턴스
+_care_plan_job_queue: Optional[JobQueue] = None
+_care_plan_job_queue_lock = threading.Lock()
+
+
+def _server_workers() -> int:
+    """서버 워커 프로세스 수 (gunicorn과 같은 WEB_CONCURRENCY 환경 변수, 없으면 1)"""
+    try:
+        return int(os.environ.get("WEB_CONCURRENCY", "1"))
+    except ValueError:
+        return 1
+
+
+def get_care_plan_job_queue() -> JobQueue:
+    """케어 플랜 작업 큐 싱글톤 인스턴스 반환"""
+    global _care_plan_job_queue
+
+    if _care_plan_job_queue is None:
+        with _care_plan_job_queue_lock:
+            if _care_plan_job_queue is None:
+                from app.core.config import get_settings
+
+                settings = get_settings()
+                backend = MemoryJobBackend()
+                if settings.CARE_PLAN_JOB_BACKEND == "sqlite":
+                    try:
+                        backend = SQLiteJobBackend(settings.CARE_PLAN_JOB_SQLITE_PATH)
+                    except Exception as e:
+                        logger.warning(f"케어 플랜 작업 SQLite 백엔드 초기화 실패 - memory 백엔드 사용: {e}")
+
+                workers = _server_workers()
+                if isinstance(backend, MemoryJobBackend) and workers > 1:
+                    # 작업은 등록한 워커만 알고 있으므로 다른 워커로 간 폴링/구독은 404
+                    logger.error(
+                        f"❌ 케어 플랜 작업 큐가 memory 백엔드인데 서버 워커가 {workers}개입니다 - "
+                        f"작업 상태 조회가 다른 워커로 가면 404가 됩니다. CARE_PLAN_JOB_BACKEND=sqlite로 설정하세요."
+                    )
+
+                _care_plan_job_queue = JobQueue(
+                    backend,
+                    run_care_plan_job,
+                    CARE_PLAN_JOB_KIND,
+                    workers=settings.CARE_PLAN_JOB_WORKERS,
+                    max_queued=settings.CARE_PLAN_JOB_MAX_QUEUED,
+                    ttl_seconds=settings.CARE_PLAN_JOB_TTL_SECONDS,
+                    stale_seconds=settings.CARE_PLAN_JOB_STALE_SECONDS,
+                )
+
+    return _care_plan_job_queue
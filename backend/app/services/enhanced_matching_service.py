@@ -101,7 +101,8 @@ class EnhancedMatchingService:
             # 일괄 예측
             batch_results = EnhancedMatchingService.xgboost_service.batch_predict(
                 patient_personality=patient_personality,
-                caregivers=caregivers_for_prediction
+                caregivers=caregivers_for_prediction,
+                patient_id=patient_id
             )
 
             # 결과와 간병인 정보 병합
@@ -129,7 +130,7 @@ class EnhancedMatchingService:
                         "profile_image_url": caregiver_info.get("profile_image_url", ""),
                         "specialties": caregiver_info.get("specialties", []),
                         "availability": caregiver_info.get("availability", []),
-                        "model_version": "XGBoost_v3",  # 모델 버전 추적
+                        "model_version": result.get("model_version", "XGBoost_v3"),  # 모델 버전 추적 (레지스트리 버전@해시)
                     }
                     recommendations.append(recommendation)
 
@@ -5,11 +5,19 @@
 # 설명: 환자-간병인 쌍에 대한 특성(Feature) 생성
 # 버전: V2 (전문분야, 지역, 프로필 정보 포함)
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 import logging
 
+import numpy as np
+
+from app.services.matching.region_index import get_region_index
+from app.services.matching.specialty_vocab import get_specialty_vocabulary
+
 logger = logging.getLogger(__name__)
 
+# 성격 점수 순서 (특성 행렬 / 간병인 성격 배열 공통)
+PERSONALITY_TYPES = ["empathy", "activity", "patience", "independence"]
+
 
 class FeatureEngineer:
     """특성 생성 클래스 (V2)"""
@@ -77,12 +85,8 @@ class FeatureEngineer:
         Returns:
             float: 일치율 (0~1)
         """
-        if not patient_diseases or not caregiver_specialties:
-            return 0.0
-        
-        # 환자 질병 중 간병인이 전문으로 하는 비율
-        matched = sum(1 for d in patient_diseases if d in caregiver_specialties)
-        return matched / len(patient_diseases)
+        # 환자 질병 중 간병인이 전문으로 하는 비율 (비트마스크 popcount)
+        return get_specialty_vocabulary().match_ratio(patient_diseases, caregiver_specialties)
     
     def calculate_region_score(
         self,
@@ -99,27 +103,8 @@ class FeatureEngineer:
         Returns:
             float: 지역 점수 (0, 0.5, 0.75, 1.0)
         """
-        if not patient_region or not caregiver_region:
-            return 0.5
-        
-        # 완전 일치
-        if patient_region == caregiver_region:
-            return 1.0
-        
-        # 같은 시/도
-        p_city = patient_region.split("_")[0] if "_" in patient_region else patient_region
-        c_city = caregiver_region.split("_")[0] if "_" in caregiver_region else caregiver_region
-        
-        if p_city == c_city:
-            return 0.75
-        
-        # 수도권 내 (서울-경기-인천)
-        capital_area = ["SEOUL", "GYEONGGI", "INCHEON"]
-        if p_city in capital_area and c_city in capital_area:
-            return 0.5
-        
-        # 그 외 (지역 불일치)
-        return 0.0
+        # 미리 계산된 지역×지역 점수 행렬에서 조회
+        return get_region_index().score(patient_region, caregiver_region)
     
     def create_features_for_pair(
         self,
@@ -191,24 +176,7 @@ class FeatureEngineer:
         
         # 5. 환자 정보
         # 요양등급을 숫자로 변환 (1등급=1, 2등급=2, ..., 등급외=7)
-        care_level = patient_data.get("care_level", "3등급")
-        if isinstance(care_level, str):
-            if "1등급" in care_level:
-                care_level_num = 1
-            elif "2등급" in care_level:
-                care_level_num = 2
-            elif "3등급" in care_level:
-                care_level_num = 3
-            elif "4등급" in care_level:
-                care_level_num = 4
-            elif "5등급" in care_level:
-                care_level_num = 5
-            elif "인지지원" in care_level:
-                care_level_num = 6
-            else:  # 등급외
-                care_level_num = 7
-        else:
-            care_level_num = int(care_level) if care_level else 3
+        care_level_num = self.get_care_level_num(patient_data.get("care_level", "3등급"))
             
         features["patient_care_level"] = float(care_level_num)
         
@@ -220,6 +188,139 @@ class FeatureEngineer:
         
         return features
     
+    def get_care_level_num(self, care_level) -> int:
+        """
+        요양등급을 숫자로 변환 (1등급=1, 2등급=2, ..., 인지지원=6, 등급외=7)
+
+        Args:
+            care_level: 요양등급 문자열 또는 숫자
+
+        Returns:
+            int: 요양등급 숫자
+        """
+        if isinstance(care_level, str):
+            if "1등급" in care_level:
+                return 1
+            elif "2등급" in care_level:
+                return 2
+            elif "3등급" in care_level:
+                return 3
+            elif "4등급" in care_level:
+                return 4
+            elif "5등급" in care_level:
+                return 5
+            elif "인지지원" in care_level:
+                return 6
+            else:  # 등급외
+                return 7
+        return int(care_level) if care_level else 3
+
+    def calculate_specialty_match_matrix(
+        self,
+        patient_diseases: List[str],
+        caregiver_specialties: Sequence[List[str]]
+    ) -> np.ndarray:
+        """
+        간병인 N명에 대한 전문분야 일치율을 한 번에 계산
+
+        Args:
+            patient_diseases: 환자 질병 리스트
+            caregiver_specialties: 간병인별 전문분야 리스트 (길이 N)
+
+        Returns:
+            np.ndarray: (N,) 일치율 (0~1), calculate_specialty_match와 동일한 값
+        """
+        # 간병인 전문분야 → 비트마스크 후 전체 풀에 대해 popcount 일괄 계산
+        vocab = get_specialty_vocabulary()
+        return vocab.match_ratios(patient_diseases, vocab.encode_many(caregiver_specialties))
+
+    def calculate_region_score_matrix(
+        self,
+        patient_region: str,
+        caregiver_regions: Sequence[str]
+    ) -> np.ndarray:
+        """
+        간병인 N명에 대한 지역 일치 점수를 한 번에 계산
+
+        Args:
+            patient_region: 환자 지역 코드
+            caregiver_regions: 간병인별 지역 코드 (길이 N)
+
+        Returns:
+            np.ndarray: (N,) 지역 점수 (0, 0.5, 0.75, 1.0)
+        """
+        n = len(caregiver_regions)
+        if n == 0:
+            return np.zeros(0, dtype=np.float64)
+
+        # 등록된 지역 코드는 점수 행렬에서 gather, 요청으로만 들어온 코드는 등록하지 않고 계산
+        return get_region_index().scores_for_codes(patient_region, list(caregiver_regions))
+
+    def create_feature_matrix(
+        self,
+        patient_data: Dict,
+        caregiver_personality: np.ndarray,
+        caregiver_specialties: Sequence[List[str]],
+        caregiver_regions: Sequence[str],
+        caregiver_experience: Sequence[float]
+    ) -> np.ndarray:
+        """
+        환자 1명 + 간병인 N명에 대한 특성 행렬 생성 (컬럼 기반)
+
+        create_features_for_pair를 N번 호출하는 대신 NumPy 배열 연산으로
+        feature_columns 순서의 (N, 10) 행렬을 바로 만듭니다.
+
+        Args:
+            patient_data: 환자 데이터 딕셔너리 (create_features_for_pair와 동일)
+            caregiver_personality: (N, 4) 간병인 성격 점수 (PERSONALITY_TYPES 순서)
+            caregiver_specialties: 간병인별 전문분야 리스트 (길이 N)
+            caregiver_regions: 간병인별 지역 코드 (길이 N)
+            caregiver_experience: 간병인별 경력 (길이 N)
+
+        Returns:
+            np.ndarray: (N, 10) float32 C-contiguous 특성 행렬
+        """
+        caregiver_personality = np.asarray(caregiver_personality, dtype=np.float64).reshape(-1, len(PERSONALITY_TYPES))
+        n = caregiver_personality.shape[0]
+
+        patient_personality = patient_data.get("personality", {})
+        patient_scores = np.array(
+            [float(patient_personality.get(f"{ptype}_score", 50)) for ptype in PERSONALITY_TYPES],
+            dtype=np.float64
+        )
+
+        patient_diseases = patient_data.get("diseases", [])
+        if not isinstance(patient_diseases, list):
+            patient_diseases = []
+
+        # 문자열 등 리스트가 아닌 전문분야는 빈 리스트로 처리
+        caregiver_specialties = [
+            specs if isinstance(specs, list) else [] for specs in caregiver_specialties
+        ]
+
+        matrix = np.empty((n, len(self.feature_columns)), dtype=np.float32)
+
+        # 1. 성격 차이 (4개)
+        matrix[:, 0:4] = np.abs(patient_scores - caregiver_personality)
+
+        # 2. 전문분야 일치율
+        matrix[:, 4] = self.calculate_specialty_match_matrix(patient_diseases, caregiver_specialties)
+
+        # 3. 지역 일치 점수
+        matrix[:, 5] = self.calculate_region_score_matrix(
+            patient_data.get("region_code", ""), caregiver_regions
+        )
+
+        # 4. 간병인 정보
+        matrix[:, 6] = np.asarray(caregiver_experience, dtype=np.float64)
+        matrix[:, 7] = np.fromiter((len(specs) for specs in caregiver_specialties), dtype=np.float64, count=n)
+
+        # 5. 환자 정보
+        matrix[:, 8] = float(self.get_care_level_num(patient_data.get("care_level", "3등급")))
+        matrix[:, 9] = float(len(patient_diseases))
+
+        return matrix
+
     def get_feature_names(self) -> List[str]:
         """특성 컬럼 이름 반환"""
         return self.feature_columns.copy()
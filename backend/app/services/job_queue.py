@@ -0,0 +1,503 @@
+# ========================================
+# 늘봄케어 - 백그라운드 작업 큐
+# ========================================
+# 파일: job_queue.py
+# 설명: 오래 걸리는 요청(LLM 생성 + DB 저장)을 작업으로 등록하고 워커 태스크가 실행
+#       (요청은 작업 ID만 받아 바로 반환, 클라이언트는 상태를 폴링/구독)
+#
+# 백엔드
+# - memory: 프로세스 내 asyncio.Queue (기본값, 작업 상태도 이 프로세스에만 있음)
+# - sqlite: 같은 호스트의 워커들이 공유하는 SQLite 파일 (어느 워커든 작업을 가져가 실행하고,
+#           어느 워커로 폴링해도 같은 상태를 조회 - gunicorn 워커가 여러 개일 때 사용)
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from app.core.sqlite import ForkSafeSQLite
+
+logger = logging.getLogger(__name__)
+
+# 작업 상태
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+TERMINAL_STATUSES = (JOB_SUCCEEDED, JOB_FAILED)
+
+
+class JobQueueFullError(RuntimeError):
+    """대기 중인 작업이 최대 수에 도달"""
+
+
+class Job:
+    """작업 레코드 (상태, 진행 단계, 결과/오류)"""
+
+    def __init__(
+        self,
+        job_id: str,
+        kind: str,
+        payload: Dict[str, Any],
+        status: str = JOB_QUEUED,
+        stage: Optional[str] = None,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+        created_at: Optional[float] = None,
+        started_at: Optional[float] = None,
+        finished_at: Optional[float] = None,
+        updated_at: Optional[float] = None
+    ):
+        now = time.time()
+        self.job_id = job_id
+        self.kind = kind
+        self.payload = payload
+        self.status = status
+        self.stage = stage
+        self.result = result
+        self.error = error
+        self.created_at = created_at or now
+        self.started_at = started_at
+        self.finished_at = finished_at
+        self.updated_at = updated_at or self.created_at
+
+    @classmethod
+    def create(cls, kind: str, payload: Dict[str, Any]) -> "Job":
+        return cls(uuid.uuid4().hex, kind, payload)
+
+    @property
+    def is_done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        """클라이언트 응답용 (payload 제외)"""
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "status": self.status,
+            "stage": self.stage,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "updated_at": self.updated_at,
+        }
+
+
+# handler(job, progress) → 결과 dict, progress(stage, partial=None)는 진행 단계(와 중간 결과) 기록
+JobHandler = Callable[[Job, Callable[..., Awaitable[None]]], Awaitable[Dict[str, Any]]]
+
+
+class JobBackend:
+    """작업 저장/전달 백엔드 (모든 메서드는 작업 큐의 이벤트 루프에서 호출)"""
+
+    name = ""
+
+    async def put(self, job: Job, max_queued: int):
+        """작업 등록 (대기 작업이 max_queued개 이상이면 JobQueueFullError)"""
+        raise NotImplementedError
+
+    async def take(self) -> Job:
+        """다음 대기 작업을 running으로 바꿔 반환 (없으면 생길 때까지 대기)"""
+        raise NotImplementedError
+
+    async def save(self, job: Job):
+        """작업 상태 저장"""
+        raise NotImplementedError
+
+    async def load(self, job_id: str) -> Optional[Job]:
+        """작업 조회 (없거나 만료되면 None)"""
+        raise NotImplementedError
+
+    async def purge(self, finished_before: float, stale_before: float) -> int:
+        """finished_before 이전에 끝난 작업 삭제, stale_before 이후 갱신이 없는 running 작업은 실패 처리"""
+        raise NotImplementedError
+
+    async def counts(self) -> Dict[str, int]:
+        """상태별 작업 수"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class MemoryJobBackend(JobBackend):
+    """프로세스 내 asyncio.Queue 백엔드"""
+
+    name = "memory"
+
+    def __init__(self):
+        self._jobs: Dict[str, Job] = {}
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    async def put(self, job: Job, max_queued: int):
+        if self._queue.qsize() >= max_queued:
+            raise JobQueueFullError(f"대기 중인 작업 {self._queue.qsize()}건")
+        self._jobs[job.job_id] = job
+        self._queue.put_nowait(job.job_id)
+
+    async def take(self) -> Job:
+        while True:
+            job = self._jobs.get(await self._queue.get())
+            if job is not None and job.status == JOB_QUEUED:
+                job.status, job.started_at = JOB_RUNNING, time.time()
+                job.updated_at = job.started_at
+                return job
+
+    async def save(self, job: Job):
+        job.updated_at = time.time()
+        self._jobs[job.job_id] = job
+
+    async def load(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def purge(self, finished_before: float, stale_before: float) -> int:
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.is_done and job.finished_at < finished_before
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+        return len(expired)
+
+    async def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for job in self._jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return counts
+
+
+class SQLiteJobBackend(JobBackend):
+    """같은 호스트의 워커들이 공유하는 SQLite 파일 백엔드"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, poll_interval: float = 0.5):
+        """
+        Args:
+            path: SQLite 파일 경로
+            poll_interval: 대기 작업이 없을 때 다시 확인하는 주기 (초, 이 프로세스에서 등록한 작업은 바로 실행)
+        """
+        self.path = path
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._db = ForkSafeSQLite(path, schema=[
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                stage TEXT,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                updated_at REAL NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at)",
+        ], isolation_level=None)
+        self._wakeup: Optional[asyncio.Event] = None
+
+        # 파일을 열 수 없으면 생성 시 예외 (호출 측에서 memory 백엔드로 대체)
+        self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        """현재 프로세스의 연결 (fork된 워커에서는 새로 연결, lock 보유 상태 또는 생성자에서 호출)"""
+        return self._db.connect()
+
+    async def _run(self, fn: Callable, *args):
+        """SQLite 작업을 스레드에서 실행 (잠금 대기로 이벤트 루프를 막지 않음)"""
+        def locked():
+            with self._lock:
+                return fn(self._connection(), *args)
+        return await asyncio.to_thread(locked)
+
+    def _event(self) -> asyncio.Event:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        return self._wakeup
+
+    async def put(self, job: Job, max_queued: int):
+        def insert(conn: sqlite3.Connection):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                queued = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (JOB_QUEUED,)).fetchone()[0]
+                if queued >= max_queued:
+                    raise JobQueueFullError(f"대기 중인 작업 {queued}건")
+                conn.execute(
+                    "INSERT INTO jobs (job_id, kind, status, stage, payload, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (job.job_id, job.kind, job.status, job.stage,
+                     json.dumps(job.payload, ensure_ascii=False, default=str), job.created_at, job.updated_at)
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+        await self._run(insert)
+        self._event().set()
+
+    async def take(self) -> Job:
+        def claim(conn: sqlite3.Connection) -> Optional[Job]:
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (JOB_QUEUED,)
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, started_at = ?, updated_at = ? WHERE job_id = ?",
+                        (JOB_RUNNING, now, now, row[0])
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            if row is None:
+                return None
+            job = self._from_row(row)
+            job.status, job.started_at, job.updated_at = JOB_RUNNING, now, now
+            return job
+
+        wakeup = self._event()
+        while True:
+            wakeup.clear()
+            job = await self._run(claim)
+            if job is not None:
+                return job
+            # 다른 워커가 등록한 작업은 poll_interval마다, 이 프로세스에서 등록한 작업은 바로 확인
+            try:
+                await asyncio.wait_for(wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def save(self, job: Job):
+        job.updated_at = time.time()
+
+        def update(conn: sqlite3.Connection):
+            conn.execute(
+                "UPDATE jobs SET status = ?, stage = ?, result = ?, error = ?, "
+                "started_at = ?, finished_at = ?, updated_at = ? WHERE job_id = ?",
+                (job.status, job.stage,
+                 json.dumps(job.result, ensure_ascii=False, default=str) if job.result is not None else None,
+                 job.error, job.started_at, job.finished_at, job.updated_at, job.job_id)
+            )
+
+        await self._run(update)
+
+    async def load(self, job_id: str) -> Optional[Job]:
+        def select(conn: sqlite3.Connection):
+            return conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+
+        row = await self._run(select)
+        return self._from_row(row) if row is not None else None
+
+    async def purge(self, finished_before: float, stale_before: float) -> int:
+        def delete(conn: sqlite3.Connection) -> int:
+            now = time.time()
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ?, updated_at = ? "
+                "WHERE status = ? AND updated_at < ?",
+                (JOB_FAILED, "작업을 실행하던 워커가 응답하지 않습니다", now, now, JOB_RUNNING, stale_before)
+            )
+            return conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                (*TERMINAL_STATUSES, finished_before)
+            ).rowcount
+
+        return await self._run(delete)
+
+    async def counts(self) -> Dict[str, int]:
+        def select(conn: sqlite3.Connection):
+            return conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+
+        return dict(await self._run(select))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def _from_row(row) -> Job:
+        (job_id, kind, status, stage, payload, result, error,
+         created_at, started_at, finished_at, updated_at) = row
+        return Job(
+            job_id, kind, json.loads(payload), status=status, stage=stage,
+            result=json.loads(result) if result else None, error=error,
+            created_at=created_at, started_at=started_at, finished_at=finished_at, updated_at=updated_at
+        )
+
+
+class JobQueue:
+    """작업 등록 / 워커 태스크 실행 / 상태 조회"""
+
+    def __init__(
+        self,
+        backend: JobBackend,
+        handler: JobHandler,
+        kind: str,
+        workers: int = 4,
+        max_queued: int = 100,
+        ttl_seconds: float = 3600,
+        stale_seconds: float = 600
+    ):
+        """
+        Args:
+            backend: 작업 저장/전달 백엔드
+            handler: async handler(job, progress) → 결과 dict
+                (progress(stage, partial)로 진행 단계와 중간 결과를 기록, 중간 결과는 실행 중 result로 조회)
+            kind: 작업 종류 (상태 응답에 포함)
+            workers: 이 프로세스에서 동시에 실행하는 작업 수
+            max_queued: 최대 대기 작업 수 (초과 시 등록 거부)
+            ttl_seconds: 완료된 작업 보관 시간 (초)
+            stale_seconds: 이 시간 동안 갱신이 없는 running 작업은 실패 처리 (워커 종료 대비)
+        """
+        self.backend = backend
+        self.handler = handler
+        self.kind = kind
+        self.workers = max(1, int(workers))
+        self.max_queued = max(1, int(max_queued))
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+
+        self._tasks: List[asyncio.Task] = []
+        self.running = 0
+        self.succeeded = 0
+        self.failed = 0
+        self._durations: List[float] = []
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._tasks)
+
+    async def submit(self, payload: Dict[str, Any]) -> Job:
+        """
+        작업 등록 (바로 반환)
+
+        Raises:
+            JobQueueFullError: 대기 작업이 max_queued개 이상
+        """
+        job = Job.create(self.kind, payload)
+        await self.backend.put(job, self.max_queued)
+        logger.info(f"[작업 등록] {self.kind} {job.job_id}")
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        """작업 상태 조회"""
+        return await self.backend.load(job_id)
+
+    async def watch(self, job_id: str, poll_interval: float = 0.5) -> AsyncIterator[Job]:
+        """
+        작업 상태 구독 (상태/단계/중간 결과가 갱신될 때마다 반환, 완료되거나 작업이 없으면 종료)
+
+        Yields:
+            Job: 현재 작업 상태 (첫 번째는 구독 시점 상태)
+        """
+        last = None
+        deadline = time.time() + self.stale_seconds + self.ttl_seconds
+        while time.time() < deadline:
+            job = await self.backend.load(job_id)
+            if job is None:
+                return
+            if job.updated_at != last:
+                last = job.updated_at
+                yield job
+            if job.is_done:
+                return
+            await asyncio.sleep(poll_interval)
+
+    def start(self):
+        """워커 태스크 시작 (실행 중인 이벤트 루프에서 호출)"""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"{self.kind}-job-{i}") for i in range(self.workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._purge_loop(), name=f"{self.kind}-job-purge"))
+        logger.info(f"✅ {self.kind} 작업 큐 시작 (백엔드 {self.backend.name}, 워커 {self.workers}개)")
+
+    async def stop(self):
+        """워커 태스크 중지 (실행 중인 작업은 취소)"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.backend.close()
+
+    async def _worker(self):
+        while True:
+            job = await self.backend.take()
+            await self._run(job)
+
+    async def _run(self, job: Job):
+        """작업 1건 실행 (handler 예외는 실패 상태로 기록)"""
+        async def progress(stage: str, partial: Optional[Dict[str, Any]] = None):
+            job.stage = stage
+            if partial is not None:
+                job.result = partial
+            await self.backend.save(job)
+
+        self.running += 1
+        try:
+            job.result = await self.handler(job, progress)
+            job.status = JOB_SUCCEEDED
+            self.succeeded += 1
+        except asyncio.CancelledError:
+            job.status, job.error = JOB_FAILED, "서버 종료로 작업이 중단되었습니다"
+            self.failed += 1
+            raise
+        except Exception as e:
+            logger.exception(f"[작업 실패] {self.kind} {job.job_id}: {e}")
+            job.status, job.error = JOB_FAILED, str(e)
+            self.failed += 1
+        finally:
+            self.running -= 1
+            job.finished_at = time.time()
+            self._durations = (self._durations + [job.finished_at - job.started_at])[-100:]
+            try:
+                await asyncio.shield(self.backend.save(job))
+            except Exception as e:
+                logger.warning(f"작업 상태 저장 실패 ({job.job_id}): {e}")
+        logger.info(f"[작업 완료] {self.kind} {job.job_id} {job.status} ({job.finished_at - job.started_at:.1f}초)")
+
+    async def _purge_loop(self):
+        """만료된 완료 작업 삭제 / 응답 없는 running 작업 실패 처리 (1분마다)"""
+        while True:
+            now = time.time()
+            try:
+                removed = await self.backend.purge(now - self.ttl_seconds, now - self.stale_seconds)
+                if removed:
+                    logger.info(f"[작업 정리] {self.kind} 완료 작업 {removed}건 삭제")
+            except Exception as e:
+                logger.warning(f"작업 정리 실패: {e}")
+            await asyncio.sleep(60)
+
+    async def get_status(self) -> Dict[str, Any]:
+        """작업 큐 상태"""
+        try:
+            counts = await self.backend.counts()
+        except Exception as e:
+            counts = {"error": str(e)}
+        durations = sorted(self._durations)
+        return {
+            "backend": self.backend.name,
+            "started": self.is_running,
+            "workers": self.workers,
+            "max_queued": self.max_queued,
+            "jobs": counts,
+            "running_here": self.running,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "p50_seconds": round(durations[len(durations) // 2], 2) if durations else None,
+        }
@@ -0,0 +1,107 @@
+# ========================================
+# 늘봄케어 - 스트리밍 JSON 배열 파서
+# ========================================
+# 파일: json_stream.py
+# 설명: LLM 스트리밍 응답에서 최상위 객체의 특정 배열 키(예: weekly_schedule)의 항목을
+#       객체가 닫히는 즉시 하나씩 꺼내는 증분 파서 (전체 응답을 기다리지 않음)
+
+import json
+import logging
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JSONArrayStreamParser:
+    """
+    최상위 JSON 객체의 `key` 배열 항목을 증분 파싱
+
+    응답 앞뒤의 다른 텍스트(```json 코드 블록 등)는 무시하고, 문자열 안의 괄호/이스케이프는
+    구조로 취급하지 않습니다. 파싱에 실패한 항목은 건너뜁니다 (최종 검증은 전체 응답으로).
+
+    Example:
+        >>> parser = JSONArrayStreamParser("weekly_schedule")
+        >>> parser.feed('{"weekly_schedule": [{"day": "월')
+        []
+        >>> parser.feed('요일"}, {"day"')
+        [{'day': '월요일'}]
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.items_parsed = 0
+
+        self._depth = 0  # 현재 중첩 깊이 (문자열 밖의 {, [ 기준)
+        self._in_string = False
+        self._escape = False
+        self._string: Optional[List[str]] = None  # 최상위 객체 안 문자열(키 후보) 수집
+        self._last_key: Optional[str] = None  # ':' 앞에 온 최상위 키
+        self._array_depth: Optional[int] = None  # 대상 배열 안의 깊이 (배열이 닫히면 None)
+        self._done = False
+        self._item: Optional[List[str]] = None  # 수집 중인 항목 텍스트
+
+    @property
+    def done(self) -> bool:
+        """대상 배열이 닫혔는지"""
+        return self._done
+
+    def feed(self, text: str) -> List[Any]:
+        """
+        응답 조각 추가
+
+        Returns:
+            List[Any]: 이번 조각으로 완성된 배열 항목 (순서대로)
+        """
+        completed = []
+        for char in text:
+            if self._item is not None:
+                self._item.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._string is not None:
+                        self._last_key = "".join(self._string)
+                        self._string = None
+                elif self._string is not None:
+                    self._string.append(char)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                # 최상위 객체(깊이 1)의 문자열만 키 후보로 수집
+                self._string = [] if self._depth == 1 else None
+            elif char in "{[":
+                if (char == "[" and self._depth == 1 and not self._done
+                        and self._last_key == self.key and self._array_depth is None):
+                    self._array_depth = self._depth + 1
+                elif self._array_depth is not None and self._depth == self._array_depth and self._item is None:
+                    self._item = [char]
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._array_depth is not None and self._depth == self._array_depth and self._item is not None:
+                    item = self._parse("".join(self._item))
+                    self._item = None
+                    if item is not None:
+                        completed.append(item)
+                elif self._array_depth is not None and self._depth < self._array_depth:
+                    self._array_depth = None
+                    self._done = True
+            elif char == "," and self._depth == 1:
+                self._last_key = None
+        return completed
+
+    def _parse(self, text: str) -> Optional[Any]:
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError as e:
+            logger.warning(f"스트리밍 항목 파싱 실패 ({self.key}[{self.items_parsed}]): {e}")
+            return None
+        self.items_parsed += 1
+        return item
+
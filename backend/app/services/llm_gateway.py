@@ -0,0 +1,591 @@
+# ========================================
+# 늘봄케어 - Azure OpenAI 공용 게이트웨이
+# ========================================
+# 파일: llm_gateway.py
+# 설명: 프로세스 전체가 공유하는 비동기 Azure OpenAI 클라이언트
+#       (HTTP/2 keep-alive 연결 풀, 배포별 동시 호출 제한, 지터 재시도, 호출 지표)
+#
+# 게이트웨이는 전용 이벤트 루프 스레드 하나에서 AsyncAzureOpenAI 클라이언트를 소유합니다.
+# httpx 연결 풀은 생성된 이벤트 루프에 묶이므로, FastAPI 이벤트 루프(async 라우트)와
+# 스레드 풀에서 도는 동기 코드(매칭 추천 경로)가 같은 연결 풀을 쓰려면 루프를 하나로 고정해야 합니다.
+# - async 호출: await gateway.acomplete(...)
+# - async 스트리밍: async for text in gateway.astream(...) (토큰 조각을 받는 대로 반환)
+# - 동기 호출: gateway.complete(...) 또는 gateway.submit(...) → concurrent.futures.Future
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# Azure OpenAI 비동기 클라이언트 import
+try:
+    import httpx
+    from openai import APIConnectionError, AsyncAzureOpenAI
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+    logger.warning("openai/httpx 패키지가 설치되지 않았습니다. pip install openai httpx[http2]")
+
+# 재시도하는 HTTP 상태 코드 (5xx는 모두 재시도)
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+# 지연 시간 백분위 계산에 쓰는 최근 호출 수 (호출자별)
+LATENCY_WINDOW = 512
+
+
+class LLMUnavailableError(RuntimeError):
+    """Azure OpenAI 미설정 또는 패키지 미설치"""
+
+
+class LLMResult(NamedTuple):
+    """채팅 완성 결과"""
+    content: str
+    deployment: str
+    prompt_tokens: int
+    completion_tokens: int
+    latency_ms: float  # 재시도 대기 포함 전체 시간
+    attempts: int
+
+
+def parse_deployment_limits(spec: str) -> Dict[str, int]:
+    """
+    배포별 동시 호출 제한 설정 파싱
+
+    Args:
+        spec: "gpt-4o=8,gpt-4o-mini=16" 형식 (잘못된 항목은 무시)
+
+    Returns:
+        Dict[str, int]: 배포 이름 → 최대 동시 호출 수
+    """
+    limits = {}
+    for item in (spec or "").split(","):
+        name, sep, value = item.partition("=")
+        if not sep or not name.strip():
+            continue
+        try:
+            limits[name.strip()] = max(1, int(value))
+        except ValueError:
+            logger.warning(f"LLM_DEPLOYMENT_CONCURRENCY 항목 무시: {item!r}")
+    return limits
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """재시도할 오류인지 (호출 한도 초과, 서버 오류, 연결/시간 초과)"""
+    status_code = getattr(exc, "status_code", None)
+    if status_code is not None:
+        return status_code in RETRYABLE_STATUS_CODES or status_code >= 500
+    if OPENAI_AVAILABLE and isinstance(exc, APIConnectionError):  # APITimeoutError 포함
+        return True
+    return isinstance(exc, (asyncio.TimeoutError, ConnectionError))
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """응답의 retry-after-ms / retry-after 헤더 (초, 없으면 None)"""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+class _CallerStats:
+    """호출자별 누적 지표 (지연 시간은 최근 LATENCY_WINDOW건)"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def to_dict(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 1)
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "avg_ms": round(sum(latencies) / len(latencies), 1) if latencies else None,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+        }
+
+
+class LLMGateway:
+    """프로세스 공용 비동기 Azure OpenAI 게이트웨이"""
+
+    def __init__(
+        self,
+        api_key: str = "",
+        endpoint: str = "",
+        api_version: str = "2024-02-15-preview",
+        deployment: str = "",
+        timeout: float = 30.0,
+        http2: bool = True,
+        max_connections: int = 20,
+        keepalive_seconds: float = 60.0,
+        max_concurrency: int = 8,
+        deployment_limits: Optional[Dict[str, int]] = None,
+        max_retries: int = 2,
+        retry_base_seconds: float = 0.5,
+        retry_max_seconds: float = 8.0,
+        client_factory: Optional[Callable[[], Any]] = None
+    ):
+        """
+        Args:
+            api_key / endpoint / api_version: Azure OpenAI 접속 정보
+            deployment: 기본 배포 이름 (호출 시 deployment를 생략하면 사용)
+            timeout: 호출당 기본 타임아웃 (초)
+            http2: HTTP/2 사용 여부 (h2 패키지가 없으면 HTTP/1.1)
+            max_connections: 연결 풀 최대 연결 수 (keep-alive 연결 수도 같은 값)
+            keepalive_seconds: 유휴 keep-alive 연결 유지 시간 (초)
+            max_concurrency: 배포별 기본 최대 동시 호출 수
+            deployment_limits: 배포별 최대 동시 호출 수 (max_concurrency보다 우선)
+            max_retries: 재시도 횟수 (429/5xx/연결 오류, 0이면 재시도 안 함)
+            retry_base_seconds / retry_max_seconds: 지수 백오프 기본값/상한 (full jitter)
+            client_factory: 클라이언트 생성 함수 (None이면 AsyncAzureOpenAI)
+        """
+        self.api_key = api_key
+        self.endpoint = endpoint
+        self.api_version = api_version
+        self.deployment = deployment
+        self.timeout = timeout
+        self.http2 = http2
+        self.max_connections = max(1, int(max_connections))
+        self.keepalive_seconds = keepalive_seconds
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.deployment_limits = dict(deployment_limits or {})
+        self.max_retries = max(0, int(max_retries))
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self._client_factory = client_factory
+
+        # 이벤트 루프 스레드 (최초 호출 시 시작)
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+        # 아래는 이벤트 루프 스레드에서만 사용
+        self._client = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+        # 지표 (다른 스레드에서 get_stats로 읽음)
+        self._stats_lock = threading.Lock()
+        self._callers: Dict[str, _CallerStats] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._waiting: Dict[str, int] = {}
+
+    @property
+    def is_available(self) -> bool:
+        """호출 가능 여부 (클라이언트 주입 또는 패키지 설치 + 키/엔드포인트 설정)"""
+        if self._client_factory is not None:
+            return True
+        return OPENAI_AVAILABLE and bool(self.api_key) and bool(self.endpoint)
+
+    def limit_for(self, deployment: str) -> int:
+        """배포의 최대 동시 호출 수"""
+        return self.deployment_limits.get(deployment, self.max_concurrency)
+
+    # ------------------------------------------------------------------
+    # 호출 API
+    # ------------------------------------------------------------------
+
+    def run(self, coro: Awaitable) -> Future:
+        """코루틴을 게이트웨이 이벤트 루프에서 실행 (Future.cancel()은 작업 취소)"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def submit(
+        self,
+        messages: List[Dict[str, str]],
+        caller: str,
+        deployment: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **params
+    ) -> Future:
+        """
+        채팅 완성 요청을 예약하고 바로 반환 (동기 코드에서 여러 건을 동시에 보낼 때)
+
+        Args:
+            messages: 채팅 메시지 리스트
+            caller: 지표 집계용 호출자 이름 (예: "ai_comment", "care_plan")
+            deployment: 배포 이름 (None이면 기본 배포)
+            timeout: 시도당 타임아웃 (초, None이면 기본값)
+            **params: chat.completions.create 추가 인자 (temperature, max_tokens, response_format 등)
+
+        Returns:
+            Future[LLMResult]
+
+        Raises:
+            LLMUnavailableError: Azure OpenAI 미설정
+        """
+        if not self.is_available:
+            raise LLMUnavailableError("Azure OpenAI가 설정되지 않았습니다")
+        return self.run(self._complete(messages, caller, deployment or self.deployment, timeout, params))
+
+    def complete(
+        self,
+        messages: List[Dict[str, str]],
+        caller: str,
+        deployment: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **params
+    ) -> LLMResult:
+        """채팅 완성 (동기, 완료될 때까지 대기)"""
+        future = self.submit(messages, caller, deployment, timeout, **params)
+        try:
+            return future.result()
+        except BaseException:
+            future.cancel()
+            raise
+
+    async def acomplete(
+        self,
+        messages: List[Dict[str, str]],
+        caller: str,
+        deployment: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **params
+    ) -> LLMResult:
+        """채팅 완성 (async, 어느 이벤트 루프에서든 await 가능)"""
+        return await asyncio.wrap_future(self.submit(messages, caller, deployment, timeout, **params))
+
+    async def astream(
+        self,
+        messages: List[Dict[str, str]],
+        caller: str,
+        deployment: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **params
+    ) -> AsyncIterator[str]:
+        """
+        채팅 완성 스트리밍 (async, 어느 이벤트 루프에서든 사용 가능)
+
+        응답 토큰 조각을 받는 대로 반환합니다. 첫 조각을 받기 전의 재시도할 오류만 재시도하고,
+        스트림 도중 오류는 그대로 전달합니다. 반복을 중간에 멈추면(aclose) 호출을 취소합니다.
+
+        Yields:
+            str: 응답 내용 조각
+
+        Raises:
+            LLMUnavailableError: Azure OpenAI 미설정
+        """
+        if not self.is_available:
+            raise LLMUnavailableError("Azure OpenAI가 설정되지 않았습니다")
+
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+
+        def on_delta(text: str):
+            loop.call_soon_threadsafe(chunks.put_nowait, text)
+
+        done = asyncio.wrap_future(self.run(self._complete(
+            messages, caller, deployment or self.deployment, timeout, params, on_delta
+        )))
+        # 완료 알림은 앞서 예약된 조각들 뒤에 도착 (같은 루프의 call_soon 순서)
+        done.add_done_callback(lambda _: chunks.put_nowait(None))
+        try:
+            while True:
+                text = await chunks.get()
+                if text is None:
+                    break
+                yield text
+            await done
+        finally:
+            if not done.done():
+                done.cancel()
+
+    # ------------------------------------------------------------------
+    # 이벤트 루프 스레드 내부
+    # ------------------------------------------------------------------
+
+    async def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        caller: str,
+        deployment: str,
+        timeout: Optional[float],
+        params: Dict[str, Any],
+        on_delta: Optional[Callable[[str], None]] = None
+    ) -> LLMResult:
+        """
+        배포별 동시 호출 제한 안에서 호출하고, 재시도할 오류는 지터 백오프 후 재시도
+
+        on_delta가 있으면 스트리밍으로 호출하고 응답 조각마다 on_delta(text)를 부릅니다
+        (스트림을 다 읽을 때까지 동시 호출 슬롯을 점유).
+        """
+        if on_delta is not None:
+            params = dict(params, stream=True)
+        semaphore = self._semaphore(deployment)
+        start = time.perf_counter()
+        attempt = 0
+
+        self._add_gauge(self._waiting, deployment, 1)
+        try:
+            async with semaphore:
+                self._add_gauge(self._waiting, deployment, -1)
+                self._add_gauge(self._in_flight, deployment, 1)
+                try:
+                    while True:
+                        attempt += 1
+                        try:
+                            response = await self._get_client().chat.completions.create(
+                                model=deployment,
+                                messages=messages,
+                                timeout=timeout if timeout is not None else self.timeout,
+                                **params
+                            )
+                            if on_delta is None:
+                                break
+                            # 스트림은 첫 조각까지 받아야 연결/한도 오류가 드러나므로 재시도 범위에 포함
+                            stream = response.__aiter__()
+                            first = await stream.__anext__()
+                            break
+                        except asyncio.CancelledError:
+                            raise
+                        except Exception as e:
+                            if attempt > self.max_retries or not is_retryable(e):
+                                raise
+                            delay = self._backoff(attempt, e)
+                            logger.info(
+                                f"Azure OpenAI 재시도 {attempt}/{self.max_retries} "
+                                f"({caller}, {deployment}, {delay:.2f}초 후): {e}"
+                            )
+                            await asyncio.sleep(delay)
+
+                    if on_delta is None:
+                        content = response.choices[0].message.content or ""
+                        usage = getattr(response, "usage", None)
+                    else:
+                        try:
+                            content, usage = await self._read_stream(first, stream, on_delta)
+                        finally:
+                            # 취소/오류로 중간에 멈춰도 HTTP 스트림을 닫아 연결을 풀에 반환
+                            close = getattr(response, "close", None)
+                            if close is not None:
+                                await close()
+                finally:
+                    self._add_gauge(self._in_flight, deployment, -1)
+        except BaseException:
+            if attempt == 0:
+                self._add_gauge(self._waiting, deployment, -1)
+            self._record(caller, start, attempt, None)
+            raise
+
+        result = LLMResult(
+            content=content,
+            deployment=deployment,
+            prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+            latency_ms=(time.perf_counter() - start) * 1000,
+            attempts=attempt,
+        )
+        self._record(caller, start, attempt, result)
+        return result
+
+    @staticmethod
+    async def _read_stream(first, stream, on_delta: Callable[[str], None]):
+        """스트림 응답을 끝까지 읽어 (전체 내용, usage) 반환 (usage는 include_usage 요청 시에만 있음)"""
+        parts: List[str] = []
+        usage = None
+        chunk = first
+        while True:
+            # Azure는 첫 조각(콘텐츠 필터 결과)과 usage 조각의 choices가 비어 있음
+            text = chunk.choices[0].delta.content if chunk.choices else None
+            if text:
+                parts.append(text)
+                on_delta(text)
+            usage = getattr(chunk, "usage", None) or usage
+            try:
+                chunk = await stream.__anext__()
+            except StopAsyncIteration:
+                return "".join(parts), usage
+
+    def _backoff(self, attempt: int, exc: BaseException) -> float:
+        """재시도 대기 시간 (full jitter 지수 백오프, retry-after 헤더가 더 길면 그 값, 상한 retry_max_seconds)"""
+        delay = random.uniform(0, min(self.retry_max_seconds, self.retry_base_seconds * 2 ** (attempt - 1)))
+        retry_after = retry_after_seconds(exc)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return min(delay, self.retry_max_seconds)
+
+    def _semaphore(self, deployment: str) -> asyncio.Semaphore:
+        """배포별 세마포어 (이벤트 루프 스레드에서만 호출)"""
+        semaphore = self._semaphores.get(deployment)
+        if semaphore is None:
+            semaphore = self._semaphores[deployment] = asyncio.Semaphore(self.limit_for(deployment))
+        return semaphore
+
+    def _get_client(self):
+        """비동기 클라이언트 (이벤트 루프 스레드에서 최초 사용 시 생성)"""
+        if self._client is None:
+            self._client = self._client_factory() if self._client_factory is not None else self._create_client()
+        return self._client
+
+    def _create_client(self):
+        """HTTP/2 keep-alive 연결 풀을 쓰는 AsyncAzureOpenAI 생성 (재시도는 게이트웨이가 담당)"""
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+            keepalive_expiry=self.keepalive_seconds,
+        )
+        try:
+            http_client = httpx.AsyncClient(http2=self.http2, limits=limits, timeout=self.timeout)
+        except ImportError:
+            logger.warning("h2 패키지 미설치 - HTTP/1.1 연결 풀 사용 (pip install httpx[http2])")
+            self.http2 = False
+            http_client = httpx.AsyncClient(limits=limits, timeout=self.timeout)
+
+        logger.info(
+            f"✅ Azure OpenAI 게이트웨이 연결 풀 생성 (HTTP/{'2' if self.http2 else '1.1'}, "
+            f"최대 연결 {self.max_connections}, 기본 배포 {self.deployment})"
+        )
+        return AsyncAzureOpenAI(
+            api_key=self.api_key,
+            api_version=self.api_version,
+            azure_endpoint=self.endpoint,
+            http_client=http_client,
+            timeout=self.timeout,
+            max_retries=0,
+        )
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """이벤트 루프 스레드 반환 (없으면 시작)"""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+                thread = threading.Thread(
+                    target=self._run_loop, args=(loop, started), name="llm-gateway", daemon=True
+                )
+                thread.start()
+                started.wait()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop, started: threading.Event):
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        loop.run_forever()
+
+    # ------------------------------------------------------------------
+    # 지표 / 종료
+    # ------------------------------------------------------------------
+
+    def _add_gauge(self, gauge: Dict[str, int], deployment: str, delta: int):
+        with self._stats_lock:
+            gauge[deployment] = gauge.get(deployment, 0) + delta
+
+    def _record(self, caller: str, start: float, attempts: int, result: Optional[LLMResult]):
+        """호출 1건 지표 기록 (result가 None이면 실패/취소)"""
+        with self._stats_lock:
+            stats = self._callers.setdefault(caller, _CallerStats())
+            stats.calls += 1
+            stats.retries += max(0, attempts - 1)
+            if result is None:
+                stats.errors += 1
+                return
+            stats.prompt_tokens += result.prompt_tokens
+            stats.completion_tokens += result.completion_tokens
+            stats.latencies.append(result.latency_ms)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """게이트웨이 상태와 호출자별 지연 시간/토큰 지표"""
+        with self._stats_lock:
+            deployments = sorted(set(self._in_flight) | set(self._waiting) | set(self.deployment_limits))
+            return {
+                "available": self.is_available,
+                "http2": self.http2,
+                "max_connections": self.max_connections,
+                "default_deployment": self.deployment,
+                "deployments": {
+                    name: {
+                        "limit": self.limit_for(name),
+                        "in_flight": self._in_flight.get(name, 0),
+                        "waiting": self._waiting.get(name, 0),
+                    }
+                    for name in deployments
+                },
+                "callers": {name: stats.to_dict() for name, stats in sorted(self._callers.items())},
+            }
+
+    def close(self, timeout: float = 5.0):
+        """연결 풀을 닫고 이벤트 루프 스레드 종료 (이후 호출 시 다시 시작)"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+
+        client, self._client = self._client, None
+        close = getattr(client, "close", None)
+        if close is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(close(), loop).result(timeout)
+            except Exception as e:
+                logger.warning(f"Azure OpenAI 연결 풀 종료 실패: {e}")
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        loop.close()
+        self._semaphores = {}
+
+
+# 싱글톤 인스턴스
+_llm_gateway: Optional[LLMGateway] = None
+_llm_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """LLMGateway 싱글톤 인스턴스 반환"""
+    global _llm_gateway
+
+    if _llm_gateway is None:
+        with _llm_gateway_lock:
+            if _llm_gateway is None:
+                from app.core.config import get_settings
+
+                settings = get_settings()
+                _llm_gateway = LLMGateway(
+                    api_key=settings.AZURE_OPENAI_API_KEY,
+                    endpoint=settings.AZURE_OPENAI_ENDPOINT,
+                    api_version=settings.AZURE_OPENAI_API_VERSION,
+                    deployment=settings.AZURE_OPENAI_DEPLOYMENT or "gpt-4o",
+                    timeout=settings.AZURE_OPENAI_TIMEOUT,
+                    http2=settings.LLM_HTTP2,
+                    max_connections=settings.LLM_MAX_CONNECTIONS,
+                    keepalive_seconds=settings.LLM_KEEPALIVE_SECONDS,
+                    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+                    deployment_limits=parse_deployment_limits(settings.LLM_DEPLOYMENT_CONCURRENCY),
+                    max_retries=settings.LLM_MAX_RETRIES,
+                    retry_base_seconds=settings.LLM_RETRY_BASE_SECONDS,
+                    retry_max_seconds=settings.LLM_RETRY_MAX_SECONDS,
+                )
+
+    return _llm_gateway
+
+
+def close_llm_gateway():
+    """게이트웨이 연결 풀 종료 (앱 종료 시)"""
+    if _llm_gateway is not None:
+        _llm_gateway.close()
@@ -5,10 +5,37 @@ from .data_preprocessing import DataPreprocessor
 from .feature_engineering import FeatureEngineer
 from .ai_comment import AICommentGenerator
 from .nuelbom_predictor import NuelbomMatchingPredictor
+from .region_index import RegionIndex, get_region_index
+from .specialty_vocab import SpecialtyVocabulary, get_specialty_vocabulary
+from .certification_index import CertificationIndex
+from .tree_ensemble import TreeEnsembleModel
+from .onnx_inference import OnnxModel, export_matching_models
+from .model_registry import ModelRegistry, get_model_registry
+from .model_experiment import ModelExperiment
+from .score_matrix import ScoreMatrix, ScoreMatrixStore, build_score_matrix, compute_score_matrix, get_score_matrix_store
+from .score_invalidation import ScoreInvalidationConsumer, install_change_tracking
 
 __all__ = [
     "DataPreprocessor",
     "FeatureEngineer",
     "AICommentGenerator",
-    "NuelbomMatchingPredictor"
+    "NuelbomMatchingPredictor",
+    "RegionIndex",
+    "get_region_index",
+    "SpecialtyVocabulary",
+    "get_specialty_vocabulary",
+    "CertificationIndex",
+    "TreeEnsembleModel",
+    "OnnxModel",
+    "export_matching_models",
+    "ModelRegistry",
+    "get_model_registry",
+    "ModelExperiment",
+    "ScoreMatrix",
+    "ScoreMatrixStore",
+    "build_score_matrix",
+    "compute_score_matrix",
+    "get_score_matrix_store",
+    "ScoreInvalidationConsumer",
+    "install_change_tracking",
 ]
@@ -4,77 +4,58 @@
 # 파일: ai_comment.py
 # 설명: Azure OpenAI를 사용한 AI 코멘트 생성
 
-import os
-from typing import Dict, Optional
+import asyncio
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
 import logging
 
+from app.services.llm_gateway import LLMGateway, get_llm_gateway
+
+from .comment_cache import CommentCache
+
 logger = logging.getLogger(__name__)
 
-# Azure OpenAI 클라이언트 import
-try:
-    from openai import AzureOpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-    logger.warning("openai 패키지가 설치되지 않았습니다. pip install openai")
+SYSTEM_PROMPT = """당신은 늘봄케어 AI 매칭 서비스의 전문 상담사입니다.
+환자와 간병인의 매칭 결과를 바탕으로 보호자에게 추천 이유를 설명합니다.
+- 친절하고 따뜻한 톤으로 작성하세요
+- 1-2문장으로 간결하게 작성하세요
+- 구체적인 장점을 언급하세요
+- 한국어로 작성하세요"""
 
 
 class AICommentGenerator:
-    """Azure OpenAI를 사용한 AI 코멘트 생성기"""
+    """Azure OpenAI를 사용한 AI 코멘트 생성기 (공용 LLM 게이트웨이 사용)"""
 
     def __init__(
         self,
-        api_key: Optional[str] = None,
-        endpoint: Optional[str] = None,
+        gateway: Optional[LLMGateway] = None,
         deployment_name: Optional[str] = None,
-        api_version: Optional[str] = None
+        timeout: Optional[float] = None,
+        max_concurrency: int = 5,
+        comment_cache: Optional[CommentCache] = None
     ):
         """
         Args:
-            api_key: Azure OpenAI API 키 (환경변수 AZURE_OPENAI_API_KEY)
-            endpoint: Azure OpenAI 엔드포인트 (환경변수 AZURE_OPENAI_ENDPOINT)
-            deployment_name: 배포된 모델 이름 (환경변수 AZURE_OPENAI_DEPLOYMENT)
-            api_version: API 버전 (환경변수 AZURE_OPENAI_API_VERSION)
+            gateway: Azure OpenAI 게이트웨이 (None이면 프로세스 공용 게이트웨이)
+            deployment_name: 배포된 모델 이름 (None이면 게이트웨이 기본 배포)
+            timeout: API 호출 타임아웃 (초, None이면 게이트웨이 기본값)
+            max_concurrency: 이 생성기가 동시에 호출하는 최대 요청 수 (배포별 제한과 별도)
+            comment_cache: 같은 프롬프트 입력의 코멘트를 재사용하는 캐시 (None이면 캐시 없음)
         """
-        self.api_key = api_key or os.getenv("AZURE_OPENAI_API_KEY")
-        self.endpoint = endpoint or os.getenv("AZURE_OPENAI_ENDPOINT")
-        self.deployment_name = deployment_name or os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o")
-        self.api_version = api_version or os.getenv("AZURE_OPENAI_API_VERSION", "2024-12-01-preview")
-
-        self.client = None
-        self.is_available = False
-
-        # 클라이언트 초기화 시도
-        self._init_client()
-
-    def _init_client(self):
-        """Azure OpenAI 클라이언트 초기화"""
-        if not OPENAI_AVAILABLE:
-            logger.warning("openai 패키지 미설치 - 규칙 기반 코멘트 사용")
-            self.is_available = False
-            return
+        self.gateway = gateway or get_llm_gateway()
+        self.deployment_name = deployment_name or self.gateway.deployment
+        self.timeout = timeout
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.comment_cache = comment_cache
 
-        if not self.api_key:
-            logger.debug("AZURE_OPENAI_API_KEY 미설정 - 규칙 기반 코멘트 사용")
-            self.is_available = False
-            return
+        # 코멘트 요청 동시 호출 제한 (게이트웨이 이벤트 루프에서만 사용)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
 
-        if not self.endpoint:
-            logger.debug("AZURE_OPENAI_ENDPOINT 미설정 - 규칙 기반 코멘트 사용")
-            self.is_available = False
-            return
-
-        try:
-            self.client = AzureOpenAI(
-                api_key=self.api_key,
-                api_version=self.api_version,
-                azure_endpoint=self.endpoint
-            )
-            self.is_available = True
-            logger.info(f"✅ Azure OpenAI 클라이언트 초기화 성공 (deployment: {self.deployment_name})")
-        except Exception as e:
-            logger.warning(f"Azure OpenAI 클라이언트 초기화 실패: {e}")
-            self.is_available = False
+        self.is_available = self.gateway.is_available
+        if self.is_available:
+            logger.info(f"✅ Azure OpenAI 코멘트 생성기 준비 (deployment: {self.deployment_name})")
+        else:
+            logger.debug("Azure OpenAI 미설정 - 규칙 기반 코멘트 사용")
 
     def generate_comment(
         self,
@@ -98,6 +79,7 @@ class AICommentGenerator:
 
         Returns:
             Dict: {"comment": str, "source": "azure_openai" | "rule_based"}
+                (캐시 적중 시 "cached": True 추가)
         """
         # Azure OpenAI 사용 불가시 규칙 기반 코멘트 반환
         if not self.is_available:
@@ -106,6 +88,74 @@ class AICommentGenerator:
                 "source": "rule_based"
             }
 
+        # 코멘트 캐시 조회 (같은 프롬프트 입력이면 API 호출 생략)
+        cache_key, cached = self._lookup_cache(
+            patient_info, caregiver_info, matching_score, grade, features
+        )
+        if cached is not None:
+            return cached
+
+        return self._request_comment(
+            cache_key, patient_info, caregiver_info, matching_score, grade, features, verbose
+        )
+
+    def _lookup_cache(
+        self,
+        patient_info: Dict,
+        caregiver_info: Dict,
+        matching_score: float,
+        grade: str,
+        features: Dict
+    ) -> Tuple[Optional[str], Optional[Dict]]:
+        """
+        코멘트 캐시 조회
+
+        Returns:
+            (cache_key, result): 캐시 키(캐시 없으면 None)와 캐시 적중 결과(미적중 시 None)
+        """
+        if self.comment_cache is None or not self.comment_cache.is_available:
+            return None, None
+
+        cache_key = self.comment_cache.make_key(
+            patient_info, caregiver_info, matching_score, grade, features,
+            model=self.deployment_name
+        )
+        comment = self.comment_cache.get(cache_key)
+        if comment is None:
+            return cache_key, None
+
+        return cache_key, {"comment": comment, "source": "azure_openai", "cached": True}
+
+    def _request_comment(
+        self,
+        cache_key: Optional[str],
+        patient_info: Dict,
+        caregiver_info: Dict,
+        matching_score: float,
+        grade: str,
+        features: Dict,
+        verbose: bool = False
+    ) -> Dict:
+        """Azure OpenAI 호출로 코멘트 생성 (성공 시 cache_key로 캐시에 저장)"""
+        return self._submit_comment(
+            cache_key, patient_info, caregiver_info, matching_score, grade, features, verbose
+        ).result()
+
+    def _submit_comment(self, cache_key: Optional[str], *args, **kwargs) -> Future:
+        """코멘트 요청을 게이트웨이 이벤트 루프에 예약 (Future.cancel()은 호출 취소)"""
+        return self.gateway.run(self._arequest_comment(cache_key, *args, **kwargs))
+
+    async def _arequest_comment(
+        self,
+        cache_key: Optional[str],
+        patient_info: Dict,
+        caregiver_info: Dict,
+        matching_score: float,
+        grade: str,
+        features: Dict,
+        verbose: bool = False
+    ) -> Dict:
+        """Azure OpenAI 호출 (max_concurrency개씩, 실패 시 규칙 기반 코멘트)"""
         try:
             if verbose:
                 logger.debug(f"Azure OpenAI API 호출 (model: {self.deployment_name})")
@@ -116,31 +166,29 @@ class AICommentGenerator:
             )
 
             # Azure OpenAI 호출
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """당신은 늘봄케어 AI 매칭 서비스의 전문 상담사입니다.
-환자와 간병인의 매칭 결과를 바탕으로 보호자에게 추천 이유를 설명합니다.
-- 친절하고 따뜻한 톤으로 작성하세요
-- 1-2문장으로 간결하게 작성하세요
-- 구체적인 장점을 언급하세요
-- 한국어로 작성하세요"""
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=150,
-                temperature=0.7
-            )
-
-            comment = response.choices[0].message.content.strip()
+            async with self._semaphore:
+                result = await self.gateway.acomplete(
+                    [
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    caller="ai_comment",
+                    deployment=self.deployment_name,
+                    timeout=self.timeout,
+                    max_tokens=150,
+                    temperature=0.7
+                )
+
+            comment = result.content.strip()
 
             if verbose:
-                logger.debug(f"Azure OpenAI 응답 성공 (토큰: {response.usage.total_tokens})")
+                logger.debug(
+                    f"Azure OpenAI 응답 성공 (토큰: {result.prompt_tokens + result.completion_tokens}, "
+                    f"{result.latency_ms:.0f}ms)"
+                )
+
+            if cache_key is not None:
+                self.comment_cache.put(cache_key, comment)
 
             return {
                 "comment": comment,
@@ -154,6 +202,94 @@ class AICommentGenerator:
                 "source": "rule_based"
             }
 
+    def generate_comments(
+        self,
+        requests: List[Dict],
+        deadline_seconds: Optional[float] = None,
+        verbose: bool = False
+    ) -> List[Dict]:
+        """
+        여러 매칭 결과의 AI 코멘트를 동시에 생성 (최대 max_concurrency개 동시 호출)
+
+        Args:
+            requests: generate_comment 인자 dict 리스트
+                (patient_info, caregiver_info, matching_score, grade, features)
+            deadline_seconds: 전체 대기 시간 (초, None이면 모두 완료될 때까지 대기)
+            verbose: 디버깅 출력 여부
+
+        Returns:
+            List[Dict]: requests 순서의 {"comment": str, "source": str}
+                (기한 내 완료되지 않은 항목은 규칙 기반 코멘트)
+        """
+        results: List[Optional[Dict]] = [None] * len(requests)
+        for i, result in self.iter_comments(requests, deadline_seconds, verbose):
+            results[i] = result
+        return results
+
+    def iter_comments(
+        self,
+        requests: List[Dict],
+        deadline_seconds: Optional[float] = None,
+        verbose: bool = False
+    ) -> Iterator[Tuple[int, Dict]]:
+        """
+        여러 매칭 결과의 AI 코멘트를 동시에 생성하고 완료되는 순서대로 반환
+
+        Args:
+            requests: generate_comment 인자 dict 리스트
+                (patient_info, caregiver_info, matching_score, grade, features)
+            deadline_seconds: 전체 대기 시간 (초, None이면 모두 완료될 때까지 대기)
+            verbose: 디버깅 출력 여부
+
+        Yields:
+            (index, result): requests 내 순번과 {"comment": str, "source": str}
+                (캐시 적중 항목 먼저, 기한 내 완료되지 않은 항목은 마지막에 규칙 기반 코멘트)
+        """
+        if not self.is_available:
+            for i, req in enumerate(requests):
+                yield i, self._rule_based_result(req)
+            return
+
+        # 캐시 적중 항목은 바로 반환하고, 미적중 항목만 게이트웨이로 호출
+        pending = {}
+        for i, req in enumerate(requests):
+            cache_key, cached = self._lookup_cache(**req)
+            if cached is not None:
+                yield i, cached
+                continue
+
+            pending[self._submit_comment(cache_key, verbose=verbose, **req)] = i
+
+        if not pending:
+            return
+
+        try:
+            for future in as_completed(pending, timeout=deadline_seconds):
+                yield pending.pop(future), future.result()
+        except FutureTimeoutError:
+            pass
+        finally:
+            # 기한 초과(또는 호출 측 중단): 진행 중인 호출은 취소
+            for future in pending:
+                future.cancel()
+
+        if pending:
+            logger.warning(
+                f"Azure OpenAI 코멘트 {len(pending)}/{len(requests)}건이 "
+                f"{deadline_seconds}초 내에 완료되지 않아 규칙 기반 코멘트 사용"
+            )
+            for i in sorted(pending.values()):
+                yield i, self._rule_based_result(requests[i])
+
+    def _rule_based_result(self, request: Dict) -> Dict:
+        """generate_comment 인자 dict → 규칙 기반 코멘트 결과"""
+        return {
+            "comment": self._generate_rule_based_comment(
+                request["grade"], request["features"], request["caregiver_info"]
+            ),
+            "source": "rule_based"
+        }
+
     def _create_prompt(
         self,
         patient_info: Dict,
@@ -0,0 +1,600 @@
+# ========================================
+# 늘봄케어 매칭 모델 - 간병인 특성 저장소
+# ========================================
+# 파일: caregiver_store.py
+# 설명: 간병인 특성을 프로세스 메모리에 컬럼 배열로 보관하고 updated_at 기준으로 증분 갱신
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Set
+
+import numpy as np
+import logging
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, contains_eager
+
+from app.utils.certifications import split_certifications
+
+from .certification_index import CertificationIndex
+from .feature_engineering import PERSONALITY_TYPES
+from .region_index import get_region_index
+from .specialty_vocab import get_specialty_vocabulary
+
+logger = logging.getLogger(__name__)
+
+# 기존 라우트와 동일한 기본값
+DEFAULT_PERSONALITY_SCORE = 50.0
+DEFAULT_HOURLY_RATE = 25000
+DEFAULT_AVG_RATING = 4.5
+
+
+def parse_specialties(specialties) -> List[str]:
+    """
+    specialties 파싱: PostgreSQL ARRAY 타입을 처리
+    DB에서 {항목1,항목2,항목3} 또는 [항목1, 항목2] 형태로 올 수 있음
+    """
+    if not specialties:
+        return []
+
+    # 이미 리스트/튜플인 경우
+    if isinstance(specialties, (list, tuple)):
+        return [str(s).strip() for s in specialties if s]
+
+    # 문자열인 경우: {항목1,항목2} 형태
+    specs_str = str(specialties)
+    if specs_str.startswith('{') and specs_str.endswith('}'):
+        specs_str = specs_str[1:-1]  # {} 제거
+    # 쉼표로 구분된 항목 파싱
+    return [s.strip() for s in specs_str.split(',') if s.strip()]
+
+
+class CaregiverSnapshot:
+    """
+    간병인 특성 스냅샷 (읽기 전용 컬럼 배열)
+
+    갱신 시에는 새 스냅샷을 만들어 교체하므로, 요청 처리 중에는
+    같은 스냅샷을 잠금 없이 읽을 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        caregiver_ids: np.ndarray,
+        names: List[str],
+        profile_image_urls: List[str],
+        certifications: List[str],
+        certification_lists: List[List[str]],
+        specialties: List[List[str]],
+        service_regions: List[str],
+        personality: np.ndarray,
+        specialty_masks: np.ndarray,
+        region_ids: np.ndarray,
+        experience_years: np.ndarray,
+        hourly_rates: np.ndarray,
+        avg_ratings: np.ndarray,
+        version: int = 0
+    ):
+        self.caregiver_ids = caregiver_ids
+        self.names = names
+        self.profile_image_urls = profile_image_urls
+        self.certifications = certifications
+        self.certification_lists = certification_lists
+        self.specialties = specialties
+        self.service_regions = service_regions
+        self.personality = personality
+        self.specialty_masks = specialty_masks
+        self.region_ids = region_ids
+        self.experience_years = experience_years
+        self.hourly_rates = hourly_rates
+        self.avg_ratings = avg_ratings
+        self.version = version
+
+        self.positions: Dict[int, int] = {
+            cg_id: i for i, cg_id in enumerate(caregiver_ids.tolist())
+        }
+        self.specialty_counts = np.fromiter(
+            (len(specs) for specs in specialties), dtype=np.int64, count=len(specialties)
+        )
+        self._certification_index: Optional[CertificationIndex] = None
+
+    def __len__(self) -> int:
+        return len(self.caregiver_ids)
+
+    @property
+    def certification_index(self) -> CertificationIndex:
+        """자격증 역색인 (스냅샷별 최초 조회 시 1회 생성)"""
+        if self._certification_index is None:
+            self._certification_index = CertificationIndex(self.certification_lists)
+        return self._certification_index
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Dict], version: int = 0) -> "CaregiverSnapshot":
+        """간병인 행(dict) 리스트로 스냅샷 생성"""
+        n = len(rows)
+        specialties = [row["specialties"] for row in rows]
+        service_regions = [row["service_region"] for row in rows]
+
+        return cls(
+            caregiver_ids=np.fromiter((row["caregiver_id"] for row in rows), dtype=np.int64, count=n),
+            names=[row["caregiver_name"] for row in rows],
+            profile_image_urls=[row["profile_image_url"] for row in rows],
+            certifications=[row["certifications"] for row in rows],
+            certification_lists=[
+                row.get("certification_list") or split_certifications(row["certifications"])
+                for row in rows
+            ],
+            specialties=specialties,
+            service_regions=service_regions,
+            personality=np.array(
+                [[row[f"{ptype}_score"] for ptype in PERSONALITY_TYPES] for row in rows],
+                dtype=np.float64
+            ).reshape(n, len(PERSONALITY_TYPES)),
+            specialty_masks=get_specialty_vocabulary().encode_many(specialties),
+            region_ids=get_region_index().register_many(service_regions),
+            experience_years=np.fromiter((row["experience_years"] for row in rows), dtype=np.int64, count=n),
+            hourly_rates=np.fromiter((row["hourly_rate"] for row in rows), dtype=np.int64, count=n),
+            avg_ratings=np.fromiter((row["avg_rating"] for row in rows), dtype=np.float64, count=n),
+            version=version,
+        )
+
+    def to_rows(self, indices: Optional[Sequence[int]] = None) -> List[Dict]:
+        """스냅샷 → 간병인 행(dict) 리스트"""
+        if indices is None:
+            indices = range(len(self))
+        return [self.to_caregiver_dict(i) for i in indices]
+
+    def to_caregiver_dict(self, i: int) -> Dict:
+        """
+        i번째 간병인 정보를 기존 caregivers_with_personality 항목 형태로 반환
+        (job_title은 돌봄 유형에 따라 라우트에서 결정)
+        """
+        personality = self.personality[i].tolist()
+        caregiver = {
+            "caregiver_id": int(self.caregiver_ids[i]),
+            "caregiver_name": self.names[i],
+            "experience_years": int(self.experience_years[i]),
+            "hourly_rate": int(self.hourly_rates[i]),
+            "avg_rating": float(self.avg_ratings[i]),
+            "profile_image_url": self.profile_image_urls[i],
+            "specialties": list(self.specialties[i]),
+            "certifications": self.certifications[i],
+            "certification_list": list(self.certification_lists[i]),
+            "service_region": self.service_regions[i],
+        }
+        for ptype, score in zip(PERSONALITY_TYPES, personality):
+            caregiver[f"{ptype}_score"] = score
+        return caregiver
+
+    def with_changes(
+        self,
+        upserts: Sequence[Dict],
+        alive_ids: Optional[set] = None,
+        version: int = 0
+    ) -> "CaregiverSnapshot":
+        """
+        변경된 간병인만 반영한 새 스냅샷 반환 (기존 스냅샷은 변경하지 않음)
+
+        Args:
+            upserts: 추가/수정된 간병인 행
+            alive_ids: 현재 존재하는 간병인 ID (None이면 삭제 확인 생략)
+            version: 새 스냅샷 버전
+        """
+        vocab = get_specialty_vocabulary()
+
+        caregiver_ids = self.caregiver_ids.copy()
+        names = list(self.names)
+        profile_image_urls = list(self.profile_image_urls)
+        certifications = list(self.certifications)
+        certification_lists = list(self.certification_lists)
+        specialties = list(self.specialties)
+        service_regions = list(self.service_regions)
+        personality = self.personality.copy()
+        region_ids = self.region_ids.copy()
+        experience_years = self.experience_years.copy()
+        hourly_rates = self.hourly_rates.copy()
+        avg_ratings = self.avg_ratings.copy()
+
+        updated = [row for row in upserts if row["caregiver_id"] in self.positions]
+        added = [row for row in upserts if row["caregiver_id"] not in self.positions]
+
+        # 1. 기존 간병인 수정 (해당 행만 덮어쓰기)
+        changed = CaregiverSnapshot.from_rows(updated) if updated else None
+        specialty_masks = vocab.align(self.specialty_masks, vocab.num_words)
+        if changed is not None:
+            rows = np.array([self.positions[row["caregiver_id"]] for row in updated], dtype=np.int64)
+            for j, i in enumerate(rows.tolist()):
+                names[i] = changed.names[j]
+                profile_image_urls[i] = changed.profile_image_urls[j]
+                certifications[i] = changed.certifications[j]
+                certification_lists[i] = changed.certification_lists[j]
+                specialties[i] = changed.specialties[j]
+                service_regions[i] = changed.service_regions[j]
+            personality[rows] = changed.personality
+            specialty_masks[rows] = vocab.align(changed.specialty_masks, vocab.num_words)
+            region_ids[rows] = changed.region_ids
+            experience_years[rows] = changed.experience_years
+            hourly_rates[rows] = changed.hourly_rates
+            avg_ratings[rows] = changed.avg_ratings
+
+        # 2. 신규 간병인 추가
+        if added:
+            new = CaregiverSnapshot.from_rows(added)
+            num_words = vocab.num_words
+            caregiver_ids = np.concatenate([caregiver_ids, new.caregiver_ids])
+            names += new.names
+            profile_image_urls += new.profile_image_urls
+            certifications += new.certifications
+            certification_lists += new.certification_lists
+            specialties += new.specialties
+            service_regions += new.service_regions
+            personality = np.concatenate([personality, new.personality])
+            specialty_masks = np.concatenate([
+                vocab.align(specialty_masks, num_words),
+                vocab.align(new.specialty_masks, num_words),
+            ])
+            region_ids = np.concatenate([region_ids, new.region_ids])
+            experience_years = np.concatenate([experience_years, new.experience_years])
+            hourly_rates = np.concatenate([hourly_rates, new.hourly_rates])
+            avg_ratings = np.concatenate([avg_ratings, new.avg_ratings])
+
+        # 3. 삭제된 간병인 제거
+        if alive_ids is not None:
+            keep = np.isin(caregiver_ids, np.fromiter(alive_ids, dtype=np.int64, count=len(alive_ids)))
+            if not keep.all():
+                kept = np.flatnonzero(keep).tolist()
+                caregiver_ids = caregiver_ids[keep]
+                names = [names[i] for i in kept]
+                profile_image_urls = [profile_image_urls[i] for i in kept]
+                certifications = [certifications[i] for i in kept]
+                certification_lists = [certification_lists[i] for i in kept]
+                specialties = [specialties[i] for i in kept]
+                service_regions = [service_regions[i] for i in kept]
+                personality = personality[keep]
+                specialty_masks = specialty_masks[keep]
+                region_ids = region_ids[keep]
+                experience_years = experience_years[keep]
+                hourly_rates = hourly_rates[keep]
+                avg_ratings = avg_ratings[keep]
+
+        return CaregiverSnapshot(
+            caregiver_ids=caregiver_ids,
+            names=names,
+            profile_image_urls=profile_image_urls,
+            certifications=certifications,
+            certification_lists=certification_lists,
+            specialties=specialties,
+            service_regions=service_regions,
+            personality=personality,
+            specialty_masks=specialty_masks,
+            region_ids=region_ids,
+            experience_years=experience_years,
+            hourly_rates=hourly_rates,
+            avg_ratings=avg_ratings,
+            version=version,
+        )
+
+
+class CaregiverFeatureStore:
+    """
+    프로세스 로컬 간병인 특성 저장소
+
+    caregivers / caregiver_personality / users 테이블의 updated_at 워터마크 이후
+    변경된 행만 다시 조회하여 스냅샷을 갱신합니다. 매칭 요청은 메모리의 스냅샷만
+    읽으므로 점수 계산 전에 DB를 조회하지 않습니다.
+
+    updated_at(func.now())은 커밋 시각이 아니라 트랜잭션 시작 시각이므로, 워터마크보다
+    watermark_overlap 초 이전부터 다시 조회해 늦게 커밋된 긴 트랜잭션의 변경도 반영합니다.
+    """
+
+    def __init__(self, refresh_interval: float = 60.0, watermark_overlap: float = 300.0):
+        """
+        Args:
+            refresh_interval: 갱신 주기 (초)
+            watermark_overlap: 워터마크 이전부터 다시 조회하는 구간 (초, 가장 긴 트랜잭션보다 길게)
+        """
+        self.refresh_interval = refresh_interval
+        self.watermark_overlap = timedelta(seconds=watermark_overlap)
+
+        self._snapshot: Optional[CaregiverSnapshot] = None
+        self._refresh_lock = threading.Lock()
+        self._version = 0
+        self._last_refresh = 0.0
+
+        # updated_at 워터마크 (테이블별)
+        self._caregiver_watermark: Optional[datetime] = None
+        self._personality_watermark: Optional[datetime] = None
+        self._user_watermark: Optional[datetime] = None
+
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        # 증분 갱신 시 새 스냅샷 공개 직전에 호출 (점수 캐시/사전 계산 점수 증분 재계산)
+        self._change_listeners: List[Callable[[CaregiverSnapshot, Set[int], Set[int]], None]] = []
+
+    @property
+    def version(self) -> int:
+        """스냅샷 버전 (간병인 데이터가 바뀔 때마다 증가)"""
+        return self._version
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._snapshot is not None
+
+    def get_snapshot(self, db: Optional[Session] = None) -> CaregiverSnapshot:
+        """
+        현재 스냅샷 반환
+
+        아직 로드되지 않았거나 (백그라운드 갱신이 없을 때) 갱신 주기가 지났으면
+        주어진 세션으로 먼저 갱신합니다.
+        """
+        background = self._refresh_thread is not None and self._refresh_thread.is_alive()
+        stale = time.monotonic() - self._last_refresh > self.refresh_interval
+
+        if db is not None and (self._snapshot is None or (stale and not background)):
+            self.refresh(db)
+
+        if self._snapshot is None:
+            raise RuntimeError("간병인 특성 저장소가 아직 로드되지 않았습니다.")
+
+        return self._snapshot
+
+    def _caregiver_query(self, db: Session):
+        """간병인 + 사용자 + 성격 조회 쿼리"""
+        from app.models.profile import Caregiver
+        from app.models.user import User
+        from app.models.care_details import CaregiverPersonality
+
+        return db.query(Caregiver)\
+            .join(User, Caregiver.user)\
+            .outerjoin(CaregiverPersonality, Caregiver.personality)\
+            .options(contains_eager(Caregiver.user), contains_eager(Caregiver.personality))
+
+    @staticmethod
+    def _to_row(caregiver) -> Dict:
+        """ORM 객체 → 간병인 행 (기존 라우트의 기본값 규칙 유지)"""
+        personality = caregiver.personality
+        user = caregiver.user
+
+        row = {
+            "caregiver_id": int(caregiver.caregiver_id),
+            "caregiver_name": user.name if user else "Unknown",
+            "experience_years": caregiver.experience_years or 0,
+            "hourly_rate": caregiver.hourly_rate or DEFAULT_HOURLY_RATE,
+            "avg_rating": float(caregiver.avg_rating) if caregiver.avg_rating else DEFAULT_AVG_RATING,
+            "profile_image_url": (user.profile_image_url or "") if user else "",
+            "certifications": caregiver.certifications or "",
+            "certification_list": (
+                list(caregiver.certification_list)
+                if caregiver.certification_list is not None
+                else split_certifications(caregiver.certifications)
+            ),
+            "service_region": caregiver.service_region or "",
+        }
+
+        try:
+            row["specialties"] = parse_specialties(caregiver.specialties)
+        except Exception as e:
+            logger.warning(f"[간병인 저장소] specialties 파싱 실패: {caregiver.caregiver_id}, error: {e}")
+            row["specialties"] = []
+
+        for ptype in PERSONALITY_TYPES:
+            score = getattr(personality, f"{ptype}_score", None) if personality else None
+            row[f"{ptype}_score"] = float(score) if score is not None else DEFAULT_PERSONALITY_SCORE
+
+        return row
+
+    def _advance_watermarks(self, caregivers: Sequence):
+        """조회한 행들의 updated_at 최댓값으로 워터마크 갱신"""
+        def latest(current, values):
+            values = [v for v in values if v is not None]
+            if not values:
+                return current
+            newest = max(values)
+            return newest if current is None or newest > current else current
+
+        self._caregiver_watermark = latest(
+            self._caregiver_watermark, [cg.updated_at for cg in caregivers]
+        )
+        self._personality_watermark = latest(
+            self._personality_watermark,
+            [cg.personality.updated_at for cg in caregivers if cg.personality is not None]
+        )
+        self._user_watermark = latest(
+            self._user_watermark, [cg.user.updated_at for cg in caregivers if cg.user is not None]
+        )
+
+    def refresh(self, db: Session) -> CaregiverSnapshot:
+        """
+        저장소 갱신
+
+        최초 호출 시 전체 로드, 이후에는 워터마크 이후 변경된 간병인만 조회합니다.
+        """
+        from app.models.profile import Caregiver
+        from app.models.user import User
+        from app.models.care_details import CaregiverPersonality
+
+        with self._refresh_lock:
+            started = time.perf_counter()
+
+            if self._snapshot is None:
+                caregivers = self._caregiver_query(db).all()
+                self._version += 1
+                snapshot = CaregiverSnapshot.from_rows(
+                    [self._to_row(cg) for cg in caregivers], version=self._version
+                )
+                self._advance_watermarks(caregivers)
+                logger.info(
+                    f"✅ 간병인 특성 저장소 로드: {len(snapshot)}명 "
+                    f"({(time.perf_counter() - started) * 1000:.0f}ms)"
+                )
+            else:
+                # updated_at은 트랜잭션 시작 시각이라 워터마크를 넘긴 뒤 커밋되는 행이 있음
+                # → overlap 구간을 다시 조회 (바뀌지 않은 행은 _is_changed에서 걸러져 중복 무해)
+                conditions = []
+                if self._caregiver_watermark is not None:
+                    conditions.append(Caregiver.updated_at >= self._caregiver_watermark - self.watermark_overlap)
+                if self._personality_watermark is not None:
+                    conditions.append(
+                        CaregiverPersonality.updated_at >= self._personality_watermark - self.watermark_overlap
+                    )
+                if self._user_watermark is not None:
+                    conditions.append(User.updated_at >= self._user_watermark - self.watermark_overlap)
+
+                query = self._caregiver_query(db)
+                if conditions:
+                    query = query.filter(or_(*conditions))
+                caregivers = query.all()
+
+                # 삭제 확인 (ID만 조회)
+                alive_ids = {
+                    int(cg_id) for (cg_id,) in db.query(Caregiver.caregiver_id).join(User, Caregiver.user).all()
+                }
+
+                snapshot = self._apply_changes([self._to_row(cg) for cg in caregivers], alive_ids)
+                self._advance_watermarks(caregivers)
+
+            self._publish(snapshot)
+            self._last_refresh = time.monotonic()
+            return snapshot
+
+    def refresh_ids(self, db: Session, caregiver_ids: Set[int]) -> CaregiverSnapshot:
+        """
+        지정한 간병인만 다시 조회해 반영 (점수 무효화 아웃박스의 간병인 ID)
+
+        updated_at 워터마크와 무관하게 caregiver_ids를 정확히 upsert/삭제하므로, 워터마크 이후에
+        늦게 커밋된 변경도 아웃박스에 기록되어 있으면 반영됩니다. 아직 로드 전이면 전체 로드합니다.
+        """
+        from app.models.profile import Caregiver
+
+        if self._snapshot is None:
+            return self.refresh(db)
+        if not caregiver_ids:
+            return self._snapshot
+
+        caregivers = self._caregiver_query(db)\
+            .filter(Caregiver.caregiver_id.in_(sorted(caregiver_ids)))\
+            .all()
+        return self.apply_rows([self._to_row(cg) for cg in caregivers], caregiver_ids)
+
+    def apply_rows(self, rows: Sequence[Dict], caregiver_ids: Set[int]) -> CaregiverSnapshot:
+        """
+        caregiver_ids를 다시 조회한 결과(rows) 반영: rows는 upsert, rows에 없는 ID는 삭제
+
+        Returns:
+            CaregiverSnapshot: 반영 후 스냅샷 (바뀐 것이 없으면 기존 스냅샷)
+        """
+        with self._refresh_lock:
+            if self._snapshot is None:
+                raise RuntimeError("간병인 특성 저장소가 아직 로드되지 않았습니다.")
+
+            found = {row["caregiver_id"] for row in rows}
+            alive_ids = (set(self._snapshot.positions) - set(caregiver_ids)) | found
+            snapshot = self._apply_changes(rows, alive_ids)
+            self._publish(snapshot)
+            return snapshot
+
+    def _apply_changes(self, rows: Sequence[Dict], alive_ids: Set[int]) -> CaregiverSnapshot:
+        """조회한 행 중 실제로 바뀐 행과 삭제를 반영한 새 스냅샷 (갱신 lock 보유 상태에서 호출)"""
+        upserts = [row for row in rows if self._is_changed(row)]
+        removed = len(self._snapshot) - len(alive_ids & set(self._snapshot.positions))
+
+        if not (upserts or removed):
+            return self._snapshot
+
+        self._version += 1
+        snapshot = self._snapshot.with_changes(upserts, alive_ids=alive_ids, version=self._version)
+        logger.info(
+            f"🔄 간병인 특성 저장소 갱신: 변경 {len(upserts)}명, 삭제 {removed}명 "
+            f"(총 {len(snapshot)}명, v{self._version})"
+        )
+        self._notify_listeners(
+            snapshot,
+            {row["caregiver_id"] for row in upserts},
+            set(self._snapshot.positions) - alive_ids,
+        )
+        return snapshot
+
+    def _publish(self, snapshot: CaregiverSnapshot):
+        """스냅샷 교체 (자격증 역색인을 교체 전에 생성해 요청 처리 중 생성 비용이 들지 않도록)"""
+        snapshot.certification_index
+        self._snapshot = snapshot
+
+    def add_change_listener(self, listener: Callable[[CaregiverSnapshot, Set[int], Set[int]], None]):
+        """
+        증분 갱신 리스너 등록
+
+        listener(snapshot, changed_ids, removed_ids)는 새 스냅샷을 요청에 공개하기 전에
+        갱신 lock 안에서 호출됩니다 (요청은 리스너 처리가 끝난 뒤에 새 스냅샷을 봅니다).
+        """
+        if listener not in self._change_listeners:
+            self._change_listeners.append(listener)
+
+    def _notify_listeners(self, snapshot: CaregiverSnapshot, changed_ids: Set[int], removed_ids: Set[int]):
+        for listener in self._change_listeners:
+            try:
+                listener(snapshot, changed_ids, removed_ids)
+            except Exception as e:
+                logger.error(f"❌ 간병인 변경 리스너 실패: {e}")
+
+    def _is_changed(self, row: Dict) -> bool:
+        """워터마크 경계에서 다시 조회된 행이 실제로 바뀌었는지 확인"""
+        snapshot = self._snapshot
+        i = snapshot.positions.get(row["caregiver_id"])
+        if i is None:
+            return True
+        return snapshot.to_caregiver_dict(i) != row
+
+    def start_background_refresh(self, interval: Optional[float] = None):
+        """백그라운드 스레드에서 주기적으로 갱신 (최초 로드 포함)"""
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+
+        if interval is not None:
+            self.refresh_interval = interval
+
+        self._stop_event.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop, name="caregiver-store-refresh", daemon=True
+        )
+        self._refresh_thread.start()
+
+    def stop_background_refresh(self):
+        """백그라운드 갱신 중지"""
+        self._stop_event.set()
+
+    def _refresh_loop(self):
+        from app.core.database import SessionLocal
+
+        while not self._stop_event.is_set():
+            db = SessionLocal()
+            try:
+                self.refresh(db)
+            except Exception as e:
+                logger.error(f"❌ 간병인 특성 저장소 갱신 실패: {e}")
+            finally:
+                db.close()
+            self._stop_event.wait(self.refresh_interval)
+
+
+# 전역 인스턴스 (프로세스 공유)
+_caregiver_store: Optional[CaregiverFeatureStore] = None
+_caregiver_store_lock = threading.Lock()
+
+
+def get_caregiver_store() -> CaregiverFeatureStore:
+    """CaregiverFeatureStore 싱글톤 인스턴스 반환"""
+    global _caregiver_store
+
+    if _caregiver_store is None:
+        with _caregiver_store_lock:
+            if _caregiver_store is None:
+                from app.core.config import get_settings
+
+                settings = get_settings()
+                _caregiver_store = CaregiverFeatureStore(
+                    refresh_interval=settings.CAREGIVER_STORE_REFRESH_SECONDS,
+                    watermark_overlap=settings.CAREGIVER_STORE_REFRESH_OVERLAP_SECONDS,
+                )
+
+    return _caregiver_store
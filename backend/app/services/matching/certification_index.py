@@ -0,0 +1,118 @@
+# ========================================
+# 늘봄케어 매칭 모델 - 자격증 역색인
+# ========================================
+# 파일: certification_index.py
+# 설명: 자격증 → 간병인 행 번호 역색인과 돌봄 유형별 직업명(job title) 사전 계산
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 돌봄 유형 → 자격증 키워드
+CARE_TYPE_TO_CERTIFICATION = {
+    'nursing-aide': '요양보호사',      # matches 요양보호사 1급, 요양보호사 2급, etc.
+    'nursing-assistant': '간호조무사',  # matches 간호조무사
+    'nurse': '간호사'                  # matches 간호사
+}
+
+# 매칭되는 자격증이 없을 때의 직업명
+DEFAULT_JOB_TITLE = "케어기버"
+
+
+class CertificationIndex:
+    """
+    자격증 역색인 (스냅샷 1개에 대해 한 번 생성, 읽기 전용)
+
+    자격증 이름별로 그 자격증을 가진 간병인의 행 번호 배열을 보관합니다.
+    키워드 조회는 서로 다른 자격증 이름(수십 개)만 확인한 뒤
+    해당 행 번호 배열을 합치므로, 간병인 수만큼 문자열을 검사하지 않습니다.
+
+    키워드 결과(행 번호, 행별 직업명)는 키워드별로 한 번만 계산해 재사용합니다.
+    """
+
+    def __init__(self, certification_lists: Sequence[List[str]]):
+        """
+        Args:
+            certification_lists: 간병인 행별 정규화된 자격증 목록
+        """
+        self._size = len(certification_lists)
+        self._lists = certification_lists
+
+        rows_by_name: Dict[str, List[int]] = {}
+        for row, certifications in enumerate(certification_lists):
+            for cert in dict.fromkeys(certifications):
+                rows_by_name.setdefault(cert, []).append(row)
+
+        self._postings: Dict[str, np.ndarray] = {
+            cert: np.asarray(rows, dtype=np.int64) for cert, rows in rows_by_name.items()
+        }
+        self._keyword_rows: Dict[str, np.ndarray] = {}
+        self._keyword_titles: Dict[str, Dict[int, str]] = {}
+
+        for keyword in CARE_TYPE_TO_CERTIFICATION.values():
+            self.rows_for_keyword(keyword)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def names(self) -> List[str]:
+        """등록된 자격증 이름 목록"""
+        return list(self._postings)
+
+    def rows_for_keyword(self, keyword: str) -> np.ndarray:
+        """
+        키워드를 포함하는 자격증을 가진 간병인 행 번호 (대소문자 무시 부분 일치)
+
+        예: "요양보호사" → "요양보호사 1급", "요양보호사 2급" 보유자 모두
+
+        Args:
+            keyword: 자격증 키워드
+
+        Returns:
+            np.ndarray: 정렬된 행 번호 (int64)
+        """
+        key = keyword.lower()
+        rows = self._keyword_rows.get(key)
+        if rows is not None:
+            return rows
+
+        matched = [cert for cert in self._postings if key in cert.lower()]
+        if not matched:
+            rows = np.empty(0, dtype=np.int64)
+        elif len(matched) == 1:
+            rows = self._postings[matched[0]]
+        else:
+            rows = np.unique(np.concatenate([self._postings[cert] for cert in matched]))
+
+        # 행별 직업명: 자격증 목록 순서상 키워드를 포함하는 첫 자격증
+        titles = {}
+        for row in rows.tolist():
+            titles[row] = next(cert for cert in self._lists[row] if key in cert.lower())
+
+        self._keyword_titles[key] = titles
+        self._keyword_rows[key] = rows
+        return rows
+
+    def mask_for_keyword(self, keyword: str) -> np.ndarray:
+        """rows_for_keyword의 (N,) bool 마스크 버전"""
+        mask = np.zeros(self._size, dtype=bool)
+        mask[self.rows_for_keyword(keyword)] = True
+        return mask
+
+    def job_title(self, row: int, keyword: str) -> str:
+        """
+        돌봄 유형 키워드에 맞는 직업명 (사전 계산 값 조회)
+
+        예: ["요양보호사 1급", "물리치료사"] + "요양보호사" → "요양보호사 1급"
+
+        Returns:
+            str: 매칭되는 자격증, 없으면 DEFAULT_JOB_TITLE
+        """
+        key = keyword.lower()
+        if key not in self._keyword_titles:
+            self.rows_for_keyword(keyword)
+        return self._keyword_titles[key].get(row, DEFAULT_JOB_TITLE)
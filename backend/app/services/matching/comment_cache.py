@@ -0,0 +1,294 @@
+# ========================================
+# 늘봄케어 매칭 모델 - AI 코멘트 캐시
+# ========================================
+# 파일: comment_cache.py
+# 설명: 같은 프롬프트 입력의 Azure OpenAI 코멘트를 SQLite 파일에 저장 (TTL + LRU)
+
+import hashlib
+import json
+import math
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import logging
+
+from app.core.sqlite import ForkSafeSQLite
+
+logger = logging.getLogger(__name__)
+
+
+class CommentCache:
+    """
+    AI 코멘트 캐시 (SQLite 파일, TTL + LRU)
+
+    키는 AICommentGenerator._create_prompt가 사용하는 입력(요양등급, 질환, 간병인 이름/경력/
+    자격증/전문분야, 점수 구간, 등급, 전문분야/지역 일치율)을 정규화한 값의 해시입니다.
+    파일에 저장하므로 재시작 후에도 유지되고, 같은 파일을 쓰는 워커끼리 공유됩니다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 10000,
+        ttl_seconds: float = 7 * 24 * 3600,
+        score_bucket: float = 5.0
+    ):
+        """
+        Args:
+            path: SQLite 파일 경로 (":memory:"이면 프로세스 메모리)
+            max_entries: 최대 캐시 항목 수 (초과 시 가장 오래 사용하지 않은 항목 제거)
+            ttl_seconds: 항목 유효 시간 (초)
+            score_bucket: 매칭 점수 구간 크기 (같은 구간의 점수는 같은 키)
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.score_bucket = score_bucket
+
+        self._lock = threading.Lock()
+        self._db: Optional[ForkSafeSQLite] = ForkSafeSQLite(path, schema=[
+            """
+            CREATE TABLE IF NOT EXISTS ai_comments (
+                key TEXT PRIMARY KEY,
+                comment TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_ai_comments_last_access ON ai_comments (last_access)",
+        ])
+
+        self.hits = 0
+        self.misses = 0
+
+        with self._lock:
+            if self._connection() is not None:
+                logger.info(f"✅ AI 코멘트 캐시 초기화: {self.path}")
+
+    @property
+    def is_available(self) -> bool:
+        return self._db is not None
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """현재 프로세스의 연결 (lock 보유 상태에서 호출, 열 수 없으면 캐시 비활성화 후 None)"""
+        if self._db is None:
+            return None
+        try:
+            return self._db.connect()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"AI 코멘트 캐시 초기화 실패 - 캐시 없이 동작: {e}")
+            self._db = None
+            return None
+
+    def make_key(
+        self,
+        patient_info: Dict,
+        caregiver_info: Dict,
+        matching_score: float,
+        grade: str,
+        features: Dict,
+        model: str = ""
+    ) -> str:
+        """
+        캐시 키 생성 (프롬프트 입력 정규화 → sha256)
+
+        Args:
+            patient_info: 환자 정보
+            caregiver_info: 간병인 정보
+            matching_score: 매칭 점수 (score_bucket 단위로 내림)
+            grade: 매칭 등급
+            features: 특성 값들
+            model: 배포 모델 이름
+
+        Returns:
+            str: sha256 hex digest
+        """
+        payload = json.dumps(
+            {
+                "model": model,
+                "care_level": str(patient_info.get("care_level", "") or "").strip(),
+                "diseases": _normalize_list(patient_info.get("diseases_list", [])),
+                "caregiver_name": str(
+                    caregiver_info.get("name", caregiver_info.get("caregiver_name", "")) or ""
+                ).strip(),
+                "experience_years": caregiver_info.get("experience_years", 0),
+                "certifications": _normalize_list(caregiver_info.get("certifications", "")),
+                "specialties": _normalize_list(caregiver_info.get("specialties", "")),
+                "score_bucket": self.bucket_score(matching_score),
+                "grade": grade,
+                # 프롬프트와 같은 정밀도 (정수 %)
+                "specialty_match": round(float(features.get("specialty_match_ratio", 0)) * 100),
+                "region_match": round(float(features.get("region_match_score", 0)) * 100),
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def bucket_score(self, matching_score: float) -> float:
+        """매칭 점수 → 구간 하한값"""
+        if self.score_bucket <= 0:
+            return round(float(matching_score), 1)
+        return math.floor(float(matching_score) / self.score_bucket) * self.score_bucket
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        캐시 조회 (만료 시 None)
+
+        Args:
+            key: make_key로 만든 키
+
+        Returns:
+            캐시된 코멘트 또는 None
+        """
+        if self._db is None:
+            return None
+
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT comment, created_at FROM ai_comments WHERE key = ?", (key,)
+                ).fetchone()
+
+                if row is None:
+                    self.misses += 1
+                    return None
+
+                comment, created_at = row
+                if created_at + self.ttl_seconds < now:
+                    conn.execute("DELETE FROM ai_comments WHERE key = ?", (key,))
+                    conn.commit()
+                    self.misses += 1
+                    return None
+
+                conn.execute(
+                    "UPDATE ai_comments SET last_access = ? WHERE key = ?", (now, key)
+                )
+                conn.commit()
+                self.hits += 1
+                return comment
+            except sqlite3.Error as e:
+                logger.warning(f"AI 코멘트 캐시 조회 실패: {e}")
+                self.misses += 1
+                return None
+
+    def put(self, key: str, comment: str):
+        """
+        캐시 저장 (최대 항목 수 초과 시 LRU 제거)
+
+        Args:
+            key: make_key로 만든 키
+            comment: Azure OpenAI 코멘트
+        """
+        if self._db is None:
+            return
+
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO ai_comments (key, comment, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, comment, now, now)
+                )
+                self._evict(conn, now)
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"AI 코멘트 캐시 저장 실패: {e}")
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        if self._db is None:
+            return
+
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return
+            conn.execute("DELETE FROM ai_comments")
+            conn.commit()
+
+    def get_stats(self) -> Dict:
+        """캐시 통계"""
+        entries = 0
+        if self._db is not None:
+            with self._lock:
+                try:
+                    conn = self._connection()
+                    if conn is not None:
+                        entries = conn.execute("SELECT COUNT(*) FROM ai_comments").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+
+        total = self.hits + self.misses
+        return {
+            "available": self.is_available,
+            "path": self.path,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "score_bucket": self.score_bucket,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """만료 항목 및 최대 항목 수 초과분(가장 오래 사용하지 않은 항목) 삭제 (lock 보유 상태에서 호출)"""
+        conn.execute(
+            "DELETE FROM ai_comments WHERE created_at < ?", (now - self.ttl_seconds,)
+        )
+        conn.execute(
+            "DELETE FROM ai_comments WHERE key IN ("
+            "SELECT key FROM ai_comments ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+
+def _normalize_list(value: Any) -> List[str]:
+    """쉼표 구분 문자열 또는 리스트 → 공백 제거, 중복 제거, 정렬된 리스트"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        items = value.split(",")
+    else:
+        try:
+            items = list(value)
+        except TypeError:
+            items = [value]
+    return sorted({str(item).strip() for item in items if str(item).strip()})
+
+
+# 전역 인스턴스 (프로세스 공유)
+_comment_cache: Optional[CommentCache] = None
+_comment_cache_lock = threading.Lock()
+
+
+def get_comment_cache() -> CommentCache:
+    """CommentCache 싱글톤 인스턴스 반환"""
+    global _comment_cache
+
+    if _comment_cache is None:
+        with _comment_cache_lock:
+            if _comment_cache is None:
+                from app.core.config import get_settings
+
+                settings = get_settings()
+                _comment_cache = CommentCache(
+                    path=settings.AI_COMMENT_CACHE_PATH,
+                    max_entries=settings.AI_COMMENT_CACHE_MAX_ENTRIES,
+                    ttl_seconds=settings.AI_COMMENT_CACHE_TTL_SECONDS,
+                    score_bucket=settings.AI_COMMENT_CACHE_SCORE_BUCKET,
+                )
+
+    return _comment_cache
@@ -9,6 +9,8 @@ import numpy as np
 from pathlib import Path
 import logging
 
+from .region_index import get_region_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -109,6 +111,9 @@ class DataPreprocessor:
         # 전문분야 개수
         df["specialties_count"] = df["specialties_list"].apply(len)
 
+        # 지역 코드 → 지역 ID
+        df["service_region_id"] = get_region_index().register_many(df["service_region"])
+
         # 결측치 처리 (성격 점수)
         personality_cols = [
             "empathy_score", "activity_score",
@@ -166,6 +171,9 @@ class DataPreprocessor:
         }
         df["care_level_num"] = df["care_level"].map(care_level_map).fillna(3)
 
+        # 지역 코드 → 지역 ID
+        df["region_id"] = get_region_index().register_many(df["region_code"])
+
         # 결측치 처리 (성격 점수)
         personality_cols = [
             "empathy_score", "activity_score",
@@ -6,11 +6,17 @@
 
 import pandas as pd
 import numpy as np
-from typing import Tuple, List, Dict
+from typing import Tuple, List, Dict, Sequence
 import logging
 
+from .region_index import get_region_index
+from .specialty_vocab import get_specialty_vocabulary
+
 logger = logging.getLogger(__name__)
 
+# 성격 점수 순서 (특성 행렬 / 간병인 성격 배열 공통)
+PERSONALITY_TYPES = ["empathy", "activity", "patience", "independence"]
+
 
 class FeatureEngineer:
     """특성 생성 클래스"""
@@ -78,12 +84,8 @@ class FeatureEngineer:
         Returns:
             float: 일치율 (0~1)
         """
-        if not patient_diseases or not caregiver_specialties:
-            return 0.0
-
-        # 환자 질병 중 간병인이 전문으로 하는 비율
-        matched = sum(1 for d in patient_diseases if d in caregiver_specialties)
-        return matched / len(patient_diseases)
+        # 환자 질병 중 간병인이 전문으로 하는 비율 (비트마스크 popcount)
+        return get_specialty_vocabulary().match_ratio(patient_diseases, caregiver_specialties)
 
     def calculate_region_score(
         self,
@@ -100,27 +102,8 @@ class FeatureEngineer:
         Returns:
             float: 지역 점수 (0, 0.5, 0.75, 1.0)
         """
-        if pd.isna(patient_region) or pd.isna(caregiver_region):
-            return 0.5
-
-        # 완전 일치
-        if patient_region == caregiver_region:
-            return 1.0
-
-        # 같은 시/도
-        p_city = patient_region.split("_")[0]
-        c_city = caregiver_region.split("_")[0]
-
-        if p_city == c_city:
-            return 0.75
-
-        # 수도권 내 (서울-경기-인천)
-        capital_area = ["SEOUL", "GYEONGGI", "INCHEON"]
-        if p_city in capital_area and c_city in capital_area:
-            return 0.5
-
-        # 그 외 (지역 불일치)
-        return 0.0
+        # 미리 계산된 지역×지역 점수 행렬에서 조회
+        return get_region_index().score(patient_region, caregiver_region)
 
     def create_features_for_pair(
         self,
@@ -322,6 +305,55 @@ class FeatureEngineer:
 
         return features
 
+    def create_feature_matrix_from_db_data(
+        self,
+        patient_personality: Dict[str, float],
+        caregiver_personality: np.ndarray,
+        caregiver_specialties_count: Sequence[float],
+        caregiver_experience: Sequence[float]
+    ) -> np.ndarray:
+        """
+        DB 데이터에서 간병인 N명의 특성 행렬을 한 번에 생성 (컬럼 기반)
+
+        create_features_from_db_data와 같은 값을 feature_columns 순서의
+        (N, 10) 행렬로 반환합니다. 특성 dict → DataFrame 변환을 거치지 않습니다.
+
+        Args:
+            patient_personality: 환자 성격 점수 딕셔너리
+            caregiver_personality: (N, 4) 간병인 성격 점수 (PERSONALITY_TYPES 순서)
+            caregiver_specialties_count: 간병인별 전문분야 수 (길이 N)
+            caregiver_experience: 간병인별 경력 (길이 N)
+
+        Returns:
+            np.ndarray: (N, 10) float32 C-contiguous 특성 행렬
+        """
+        caregiver_personality = np.asarray(caregiver_personality, dtype=np.float64).reshape(-1, len(PERSONALITY_TYPES))
+        n = caregiver_personality.shape[0]
+
+        patient_scores = np.array(
+            [float(patient_personality.get(f"{ptype}_score", 50)) for ptype in PERSONALITY_TYPES],
+            dtype=np.float64
+        )
+
+        matrix = np.empty((n, len(self.feature_columns)), dtype=np.float32)
+
+        # 1. 성격 차이 (4개)
+        matrix[:, 0:4] = np.abs(patient_scores - caregiver_personality)
+
+        # 2. 전문분야 일치율 / 3. 지역 일치 점수 (DB에서는 간략화)
+        matrix[:, 4] = 0.5
+        matrix[:, 5] = 0.5
+
+        # 4. 간병인 정보
+        matrix[:, 6] = np.asarray(caregiver_experience, dtype=np.float64)
+        matrix[:, 7] = np.asarray(caregiver_specialties_count, dtype=np.float64)
+
+        # 5. 환자 정보 (DB에서는 기본값 사용)
+        matrix[:, 8] = 3.0
+        matrix[:, 9] = 0.0
+
+        return matrix
+
     def get_feature_names(self) -> List[str]:
         """특성 컬럼 이름 반환"""
         return self.feature_columns.copy()
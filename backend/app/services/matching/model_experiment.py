@@ -0,0 +1,322 @@
+# ========================================
+# 늘봄케어 매칭 모델 - 섀도 평가 / A/B 트래픽 분할
+# ========================================
+# 파일: model_experiment.py
+# 설명: 보조 모델 버전을 요청 경로 밖에서 섀도 평가하고, 환자별로 고정된 비율만 후보 버전으로 점수 계산
+
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import logging
+
+from .model_registry import ModelRegistry, ServedModel
+
+logger = logging.getLogger(__name__)
+
+# A/B 버킷 수 (트래픽 비율을 0.01% 단위로 지정)
+_AB_BUCKETS = 10000
+
+
+def _average_ranks(values: np.ndarray) -> np.ndarray:
+    """순위 (동점은 평균 순위)"""
+    order = np.argsort(values, kind="mergesort")
+    ranks = np.empty(len(values), dtype=np.float64)
+    ranks[order] = np.arange(len(values))
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    return (np.bincount(inverse, weights=ranks) / counts)[inverse]
+
+
+def rank_correlation(a: np.ndarray, b: np.ndarray) -> Optional[float]:
+    """스피어만 순위 상관계수 (후보 2명 미만이거나 한쪽 점수가 모두 같으면 None)"""
+    if len(a) < 2:
+        return None
+    ranks_a, ranks_b = _average_ranks(a), _average_ranks(b)
+    if ranks_a.std() == 0 or ranks_b.std() == 0:
+        return None
+    return float(np.corrcoef(ranks_a, ranks_b)[0, 1])
+
+
+def top_k_overlap(a: np.ndarray, b: np.ndarray, k: int) -> float:
+    """두 점수의 상위 k명 중 겹치는 비율 (사용자에게 노출되는 추천 목록 기준)"""
+    k = min(k, len(a))
+    if k <= 0:
+        return 1.0
+    top_a = set(np.argsort(-a, kind="stable")[:k].tolist())
+    top_b = set(np.argsort(-b, kind="stable")[:k].tolist())
+    return len(top_a & top_b) / k
+
+
+class ModelExperiment:
+    """
+    매칭 모델 섀도 평가 / A/B 트래픽 분할
+
+    - A/B: 환자 ID 해시로 버킷을 정해 ab_percent 비율의 환자만 후보 버전(ab_version)으로 점수 계산.
+      같은 환자는 항상 같은 버전으로 계산되므로 추천 결과 캐시와 재요청 결과가 흔들리지 않습니다.
+    - 섀도: 응답에 쓴 점수와 같은 특성 행렬을 섀도 버전(shadow_version)으로 다시 계산하여
+      점수 차이, 순위 상관계수, 상위 N명 일치율을 로그와 누적 통계로 남깁니다.
+      전용 스레드 1개에서 실행하고 대기 작업이 shadow_max_pending개를 넘으면 버리므로
+      요청 처리 시간과 CPU 경합이 늘지 않습니다 (섀도 모델도 스레드 1개로 예측).
+
+    후보/섀도 버전은 ModelRegistry.load로 같은 검증을 거쳐 처음 사용할 때 로드하며,
+    로드에 실패하면 해당 기능만 끄고 활성 버전으로 계속 서비스합니다.
+    """
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        shadow_version: str = "",
+        ab_version: str = "",
+        ab_percent: float = 0.0,
+        shadow_max_pending: int = 2
+    ):
+        """
+        Args:
+            registry: 모델 레지스트리 (활성 버전 = A/B의 기준 버전)
+            shadow_version: 섀도 평가 버전 (비어 있으면 섀도 평가 안 함)
+            ab_version: A/B 후보 버전 (비어 있으면 분할 안 함)
+            ab_percent: 후보 버전으로 점수를 계산할 환자 비율 (0~100)
+            shadow_max_pending: 섀도 대기 작업 최대 수 (초과분은 버림)
+        """
+        self.registry = registry
+        self.shadow_version = shadow_version
+        self.ab_version = ab_version
+        self.ab_percent = max(0.0, min(100.0, ab_percent))
+        self.shadow_max_pending = max(1, shadow_max_pending)
+
+        self._models: Dict[str, Optional[ServedModel]] = {}
+        self._models_lock = threading.Lock()
+        self._errors: Dict[str, str] = {}
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._pending = threading.BoundedSemaphore(self.shadow_max_pending)
+        self._shadow_load_scheduled = False
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "comparisons": 0,
+            "rows": 0,
+            "dropped": 0,
+            "skipped": 0,
+            "errors": 0,
+            "sum_mean_abs_delta": 0.0,
+            "max_abs_delta": 0.0,
+            "sum_rank_correlation": 0.0,
+            "rank_correlation_count": 0,
+            "sum_top_k_overlap": 0.0,
+        }
+        self._ab_requests = {"active": 0, "candidate": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.shadow_version) or (bool(self.ab_version) and self.ab_percent > 0)
+
+    # ------------------------------------------------------------------
+    # 모델 로드
+    # ------------------------------------------------------------------
+
+    def _get_model(self, version: str, single_thread: bool = False) -> Optional[ServedModel]:
+        """후보/섀도 버전 (처음 한 번 로드, 실패하면 None을 기억하여 재시도하지 않음)"""
+        if version in self._models:
+            return self._models[version]
+
+        with self._models_lock:
+            if version not in self._models:
+                try:
+                    served = self.registry.load(version)
+                    if single_thread and hasattr(served.model, "get_booster"):
+                        served.model.set_params(n_jobs=1)
+                    self._models[version] = served
+                    logger.info(f"✅ 매칭 모델 실험 버전 로드: {served.tag} (추론 백엔드: {served.backend})")
+                except Exception as e:
+                    self._models[version] = None
+                    self._errors[version] = str(e)
+                    logger.error(f"❌ 매칭 모델 실험 버전 {version} 로드 실패 - 비활성화: {e}")
+        return self._models[version]
+
+    def preload(self):
+        """후보/섀도 버전 미리 로드 (워밍업 시 호출)"""
+        if self.ab_version and self.ab_percent > 0:
+            self._get_model(self.ab_version)
+        if self.shadow_version:
+            self._get_model(self.shadow_version, single_thread=True)
+
+    # ------------------------------------------------------------------
+    # A/B 분할
+    # ------------------------------------------------------------------
+
+    def bucket(self, patient_id: int) -> int:
+        """환자 ID → 0 ~ 9999 버킷 (후보 버전 이름을 섞어 실험마다 다른 환자 집합)"""
+        digest = hashlib.sha256(f"{self.ab_version}:{patient_id}".encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big") % _AB_BUCKETS
+
+    def in_candidate_arm(self, patient_id: Optional[int]) -> bool:
+        if patient_id is None or not self.ab_version or self.ab_percent <= 0:
+            return False
+        return self.bucket(patient_id) < self.ab_percent * (_AB_BUCKETS / 100)
+
+    def assign(self, patient_id: Optional[int], record: bool = True) -> ServedModel:
+        """
+        환자에게 점수를 계산할 모델
+
+        후보 버전 비율에 해당하는 환자는 후보 버전, 나머지(또는 후보 로드 실패, 후보가 이미
+        활성 버전인 경우)는 레지스트리의 활성 버전을 반환합니다.
+
+        Args:
+            patient_id: 환자 ID (None이면 활성 버전)
+            record: 버전별 요청 수에 포함 여부 (캐시 키 조회 등은 False)
+        """
+        active = self.registry.current()
+        served = active
+        if active.version != self.ab_version and self.in_candidate_arm(patient_id):
+            served = self._get_model(self.ab_version) or active
+
+        if record:
+            with self._stats_lock:
+                self._ab_requests["candidate" if served is not active else "active"] += 1
+        return served
+
+    # ------------------------------------------------------------------
+    # 섀도 평가
+    # ------------------------------------------------------------------
+
+    def submit_shadow(
+        self,
+        X: np.ndarray,
+        scores: np.ndarray,
+        served: ServedModel,
+        feature_columns: Sequence[str],
+        patient_id: Optional[int] = None,
+        top_n: int = 5
+    ) -> bool:
+        """
+        섀도 평가 예약 (대기 중인 작업이 가득 차면 버림, 호출 측은 기다리지 않음)
+
+        Args:
+            X: 응답 점수를 계산한 특성 행렬 (호출 후 수정하지 않아야 함)
+            scores: 응답에 사용한 점수
+            served: 응답 점수를 계산한 모델
+            feature_columns: X의 컬럼 순서
+            patient_id: 로그용 환자 ID
+            top_n: 상위 N명 일치율 기준
+
+        Returns:
+            bool: 예약 여부
+        """
+        if not self.shadow_version or served.version == self.shadow_version:
+            return False
+
+        shadow = self._models.get(self.shadow_version)
+        if shadow is None:
+            # 아직 로드 전이면 섀도 스레드에서 로드만 하고 이번 요청은 건너뜀 (요청 경로에서 로드하지 않음)
+            if self.shadow_version not in self._models and not self._shadow_load_scheduled:
+                self._shadow_load_scheduled = True
+                self._get_executor().submit(self._get_model, self.shadow_version, True)
+            return False
+        if shadow.feature_columns != list(feature_columns):
+            with self._stats_lock:
+                self._stats["skipped"] += 1
+            return False
+
+        if not self._pending.acquire(blocking=False):
+            with self._stats_lock:
+                self._stats["dropped"] += 1
+            return False
+
+        try:
+            self._get_executor().submit(self._compare, shadow, X, scores, served.tag, patient_id, top_n)
+        except RuntimeError:
+            # 종료 중인 스레드 풀
+            self._pending.release()
+            return False
+        return True
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """섀도 평가용 스레드 풀 (스레드 1개, lazy initialization)"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-shadow")
+        return self._executor
+
+    def _compare(
+        self,
+        shadow: ServedModel,
+        X: np.ndarray,
+        scores: np.ndarray,
+        served_tag: str,
+        patient_id: Optional[int],
+        top_n: int
+    ):
+        """섀도 예측 → 점수 차이 / 순위 상관계수 / 상위 N명 일치율 기록"""
+        try:
+            primary = np.asarray(scores, dtype=np.float64)
+            shadow_scores = np.asarray(shadow.predict(X), dtype=np.float64)
+            delta = np.abs(shadow_scores - primary)
+            mean_abs_delta = float(delta.mean()) if len(delta) else 0.0
+            max_abs_delta = float(delta.max()) if len(delta) else 0.0
+            correlation = rank_correlation(primary, shadow_scores)
+            overlap = top_k_overlap(primary, shadow_scores, top_n)
+
+            with self._stats_lock:
+                stats = self._stats
+                stats["comparisons"] += 1
+                stats["rows"] += len(primary)
+                stats["sum_mean_abs_delta"] += mean_abs_delta
+                stats["max_abs_delta"] = max(stats["max_abs_delta"], max_abs_delta)
+                if correlation is not None:
+                    stats["sum_rank_correlation"] += correlation
+                    stats["rank_correlation_count"] += 1
+                stats["sum_top_k_overlap"] += overlap
+
+            logger.info(
+                f"[섀도 평가] 환자 {patient_id}: {served_tag} vs {shadow.tag} - "
+                f"후보 {len(primary)}명, 평균 차이 {mean_abs_delta:.2f}, 최대 차이 {max_abs_delta:.2f}, "
+                f"순위 상관 {correlation if correlation is None else round(correlation, 4)}, "
+                f"상위 {top_n}명 일치 {overlap * 100:.0f}%"
+            )
+        except Exception as e:
+            with self._stats_lock:
+                self._stats["errors"] += 1
+            logger.error(f"❌ 섀도 평가 실패: {e}")
+        finally:
+            self._pending.release()
+
+    def get_status(self) -> Dict:
+        """A/B 분할 설정/요청 수, 섀도 평가 누적 통계"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+            ab_requests = dict(self._ab_requests)
+
+        comparisons = stats["comparisons"]
+        correlations = stats["rank_correlation_count"]
+        loaded = {version: served.tag for version, served in self._models.items() if served is not None}
+
+        return {
+            "ab_test": {
+                "candidate_version": self.ab_version or None,
+                "candidate_model": loaded.get(self.ab_version),
+                "traffic_percent": self.ab_percent,
+                "requests": ab_requests,
+            },
+            "shadow": {
+                "version": self.shadow_version or None,
+                "model": loaded.get(self.shadow_version),
+                "max_pending": self.shadow_max_pending,
+                "comparisons": comparisons,
+                "rows": stats["rows"],
+                "dropped": stats["dropped"],
+                "skipped": stats["skipped"],
+                "errors": stats["errors"],
+                "mean_abs_delta": round(stats["sum_mean_abs_delta"] / comparisons, 4) if comparisons else None,
+                "max_abs_delta": round(stats["max_abs_delta"], 4) if comparisons else None,
+                "mean_rank_correlation": (
+                    round(stats["sum_rank_correlation"] / correlations, 4) if correlations else None
+                ),
+                "mean_top_k_overlap": round(stats["sum_top_k_overlap"] / comparisons, 4) if comparisons else None,
+            },
+            "load_errors": dict(self._errors),
+        }
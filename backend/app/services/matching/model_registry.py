@@ -0,0 +1,553 @@
+# ========================================
+# 늘봄케어 매칭 모델 - 모델 레지스트리 (버전 관리 / 무중단 교체)
+# ========================================
+# 파일: model_registry.py
+# 설명: models/ 디렉토리의 버전별 XGBoost 모델과 메타데이터를 로드·검증하고 활성 버전을 원자적으로 교체
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 모델 파일 이름 규칙: xgboost_<버전>.json (+ feature_columns_<버전>.json, training_results_<버전>.json)
+MODEL_PREFIX = "xgboost"
+
+# 활성 버전 포인터 파일 (관리자 API가 기록, 모든 워커가 감시하여 같은 버전으로 전환)
+ACTIVE_VERSION_FILE = "ACTIVE_VERSION"
+
+# 버전 이름 (파일 이름 일부로 사용하므로 경로 구분자 불허)
+_VERSION_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+
+
+def version_from_path(path: Path) -> str:
+    """모델 파일 경로 → 버전 이름 (xgboost_v2.json → "v2", xgboost.json → "xgboost")"""
+    stem = path.stem
+    if stem.startswith(f"{MODEL_PREFIX}_"):
+        return stem[len(MODEL_PREFIX) + 1:]
+    return stem
+
+
+class ServedModel:
+    """
+    로드·검증이 끝난 모델 한 버전 (불변)
+
+    레지스트리는 활성 ServedModel 참조만 교체하므로, 요청 처리 중에 잡아 둔 ServedModel은
+    교체 이후에도 그대로 사용할 수 있습니다 (처리 중인 요청은 이전 버전으로 끝까지 계산).
+    """
+
+    def __init__(
+        self,
+        version: str,
+        model,
+        feature_columns: List[str],
+        metadata: Dict,
+        files: Dict[str, str],
+        digest: str,
+        backend: str
+    ):
+        """
+        Args:
+            version: 버전 이름 (예: "v2")
+            model: predict(X)를 제공하는 추론 모델 (XGBRegressor / TreeEnsembleModel / OnnxModel)
+            feature_columns: 모델 입력 특성 순서
+            metadata: training_results_<버전>.json 내용 (없으면 빈 dict)
+            files: 종류별 파일 경로 (model / feature_columns / training_results)
+            digest: 모델 파일 sha256
+            backend: 추론 백엔드
+        """
+        self.version = version
+        self.model = model
+        self.feature_columns = list(feature_columns)
+        self.metadata = metadata
+        self.files = files
+        self.digest = digest
+        self.backend = backend
+        self.loaded_at = datetime.utcnow()
+        # 합성 입력 예측 확인 여부 (preload 마스터에서는 fork 이후 워커가 확인)
+        self.validated = False
+
+    @property
+    def tag(self) -> str:
+        """예측 결과에 기록하는 버전 문자열 (버전@모델 해시 앞 12자리)"""
+        return f"{self.version}@{self.digest[:12]}"
+
+    def predict(self, X) -> np.ndarray:
+        return self.model.predict(X)
+
+    def to_dict(self) -> Dict:
+        regression = self.metadata.get("regression", {})
+        best = regression.get("best_model")
+        return {
+            "version": self.version,
+            "tag": self.tag,
+            "backend": self.backend,
+            "feature_columns": self.feature_columns,
+            "files": self.files,
+            "loaded_at": self.loaded_at.isoformat(),
+            "metrics": regression.get(best, {}) if best else {},
+        }
+
+
+class ModelRegistry:
+    """
+    매칭 모델 레지스트리
+
+    models/ 디렉토리의 xgboost_<버전>.json을 버전으로 인식하고, 활성화할 때
+    feature_columns_<버전>.json / training_results_<버전>.json을 함께 읽어 특성 순서를 검증합니다.
+    새 버전은 교체 전에 로드·검증·합성 예측까지 마치고, 성공한 경우에만 활성 참조를 바꿉니다.
+
+    워커마다 레지스트리가 따로 있으므로 관리자 API로 활성화하면 ACTIVE_VERSION 파일에 기록하고,
+    감시 스레드가 이 파일과 활성 버전의 파일 변경을 확인하여 다른 워커도 같은 버전으로 전환합니다.
+    """
+
+    def __init__(
+        self,
+        model_dir: Path,
+        default_version: str = "v2",
+        expected_features: Optional[Sequence[str]] = None,
+        inference_backend: str = "xgboost",
+        onnx_threads: int = 1,
+        watch_interval: float = 0,
+        validate_predict: bool = True
+    ):
+        """
+        Args:
+            model_dir: 모델 디렉토리
+            default_version: ACTIVE_VERSION 파일이 없을 때 처음 활성화할 버전
+            expected_features: 서비스가 만드는 특성 순서 (다르면 활성화 거부)
+            inference_backend: "xgboost" | "numpy" | "onnx"
+            onnx_threads: onnx 백엔드 연산 내부 스레드 수
+            watch_interval: 파일 감시 주기 (초, 0이면 감시 안 함)
+            validate_predict: 로드할 때 합성 입력 예측 확인 (fork 전 preload에서는 False → validate()로 나중에 확인)
+        """
+        self.model_dir = Path(model_dir)
+        self.default_version = default_version
+        self.expected_features = list(expected_features) if expected_features else None
+        self.inference_backend = inference_backend
+        self.onnx_threads = onnx_threads
+        self.watch_interval = watch_interval
+        self.validate_predict = validate_predict
+
+        self._active: Optional[ServedModel] = None
+        # 로드/교체 직렬화 (요청 처리 경로는 잠그지 않음)
+        self._swap_lock = threading.Lock()
+        self._swaps = 0
+        self._last_error: Optional[str] = None
+        # 감시 중 같은 파일 상태로 실패를 반복하지 않도록 마지막으로 확인한 파일 상태 저장
+        self._checked_signature: Optional[Tuple] = None
+
+        self._watch_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        # 섀도 평가 / A/B 분할 (ModelExperiment, 설정된 경우에만)
+        self.experiment = None
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def current(self) -> ServedModel:
+        """활성 모델 (아직 없으면 ACTIVE_VERSION 또는 기본 버전을 로드)"""
+        active = self._active
+        if active is not None:
+            return active
+
+        with self._swap_lock:
+            if self._active is None:
+                self._activate_locked(self._initial_version())
+            return self._active
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._active is not None
+
+    def list_versions(self) -> List[Dict]:
+        """models/ 디렉토리의 버전 목록 (파일 존재 여부만 확인, 로드하지 않음)"""
+        active = self._active
+        versions = []
+        for path in sorted(self.model_dir.glob(f"{MODEL_PREFIX}*.json")):
+            version = version_from_path(path)
+            files = self._files(version)
+            if files["model"] != path:
+                continue
+            versions.append({
+                "version": version,
+                "active": active is not None and active.version == version,
+                "model_file": path.name,
+                "has_feature_columns": files["feature_columns"].exists(),
+                "has_training_results": files["training_results"].exists(),
+                "size_kb": round(path.stat().st_size / 1024, 1),
+            })
+        return versions
+
+    def get_status(self) -> Dict:
+        """레지스트리 상태 (활성 버전, 버전 목록, 교체 횟수)"""
+        active = self._active
+        return {
+            "model_dir": str(self.model_dir),
+            "active": active.to_dict() if active is not None else None,
+            "versions": self.list_versions(),
+            "swaps": self._swaps,
+            "watch_interval": self.watch_interval,
+            "watching": self._watch_thread is not None and self._watch_thread.is_alive(),
+            "last_error": self._last_error,
+            "experiment": self.experiment.get_status() if self.experiment is not None else None,
+        }
+
+    # ------------------------------------------------------------------
+    # 로드 / 검증 / 교체
+    # ------------------------------------------------------------------
+
+    def _files(self, version: str) -> Dict[str, Path]:
+        """버전 → 모델/메타데이터 파일 경로"""
+        if not _VERSION_PATTERN.match(version):
+            raise ValueError(f"잘못된 모델 버전 이름입니다: {version!r}")
+        suffix = "" if version == MODEL_PREFIX else f"_{version}"
+        return {
+            "model": self.model_dir / f"{MODEL_PREFIX}{suffix}.json",
+            "feature_columns": self.model_dir / f"feature_columns{suffix}.json",
+            "training_results": self.model_dir / f"training_results{suffix}.json",
+        }
+
+    def _signature(self, version: str) -> Tuple:
+        """버전 파일들의 (경로, 수정 시각, 크기) - 감시 시 변경 확인용"""
+        signature = []
+        for path in self._files(version).values():
+            try:
+                stat = path.stat()
+                signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((str(path), None, None))
+        return tuple(signature)
+
+    def _initial_version(self) -> str:
+        """처음 활성화할 버전: ACTIVE_VERSION 파일 → 기본 버전"""
+        pointer = self._read_pointer()
+        if pointer and pointer != self.default_version:
+            if self._files(pointer)["model"].exists():
+                return pointer
+            logger.warning(f"⚠️ {ACTIVE_VERSION_FILE}의 버전 {pointer}을 찾을 수 없습니다 - {self.default_version} 사용")
+        return self.default_version
+
+    def load(self, version: str) -> ServedModel:
+        """
+        버전 로드 및 검증 (활성 모델은 바꾸지 않음)
+
+        검증 항목:
+            - 모델 파일 존재, 특성 컬럼 메타데이터(파일 또는 모델에 저장된 이름) 존재
+            - 모델에 저장된 특성 이름/개수와 메타데이터 순서 일치
+            - 서비스가 만드는 특성 순서(expected_features)와 일치
+            - 합성 입력 예측값이 유한한 값 (validate_predict=True일 때, 아니면 validate()로 나중에 확인)
+
+        Raises:
+            FileNotFoundError: 모델 파일 없음
+            ValueError: 검증 실패
+        """
+        files = self._files(version)
+        model_path = files["model"]
+        if not model_path.exists():
+            raise FileNotFoundError(f"모델 버전 {version}을 찾을 수 없습니다: {model_path}")
+
+        raw = model_path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        model_dict = json.loads(raw)
+        learner = model_dict["learner"]
+        num_feature = int(learner["learner_model_param"]["num_feature"])
+        embedded_features = learner.get("feature_names") or []
+
+        if files["feature_columns"].exists():
+            with open(files["feature_columns"], "r", encoding="utf-8") as f:
+                feature_columns = json.load(f)
+        elif embedded_features:
+            feature_columns = list(embedded_features)
+        else:
+            raise ValueError(
+                f"모델 버전 {version}의 특성 컬럼 메타데이터가 없습니다 ({files['feature_columns'].name})"
+            )
+
+        if embedded_features and list(embedded_features) != list(feature_columns):
+            raise ValueError(
+                f"모델 버전 {version}: 모델에 저장된 특성 순서가 {files['feature_columns'].name}와 다릅니다"
+            )
+        if num_feature != len(feature_columns):
+            raise ValueError(
+                f"모델 버전 {version}: 모델 특성 수 {num_feature}개, 메타데이터 {len(feature_columns)}개"
+            )
+        if self.expected_features is not None and list(feature_columns) != self.expected_features:
+            mismatched = [
+                f"{i}: {actual} != {expected}"
+                for i, (actual, expected) in enumerate(zip(feature_columns, self.expected_features))
+                if actual != expected
+            ]
+            raise ValueError(
+                f"모델 버전 {version}의 특성 순서가 서비스와 다릅니다 "
+                f"(모델 {len(feature_columns)}개, 서비스 {len(self.expected_features)}개; {', '.join(mismatched[:3])})"
+            )
+
+        metadata = {}
+        if files["training_results"].exists():
+            with open(files["training_results"], "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+
+        model, backend = self._build_model(model_dict, raw, num_feature)
+
+        served = ServedModel(
+            version=version,
+            model=model,
+            feature_columns=feature_columns,
+            metadata=metadata,
+            files={kind: str(path) for kind, path in files.items() if path.exists()},
+            digest=digest,
+            backend=backend,
+        )
+        if self.validate_predict:
+            self.validate(served)
+        return served
+
+    @staticmethod
+    def validate(served: ServedModel) -> ServedModel:
+        """
+        합성 입력으로 예측 확인 (교체 전에 추론 경로 초기화, 이미 확인한 모델은 생략)
+
+        XGBoost 예측은 OpenMP 스레드 풀을 만들므로 fork 전(gunicorn preload 마스터)에는 호출하지 않습니다.
+
+        Raises:
+            ValueError: 예측값이 유한하지 않음
+        """
+        if served.validated:
+            return served
+
+        sample = np.zeros((1, len(served.feature_columns)), dtype=np.float32)
+        if not np.all(np.isfinite(np.asarray(served.model.predict(sample), dtype=np.float64))):
+            raise ValueError(f"모델 버전 {served.version}의 예측값이 유한하지 않습니다")
+        served.validated = True
+        return served
+
+    def _build_model(self, model_dict: Dict, raw: bytes, num_feature: int):
+        """JSON 모델 → 추론 모델 (XGBOOST_INFERENCE_BACKEND 적용, 변환 실패 시 xgboost)"""
+        from .tree_ensemble import TreeEnsembleModel
+
+        if self.inference_backend == "numpy":
+            try:
+                return TreeEnsembleModel.from_dict(model_dict), "numpy"
+            except ValueError as e:
+                logger.warning(f"⚠️ numpy 백엔드 변환 실패 - xgboost 사용: {e}")
+
+        from xgboost import XGBRegressor
+
+        model = XGBRegressor()
+        model.load_model(bytearray(raw))
+
+        if self.inference_backend == "onnx":
+            from .onnx_inference import load_onnx_model
+
+            try:
+                return load_onnx_model(
+                    model, n_features=num_feature, intra_op_num_threads=self.onnx_threads
+                ), "onnx"
+            except Exception as e:
+                logger.warning(f"⚠️ onnx 백엔드 변환 실패 - xgboost 사용: {e}")
+
+        return model, "xgboost"
+
+    def activate(self, version: str, persist: bool = False) -> ServedModel:
+        """
+        버전 로드·검증 후 활성 모델로 교체
+
+        Args:
+            version: 버전 이름
+            persist: True이면 ACTIVE_VERSION 파일에 기록 (다른 워커/재시작 후에도 같은 버전)
+
+        Returns:
+            ServedModel: 새 활성 모델
+
+        Raises:
+            FileNotFoundError / ValueError: 로드·검증 실패 (활성 모델은 그대로)
+        """
+        with self._swap_lock:
+            served = self._activate_locked(version)
+            if persist:
+                self._write_pointer(version)
+            return served
+
+    def reload(self) -> ServedModel:
+        """활성 버전을 디스크에서 다시 로드 (같은 이름으로 모델 파일을 교체한 경우)"""
+        with self._swap_lock:
+            version = self._active.version if self._active is not None else self._initial_version()
+            return self._activate_locked(version)
+
+    def _activate_locked(self, version: str) -> ServedModel:
+        """로드 → 참조 교체 (swap_lock 보유 상태에서 호출)"""
+        start = time.perf_counter()
+        signature = self._signature(version)
+        try:
+            served = self.load(version)
+        except Exception as e:
+            self._last_error = f"{version}: {e}"
+            self._checked_signature = signature
+            logger.error(f"❌ 매칭 모델 버전 {version} 활성화 실패 - 기존 버전 유지: {e}")
+            raise
+
+        previous = self._active
+        self._active = served
+        self._swaps += 1
+        self._last_error = None
+        self._checked_signature = signature
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if previous is None:
+            logger.info(f"✅ 매칭 모델 활성화: {served.tag} (추론 백엔드: {served.backend}, {elapsed_ms:.0f}ms)")
+        else:
+            logger.info(f"🔄 매칭 모델 교체: {previous.tag} → {served.tag} ({elapsed_ms:.0f}ms)")
+        return served
+
+    # ------------------------------------------------------------------
+    # ACTIVE_VERSION 파일 / 감시
+    # ------------------------------------------------------------------
+
+    def _read_pointer(self) -> Optional[str]:
+        try:
+            version = (self.model_dir / ACTIVE_VERSION_FILE).read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+        return version if _VERSION_PATTERN.match(version) else None
+
+    def _write_pointer(self, version: str):
+        """ACTIVE_VERSION 파일 기록 (임시 파일 → rename으로 원자적 교체)"""
+        pointer = self.model_dir / ACTIVE_VERSION_FILE
+        tmp = pointer.with_name(f".{ACTIVE_VERSION_FILE}.{os.getpid()}.tmp")
+        tmp.write_text(version + "\n", encoding="utf-8")
+        os.replace(tmp, pointer)
+
+    def check_for_changes(self) -> bool:
+        """
+        ACTIVE_VERSION 변경 또는 활성 버전 파일 변경 확인 후 교체
+
+        Returns:
+            bool: 교체 여부
+        """
+        active = self._active
+        if active is None:
+            return False
+
+        target = self._read_pointer() or active.version
+        signature = self._signature(target)
+        if target == active.version and signature == self._checked_signature:
+            return False
+
+        with self._swap_lock:
+            # 대기 중 다른 스레드가 먼저 교체했으면 무시
+            if signature == self._checked_signature:
+                return False
+            try:
+                self._activate_locked(target)
+            except Exception:
+                return False
+        return True
+
+    def start_watch(self, interval: Optional[float] = None):
+        """백그라운드 스레드에서 주기적으로 check_for_changes (interval이 0이면 시작하지 않음)"""
+        if interval is not None:
+            self.watch_interval = interval
+        if self.watch_interval <= 0:
+            return
+        if self._watch_thread is not None and self._watch_thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._watch_thread = threading.Thread(
+            target=self._watch_loop, name="model-registry-watch", daemon=True
+        )
+        self._watch_thread.start()
+
+    def stop_watch(self):
+        """감시 중지"""
+        self._stop_event.set()
+
+    def _watch_loop(self):
+        while not self._stop_event.wait(self.watch_interval):
+            try:
+                self.check_for_changes()
+            except Exception as e:
+                logger.error(f"❌ 매칭 모델 파일 감시 실패: {e}")
+
+
+# 전역 인스턴스 (프로세스 공유)
+_model_registry: Optional[ModelRegistry] = None
+_model_registry_lock = threading.Lock()
+
+
+def _registry_settings():
+    """
+    레지스트리 설정
+
+    DATABASE_URL 등 앱 필수 설정이 없는 단독 실행(예: XGBoostMatchingService만 쓰는 스크립트)에서는
+    Settings를 만들 수 없으므로 Settings 필드 기본값을 사용합니다.
+    """
+    from types import SimpleNamespace
+    from app.core.config import Settings, get_settings
+
+    try:
+        return get_settings()
+    except Exception as e:
+        logger.warning(f"⚠️ 앱 설정을 읽을 수 없어 모델 레지스트리 기본 설정 사용: {str(e).splitlines()[0]}")
+        return SimpleNamespace(**{
+            name: field.default for name, field in Settings.model_fields.items() if not field.is_required()
+        })
+
+
+def get_model_registry() -> ModelRegistry:
+    """ModelRegistry 싱글톤 인스턴스 반환"""
+    global _model_registry
+
+    if _model_registry is None:
+        with _model_registry_lock:
+            if _model_registry is None:
+                from .feature_engineering import FeatureEngineer
+                from .model_experiment import ModelExperiment
+
+                settings = _registry_settings()
+                model_dir = (
+                    Path(settings.MATCHING_MODEL_DIR)
+                    if settings.MATCHING_MODEL_DIR
+                    else Path(__file__).parent.parent.parent.parent / "models"
+                )
+                default_version = settings.MATCHING_MODEL_VERSION
+
+                # XGBOOST_MODEL_PATH(JSON 모델)가 있으면 그 파일의 디렉토리/버전 사용
+                model_path = Path(settings.XGBOOST_MODEL_PATH) if settings.XGBOOST_MODEL_PATH else None
+                if model_path is not None and model_path.suffix == ".json" and model_path.exists():
+                    model_dir, default_version = model_path.parent, version_from_path(model_path)
+
+                registry = ModelRegistry(
+                    model_dir=model_dir,
+                    default_version=default_version,
+                    expected_features=FeatureEngineer().feature_columns,
+                    inference_backend=settings.XGBOOST_INFERENCE_BACKEND,
+                    onnx_threads=settings.ONNX_INTRA_OP_NUM_THREADS,
+                    watch_interval=settings.MATCHING_MODEL_WATCH_SECONDS,
+                )
+
+                experiment = ModelExperiment(
+                    registry,
+                    shadow_version=settings.MATCHING_SHADOW_MODEL_VERSION,
+                    ab_version=settings.MATCHING_AB_MODEL_VERSION,
+                    ab_percent=settings.MATCHING_AB_TRAFFIC_PERCENT,
+                    shadow_max_pending=settings.MATCHING_SHADOW_MAX_PENDING,
+                )
+                if experiment.enabled:
+                    registry.experiment = experiment
+
+                _model_registry = registry
+
+    return _model_registry
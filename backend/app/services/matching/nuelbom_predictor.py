@@ -6,7 +6,7 @@
 
 import os
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, Iterator, List, Dict, Optional, Sequence, Tuple
 import logging
 import json
 
@@ -15,8 +15,16 @@ import numpy as np
 import joblib
 
 from .data_preprocessing import DataPreprocessor
-from .feature_engineering import FeatureEngineer
+from .feature_engineering import FeatureEngineer, PERSONALITY_TYPES
 from .ai_comment import AICommentGenerator
+from .caregiver_store import CaregiverSnapshot
+from .comment_cache import get_comment_cache
+from .model_registry import ModelRegistry, ServedModel, get_model_registry
+from .onnx_inference import load_onnx_model
+from .region_index import get_region_index
+from .retrieval import StageTimer, select_top_k
+from .specialty_vocab import get_specialty_vocabulary
+from .tree_ensemble import TreeEnsembleModel
 
 logger = logging.getLogger(__name__)
 
@@ -59,23 +67,64 @@ class NuelbomMatchingPredictor:
         logger.info(f"모델 경로: {self.model_dir}")
         logger.info(f"데이터 경로: {self.data_dir}")
 
-        # 모델 로드
+        # 모델 로드 (pkl 회귀 모델이 없으면 모델 레지스트리의 활성 버전 사용)
+        self.model_registry: Optional[ModelRegistry] = None
         self.regressor = None
         self.classifier = None
         self.feature_columns = None
+        self.model_version = None
 
         # 데이터 로드
         self.preprocessor = None
         self.engineer = None
         self.caregivers = None
         self.patients = None
+        self.caregiver_specialty_masks = None
 
         # Azure OpenAI 코멘트 생성기
         self.ai_comment_generator = None
         self.use_azure_openai = use_azure_openai
+        self.ai_comment_deadline_seconds: Optional[float] = None
 
         NuelbomMatchingPredictor._initialized = True
 
+    def current_model(self, patient_id: Optional[int] = None) -> Tuple[object, Optional[str]]:
+        """
+        (회귀 모델, 모델 버전) - 요청 하나에서 한 번만 조회하여 함께 사용
+
+        레지스트리 모드에서는 활성 버전이 교체되어도 이미 조회한 쌍으로 계산을 마치므로,
+        점수와 기록되는 버전이 항상 일치합니다. patient_id를 주면 A/B 분할을 적용합니다.
+        """
+        served = self._served_model(patient_id, record=False)
+        if served is not None:
+            return served.model, served.tag
+        return self._regressor, self._model_version
+
+    def _served_model(self, patient_id: Optional[int] = None, record: bool = True) -> Optional[ServedModel]:
+        """레지스트리 모드의 점수 계산 모델 (A/B 실험이 있으면 환자별 분할, pkl 모드면 None)"""
+        if self.model_registry is None:
+            return None
+        experiment = self.model_registry.experiment
+        if experiment is not None and patient_id is not None:
+            return experiment.assign(patient_id, record=record)
+        return self.model_registry.current()
+
+    @property
+    def regressor(self):
+        return self.current_model()[0]
+
+    @regressor.setter
+    def regressor(self, model):
+        self._regressor = model
+
+    @property
+    def model_version(self) -> Optional[str]:
+        return self.current_model()[1]
+
+    @model_version.setter
+    def model_version(self, version: Optional[str]):
+        self._model_version = version
+
     def load_models(self, model_type: str = "xgboost"):
         """
         학습된 모델 로드
@@ -83,15 +132,31 @@ class NuelbomMatchingPredictor:
         Args:
             model_type: "xgboost" 또는 "randomforest"
         """
+        from app.core.config import get_settings
+
+        settings = get_settings()
         logger.info(f"📦 모델 로드 중... ({model_type})")
 
-        # 회귀 모델 로드
+        # 회귀 모델 로드 (pkl이 없으면 모델 레지스트리 사용)
         reg_path = self.model_dir / f"{model_type}_regressor.pkl"
-        if reg_path.exists():
+        if not reg_path.exists():
+            registry = get_model_registry()
+            served = registry.current()
+            self.model_registry = registry
+            self.feature_columns = served.feature_columns
+            logger.info(f"   ✅ 회귀 모델: 모델 레지스트리 {served.tag} ({registry.model_dir})")
+        else:
             self.regressor = joblib.load(reg_path)
+            self.model_version = f"{reg_path.name}@{reg_path.stat().st_mtime_ns}"
             logger.info(f"   ✅ 회귀 모델 로드: {reg_path}")
-        else:
-            raise FileNotFoundError(f"회귀 모델을 찾을 수 없습니다: {reg_path}")
+
+            # numpy 추론 백엔드: XGBoost 부스터를 평탄한 배열로 변환 (같은 예측값, 작은 배치 호출 비용 감소)
+            if settings.XGBOOST_INFERENCE_BACKEND == "numpy" and hasattr(self.regressor, "get_booster"):
+                try:
+                    self.regressor = TreeEnsembleModel.from_xgboost(self.regressor)
+                    logger.info("   ✅ 회귀 모델 추론 백엔드: numpy")
+                except ValueError as e:
+                    logger.warning(f"   ⚠️ numpy 백엔드 변환 실패 - xgboost 사용: {e}")
 
         # 분류 모델 로드
         clf_path = self.model_dir / f"{model_type}_classifier.pkl"
@@ -101,14 +166,26 @@ class NuelbomMatchingPredictor:
 
         # 특성 컬럼 로드
         feature_path = self.model_dir / "feature_columns.json"
-        if feature_path.exists():
+        if self.model_registry is None and feature_path.exists():
             with open(feature_path, "r", encoding="utf-8") as f:
                 self.feature_columns = json.load(f)
             logger.info(f"   ✅ 특성 컬럼 로드: {len(self.feature_columns)}개")
 
+        # onnx 추론 백엔드: 회귀/분류 모델을 onnxruntime 세션으로 교체 (원본과 parity 확인 후)
+        if settings.XGBOOST_INFERENCE_BACKEND == "onnx":
+            if self.model_registry is None:
+                self.regressor = self._to_onnx(self.regressor, reg_path, settings.ONNX_INTRA_OP_NUM_THREADS)
+            if self.classifier is not None:
+                self.classifier = self._to_onnx(self.classifier, clf_path, settings.ONNX_INTRA_OP_NUM_THREADS)
+
         # Azure OpenAI 코멘트 생성기 초기화
         if self.use_azure_openai:
-            self.ai_comment_generator = AICommentGenerator()
+            self.ai_comment_deadline_seconds = settings.AI_COMMENT_DEADLINE_SECONDS
+            self.ai_comment_generator = AICommentGenerator(
+                timeout=settings.AI_COMMENT_DEADLINE_SECONDS,
+                max_concurrency=settings.AI_COMMENT_MAX_CONCURRENCY,
+                comment_cache=get_comment_cache()
+            )
             if self.ai_comment_generator.is_available:
                 logger.info("   ✅ Azure OpenAI 연결 성공")
             else:
@@ -118,6 +195,34 @@ class NuelbomMatchingPredictor:
 
         logger.info("✅ 모델 로드 완료!")
 
+    def _to_onnx(self, model, pkl_path: Path, intra_op_num_threads: int):
+        """
+        모델 → OnnxModel (실패하거나 parity가 맞지 않으면 원본 모델 그대로 반환)
+
+        pkl 옆에 export_matching_models로 만든 .onnx 파일이 있고 pkl보다 새로우면 그 파일을,
+        없으면 메모리에서 변환한 모델을 사용합니다.
+        """
+        onnx_path = pkl_path.with_suffix(".onnx")
+        if not onnx_path.exists() or onnx_path.stat().st_mtime_ns < pkl_path.stat().st_mtime_ns:
+            onnx_path = None
+
+        try:
+            onnx_model = load_onnx_model(
+                model,
+                onnx_path=onnx_path,
+                n_features=len(self.feature_columns) if self.feature_columns else None,
+                intra_op_num_threads=intra_op_num_threads,
+            )
+        except Exception as e:
+            logger.warning(f"   ⚠️ onnx 백엔드 변환 실패 - 원본 모델 사용 ({pkl_path.name}): {e}")
+            return model
+
+        logger.info(
+            f"   ✅ {pkl_path.name} 추론 백엔드: onnx "
+            f"({onnx_path.name if onnx_path else '메모리 변환'}, 스레드 {intra_op_num_threads})"
+        )
+        return onnx_model
+
     def load_data(self):
         """데이터 로드 및 전처리"""
         logger.info("📂 데이터 로드 중...")
@@ -128,6 +233,11 @@ class NuelbomMatchingPredictor:
         self.caregivers = self.preprocessor.preprocess_caregivers()
         self.patients = self.preprocessor.preprocess_patients()
 
+        # 간병인 전문분야 비트마스크 (self.caregivers 행 순서)
+        self.caregiver_specialty_masks = get_specialty_vocabulary().encode_many(
+            self.caregivers["specialties_list"].tolist()
+        )
+
         self.engineer = FeatureEngineer()
 
         logger.info("✅ 데이터 로드 완료!")
@@ -169,40 +279,23 @@ class NuelbomMatchingPredictor:
         patient_region = patient_row.get("region_code", "")
         patient_diseases = patient_row.get("diseases_list", [])
 
-        candidates = self.caregivers.copy()
+        candidate_mask = np.ones(len(self.caregivers), dtype=bool)
 
-        # 지역 필터
+        # 지역 필터 (지역 ID 기반 점수 행렬 조회)
         if region_filter and patient_region:
-            patient_city = patient_region.split("_")[0]
-            capital_area = ["SEOUL", "GYEONGGI", "INCHEON"]
-
-            def is_region_match(cg_region):
-                if pd.isna(cg_region):
-                    return False
-                cg_city = cg_region.split("_")[0]
-                # 같은 시/도 또는 수도권 내
-                if cg_city == patient_city:
-                    return True
-                if patient_city in capital_area and cg_city in capital_area:
-                    return True
-                return False
-
-            candidates = candidates[
-                candidates["service_region"].apply(is_region_match)
-            ]
-
-        # 전문분야 필터
-        if specialty_filter and patient_diseases:
-            def has_specialty_match(specialties_list):
-                if not isinstance(specialties_list, list):
-                    return False
-                return any(d in specialties_list for d in patient_diseases)
+            region_index = get_region_index()
+            candidate_mask &= region_index.match_mask(
+                patient_region,
+                self.caregivers["service_region_id"].to_numpy()
+            )
 
-            candidates = candidates[
-                candidates["specialties_list"].apply(has_specialty_match)
-            ]
+        # 전문분야 필터 (비트마스크 AND로 하나 이상 일치하는 간병인)
+        if specialty_filter and patient_diseases:
+            candidate_mask &= get_specialty_vocabulary().any_match(
+                patient_diseases, self.caregiver_specialty_masks
+            )
 
-        return candidates["caregiver_id"].tolist()
+        return self.caregivers["caregiver_id"].to_numpy()[candidate_mask].tolist()
 
     def get_grade(self, score: float) -> str:
         """점수 → 등급 변환"""
@@ -260,6 +353,62 @@ class NuelbomMatchingPredictor:
             "source": "rule_based"
         }
 
+    def generate_ai_comments(
+        self,
+        comment_requests: List[Dict],
+        verbose: bool = False
+    ) -> List[Dict]:
+        """
+        여러 매칭 결과의 AI 코멘트를 동시에 생성
+        (AI_COMMENT_MAX_CONCURRENCY개씩 동시 호출, AI_COMMENT_DEADLINE_SECONDS 초과 시 규칙 기반 코멘트)
+
+        Args:
+            comment_requests: generate_ai_comment 인자 dict 리스트
+                (grade, features, caregiver_info, patient_info, matching_score)
+            verbose: 디버깅 출력 여부
+
+        Returns:
+            List[Dict]: comment_requests 순서의 {"comment": str, "source": str}
+        """
+        if (self.ai_comment_generator is not None and
+            self.ai_comment_generator.is_available and
+            all(req.get("patient_info") is not None for req in comment_requests)):
+            return self.ai_comment_generator.generate_comments(
+                comment_requests,
+                deadline_seconds=self.ai_comment_deadline_seconds,
+                verbose=verbose
+            )
+
+        # 규칙 기반 코멘트 (fallback)
+        return [self.generate_ai_comment(verbose=verbose, **req) for req in comment_requests]
+
+    def iter_ai_comments(
+        self,
+        comment_requests: List[Dict],
+        verbose: bool = False
+    ) -> Iterator[Tuple[int, Dict]]:
+        """
+        여러 매칭 결과의 AI 코멘트를 동시에 생성하고 완료되는 순서대로 반환
+        (Azure OpenAI 미사용 시 아무것도 반환하지 않음 - 규칙 기반 코멘트를 그대로 사용)
+
+        Args:
+            comment_requests: generate_ai_comment 인자 dict 리스트 ("_comment_request" 값)
+            verbose: 디버깅 출력 여부
+
+        Yields:
+            (index, result): comment_requests 내 순번과 {"comment": str, "source": str}
+        """
+        if (self.ai_comment_generator is None or
+            not self.ai_comment_generator.is_available or
+            any(req.get("patient_info") is None for req in comment_requests)):
+            return
+
+        yield from self.ai_comment_generator.iter_comments(
+            comment_requests,
+            deadline_seconds=self.ai_comment_deadline_seconds,
+            verbose=verbose
+        )
+
     def _generate_rule_based_comment(
         self,
         grade: str,
@@ -368,7 +517,8 @@ class NuelbomMatchingPredictor:
         X_features = X[self.feature_columns]
 
         # 3. 점수 예측
-        predicted_scores = self.regressor.predict(X_features)
+        regressor, model_version = self.current_model()
+        predicted_scores = regressor.predict(X_features)
 
         # 4. 성공 확률 예측 (분류 모델이 있는 경우)
         success_probs = None
@@ -402,6 +552,7 @@ class NuelbomMatchingPredictor:
                 "hourly_rate": cg_info.get("hourly_rate", 0),
                 "specialty_match_ratio": round(features.get("specialty_match_ratio", 0) * 100, 1),
                 "region_match_score": features.get("region_match_score", 0),
+                "model_version": model_version,
                 "_features": features,
                 "_cg_info": cg_info,
             }
@@ -418,19 +569,19 @@ class NuelbomMatchingPredictor:
         # 7. 상위 N명에만 AI 코멘트 생성
         logger.info(f"   - 상위 {len(top_results)}명에 대해 AI 코멘트 생성 중...")
 
-        for i, result in enumerate(top_results):
-            features = result.pop("_features")
-            cg_info = result.pop("_cg_info")
-
-            comment_result = self.generate_ai_comment(
-                grade=result["grade"],
-                features=features,
-                caregiver_info=cg_info,
-                patient_info=patient_info,
-                matching_score=result["predicted_score"],
-                verbose=verbose
-            )
+        comment_requests = [
+            {
+                "grade": result["grade"],
+                "features": result.pop("_features"),
+                "caregiver_info": result.pop("_cg_info"),
+                "patient_info": patient_info,
+                "matching_score": result["predicted_score"],
+            }
+            for result in top_results
+        ]
+        comment_results = self.generate_ai_comments(comment_requests, verbose=verbose)
 
+        for result, comment_result in zip(top_results, comment_results):
             result["ai_comment"] = comment_result.get("comment", "")
             result["comment_source"] = comment_result.get("source", "unknown")
 
@@ -447,7 +598,9 @@ class NuelbomMatchingPredictor:
         patient_personality: Dict[str, float],
         caregivers_with_personality: List[Dict],
         top_n: int = 5,
-        verbose: bool = False
+        verbose: bool = False,
+        timer: Optional[StageTimer] = None,
+        ai_comments: bool = True
     ) -> List[Dict]:
         """
         DB에서 가져온 성격 데이터를 사용하여 간병인 추천
@@ -459,6 +612,8 @@ class NuelbomMatchingPredictor:
             caregivers_with_personality: 간병인 정보 + 성격 점수 리스트
             top_n: 추천할 간병인 수
             verbose: 디버깅 출력 여부
+            timer: 단계별 소요 시간 기록 (선택)
+            ai_comments: False이면 규칙 기반 코멘트만 사용 (recommend_caregivers_from_store 참고)
 
         Returns:
             List[Dict]: 추천 간병인 목록
@@ -473,81 +628,297 @@ class NuelbomMatchingPredictor:
             logger.warning("   ⚠️ 후보 간병인이 없습니다.")
             return []
 
-        # Feature Engineering (DB 데이터 기반)
-        engineer = FeatureEngineer()
-        features_list = []
-        caregiver_ids = []
+        caregiver_personality = np.array(
+            [
+                [float(cg_data.get(f"{ptype}_score", 50)) for ptype in PERSONALITY_TYPES]
+                for cg_data in caregivers_with_personality
+            ],
+            dtype=np.float64
+        )
 
-        for cg_data in caregivers_with_personality:
-            features = engineer.create_features_from_db_data(
+        return self._recommend_from_columns(
+            patient_id=patient_id,
+            patient_personality=patient_personality,
+            caregiver_personality=caregiver_personality,
+            caregiver_specialties_count=[
+                len(cg_data.get("specialties", [])) for cg_data in caregivers_with_personality
+            ],
+            caregiver_experience=[cg_data.get("experience_years", 0) for cg_data in caregivers_with_personality],
+            get_caregiver=lambda i: caregivers_with_personality[i],
+            top_n=top_n,
+            verbose=verbose,
+            timer=timer,
+            ai_comments=ai_comments
+        )
+
+    def recommend_caregivers_from_store(
+        self,
+        patient_id: int,
+        patient_personality: Dict[str, float],
+        snapshot: CaregiverSnapshot,
+        candidate_indices: Sequence[int],
+        top_n: int = 5,
+        verbose: bool = False,
+        timer: Optional[StageTimer] = None,
+        ai_comments: bool = True
+    ) -> List[Dict]:
+        """
+        간병인 특성 저장소(CaregiverSnapshot)의 컬럼 배열로 간병인 추천
+        (점수 계산 전에 DB를 조회하지 않음)
+
+        Args:
+            patient_id: 환자 ID
+            patient_personality: 환자 성격 점수 딕셔너리
+            snapshot: 간병인 특성 스냅샷
+            candidate_indices: 후보 간병인의 스냅샷 행 번호 (필터를 통과한 전체 후보)
+            top_n: 추천할 간병인 수
+            verbose: 디버깅 출력 여부
+            timer: 단계별 소요 시간 기록 (선택)
+            ai_comments: False이면 규칙 기반 코멘트만 붙이고 AI 코멘트 요청을
+                "_comment_request" 키에 남김 (iter_ai_comments로 나중에 생성)
+
+        Returns:
+            List[Dict]: 추천 간병인 목록 (recommend_caregivers_with_db_personality와 동일한 형태)
+        """
+        if self.regressor is None:
+            raise ValueError("모델이 로드되지 않았습니다. initialize()를 먼저 호출하세요.")
+
+        candidate_indices = np.asarray(candidate_indices, dtype=np.int64)
+
+        logger.info(f"🔍 환자 ID {patient_id}에 대한 저장소 기반 간병인 추천...")
+        logger.info(f"   - 후보 간병인: {len(candidate_indices)}명")
+
+        if len(candidate_indices) == 0:
+            logger.warning("   ⚠️ 후보 간병인이 없습니다.")
+            return []
+
+        return self._recommend_from_columns(
+            patient_id=patient_id,
+            patient_personality=patient_personality,
+            caregiver_personality=snapshot.personality[candidate_indices],
+            caregiver_specialties_count=snapshot.specialty_counts[candidate_indices],
+            caregiver_experience=snapshot.experience_years[candidate_indices],
+            get_caregiver=lambda i: snapshot.to_caregiver_dict(int(candidate_indices[i])),
+            top_n=top_n,
+            verbose=verbose,
+            timer=timer,
+            ai_comments=ai_comments
+        )
+
+    def _recommend_from_columns(
+        self,
+        patient_id: int,
+        patient_personality: Dict[str, float],
+        caregiver_personality: np.ndarray,
+        caregiver_specialties_count: Sequence[float],
+        caregiver_experience: Sequence[float],
+        get_caregiver: Callable[[int], Dict],
+        top_n: int,
+        verbose: bool,
+        timer: Optional[StageTimer] = None,
+        ai_comments: bool = True
+    ) -> List[Dict]:
+        """
+        컬럼 배열로 특성 행렬 생성 → 점수 예측 → 상위 N명 선택 → AI 코멘트
+
+        Args:
+            get_caregiver: 후보 순번 → 간병인 정보 dict (상위 N명에 대해서만 호출)
+            timer: 단계별 소요 시간 기록 (features / scoring / top_k / ai_comment)
+            ai_comments: False이면 규칙 기반 코멘트만 붙임 (_attach_ai_comments 참고)
+        """
+        timer = timer or StageTimer()
+
+        # Feature Engineering (DB 데이터 기반, 컬럼 기반 특성 행렬)
+        with timer.stage("features"):
+            engineer = self.engineer or FeatureEngineer()
+            X = engineer.create_feature_matrix_from_db_data(
                 patient_personality=patient_personality,
-                caregiver_data=cg_data
+                caregiver_personality=caregiver_personality,
+                caregiver_specialties_count=caregiver_specialties_count,
+                caregiver_experience=caregiver_experience,
             )
-            features_list.append(features)
-            caregiver_ids.append(cg_data["caregiver_id"])
+            X, feature_columns = self._align_feature_matrix(X, engineer.feature_columns)
 
-        # DataFrame 생성
-        X = pd.DataFrame(features_list)
-        X = X[self.feature_columns]
+        # 점수 예측 (후보 전체, 요청 중 모델이 교체되어도 같은 모델/버전 사용)
+        with timer.stage("scoring"):
+            served = self._served_model(patient_id)
+            if served is not None:
+                regressor, model_version = served.model, served.tag
+            else:
+                regressor, model_version = self.current_model()
+            predicted_scores = np.asarray(regressor.predict(X), dtype=np.float64)
 
-        # 점수 예측
-        predicted_scores = self.regressor.predict(X)
+        # 섀도 평가 (별도 스레드에 예약만 하고 기다리지 않음)
+        if served is not None and self.model_registry.experiment is not None:
+            self.model_registry.experiment.submit_shadow(
+                X, predicted_scores, served, feature_columns, patient_id=patient_id, top_n=top_n
+            )
 
-        # 결과 정리
-        results = []
-        for i, cg_id in enumerate(caregiver_ids):
-            score = float(predicted_scores[i])
-            grade = self.get_grade(score)
+        # 상위 N개 선택 (전체 정렬 없이 부분 선택, 동점은 입력 순서 유지)
+        with timer.stage("top_k"):
+            order = select_top_k(np.round(predicted_scores, 1), top_n)
 
-            cg_data = caregivers_with_personality[i]
-            features = X.iloc[i].to_dict()
+        top_results = self._build_results(
+            order, predicted_scores, X, feature_columns, get_caregiver, model_version
+        )
 
-            result = {
-                "caregiver_id": cg_id,
+        # AI 코멘트 생성
+        with timer.stage("ai_comment"):
+            self._attach_ai_comments(top_results, patient_id, verbose, ai_comments=ai_comments)
+
+        logger.info(f"   ✅ 추천 완료: {len(top_results)}명")
+        return top_results
+
+    def recommend_caregivers_from_scores(
+        self,
+        patient_id: int,
+        patient_personality: Dict[str, float],
+        snapshot: CaregiverSnapshot,
+        positions: Sequence[int],
+        scores: Sequence[float],
+        model_version: Optional[str],
+        verbose: bool = False,
+        timer: Optional[StageTimer] = None,
+        ai_comments: bool = True
+    ) -> List[Dict]:
+        """
+        이미 계산된 상위 N명 점수(사전 계산 점수 행렬)로 추천 결과 생성
+
+        점수 계산 없이 상위 N명의 특성만 만들어 recommend_caregivers_from_store와
+        같은 형태의 결과를 반환합니다.
+
+        Args:
+            positions: 상위 N명의 스냅샷 행 번호 (추천 순서)
+            scores: 각 간병인의 모델 점수
+            model_version: 점수를 계산한 모델 버전
+        """
+        timer = timer or StageTimer()
+        positions = np.asarray(positions, dtype=np.int64)
+
+        with timer.stage("features"):
+            engineer = self.engineer or FeatureEngineer()
+            X = engineer.create_feature_matrix_from_db_data(
+                patient_personality=patient_personality,
+                caregiver_personality=snapshot.personality[positions],
+                caregiver_specialties_count=snapshot.specialty_counts[positions],
+                caregiver_experience=snapshot.experience_years[positions],
+            )
+            X, feature_columns = self._align_feature_matrix(X, engineer.feature_columns)
+
+        top_results = self._build_results(
+            np.arange(len(positions)),
+            np.asarray(scores, dtype=np.float64),
+            X,
+            feature_columns,
+            lambda i: snapshot.to_caregiver_dict(int(positions[i])),
+            model_version,
+        )
+
+        with timer.stage("ai_comment"):
+            self._attach_ai_comments(top_results, patient_id, verbose, ai_comments=ai_comments)
+
+        logger.info(f"   ✅ 사전 계산 점수로 추천 완료: {len(top_results)}명")
+        return top_results
+
+    def _build_results(
+        self,
+        order: np.ndarray,
+        predicted_scores: np.ndarray,
+        X: np.ndarray,
+        feature_columns: List[str],
+        get_caregiver: Callable[[int], Dict],
+        model_version: Optional[str]
+    ) -> List[Dict]:
+        """상위 N명 결과 항목 생성 (AI 코멘트용 _features / _cg_data 포함)"""
+        top_results = []
+        for i in order.tolist():
+            score = float(predicted_scores[i])
+            cg_data = get_caregiver(i)
+
+            top_results.append({
+                "caregiver_id": cg_data["caregiver_id"],
                 "caregiver_name": cg_data.get("caregiver_name", ""),
                 "job_title": cg_data.get("job_title", ""),
                 "predicted_score": round(score, 1),
-                "grade": grade,
+                "grade": self.get_grade(score),
                 "experience_years": cg_data.get("experience_years", 0),
                 "hourly_rate": cg_data.get("hourly_rate", 0),
                 "avg_rating": cg_data.get("avg_rating", 0),
                 "profile_image_url": cg_data.get("profile_image_url", ""),
                 "specialties": cg_data.get("specialties", []),
-                "_features": features,
+                "model_version": model_version,
+                "_features": dict(zip(feature_columns, X[i].tolist())),
                 "_cg_data": cg_data,
-            }
-
-            results.append(result)
+            })
+        return top_results
 
-        # 점수순 정렬 및 상위 N개 선택
-        results.sort(key=lambda x: x["predicted_score"], reverse=True)
-        top_results = results[:top_n]
+    def _attach_ai_comments(
+        self,
+        top_results: List[Dict],
+        patient_id: int,
+        verbose: bool = False,
+        ai_comments: bool = True
+    ):
+        """
+        상위 결과에 AI 코멘트 추가 (_features / _cg_data 키 제거)
 
-        # AI 코멘트 생성
-        for result in top_results:
-            features = result.pop("_features")
-            cg_data = result.pop("_cg_data")
+        ai_comments가 False이면 규칙 기반 코멘트를 붙이고,
+        AI 코멘트 요청은 "_comment_request" 키에 남깁니다 (iter_ai_comments 인자).
+        """
+        comment_requests = [
+            {
+                "grade": result["grade"],
+                "features": result.pop("_features"),
+                "caregiver_info": result.pop("_cg_data"),
+                "patient_info": {"patient_id": patient_id},
+                "matching_score": result["predicted_score"],
+            }
+            for result in top_results
+        ]
+
+        if not ai_comments:
+            for result, req in zip(top_results, comment_requests):
+                result["ai_comment"] = self._generate_rule_based_comment(
+                    req["grade"], req["features"], req["caregiver_info"]
+                )
+                result["comment_source"] = "rule_based"
+                result["_comment_request"] = req
+            return
 
-            comment_result = self.generate_ai_comment(
-                grade=result["grade"],
-                features=features,
-                caregiver_info=cg_data,
-                patient_info={"patient_id": patient_id},
-                matching_score=result["predicted_score"],
-                verbose=verbose
-            )
+        comment_results = self.generate_ai_comments(comment_requests, verbose=verbose)
 
+        for result, comment_result in zip(top_results, comment_results):
             result["ai_comment"] = comment_result.get("comment", "")
             result["comment_source"] = comment_result.get("source", "unknown")
 
-        logger.info(f"   ✅ 추천 완료: {len(top_results)}명")
-        return top_results
+    def _align_feature_matrix(
+        self,
+        X: np.ndarray,
+        columns: List[str]
+    ) -> tuple:
+        """
+        특성 행렬의 컬럼 순서를 모델 학습 시 순서(self.feature_columns)에 맞춤
+
+        Args:
+            X: FeatureEngineer.feature_columns 순서의 특성 행렬
+            columns: X의 컬럼 이름
+
+        Returns:
+            (X, columns): 모델 순서로 정렬된 행렬과 컬럼 이름
+        """
+        if not self.feature_columns or list(self.feature_columns) == list(columns):
+            return X, list(columns)
+
+        order = [columns.index(col) for col in self.feature_columns]
+        return np.ascontiguousarray(X[:, order]), list(self.feature_columns)
 
     def get_status(self) -> Dict:
         """현재 상태 반환"""
         status = {
             "model_loaded": self.regressor is not None,
             "classifier_loaded": self.classifier is not None,
+            "model_version": self.model_version,
+            "model_source": "registry" if self.model_registry is not None else "pkl",
             "data_loaded": self.caregivers is not None and self.patients is not None,
             "azure_openai_available": (
                 self.ai_comment_generator is not None and
@@ -0,0 +1,295 @@
+# ========================================
+# 늘봄케어 매칭 모델 - ONNX 변환 / 추론
+# ========================================
+# 파일: onnx_inference.py
+# 설명: 매칭 회귀/분류 모델을 skl2onnx로 ONNX 변환하고 onnxruntime으로 점수 계산
+
+import copy
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 변환에 사용하는 opset (onnxruntime 1.16 이상에서 지원)
+TARGET_OPSET = {"": 17, "ai.onnx.ml": 3}
+
+# 로드 시 원본 모델과 비교할 허용 오차 (점수는 소수 첫째 자리로 반올림하여 노출)
+PARITY_TOLERANCE = 1e-3
+
+_converters_registered = False
+_converters_lock = threading.Lock()
+
+
+def _register_xgboost_converters():
+    """XGBRegressor / XGBClassifier 변환기를 skl2onnx에 등록 (onnxmltools 변환기 사용)"""
+    global _converters_registered
+
+    with _converters_lock:
+        if _converters_registered:
+            return
+
+        from skl2onnx import update_registered_converter
+        from skl2onnx.common.shape_calculator import (
+            calculate_linear_classifier_output_shapes,
+            calculate_linear_regressor_output_shapes,
+        )
+        from onnxmltools.convert.xgboost.operator_converters.XGBoost import convert_xgboost
+        from xgboost import XGBClassifier, XGBRegressor
+
+        update_registered_converter(
+            XGBRegressor,
+            "XGBoostXGBRegressor",
+            calculate_linear_regressor_output_shapes,
+            convert_xgboost,
+        )
+        update_registered_converter(
+            XGBClassifier,
+            "XGBoostXGBClassifier",
+            calculate_linear_classifier_output_shapes,
+            convert_xgboost,
+            options={"nocl": [True, False], "zipmap": [True, False, "columns"]},
+        )
+        _converters_registered = True
+
+
+def export_onnx(model, n_features: Optional[int] = None):
+    """
+    학습된 회귀/분류 모델 → ONNX ModelProto
+
+    scikit-learn 모델(RandomForest 등)은 skl2onnx 기본 변환기를, XGBoost sklearn 래퍼는
+    onnxmltools 변환기를 사용합니다. 분류 모델은 zipmap 없이 (N, 클래스 수) 확률 행렬을 출력합니다.
+
+    Args:
+        model: XGBRegressor / XGBClassifier / scikit-learn 회귀·분류 모델
+        n_features: 입력 특성 수 (없으면 model.n_features_in_)
+
+    Returns:
+        onnx.ModelProto
+    """
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+
+    n_features = n_features or int(getattr(model, "n_features_in_", 0))
+    if not n_features:
+        raise ValueError("입력 특성 수를 알 수 없습니다. n_features를 지정하세요.")
+
+    if hasattr(model, "get_booster"):
+        _register_xgboost_converters()
+        # onnxmltools 변환기는 부스터 특성 이름이 'f0, f1, ...' 형식이어야 하므로 사본에서 이름 제거
+        model = copy.deepcopy(model)
+        model.get_booster().feature_names = None
+
+    options = {id(model): {"zipmap": False}} if hasattr(model, "predict_proba") else None
+
+    return convert_sklearn(
+        model,
+        initial_types=[("input", FloatTensorType([None, n_features]))],
+        target_opset=TARGET_OPSET,
+        options=options,
+    )
+
+
+def save_onnx(model, path: Union[str, Path], n_features: Optional[int] = None) -> Path:
+    """모델을 ONNX 파일로 저장"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(export_onnx(model, n_features).SerializeToString())
+    return path
+
+
+class OnnxModel:
+    """
+    onnxruntime 추론 세션 래퍼 (predict / predict_proba)
+
+    NuelbomMatchingPredictor가 회귀 모델(predict)과 분류 모델(predict_proba)을 호출하는 방식 그대로
+    사용할 수 있습니다. intra_op_num_threads로 요청 하나가 쓰는 스레드 수를 제한하여
+    gunicorn 워커 여러 개가 같은 CPU를 나눠 쓸 때 스레드가 과도하게 생기지 않게 합니다.
+    """
+
+    def __init__(
+        self,
+        onnx_model: Union[bytes, str, Path],
+        intra_op_num_threads: int = 1,
+        source: str = ""
+    ):
+        """
+        Args:
+            onnx_model: 직렬화된 ONNX 모델(bytes) 또는 .onnx 파일 경로
+            intra_op_num_threads: 연산 내부 스레드 수 (0이면 onnxruntime 기본값 = 물리 코어 수)
+            source: 로그/상태 표시용 출처
+        """
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_num_threads
+        options.inter_op_num_threads = 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+
+        model = str(onnx_model) if isinstance(onnx_model, Path) else onnx_model
+        self.session = ort.InferenceSession(model, options, providers=["CPUExecutionProvider"])
+        self.intra_op_num_threads = intra_op_num_threads
+        self.source = source
+
+        model_input = self.session.get_inputs()[0]
+        self._input_name = model_input.name
+        self.n_features_in_ = model_input.shape[1]
+
+        self._output_names = [output.name for output in self.session.get_outputs()]
+        # 분류 모델: label / probabilities 출력
+        self.is_classifier = "probabilities" in self._output_names
+
+    @classmethod
+    def from_estimator(
+        cls,
+        model,
+        n_features: Optional[int] = None,
+        intra_op_num_threads: int = 1
+    ) -> "OnnxModel":
+        """학습된 모델을 메모리에서 변환하여 생성"""
+        return cls(
+            export_onnx(model, n_features).SerializeToString(),
+            intra_op_num_threads=intra_op_num_threads,
+            source=type(model).__name__,
+        )
+
+    def _run(self, output_name: str, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        return self.session.run([output_name], {self._input_name: np.ascontiguousarray(X)})[0]
+
+    def predict(self, X) -> np.ndarray:
+        """
+        예측 (회귀: (N,) float32 점수, 분류: (N,) 클래스)
+
+        Args:
+            X: (N, 특성 수) 특성 행렬 (numpy 배열 또는 DataFrame, 모델 학습 시 컬럼 순서)
+        """
+        output_name = "label" if self.is_classifier else self._output_names[0]
+        return self._run(output_name, X).ravel()
+
+    def predict_proba(self, X) -> np.ndarray:
+        """분류 확률 (N, 클래스 수)"""
+        if not self.is_classifier:
+            raise ValueError("회귀 모델은 predict_proba를 지원하지 않습니다.")
+        return self._run("probabilities", X)
+
+
+def check_parity(reference, candidate, X, proba: bool = False) -> Dict:
+    """
+    두 모델의 예측값 비교
+
+    Args:
+        reference: 원본 모델 (XGBRegressor 등)
+        candidate: 비교할 모델 (OnnxModel 등)
+        X: 특성 행렬
+        proba: True이면 predict_proba의 양성 클래스 확률 비교
+
+    Returns:
+        Dict: rows, max_abs_diff, mean_abs_diff, passed (PARITY_TOLERANCE 이내)
+    """
+    if proba:
+        expected = np.asarray(reference.predict_proba(X), dtype=np.float64)[:, 1]
+        actual = np.asarray(candidate.predict_proba(X), dtype=np.float64)[:, 1]
+    else:
+        expected = np.asarray(reference.predict(X), dtype=np.float64).ravel()
+        actual = np.asarray(candidate.predict(X), dtype=np.float64).ravel()
+
+    diff = np.abs(expected - actual)
+    max_abs_diff = float(diff.max()) if len(diff) else 0.0
+    return {
+        "rows": int(len(diff)),
+        "max_abs_diff": max_abs_diff,
+        "mean_abs_diff": float(diff.mean()) if len(diff) else 0.0,
+        "passed": max_abs_diff <= PARITY_TOLERANCE,
+    }
+
+
+def parity_sample(n_features: int, n_rows: int = 256, missing_rate: float = 0.0, seed: int = 0) -> np.ndarray:
+    """parity 확인용 합성 특성 행렬 (0~100 균등 분포, missing_rate 비율만큼 결측값)"""
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(0, 100, (n_rows, n_features)).astype(np.float32)
+    if missing_rate > 0:
+        X[rng.random(X.shape) < missing_rate] = np.nan
+    return X
+
+
+def load_onnx_model(
+    model,
+    onnx_path: Optional[Path] = None,
+    n_features: Optional[int] = None,
+    intra_op_num_threads: int = 1
+) -> OnnxModel:
+    """
+    ONNX 추론 모델 준비 + 원본 모델과 parity 확인
+
+    onnx_path 파일이 있으면 그대로 로드하고, 없으면(None 포함) 원본 모델을 메모리에서 변환합니다.
+    parity가 PARITY_TOLERANCE를 넘으면 ValueError (호출 측에서 원본 모델로 폴백).
+
+    Args:
+        model: 원본 모델 (parity 기준)
+        onnx_path: export_matching_models로 저장한 .onnx 파일 경로
+        n_features: 입력 특성 수
+        intra_op_num_threads: 연산 내부 스레드 수
+    """
+    if onnx_path is not None and onnx_path.exists():
+        onnx_model = OnnxModel(onnx_path, intra_op_num_threads=intra_op_num_threads, source=onnx_path.name)
+    else:
+        onnx_model = OnnxModel.from_estimator(model, n_features, intra_op_num_threads=intra_op_num_threads)
+
+    parity = check_parity(
+        model,
+        onnx_model,
+        parity_sample(onnx_model.n_features_in_),
+        proba=onnx_model.is_classifier,
+    )
+    if not parity["passed"]:
+        raise ValueError(f"ONNX 예측값이 원본과 다릅니다 (최대 차이 {parity['max_abs_diff']:.6f})")
+
+    return onnx_model
+
+
+def export_matching_models(model_dir: Union[str, Path], model_type: str = "xgboost") -> Dict[str, Dict]:
+    """
+    {model_type}_regressor.pkl / {model_type}_classifier.pkl → 같은 경로의 .onnx 파일
+
+    Returns:
+        Dict: {"regressor": {"path", "parity"}, "classifier": {...}} (분류 모델이 없으면 생략)
+    """
+    import joblib
+
+    model_dir = Path(model_dir)
+    results = {}
+
+    for kind in ("regressor", "classifier"):
+        pkl_path = model_dir / f"{model_type}_{kind}.pkl"
+        if not pkl_path.exists():
+            if kind == "regressor":
+                raise FileNotFoundError(f"회귀 모델을 찾을 수 없습니다: {pkl_path}")
+            continue
+
+        model = joblib.load(pkl_path)
+        onnx_path = save_onnx(model, pkl_path.with_suffix(".onnx"))
+        onnx_model = OnnxModel(onnx_path)
+        parity = check_parity(
+            model, onnx_model, parity_sample(onnx_model.n_features_in_), proba=onnx_model.is_classifier
+        )
+        results[kind] = {"path": str(onnx_path), "parity": parity}
+        logger.info(f"✅ ONNX 변환: {onnx_path} (최대 차이 {parity['max_abs_diff']:.6f})")
+
+    return results
+
+
+if __name__ == "__main__":
+    # python -m app.services.matching.onnx_inference [모델 경로] [모델 종류]
+    import json
+    import sys
+
+    default_dir = Path(__file__).parent.parent.parent.parent.parent / "matching" / "models"
+    target_dir = sys.argv[1] if len(sys.argv) > 1 else default_dir
+    target_type = sys.argv[2] if len(sys.argv) > 2 else "xgboost"
+    print(json.dumps(export_matching_models(target_dir, target_type), ensure_ascii=False, indent=2))
@@ -0,0 +1,307 @@
+# ========================================
+# 늘봄케어 매칭 모델 - 추천 결과 캐시
+# ========================================
+# 파일: recommendation_cache.py
+# 설명: 같은 환자 프로필/요구사항의 반복 추천 요청을 TTL + LRU 캐시로 처리
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CacheDependency(NamedTuple):
+    """캐시 항목이 의존하는 환자/간병인 (간병인 변경 시 항목별 유효성 확인용)"""
+    patient_id: int
+    patient_personality: Dict[str, float]  # 요청의 환자 성격 점수
+    model_version: Optional[str]           # 점수를 계산한 모델 버전
+    caregiver_ids: FrozenSet[int]          # 결과에 포함된 간병인
+    kth_score: Optional[float]             # 마지막(k번째) 추천의 반올림 점수 (k명을 못 채웠으면 None)
+
+
+class RecommendationCache:
+    """
+    추천 결과 캐시 (프로세스 메모리, TTL + LRU)
+
+    키는 환자 프로필 fingerprint(성격 점수, 돌봄 유형, 선호 요일/시간대, top_k 등)와
+    모델 버전의 해시입니다. 모델 버전이 바뀌면 캐시 전체를 비웁니다.
+
+    간병인 데이터가 바뀌면 apply_caregiver_changes로 영향받는 항목만 삭제하고
+    나머지는 새 저장소 버전으로 유지합니다 (바뀐 간병인만 각 항목의 환자와 다시 점수 계산).
+    증분 처리 없이 저장소 버전이 바뀌면 캐시 전체를 비웁니다.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0):
+        """
+        Args:
+            max_entries: 최대 캐시 항목 수 (초과 시 가장 오래 사용하지 않은 항목 제거)
+            ttl_seconds: 항목 유효 시간 (초)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._dependencies: Dict[str, CacheDependency] = {}
+        self._versions: Optional[Tuple] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+        self.revalidated = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(fingerprint: Dict, model_version: Any) -> str:
+        """
+        캐시 키 생성 (간병인 저장소 버전은 키에 넣지 않고 apply_caregiver_changes로 항목별 확인)
+
+        Args:
+            fingerprint: 환자 프로필/요구사항 (JSON 직렬화 가능한 dict)
+            model_version: 모델 버전
+
+        Returns:
+            str: sha256 hex digest
+        """
+        payload = json.dumps(
+            {"fingerprint": fingerprint, "model": model_version},
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, versions: Tuple) -> Optional[Any]:
+        """
+        캐시 조회 (만료/버전 변경 시 None)
+
+        Args:
+            key: make_key로 만든 키
+            versions: 현재 (모델 버전, 저장소 버전)
+
+        Returns:
+            캐시된 값의 복사본 또는 None
+        """
+        with self._lock:
+            self._check_versions(versions)
+
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value: Any, versions: Tuple, dependency: Optional[CacheDependency] = None):
+        """
+        캐시 저장
+
+        Args:
+            key: make_key로 만든 키
+            value: 저장할 값 (복사본이 저장됨)
+            versions: 값을 계산할 때의 (모델 버전, 저장소 버전)
+            dependency: 항목이 의존하는 환자/간병인 (없으면 간병인이 하나라도 바뀌면 삭제)
+        """
+        value = copy.deepcopy(value)
+
+        with self._lock:
+            self._check_versions(versions)
+            if versions != self._versions:
+                # 계산 중에 버전이 바뀐 결과는 저장하지 않음
+                return
+
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            if dependency is not None:
+                self._dependencies[key] = dependency
+            else:
+                self._dependencies.pop(key, None)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._dependencies.pop(evicted, None)
+
+    def invalidate_patients(self, patient_ids: Iterable[int]) -> int:
+        """
+        환자 정보(지역/질병/성향)가 바뀐 환자의 항목 삭제
+
+        Returns:
+            int: 삭제한 항목 수
+        """
+        patient_ids = set(patient_ids)
+        with self._lock:
+            keys = [
+                key for key, dependency in self._dependencies.items()
+                if dependency.patient_id in patient_ids
+            ]
+            for key in keys:
+                self._remove(key)
+            self.invalidated += len(keys)
+        return len(keys)
+
+    def apply_caregiver_changes(
+        self,
+        store_version: int,
+        changed_ids: Iterable[int],
+        removed_ids: Iterable[int],
+        model_tag: Optional[str] = None,
+        score_changed: Optional[Callable[[np.ndarray], np.ndarray]] = None
+    ) -> Tuple[int, int]:
+        """
+        간병인 변경을 반영하여 영향받는 항목만 삭제하고 나머지는 새 저장소 버전으로 유지
+
+        다음 항목을 삭제합니다.
+            - 바뀌었거나 삭제된 간병인이 결과에 포함된 항목 (표시 정보/점수가 바뀜)
+            - 바뀐(추가 포함) 간병인의 새 점수가 항목의 k번째 점수 이상이라 순위에 들 수 있는 항목
+              (필터 통과 여부는 확인하지 않고 통과한다고 가정)
+            - 의존 정보가 없거나 모델 버전이 model_tag와 다른 항목
+
+        Args:
+            store_version: 변경이 반영된 새 저장소 버전
+            changed_ids: 추가/수정된 간병인 ID
+            removed_ids: 삭제된 간병인 ID
+            model_tag: score_changed가 사용하는 모델 버전
+            score_changed: (E, 4) 환자 성격 점수 → (E, C) 바뀐 간병인 점수 (changed_ids 순서)
+
+        Returns:
+            (유지한 항목 수, 삭제한 항목 수)
+        """
+        changed_ids = list(changed_ids)
+        affected = set(changed_ids) | set(removed_ids)
+
+        with self._lock:
+            if self._versions is None:
+                return 0, 0
+            model_version, current_store = self._versions
+            if store_version <= current_store:
+                return 0, 0
+            checked = dict(self._dependencies)
+
+        # 점수 계산은 lock 밖에서 (그동안의 조회는 이전 버전 항목을 그대로 사용)
+        keep = set()
+        rescore = []
+        for key, dependency in checked.items():
+            if dependency.caregiver_ids & affected:
+                continue
+            if not changed_ids:
+                keep.add(key)
+            elif dependency.kth_score is not None and dependency.model_version == model_tag and score_changed:
+                rescore.append((key, dependency))
+
+        if rescore:
+            from .feature_engineering import PERSONALITY_TYPES
+
+            personality = np.array([
+                [float(dep.patient_personality.get(f"{ptype}_score", 50)) for ptype in PERSONALITY_TYPES]
+                for _, dep in rescore
+            ])
+            best = np.round(np.asarray(score_changed(personality), dtype=np.float64), 1).max(axis=1)
+            # 동점이면 저장소 순서에 따라 순위에 들 수 있으므로 같은 점수도 삭제
+            keep.update(key for (key, dep), score in zip(rescore, best.tolist()) if score < dep.kth_score)
+
+        with self._lock:
+            if self._versions != (model_version, current_store):
+                # 처리 중 모델이 바뀌었거나 다른 갱신이 먼저 반영됨 → 다음 조회에서 전체 비움
+                return 0, 0
+
+            # 확인하지 못한 항목(처리 중 저장된 항목 포함)은 삭제
+            dropped = [key for key in self._entries if key not in keep]
+            for key in dropped:
+                self._remove(key)
+            self._versions = (model_version, store_version)
+            self.invalidated += len(dropped)
+            self.revalidated += len(self._entries)
+            kept = len(self._entries)
+
+        logger.info(
+            f"🔄 추천 캐시 증분 갱신: 간병인 변경 {len(changed_ids)}명/삭제 {len(affected) - len(set(changed_ids))}명 → "
+            f"유지 {kept}건, 삭제 {len(dropped)}건 (저장소 v{store_version})"
+        )
+        return kept, len(dropped)
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._entries.clear()
+            self._dependencies.clear()
+
+    def _remove(self, key: str):
+        """항목 삭제 (lock 보유 상태에서 호출)"""
+        self._entries.pop(key, None)
+        self._dependencies.pop(key, None)
+
+    def get_stats(self) -> Dict:
+        """캐시 통계"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "invalidated": self.invalidated,
+            "revalidated": self.revalidated,
+        }
+
+    def _check_versions(self, versions: Tuple):
+        """모델/저장소 버전이 최신으로 바뀌었으면 캐시 비우기 (lock 보유 상태에서 호출)"""
+        if versions == self._versions:
+            return
+
+        if self._versions is not None and self._is_older(versions):
+            # 이전 스냅샷으로 처리 중인 요청은 캐시를 비우지 않음
+            return
+
+        if self._entries:
+            logger.info(f"🧹 추천 캐시 무효화: {self._versions} → {versions} ({len(self._entries)}건 삭제)")
+        self._entries.clear()
+        self._dependencies.clear()
+        self._versions = versions
+
+    def _is_older(self, versions: Tuple) -> bool:
+        """저장소 버전(정수)이 현재보다 작고 모델 버전이 같으면 이전 요청으로 판단"""
+        model_version, store_version = versions
+        current_model, current_store = self._versions
+        return model_version == current_model and store_version < current_store
+
+
+# 전역 인스턴스 (프로세스 공유)
+_recommendation_cache: Optional[RecommendationCache] = None
+_recommendation_cache_lock = threading.Lock()
+
+
+def get_recommendation_cache() -> RecommendationCache:
+    """RecommendationCache 싱글톤 인스턴스 반환"""
+    global _recommendation_cache
+
+    if _recommendation_cache is None:
+        with _recommendation_cache_lock:
+            if _recommendation_cache is None:
+                from app.core.config import get_settings
+
+                settings = get_settings()
+                _recommendation_cache = RecommendationCache(
+                    max_entries=settings.RECOMMENDATION_CACHE_MAX_ENTRIES,
+                    ttl_seconds=settings.RECOMMENDATION_CACHE_TTL_SECONDS,
+                )
+
+    return _recommendation_cache
@@ -0,0 +1,301 @@
+# ========================================
+# 늘봄케어 매칭 모델 - 지역 인덱스
+# ========================================
+# 파일: region_index.py
+# 설명: 지역 코드를 정수 ID로 변환하고 지역×지역 점수 행렬을 미리 계산
+
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 수도권 (서울-경기-인천)
+CAPITAL_AREA = frozenset({"SEOUL", "GYEONGGI", "INCHEON"})
+
+# 지역 코드 없음 (None, NaN, 빈 문자열)
+UNKNOWN_REGION_ID = 0
+
+# 등록 가능한 최대 지역 코드 수 (점수 행렬 1024×1024 float64 = 8MB, 실제 시/군/구는 약 250개)
+MAX_REGION_CODES = 1024
+
+
+class RegionIndex:
+    """
+    지역 코드 인덱스
+
+    SEOUL_GANGNAM 형태의 지역 코드를 작은 정수 ID로 변환하고,
+    모든 지역 쌍의 점수(1.0 / 0.75 / 0.5 / 0.0)를 행렬로 미리 계산합니다.
+    점수 계산과 지역 필터링은 정수 인덱싱(gather)으로 처리됩니다.
+
+    등록은 간병인/학습 데이터의 지역 코드(register_many)만 하고, 조회(score, scores_for,
+    match_mask)는 등록하지 않습니다. 등록되지 않은 환자 지역 코드는 같은 규칙으로 그때그때
+    계산하므로 요청 값으로 인덱스가 커지지 않으며, 등록 수는 max_codes로 제한합니다.
+    """
+
+    def __init__(self, region_codes: Iterable[str] = (), max_codes: int = MAX_REGION_CODES):
+        """
+        Args:
+            region_codes: 미리 등록할 지역 코드들
+            max_codes: 최대 등록 지역 코드 수 (초과분은 지역 정보 없음으로 처리)
+        """
+        self._lock = threading.Lock()
+        self.max_codes = max_codes
+
+        # ID 0 = 지역 코드 없음
+        self._ids: Dict[str, int] = {}
+        self._codes: List[str] = [""]
+        self._city_ids: List[int] = [-1]
+        self._is_capital: List[bool] = [False]
+        self._city_index: Dict[str, int] = {}
+
+        self._scores = np.full((1, 1), 0.5, dtype=np.float64)
+        # 점수 행렬과 같은 크기의 시/도 ID, 수도권 여부 (미등록 코드 행 계산용, 함께 교체)
+        self._tables = (self._scores, np.array([-1], dtype=np.int32), np.array([False]))
+
+        self.register_many(region_codes)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    @staticmethod
+    def _normalize(region_code) -> str:
+        """None / NaN은 빈 문자열로 처리"""
+        if region_code is None:
+            return ""
+        if not isinstance(region_code, str):
+            if pd.isna(region_code):
+                return ""
+            region_code = str(region_code)
+        return region_code
+
+    def register_many(self, region_codes: Iterable[str]) -> np.ndarray:
+        """
+        지역 코드들을 등록하고 ID 배열 반환 (새 코드는 점수 행렬에 증분 추가)
+
+        간병인/학습 데이터의 지역 코드에만 사용합니다 (요청으로 받은 환자 지역 코드는 등록하지 않음).
+
+        Args:
+            region_codes: 지역 코드들
+
+        Returns:
+            np.ndarray: 지역 ID 배열 (int32, max_codes 초과로 등록하지 못한 코드는 UNKNOWN_REGION_ID)
+        """
+        codes = [self._normalize(code) for code in region_codes]
+        new_codes = [code for code in dict.fromkeys(codes) if code and code not in self._ids]
+
+        if new_codes:
+            with self._lock:
+                new_codes = [code for code in new_codes if code not in self._ids]
+                capacity = self.max_codes - (len(self._codes) - 1)
+                if len(new_codes) > capacity:
+                    logger.error(
+                        f"❌ 지역 코드 등록 한도 초과 ({self.max_codes}개) - "
+                        f"{len(new_codes) - max(capacity, 0)}개는 지역 정보 없음으로 처리"
+                    )
+                    new_codes = new_codes[:max(capacity, 0)]
+                if new_codes:
+                    self._extend(new_codes)
+
+        ids = self._ids
+        return np.fromiter(
+            (ids.get(code, UNKNOWN_REGION_ID) for code in codes),
+            dtype=np.int32,
+            count=len(codes)
+        )
+
+    def get_id(self, region_code: str) -> Optional[int]:
+        """지역 코드 → ID (코드 없음은 UNKNOWN_REGION_ID, 미등록 코드는 None / 등록하지 않음)"""
+        code = self._normalize(region_code)
+        if not code:
+            return UNKNOWN_REGION_ID
+        return self._ids.get(code)
+
+    def get_code(self, region_id: int) -> str:
+        """ID → 지역 코드"""
+        return self._codes[region_id]
+
+    def _extend(self, new_codes: List[str]):
+        """새 지역 코드를 등록하고 점수 행렬의 새 행/열만 계산 (lock 보유 상태에서 호출)"""
+        old_size = len(self._codes)
+
+        for code in new_codes:
+            city = code.split("_")[0]
+            if city not in self._city_index:
+                self._city_index[city] = len(self._city_index)
+            self._codes.append(code)
+            self._city_ids.append(self._city_index[city])
+            self._is_capital.append(city in CAPITAL_AREA)
+
+        size = len(self._codes)
+        city_ids = np.asarray(self._city_ids, dtype=np.int32)
+        is_capital = np.asarray(self._is_capital, dtype=bool)
+
+        scores = np.empty((size, size), dtype=np.float64)
+        scores[:old_size, :old_size] = self._scores
+
+        # 새 행 (새 코드 × 전체 코드)
+        new_rows = np.arange(old_size, size)
+        block = self._score_block(new_rows, city_ids, is_capital)
+        scores[old_size:, :] = block
+        scores[:, old_size:] = block.T
+
+        # 지역 코드 없음 → 0.5
+        scores[UNKNOWN_REGION_ID, :] = 0.5
+        scores[:, UNKNOWN_REGION_ID] = 0.5
+
+        # 행렬을 먼저 교체한 뒤 ID를 공개 (읽는 쪽은 항상 ID를 포함하는 행렬을 봄)
+        self._scores = scores
+        self._tables = (scores, city_ids, is_capital)
+        for region_id in new_rows:
+            self._ids[self._codes[region_id]] = int(region_id)
+
+        logger.debug(f"지역 코드 {len(new_codes)}개 등록 (총 {size - 1}개)")
+
+    @staticmethod
+    def _score_block(
+        rows: np.ndarray,
+        city_ids: np.ndarray,
+        is_capital: np.ndarray
+    ) -> np.ndarray:
+        """rows × 전체 코드 점수 블록 계산"""
+        cols = np.arange(len(city_ids))
+        same_code = rows[:, None] == cols[None, :]
+        same_city = city_ids[rows][:, None] == city_ids[None, :]
+        both_capital = is_capital[rows][:, None] & is_capital[None, :]
+        return np.select(
+            [same_code, same_city, both_capital],
+            [1.0, 0.75, 0.5],
+            default=0.0
+        )
+
+    @staticmethod
+    def pair_score(patient_region: str, caregiver_region: str) -> float:
+        """
+        지역 코드 문자열로 점수 계산 (점수 행렬과 같은 규칙, 미등록 코드용)
+
+        Returns:
+            float: 1.0 (완전 일치), 0.75 (같은 시/도), 0.5 (수도권 내 / 지역 정보 없음), 0.0
+        """
+        patient_region = RegionIndex._normalize(patient_region)
+        caregiver_region = RegionIndex._normalize(caregiver_region)
+        if not patient_region or not caregiver_region:
+            return 0.5
+        if patient_region == caregiver_region:
+            return 1.0
+        patient_city = patient_region.split("_")[0]
+        caregiver_city = caregiver_region.split("_")[0]
+        if patient_city == caregiver_city:
+            return 0.75
+        if patient_city in CAPITAL_AREA and caregiver_city in CAPITAL_AREA:
+            return 0.5
+        return 0.0
+
+    def score(self, patient_region: str, caregiver_region: str) -> float:
+        """
+        지역 일치 점수 (단일 쌍, 등록되지 않은 코드도 등록하지 않고 계산)
+
+        Returns:
+            float: 1.0 (완전 일치), 0.75 (같은 시/도), 0.5 (수도권 내 / 지역 정보 없음), 0.0
+        """
+        patient_region_id = self.get_id(patient_region)
+        caregiver_region_id = self.get_id(caregiver_region)
+        if patient_region_id is None or caregiver_region_id is None:
+            return self.pair_score(patient_region, caregiver_region)
+        return float(self._scores[patient_region_id, caregiver_region_id])
+
+    def patient_scores(self, patient_region: str) -> np.ndarray:
+        """
+        환자 지역 × 등록된 전체 지역 점수 행 (미등록 환자 코드는 시/도·수도권 규칙으로 계산)
+
+        Args:
+            patient_region: 환자 지역 코드
+
+        Returns:
+            np.ndarray: (등록 코드 수 + 1,) 지역 점수 (ID로 인덱싱)
+        """
+        scores, city_ids, is_capital = self._tables
+        patient_region_id = self.get_id(patient_region)
+        if patient_region_id is not None:
+            return scores[patient_region_id]
+
+        code = self._normalize(patient_region)
+        city = code.split("_")[0]
+        same_city = city_ids == self._city_index.get(city, -2)
+        both_capital = is_capital & (city in CAPITAL_AREA)
+        row = np.select([same_city, both_capital], [0.75, 0.5], default=0.0)
+        row[UNKNOWN_REGION_ID] = 0.5
+        return row
+
+    def scores_for(self, patient_region: str, caregiver_region_ids: np.ndarray) -> np.ndarray:
+        """
+        환자 1명 × 간병인 N명 지역 점수 (gather)
+
+        Args:
+            patient_region: 환자 지역 코드 (등록하지 않음)
+            caregiver_region_ids: 간병인 지역 ID 배열
+
+        Returns:
+            np.ndarray: (N,) 지역 점수
+        """
+        return self.patient_scores(patient_region)[np.asarray(caregiver_region_ids, dtype=np.intp)]
+
+    def scores_for_codes(self, patient_region: str, caregiver_regions: Sequence[str]) -> np.ndarray:
+        """
+        환자 1명 × 간병인 N명 지역 점수 (지역 코드 문자열, 요청 데이터용 - 등록하지 않음)
+
+        Args:
+            patient_region: 환자 지역 코드
+            caregiver_regions: 간병인별 지역 코드 (길이 N)
+
+        Returns:
+            np.ndarray: (N,) 지역 점수
+        """
+        caregiver_region_ids = [self.get_id(code) for code in caregiver_regions]
+        row = self.patient_scores(patient_region)
+        scores = np.empty(len(caregiver_region_ids), dtype=np.float64)
+        for i, region_id in enumerate(caregiver_region_ids):
+            if region_id is None:
+                scores[i] = self.pair_score(patient_region, caregiver_regions[i])
+            else:
+                scores[i] = row[region_id]
+        return scores
+
+    def match_mask(self, patient_region: str, caregiver_region_ids: np.ndarray) -> np.ndarray:
+        """
+        지역 필터 마스크: 같은 시/도 또는 수도권 내 간병인
+
+        지역 정보가 없는 간병인은 제외됩니다.
+
+        Args:
+            patient_region: 환자 지역 코드 (등록하지 않음)
+            caregiver_region_ids: 간병인 지역 ID 배열
+
+        Returns:
+            np.ndarray: (N,) bool 마스크
+        """
+        caregiver_region_ids = np.asarray(caregiver_region_ids, dtype=np.intp)
+        return (
+            (caregiver_region_ids != UNKNOWN_REGION_ID) &
+            (self.patient_scores(patient_region)[caregiver_region_ids] >= 0.5)
+        )
+
+
+# 전역 인스턴스 (프로세스 공유)
+_region_index: Optional[RegionIndex] = None
+_region_index_lock = threading.Lock()
+
+
+def get_region_index() -> RegionIndex:
+    """RegionIndex 싱글톤 인스턴스 반환"""
+    global _region_index
+
+    if _region_index is None:
+        with _region_index_lock:
+            if _region_index is None:
+                _region_index = RegionIndex()
+
+    return _region_index
@@ -0,0 +1,117 @@
+# ========================================
+# 늘봄케어 매칭 모델 - 후보 검색 (Retrieval)
+# ========================================
+# 파일: retrieval.py
+# 설명: 간병인 전체 풀에서 자격증/지역/전문분야 필터로 후보를 고르고, 점수 상위 k명을 부분 선택
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import logging
+
+from .caregiver_store import CaregiverSnapshot
+from .region_index import get_region_index
+from .specialty_vocab import get_specialty_vocabulary
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimer:
+    """
+    단계별 소요 시간 측정 (밀리초)
+
+    사용 예:
+        timer = StageTimer()
+        with timer.stage("scoring"):
+            ...
+        timer.timings  # {"scoring": 1.234}
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """name 단계의 소요 시간을 누적 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.timings[name] = round(self.timings.get(name, 0.0) + elapsed_ms, 3)
+
+
+def select_top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    점수 상위 k개 인덱스 (내림차순, 동점은 입력 순서 유지)
+
+    전체 정렬 대신 np.argpartition으로 k번째 점수를 O(N)에 찾고,
+    선택된 k개만 정렬합니다. np.argsort(-scores, kind="stable")[:k]와 같은 결과입니다.
+
+    Args:
+        scores: (N,) 점수 배열
+        k: 선택할 개수
+
+    Returns:
+        np.ndarray: 상위 k개 인덱스 (int64)
+    """
+    scores = np.asarray(scores)
+    n = len(scores)
+    k = min(max(int(k), 0), n)
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+
+    if k < n:
+        # k번째로 큰 점수 (경계값)
+        kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+
+        # 경계값보다 큰 점수는 모두 포함, 경계값과 같은 점수는 앞선 순서대로 채움
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[:k - len(above)]
+        selected = np.concatenate([above, ties])
+    else:
+        selected = np.arange(n)
+
+    # 선택된 k개만 정렬 (점수 내림차순, 동점은 인덱스 오름차순)
+    order = np.lexsort((selected, -scores[selected]))
+    return selected[order].astype(np.int64, copy=False)
+
+
+def filter_snapshot(
+    snapshot: CaregiverSnapshot,
+    certification_keyword: Optional[str] = None,
+    patient_region: Optional[str] = None,
+    patient_diseases: Optional[Sequence[str]] = None
+) -> np.ndarray:
+    """
+    간병인 전체 풀에서 조건에 맞는 후보의 스냅샷 행 번호 반환 (LIMIT 없음)
+
+    Args:
+        snapshot: 간병인 특성 스냅샷
+        certification_keyword: 자격증 키워드 (대소문자 무시 부분 일치, 예: 요양보호사)
+        patient_region: 환자 지역 코드 (같은 시/도 또는 수도권 내 간병인)
+        patient_diseases: 환자 질병 리스트 (하나 이상을 전문분야로 가진 간병인)
+
+    Returns:
+        np.ndarray: 후보 행 번호 (int64, 스냅샷 순서)
+    """
+    candidate_mask = np.ones(len(snapshot), dtype=bool)
+
+    # 자격증 필터 (자격증 역색인 조회, 예: 요양보호사 → 요양보호사 1급, 요양보호사 2급 모두 매칭)
+    if certification_keyword:
+        candidate_mask &= snapshot.certification_index.mask_for_keyword(certification_keyword)
+
+    # 지역 필터 (지역 ID 기반 점수 행렬 조회)
+    if patient_region:
+        region_index = get_region_index()
+        candidate_mask &= region_index.match_mask(patient_region, snapshot.region_ids)
+
+    # 전문분야 필터 (비트마스크 AND)
+    if patient_diseases:
+        candidate_mask &= get_specialty_vocabulary().any_match(
+            patient_diseases, snapshot.specialty_masks
+        )
+
+    return np.flatnonzero(candidate_mask)
@@ -0,0 +1,410 @@
+# ========================================
+# 늘봄케어 매칭 모델 - 점수 무효화 (변경 추적 + 증분 재계산)
+# ========================================
+# 파일: score_invalidation.py
+# 설명: 성향/프로필 변경을 같은 트랜잭션에서 아웃박스(score_invalidations)에 기록하고,
+#       워커마다 아웃박스를 읽어 추천 캐시·사전 계산 점수에서 바뀐 환자/간병인만 다시 계산
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import chain
+from typing import Dict, Optional, Set, Tuple
+
+import numpy as np
+import logging
+
+from sqlalchemy import event, func, inspect, or_
+from sqlalchemy.orm import Session
+
+from .caregiver_store import DEFAULT_PERSONALITY_SCORE, CaregiverSnapshot, get_caregiver_store
+from .feature_engineering import PERSONALITY_TYPES
+from .recommendation_cache import get_recommendation_cache
+from .score_matrix import get_score_matrix_store, score_pairs
+
+logger = logging.getLogger(__name__)
+
+PATIENT = "patient"
+CAREGIVER = "caregiver"
+
+_PERSONALITY_COLUMNS = tuple(f"{ptype}_score" for ptype in PERSONALITY_TYPES)
+
+# 모델 이름 → (대상, ID 속성, 점수/후보 필터에 쓰이는 컬럼)
+TRACKED_COLUMNS: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {
+    "PatientPersonality": (PATIENT, "patient_id", _PERSONALITY_COLUMNS),
+    "CaregiverPersonality": (CAREGIVER, "caregiver_id", _PERSONALITY_COLUMNS),
+    "Caregiver": (
+        CAREGIVER,
+        "caregiver_id",
+        ("experience_years", "certifications", "certification_list", "specialties", "service_region"),
+    ),
+    # 지역/질병 필터 (recommend-xgboost의 region_filter / specialty_filter)
+    "Patient": (PATIENT, "patient_id", ("region_code", "is_deleted")),
+    "HealthCondition": (PATIENT, "patient_id", ("disease_name",)),
+}
+
+
+# ----------------------------------------------------------------------
+# 변경 추적 (SQLAlchemy 세션 이벤트 → 아웃박스)
+# ----------------------------------------------------------------------
+
+def scoring_changes(session: Session) -> Set[Tuple[str, int]]:
+    """
+    flush 대상 중 점수에 영향을 주는 변경 (대상, ID)
+
+    새로 추가/삭제된 행은 항상, 수정된 행은 TRACKED_COLUMNS의 컬럼이 바뀐 경우만 포함합니다.
+    """
+    changes = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        spec = TRACKED_COLUMNS.get(type(obj).__name__)
+        if spec is None:
+            continue
+        entity_type, id_attr, columns = spec
+
+        if obj not in session.new and obj not in session.deleted:
+            attrs = inspect(obj).attrs
+            if not any(attrs[column].history.has_changes() for column in columns):
+                continue
+
+        entity_id = getattr(obj, id_attr, None)
+        if entity_id is not None:
+            changes.add((entity_type, int(entity_id)))
+    return changes
+
+
+def _record_scoring_changes(session: Session, flush_context):
+    """after_flush: 같은 트랜잭션(연결)으로 아웃박스 기록 (커밋되지 않으면 함께 롤백)"""
+    changes = scoring_changes(session)
+    if not changes:
+        return
+
+    from app.models.matching import ScoreInvalidation
+
+    session.connection().execute(
+        ScoreInvalidation.__table__.insert(),
+        [{"entity_type": entity_type, "entity_id": entity_id} for entity_type, entity_id in sorted(changes)],
+    )
+
+
+_tracking_installed = False
+_tracking_lock = threading.Lock()
+
+
+def install_change_tracking():
+    """모든 Session의 flush에서 점수 관련 변경을 아웃박스에 기록 (프로세스당 1회)"""
+    global _tracking_installed
+
+    with _tracking_lock:
+        if not _tracking_installed:
+            event.listen(Session, "after_flush", _record_scoring_changes)
+            _tracking_installed = True
+
+
+# ----------------------------------------------------------------------
+# 증분 재계산
+# ----------------------------------------------------------------------
+
+def _active_model():
+    """증분 재계산에 쓰는 활성 모델 (레지스트리를 쓸 수 없으면 None)"""
+    from .model_registry import get_model_registry
+
+    try:
+        return get_model_registry().current()
+    except Exception as e:
+        logger.warning(f"⚠️ 증분 재계산 모델 조회 실패 - 전체 무효화로 처리: {e}")
+        return None
+
+
+def on_caregivers_changed(snapshot: CaregiverSnapshot, changed_ids: Set[int], removed_ids: Set[int]):
+    """
+    간병인 저장소 증분 갱신 리스너 (새 스냅샷 공개 직전)
+
+    추천 캐시는 영향받는 항목만 삭제하고, 사전 계산 점수는 바뀐 간병인 열만 다시 계산합니다.
+    """
+    served = _active_model()
+    if served is None:
+        return
+
+    changed_ids = sorted(changed_ids)
+    positions = np.array([snapshot.positions[cg_id] for cg_id in changed_ids], dtype=np.int64)
+
+    def score_changed(patient_personality: np.ndarray) -> np.ndarray:
+        return score_pairs(
+            served.model,
+            served.feature_columns,
+            patient_personality,
+            snapshot.personality[positions],
+            snapshot.specialty_counts[positions],
+            snapshot.experience_years[positions],
+        )
+
+    get_recommendation_cache().apply_caregiver_changes(
+        snapshot.version, changed_ids, removed_ids, model_tag=served.tag, score_changed=score_changed
+    )
+    get_score_matrix_store().apply_caregiver_changes(snapshot, served)
+
+
+def rescore_patients(db: Session, patient_ids: Set[int], snapshot: Optional[CaregiverSnapshot] = None) -> int:
+    """
+    환자 변경 반영: 추천 캐시의 해당 환자 항목 삭제, 사전 계산 점수의 해당 환자 행 재계산
+
+    Returns:
+        int: 사전 계산 점수에서 다시 계산한 환자 수
+    """
+    from app.models.care_details import PatientPersonality
+    from app.models.profile import Patient
+
+    if not patient_ids:
+        return 0
+
+    get_recommendation_cache().invalidate_patients(patient_ids)
+
+    store = get_score_matrix_store()
+    served = _active_model()
+    if served is None or store.get() is None:
+        return 0
+
+    personalities = db.query(PatientPersonality)\
+        .join(Patient, PatientPersonality.patient_id == Patient.patient_id)\
+        .filter(PatientPersonality.patient_id.in_(patient_ids), Patient.is_deleted == False)\
+        .all()
+    if not personalities:
+        return 0
+
+    def score(personality, ptype: str) -> float:
+        # 다른 경로(간병인 저장소, 사전 계산 배치)와 같은 기본값
+        value = getattr(personality, f"{ptype}_score")
+        return float(value) if value is not None else DEFAULT_PERSONALITY_SCORE
+
+    snapshot = snapshot or get_caregiver_store().get_snapshot(db)
+    return store.rescore_patients(
+        [int(p.patient_id) for p in personalities],
+        np.array([[score(p, ptype) for ptype in PERSONALITY_TYPES] for p in personalities]),
+        snapshot,
+        served,
+    )
+
+
+# ----------------------------------------------------------------------
+# 아웃박스 소비 (워커별)
+# ----------------------------------------------------------------------
+
+class ScoreInvalidationConsumer:
+    """
+    아웃박스(score_invalidations) 폴링 → 워커 메모리의 점수 증분 재계산
+
+    ID 순서와 커밋 순서가 다를 수 있으므로 워터마크 이후 행과 함께 최근 overlap 초 안에
+    기록된 행도 다시 읽고, 이미 처리한 ID는 건너뜁니다 (재계산은 멱등이라 중복되어도 결과는 같음).
+    """
+
+    def __init__(
+        self,
+        poll_interval: float = 5.0,
+        retention_hours: float = 24.0,
+        overlap_seconds: float = 300.0,
+        batch_size: int = 5000
+    ):
+        """
+        Args:
+            poll_interval: 폴링 주기 (초)
+            retention_hours: 아웃박스 행 보관 시간 (지난 행은 삭제)
+            overlap_seconds: 늦게 커밋된 행을 놓치지 않도록 다시 읽는 구간 (초)
+            batch_size: 한 번에 읽는 최대 행 수
+        """
+        self.poll_interval = poll_interval
+        self.retention_hours = retention_hours
+        self.overlap_seconds = overlap_seconds
+        self.batch_size = batch_size
+
+        self._watermark: Optional[int] = None
+        self._seen: Dict[int, datetime] = {}
+        self._last_purge = 0.0
+        self._poll_lock = threading.Lock()
+
+        self.processed = 0
+        self.patients_rescored = 0
+        self.caregiver_refreshes = 0
+        self.last_error: Optional[str] = None
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def poll(self, db: Session) -> Tuple[Set[int], Set[int]]:
+        """
+        새 아웃박스 행을 읽어 반영
+
+        Returns:
+            (환자 ID, 간병인 ID)
+        """
+        from app.models.matching import ScoreInvalidation
+
+        with self._poll_lock:
+            if self._watermark is None:
+                # 시작 이전 변경은 저장소 전체 로드 / 야간 배치에 이미 반영됨
+                self._watermark = int(db.query(func.max(ScoreInvalidation.invalidation_id)).scalar() or 0)
+                return set(), set()
+
+            since = datetime.now(timezone.utc) - timedelta(seconds=self.overlap_seconds)
+            rows = db.query(ScoreInvalidation)\
+                .filter(or_(
+                    ScoreInvalidation.invalidation_id > self._watermark,
+                    ScoreInvalidation.created_at >= since,
+                ))\
+                .order_by(ScoreInvalidation.invalidation_id)\
+                .limit(self.batch_size)\
+                .all()
+            rows = [row for row in rows if row.invalidation_id not in self._seen]
+
+            patient_ids = {int(row.entity_id) for row in rows if row.entity_type == PATIENT}
+            caregiver_ids = {int(row.entity_id) for row in rows if row.entity_type == CAREGIVER}
+
+            if caregiver_ids:
+                # 아웃박스의 간병인만 다시 조회 (updated_at 워터마크와 무관하게 늦게 커밋된 변경도 반영)
+                # → on_caregivers_changed 리스너가 캐시/사전 계산 점수 반영
+                get_caregiver_store().refresh_ids(db, caregiver_ids)
+                self.caregiver_refreshes += 1
+            if patient_ids:
+                self.patients_rescored += rescore_patients(db, patient_ids)
+
+            now = datetime.now(timezone.utc)
+            for row in rows:
+                self._seen[row.invalidation_id] = now
+                self._watermark = max(self._watermark, int(row.invalidation_id))
+            self._seen = {
+                invalidation_id: seen_at for invalidation_id, seen_at in self._seen.items()
+                if seen_at >= since
+            }
+            self.processed += len(rows)
+
+            if rows:
+                logger.info(
+                    f"🔄 점수 무효화 {len(rows)}건 반영: 환자 {len(patient_ids)}명, 간병인 {len(caregiver_ids)}명"
+                )
+
+            self._purge(db)
+            return patient_ids, caregiver_ids
+
+    def _purge(self, db: Session):
+        """보관 시간이 지난 아웃박스 행 삭제 (1시간에 한 번)"""
+        from app.models.matching import ScoreInvalidation
+
+        if time.monotonic() - self._last_purge < 3600:
+            return
+        self._last_purge = time.monotonic()
+
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=self.retention_hours)
+        deleted = db.query(ScoreInvalidation)\
+            .filter(ScoreInvalidation.created_at < cutoff)\
+            .delete(synchronize_session=False)
+        db.commit()
+        if deleted:
+            logger.info(f"🧹 점수 무효화 아웃박스 정리: {deleted}건")
+
+    def start(self, interval: Optional[float] = None):
+        """백그라운드 스레드에서 주기적으로 폴링"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        if interval is not None:
+            self.poll_interval = interval
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="score-invalidation", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """폴링 중지"""
+        self._stop_event.set()
+
+    def _loop(self):
+        from app.core.database import SessionLocal
+
+        while not self._stop_event.is_set():
+            db = SessionLocal()
+            try:
+                self.poll(db)
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"❌ 점수 무효화 폴링 실패: {e}")
+            finally:
+                db.close()
+            self._stop_event.wait(self.poll_interval)
+
+    def get_status(self) -> Dict:
+        return {
+            "watermark": self._watermark,
+            "processed": self.processed,
+            "patients_rescored": self.patients_rescored,
+            "caregiver_refreshes": self.caregiver_refreshes,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "last_error": self.last_error,
+        }
+
+
+# 전역 인스턴스 (프로세스 공유)
+_consumer: Optional[ScoreInvalidationConsumer] = None
+_consumer_lock = threading.Lock()
+
+
+def get_score_invalidation_consumer() -> ScoreInvalidationConsumer:
+    """ScoreInvalidationConsumer 싱글톤 인스턴스 반환"""
+    global _consumer
+
+    if _consumer is None:
+        with _consumer_lock:
+            if _consumer is None:
+                from app.core.config import get_settings
+
+                settings = get_settings()
+                _consumer = ScoreInvalidationConsumer(
+                    poll_interval=settings.SCORE_INVALIDATION_POLL_SECONDS,
+                    retention_hours=settings.SCORE_INVALIDATION_RETENTION_HOURS,
+                )
+
+    return _consumer
+
+
+def outbox_table_exists(bind=None) -> bool:
+    """아웃박스 테이블(score_invalidations) 존재 여부 (migrations/005 적용 확인, 기본값은 앱 DB 엔진)"""
+    from sqlalchemy import inspect
+
+    from app.models.matching import ScoreInvalidation
+
+    if bind is None:
+        from app.core.database import engine as bind
+
+    return inspect(bind).has_table(ScoreInvalidation.__tablename__)
+
+
+def start_score_invalidation() -> bool:
+    """
+    변경 추적 설치, 간병인 저장소 리스너 등록, 아웃박스 폴링 시작
+
+    아웃박스 테이블이 없으면 flush마다 INSERT가 실패해 같은 트랜잭션(환자 등록, 성향 검사 등)까지
+    깨지므로 추적을 설치하지 않습니다.
+
+    Returns:
+        bool: 시작 여부
+    """
+    try:
+        table_exists = outbox_table_exists()
+    except Exception as e:
+        logger.error(f"❌ 점수 무효화 아웃박스 테이블 확인 실패 - 변경 추적을 시작하지 않습니다: {e}")
+        return False
+    if not table_exists:
+        logger.error(
+            "❌ score_invalidations 테이블이 없어 점수 무효화 변경 추적을 시작하지 않습니다 "
+            "(migrations/005_create_score_invalidations.sql 적용 필요)"
+        )
+        return False
+
+    install_change_tracking()
+    get_caregiver_store().add_change_listener(on_caregivers_changed)
+    get_score_invalidation_consumer().start()
+    return True
+
+
+def stop_score_invalidation():
+    """아웃박스 폴링 중지"""
+    get_score_invalidation_consumer().stop()
@@ -0,0 +1,814 @@
+# ========================================
+# 늘봄케어 매칭 모델 - 사전 계산 점수 행렬 (야간 배치)
+# ========================================
+# 파일: score_matrix.py
+# 설명: 활성 환자별 상위 M명 간병인 점수를 멀티프로세스로 미리 계산하여 .npz로 저장하고, 입력이 같으면 추천에 재사용
+#       (성향/프로필 변경 시 바뀐 환자 행·간병인 열만 워커 메모리에서 증분 재계산)
+
+import argparse
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import logging
+
+from .caregiver_store import CaregiverSnapshot
+from .feature_engineering import FeatureEngineer, PERSONALITY_TYPES
+from .retrieval import select_top_k
+
+logger = logging.getLogger(__name__)
+
+# 워커 프로세스 하나가 한 번에 처리하는 환자 수
+_PATIENT_CHUNK = 32
+
+# 간병인 점수 입력 컬럼 (성격 4개 + 경력 + 전문분야 수) - 바뀐 간병인 확인용
+CAREGIVER_INPUT_COLUMNS = [f"{ptype}_score" for ptype in PERSONALITY_TYPES] + [
+    "experience_years",
+    "specialty_count",
+]
+
+
+def caregiver_inputs(snapshot: CaregiverSnapshot) -> np.ndarray:
+    """스냅샷 → (N, 6) 점수 계산 입력 (FeatureEngineer.create_feature_matrix_from_db_data 인자와 같은 값)"""
+    return np.column_stack([
+        snapshot.personality,
+        snapshot.experience_years.astype(np.float64),
+        snapshot.specialty_counts.astype(np.float64),
+    ])
+
+
+def score_pairs(
+    model,
+    feature_columns: Sequence[str],
+    patient_personality: np.ndarray,
+    caregiver_personality: np.ndarray,
+    caregiver_specialty_counts: np.ndarray,
+    caregiver_experience: np.ndarray,
+    engineer: Optional[FeatureEngineer] = None
+) -> np.ndarray:
+    """
+    환자 P명 × 간병인 C명 점수 (특성을 모두 만든 뒤 한 번에 예측)
+
+    Args:
+        model: 예측 모델 (ServedModel.model)
+        feature_columns: 모델 입력 특성 순서
+        patient_personality: (P, 4) 환자 성격 점수 (PERSONALITY_TYPES 순서)
+        caregiver_personality / caregiver_specialty_counts / caregiver_experience: 간병인 C명 컬럼
+
+    Returns:
+        np.ndarray: (P, C) float64 점수
+    """
+    engineer = engineer or FeatureEngineer()
+    patient_personality = np.asarray(patient_personality, dtype=np.float64).reshape(-1, len(PERSONALITY_TYPES))
+    p, c = len(patient_personality), len(caregiver_personality)
+    if p == 0 or c == 0:
+        return np.zeros((p, c), dtype=np.float64)
+
+    order = [engineer.feature_columns.index(col) for col in feature_columns]
+    X = np.concatenate([
+        engineer.create_feature_matrix_from_db_data(
+            patient_personality=dict(zip([f"{ptype}_score" for ptype in PERSONALITY_TYPES], personality.tolist())),
+            caregiver_personality=caregiver_personality,
+            caregiver_specialties_count=caregiver_specialty_counts,
+            caregiver_experience=caregiver_experience,
+        )
+        for personality in patient_personality
+    ])
+    X = np.ascontiguousarray(X[:, order])
+    return np.asarray(model.predict(X), dtype=np.float64).reshape(p, c)
+
+
+def _select_top_m(predicted: np.ndarray, width: int) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    한 환자의 전체 간병인 점수 → 상위 M명 (실시간 추천과 같은 방식: 반올림 점수, 동점은 저장소 순서)
+
+    Returns:
+        (positions (width,) -1 채움, scores (width,) float32, boundary - 전체를 담았으면 NaN)
+    """
+    n = len(predicted)
+    top_m = min(width, n)
+    rounded = np.round(predicted, 1)
+    selected = select_top_k(rounded, top_m)
+
+    positions = np.full(width, -1, dtype=np.int64)
+    scores = np.zeros(width, dtype=np.float32)
+    positions[:top_m] = selected
+    scores[:top_m] = predicted[selected]
+    boundary = float(rounded[selected[-1]]) if top_m < n else np.nan
+    return positions, scores, boundary
+
+
+class ScoreMatrix:
+    """
+    환자 × 간병인 사전 계산 점수 (환자별 상위 M명)
+
+    각 행은 실시간 추천과 같은 순서(반올림 점수 내림차순, 동점은 간병인 저장소 순서)로 정렬되어 있고,
+    M번째 점수(boundary)보다 높은 점수는 상위 M명 밖에 없으므로, 후보 필터를 적용한 뒤에도
+    k번째 점수가 boundary보다 높으면 실시간으로 전체 후보를 계산한 결과와 같습니다.
+
+    다음 경우에는 None을 반환하여 실시간 계산으로 넘깁니다.
+        - 사전 계산에 없는 환자, 요청의 환자 성격 점수가 계산 당시와 다름
+        - 환자에게 배정된 모델 버전이 계산 당시 버전과 다름
+        - 후보 중 계산 이후 추가되었거나 점수 입력(성격/경력/전문분야 수)이 바뀐 간병인이 있음
+        - 필터를 통과한 상위 k명을 사전 계산 범위 안에서 확정할 수 없음
+    """
+
+    def __init__(
+        self,
+        model_tag: str,
+        feature_columns: Sequence[str],
+        built_at: str,
+        patient_ids: np.ndarray,
+        patient_personality: np.ndarray,
+        caregiver_ids: np.ndarray,
+        scores: np.ndarray,
+        boundary: np.ndarray,
+        caregiver_table_ids: np.ndarray,
+        caregiver_table_inputs: np.ndarray
+    ):
+        """
+        Args:
+            model_tag: 점수를 계산한 모델 버전 (ServedModel.tag)
+            feature_columns: 모델 입력 특성 순서
+            built_at: 계산 시각 (ISO)
+            patient_ids: (P,) 환자 ID
+            patient_personality: (P, 4) 계산에 사용한 환자 성격 점수 (PERSONALITY_TYPES 순서)
+            caregiver_ids: (P, M) 환자별 상위 간병인 ID (간병인이 M명보다 적으면 -1로 채움)
+            scores: (P, M) float32 모델 점수
+            boundary: (P,) 상위 M명 경계의 반올림 점수 (전체 간병인을 담았으면 NaN)
+            caregiver_table_ids: (N,) 계산 당시 간병인 ID
+            caregiver_table_inputs: (N, 6) 계산 당시 간병인 점수 입력 (CAREGIVER_INPUT_COLUMNS)
+        """
+        self.model_tag = model_tag
+        self.feature_columns = list(feature_columns)
+        self.built_at = built_at
+        self.patient_ids = patient_ids
+        self.patient_personality = patient_personality
+        self.caregiver_ids = caregiver_ids
+        self.scores = scores
+        self.boundary = boundary
+        self.caregiver_table_ids = caregiver_table_ids
+        self.caregiver_table_inputs = caregiver_table_inputs
+
+        self.rows: Dict[int, int] = {pid: i for i, pid in enumerate(patient_ids.tolist())}
+        self._table_rows: Dict[int, int] = {cg_id: i for i, cg_id in enumerate(caregiver_table_ids.tolist())}
+
+        # 스냅샷 버전별 "계산 이후 바뀐 간병인" 마스크 (스냅샷 행 순서)
+        self._changed_cache: Optional[Tuple[int, int, np.ndarray]] = None
+        self._changed_lock = threading.Lock()
+
+    @property
+    def top_m(self) -> int:
+        return self.caregiver_ids.shape[1] if self.caregiver_ids.ndim == 2 else 0
+
+    def __len__(self) -> int:
+        return len(self.patient_ids)
+
+    # ------------------------------------------------------------------
+    # 저장 / 로드
+    # ------------------------------------------------------------------
+
+    def save(self, path: Path) -> Path:
+        """.npz 저장 (임시 파일 → rename으로 원자적 교체, 서비스 중인 워커는 mtime으로 변경 감지)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(
+            tmp,
+            model_tag=np.array(self.model_tag),
+            feature_columns=np.array(self.feature_columns),
+            built_at=np.array(self.built_at),
+            patient_ids=self.patient_ids,
+            patient_personality=self.patient_personality,
+            caregiver_ids=self.caregiver_ids,
+            scores=self.scores,
+            boundary=self.boundary,
+            caregiver_table_ids=self.caregiver_table_ids,
+            caregiver_table_inputs=self.caregiver_table_inputs,
+        )
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "ScoreMatrix":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                model_tag=str(data["model_tag"]),
+                feature_columns=data["feature_columns"].tolist(),
+                built_at=str(data["built_at"]),
+                patient_ids=data["patient_ids"],
+                patient_personality=data["patient_personality"],
+                caregiver_ids=data["caregiver_ids"],
+                scores=data["scores"],
+                boundary=data["boundary"],
+                caregiver_table_ids=data["caregiver_table_ids"],
+                caregiver_table_inputs=data["caregiver_table_inputs"],
+            )
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def changed_mask(self, snapshot: CaregiverSnapshot) -> np.ndarray:
+        """스냅샷 행별로 계산 이후 추가되었거나 점수 입력이 바뀐 간병인 여부 (스냅샷 버전별 1회 계산)"""
+        cached = self._changed_cache
+        if cached is not None and cached[0] == snapshot.version and cached[1] == len(snapshot):
+            return cached[2]
+
+        with self._changed_lock:
+            rows = np.fromiter(
+                (self._table_rows.get(cg_id, -1) for cg_id in snapshot.caregiver_ids.tolist()),
+                dtype=np.int64,
+                count=len(snapshot),
+            )
+            known = rows >= 0
+            changed = ~known
+            changed[known] = np.any(
+                caregiver_inputs(snapshot)[known] != self.caregiver_table_inputs[rows[known]], axis=1
+            )
+            self._changed_cache = (snapshot.version, len(snapshot), changed)
+            return changed
+
+    def lookup(
+        self,
+        patient_id: int,
+        patient_personality: Dict[str, float],
+        model_tag: Optional[str],
+        snapshot: CaregiverSnapshot,
+        candidate_indices: np.ndarray,
+        top_k: int
+    ) -> Tuple[Optional[Tuple[np.ndarray, np.ndarray]], str]:
+        """
+        필터를 통과한 후보 중 상위 top_k명
+
+        Args:
+            patient_id: 환자 ID
+            patient_personality: 요청의 환자 성격 점수
+            model_tag: 이 환자의 점수를 계산할 모델 버전
+            snapshot: 현재 간병인 스냅샷
+            candidate_indices: 필터를 통과한 후보의 스냅샷 행 번호 (오름차순)
+            top_k: 추천 수
+
+        Returns:
+            ((스냅샷 행 번호, 점수), "hit") 또는 (None, 실시간 계산 사유)
+        """
+        row = self.rows.get(patient_id)
+        if row is None:
+            return None, "patient"
+
+        requested = np.array(
+            [float(patient_personality.get(f"{ptype}_score", 50)) for ptype in PERSONALITY_TYPES]
+        )
+        if not np.array_equal(requested, self.patient_personality[row]):
+            return None, "personality"
+
+        if model_tag != self.model_tag:
+            return None, "model"
+
+        candidate_indices = np.asarray(candidate_indices, dtype=np.int64)
+        if self.changed_mask(snapshot)[candidate_indices].any():
+            return None, "caregivers"
+
+        # 사전 계산 순서대로 후보만 남김 (삭제된 간병인은 스냅샷에 없으므로 제외)
+        is_candidate = np.zeros(len(snapshot), dtype=bool)
+        is_candidate[candidate_indices] = True
+        positions = np.fromiter(
+            (snapshot.positions.get(cg_id, -1) for cg_id in self.caregiver_ids[row].tolist()),
+            dtype=np.int64,
+            count=self.top_m,
+        )
+        keep = positions >= 0
+        keep[keep] = is_candidate[positions[keep]]
+        positions = positions[keep]
+        scores = self.scores[row][keep].astype(np.float64)
+
+        # 동점은 실시간 추천처럼 현재 스냅샷 순서로 (저장소 갱신으로 행 순서가 바뀌었을 수 있음)
+        order = np.lexsort((positions, -np.round(scores, 1)))[:top_k]
+        positions = positions[order]
+        scores = scores[order]
+
+        boundary = self.boundary[row]
+        if not np.isnan(boundary):
+            # 상위 M명 밖의 간병인이 k명 안에 들 수 있으면(경계 점수 동점 포함) 확정 불가
+            if (
+                len(positions) == 0
+                or len(positions) < min(top_k, len(candidate_indices))
+                or np.round(scores[-1], 1) <= boundary
+            ):
+                return None, "boundary"
+
+        return (positions, scores), "hit"
+
+    # ------------------------------------------------------------------
+    # 증분 재계산 (성향/프로필 변경)
+    # ------------------------------------------------------------------
+
+    def with_caregiver_changes(self, snapshot: CaregiverSnapshot, served) -> Tuple["ScoreMatrix", int]:
+        """
+        계산 이후 추가되었거나 점수 입력이 바뀐 간병인 열만 다시 계산한 새 행렬 (기존 행렬은 변경하지 않음)
+
+        각 환자 행에서 바뀐 간병인의 이전 점수를 빼고, 새 점수가 경계보다 높으면 넣습니다.
+        상위 M명을 넘치면 가장 낮은 항목을 빼고 경계를 그 점수로 올리므로
+        "저장되지 않은 간병인의 점수 ≤ 경계" 조건이 유지됩니다.
+
+        Args:
+            snapshot: 현재 간병인 스냅샷
+            served: 행렬과 같은 모델 버전의 ServedModel
+
+        Returns:
+            (새 행렬, 다시 계산한 간병인 수)
+        """
+        changed = np.flatnonzero(self.changed_mask(snapshot))
+        if len(changed) == 0:
+            return self, 0
+
+        changed_ids = snapshot.caregiver_ids[changed]
+        new_scores = score_pairs(
+            served.model,
+            served.feature_columns,
+            self.patient_personality,
+            snapshot.personality[changed],
+            snapshot.specialty_counts[changed],
+            snapshot.experience_years[changed],
+        )
+
+        width = self.top_m
+        caregiver_ids = np.full_like(self.caregiver_ids, -1)
+        scores = np.zeros_like(self.scores)
+        boundary = self.boundary.copy()
+
+        for row in range(len(self)):
+            ids = self.caregiver_ids[row]
+            keep = (ids >= 0) & ~np.isin(ids, changed_ids)
+            row_boundary = boundary[row]
+            eligible = (
+                np.ones(len(changed), dtype=bool) if np.isnan(row_boundary)
+                else np.round(new_scores[row], 1) > row_boundary
+            )
+
+            merged_ids = np.concatenate([ids[keep], changed_ids[eligible]])
+            merged_scores = np.concatenate([self.scores[row][keep].astype(np.float64), new_scores[row][eligible]])
+            rounded = np.round(merged_scores, 1)
+            order = np.argsort(-rounded, kind="stable")
+            if len(order) > width:
+                evicted = float(rounded[order[width:]].max())
+                boundary[row] = evicted if np.isnan(row_boundary) else max(float(row_boundary), evicted)
+                order = order[:width]
+
+            caregiver_ids[row, :len(order)] = merged_ids[order]
+            scores[row, :len(order)] = merged_scores[order]
+
+        stale = np.isin(self.caregiver_table_ids, changed_ids)
+        matrix = ScoreMatrix(
+            model_tag=self.model_tag,
+            feature_columns=self.feature_columns,
+            built_at=self.built_at,
+            patient_ids=self.patient_ids,
+            patient_personality=self.patient_personality,
+            caregiver_ids=caregiver_ids,
+            scores=scores,
+            boundary=boundary,
+            caregiver_table_ids=np.concatenate([self.caregiver_table_ids[~stale], changed_ids]),
+            caregiver_table_inputs=np.concatenate([
+                self.caregiver_table_inputs[~stale], caregiver_inputs(snapshot)[changed]
+            ]),
+        )
+        return matrix, len(changed)
+
+    def with_patients(
+        self,
+        patient_ids: Sequence[int],
+        patient_personality: np.ndarray,
+        snapshot: CaregiverSnapshot,
+        served
+    ) -> "ScoreMatrix":
+        """
+        환자 행만 현재 간병인 전체와 다시 계산한 새 행렬 (없는 환자는 추가)
+
+        간병인 열이 스냅샷과 같아야 하므로 with_caregiver_changes를 먼저 적용한 행렬에서 호출합니다.
+
+        Args:
+            patient_ids: 다시 계산할 환자 ID
+            patient_personality: (len(patient_ids), 4) 현재 환자 성격 점수
+            snapshot: 현재 간병인 스냅샷
+            served: 행렬과 같은 모델 버전의 ServedModel
+        """
+        patient_ids = np.asarray(patient_ids, dtype=np.int64)
+        patient_personality = np.asarray(patient_personality, dtype=np.float64).reshape(-1, len(PERSONALITY_TYPES))
+        if len(patient_ids) == 0:
+            return self
+
+        predicted = score_pairs(
+            served.model,
+            served.feature_columns,
+            patient_personality,
+            snapshot.personality,
+            snapshot.specialty_counts,
+            snapshot.experience_years,
+        )
+
+        width = self.top_m
+        added = len(set(patient_ids.tolist()) - set(self.rows))
+
+        all_patient_ids = np.concatenate([self.patient_ids, np.zeros(added, dtype=np.int64)])
+        all_personality = np.concatenate([self.patient_personality, np.zeros((added, len(PERSONALITY_TYPES)))])
+        caregiver_ids = np.concatenate([self.caregiver_ids, np.full((added, width), -1, dtype=np.int64)])
+        scores = np.concatenate([self.scores, np.zeros((added, width), dtype=np.float32)])
+        boundary = np.concatenate([self.boundary, np.full(added, np.nan, dtype=np.float32)])
+
+        rows = dict(self.rows)
+        for i, pid in enumerate(patient_ids.tolist()):
+            row = rows.setdefault(pid, len(rows))
+            positions, row_scores, row_boundary = _select_top_m(predicted[i], width)
+            all_patient_ids[row] = pid
+            all_personality[row] = patient_personality[i]
+            caregiver_ids[row] = np.where(
+                positions >= 0, snapshot.caregiver_ids[np.maximum(positions, 0)], -1
+            ) if len(snapshot) else positions
+            scores[row] = row_scores
+            boundary[row] = row_boundary
+
+        return ScoreMatrix(
+            model_tag=self.model_tag,
+            feature_columns=self.feature_columns,
+            built_at=self.built_at,
+            patient_ids=all_patient_ids,
+            patient_personality=all_personality,
+            caregiver_ids=caregiver_ids,
+            scores=scores,
+            boundary=boundary,
+            caregiver_table_ids=self.caregiver_table_ids,
+            caregiver_table_inputs=self.caregiver_table_inputs,
+        )
+
+
+# ----------------------------------------------------------------------
+# 배치 계산 (멀티프로세스)
+# ----------------------------------------------------------------------
+
+# 워커 프로세스 전역 상태 (_init_worker에서 설정)
+_worker: Dict = {}
+
+
+def _init_worker(
+    model_dir: str,
+    version: str,
+    digest: str,
+    inference_backend: str,
+    caregiver_personality: np.ndarray,
+    caregiver_experience: np.ndarray,
+    caregiver_specialty_counts: np.ndarray,
+    top_m: int
+):
+    """워커 프로세스 초기화: 같은 모델 버전 로드 (파일 해시 확인), 간병인 컬럼 보관"""
+    from .model_registry import ModelRegistry
+
+    served = ModelRegistry(Path(model_dir), version, inference_backend=inference_backend).load(version)
+    if served.digest != digest:
+        raise RuntimeError(f"모델 버전 {version} 파일이 계산 중에 바뀌었습니다")
+    # 프로세스 단위로 병렬 처리하므로 예측은 스레드 1개
+    if hasattr(served.model, "get_booster"):
+        served.model.set_params(n_jobs=1)
+
+    _worker.update(
+        model=served.model,
+        feature_columns=served.feature_columns,
+        engineer=FeatureEngineer(),
+        caregiver_personality=caregiver_personality,
+        caregiver_experience=caregiver_experience,
+        caregiver_specialty_counts=caregiver_specialty_counts,
+        top_m=top_m,
+    )
+
+
+def _score_patients(patient_personality: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    환자 c명 × 전체 간병인 점수 → 환자별 상위 M명
+
+    Returns:
+        (positions (c, M) int64, scores (c, M) float32, boundary (c,) float32)
+    """
+    width = _worker["top_m"]
+    positions = np.full((len(patient_personality), width), -1, dtype=np.int64)
+    scores = np.zeros((len(patient_personality), width), dtype=np.float32)
+    boundary = np.full(len(patient_personality), np.nan, dtype=np.float32)
+
+    for i, personality in enumerate(patient_personality):
+        # 환자 1명씩 예측 (간병인 전체 특성 행렬을 한 번에 하나만 만듦)
+        predicted = score_pairs(
+            _worker["model"],
+            _worker["feature_columns"],
+            personality,
+            _worker["caregiver_personality"],
+            _worker["caregiver_specialty_counts"],
+            _worker["caregiver_experience"],
+            engineer=_worker["engineer"],
+        )[0]
+        positions[i], scores[i], boundary[i] = _select_top_m(predicted, width)
+
+    return positions, scores, boundary
+
+
+def build_score_matrix(db, registry, top_m: int = 200, workers: int = 0) -> ScoreMatrix:
+    """
+    활성 환자(삭제되지 않고 성격 검사 결과가 있는 환자) × 전체 간병인 점수 계산
+
+    Args:
+        db: 데이터베이스 세션
+        registry: 모델 레지스트리 (활성 버전으로 계산)
+        top_m: 환자별로 저장할 상위 간병인 수
+        workers: 프로세스 수 (0이면 CPU 코어 수)
+
+    Returns:
+        ScoreMatrix
+    """
+    from app.models.care_details import PatientPersonality
+    from app.models.profile import Patient
+    from .caregiver_store import CaregiverFeatureStore
+
+    # 간병인: 실시간 추천과 같은 저장소 규칙(기본값 포함)으로 스냅샷 생성
+    snapshot = CaregiverFeatureStore().refresh(db)
+
+    patients = db.query(PatientPersonality)\
+        .join(Patient, PatientPersonality.patient_id == Patient.patient_id)\
+        .filter(Patient.is_deleted == False)\
+        .order_by(PatientPersonality.patient_id)\
+        .all()
+
+    patient_ids = np.array([int(p.patient_id) for p in patients], dtype=np.int64)
+    patient_personality = np.array(
+        [[float(getattr(p, f"{ptype}_score") or 0) for ptype in PERSONALITY_TYPES] for p in patients],
+        dtype=np.float64,
+    ).reshape(len(patients), len(PERSONALITY_TYPES))
+
+    return compute_score_matrix(registry, snapshot, patient_ids, patient_personality, top_m, workers)
+
+
+def compute_score_matrix(
+    registry,
+    snapshot: CaregiverSnapshot,
+    patient_ids: np.ndarray,
+    patient_personality: np.ndarray,
+    top_m: int = 200,
+    workers: int = 0
+) -> ScoreMatrix:
+    """
+    환자 × 스냅샷 전체 간병인 점수를 프로세스 풀로 계산 (DB 조회 없음)
+
+    Args:
+        registry: 모델 레지스트리 (활성 버전으로 계산)
+        snapshot: 간병인 스냅샷
+        patient_ids: (P,) 환자 ID
+        patient_personality: (P, 4) 환자 성격 점수 (PERSONALITY_TYPES 순서)
+        top_m: 환자별로 저장할 상위 간병인 수
+        workers: 프로세스 수 (0이면 CPU 코어 수)
+    """
+    started = time.perf_counter()
+    served = registry.current()
+
+    workers = workers or os.cpu_count() or 1
+    logger.info(
+        f"📊 점수 행렬 계산: 환자 {len(patient_ids)}명 × 간병인 {len(snapshot)}명 "
+        f"(모델 {served.tag}, 상위 {top_m}명, 프로세스 {workers}개)"
+    )
+
+    chunks = [
+        patient_personality[start:start + _PATIENT_CHUNK]
+        for start in range(0, len(patient_ids), _PATIENT_CHUNK)
+    ]
+    results = []
+    if chunks and len(snapshot):
+        # spawn: 부모 프로세스의 스레드 풀(xgboost/onnxruntime) 상태를 물려받지 않도록 새 프로세스 사용
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(
+                str(registry.model_dir),
+                served.version,
+                served.digest,
+                served.backend,
+                snapshot.personality,
+                snapshot.experience_years,
+                snapshot.specialty_counts,
+                top_m,
+            ),
+        ) as executor:
+            results = list(executor.map(_score_patients, chunks))
+
+    if results:
+        positions = np.concatenate([r[0] for r in results])
+        scores = np.concatenate([r[1] for r in results])
+        boundary = np.concatenate([r[2] for r in results])
+    else:
+        positions = np.full((0, top_m), -1, dtype=np.int64)
+        scores = np.zeros((0, top_m), dtype=np.float32)
+        boundary = np.zeros(0, dtype=np.float32)
+
+    caregiver_ids = np.where(positions >= 0, snapshot.caregiver_ids[np.maximum(positions, 0)], -1) \
+        if len(snapshot) else positions
+
+    matrix = ScoreMatrix(
+        model_tag=served.tag,
+        feature_columns=served.feature_columns,
+        built_at=datetime.utcnow().isoformat(),
+        patient_ids=patient_ids,
+        patient_personality=patient_personality,
+        caregiver_ids=caregiver_ids,
+        scores=scores,
+        boundary=boundary,
+        caregiver_table_ids=snapshot.caregiver_ids.copy(),
+        caregiver_table_inputs=caregiver_inputs(snapshot),
+    )
+    logger.info(f"✅ 점수 행렬 계산 완료: {len(matrix)}명 ({time.perf_counter() - started:.1f}초)")
+    return matrix
+
+
+# ----------------------------------------------------------------------
+# 서비스용 로더
+# ----------------------------------------------------------------------
+
+class ScoreMatrixStore:
+    """
+    사전 계산 점수 파일 로더 (파일이 바뀌면 다시 로드)
+
+    야간 배치가 파일을 원자적으로 교체하므로, 요청마다 mtime만 확인하고
+    바뀐 경우에만 새 ScoreMatrix를 로드하여 참조를 교체합니다.
+    """
+
+    def __init__(self, path: Path, enabled: bool = True):
+        self.path = Path(path)
+        self.enabled = enabled
+
+        self._matrix: Optional[ScoreMatrix] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._load_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses: Dict[str, int] = {}
+        self.rescored_caregivers = 0
+        self.rescored_patients = 0
+
+    def get(self) -> Optional[ScoreMatrix]:
+        """현재 점수 행렬 (파일이 없거나 비활성화되어 있으면 None)"""
+        if not self.enabled:
+            return None
+        try:
+            stat = self.path.stat()
+        except OSError:
+            self._matrix = None
+            return None
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature != self._signature:
+            with self._load_lock:
+                if signature != self._signature:
+                    try:
+                        self._matrix = ScoreMatrix.load(self.path)
+                        logger.info(
+                            f"✅ 사전 계산 점수 로드: 환자 {len(self._matrix)}명 "
+                            f"(모델 {self._matrix.model_tag}, {self._matrix.built_at})"
+                        )
+                    except Exception as e:
+                        self._matrix = None
+                        logger.error(f"❌ 사전 계산 점수 로드 실패 - 실시간 계산 사용: {e}")
+                    self._signature = signature
+        return self._matrix
+
+    def apply_caregiver_changes(self, snapshot: CaregiverSnapshot, served) -> int:
+        """
+        바뀐 간병인 열만 다시 계산하여 행렬 교체 (파일은 그대로, 다음 야간 배치에서 전체 재계산)
+
+        Returns:
+            int: 다시 계산한 간병인 수 (행렬이 없거나 모델 버전이 다르면 0)
+        """
+        if self.get() is None:
+            return 0
+        with self._load_lock:
+            matrix = self._matrix
+            if matrix is None or served.tag != matrix.model_tag:
+                return 0
+            self._matrix, rescored = matrix.with_caregiver_changes(snapshot, served)
+        self.rescored_caregivers += rescored
+        if rescored:
+            logger.info(f"🔄 사전 계산 점수 증분 갱신: 간병인 {rescored}명 × 환자 {len(matrix)}명")
+        return rescored
+
+    def rescore_patients(
+        self,
+        patient_ids: Sequence[int],
+        patient_personality: np.ndarray,
+        snapshot: CaregiverSnapshot,
+        served
+    ) -> int:
+        """
+        환자 행만 다시 계산하여 행렬 교체 (바뀐 간병인 열도 함께 반영)
+
+        Returns:
+            int: 다시 계산한 환자 수 (행렬이 없거나 모델 버전이 다르면 0)
+        """
+        if self.get() is None or len(patient_ids) == 0:
+            return 0
+        with self._load_lock:
+            matrix = self._matrix
+            if matrix is None or served.tag != matrix.model_tag:
+                return 0
+            matrix, rescored = matrix.with_caregiver_changes(snapshot, served)
+            self._matrix = matrix.with_patients(patient_ids, patient_personality, snapshot, served)
+        self.rescored_caregivers += rescored
+        self.rescored_patients += len(patient_ids)
+        logger.info(f"🔄 사전 계산 점수 증분 갱신: 환자 {len(patient_ids)}명 × 간병인 {len(snapshot)}명")
+        return len(patient_ids)
+
+    def record(self, reason: str):
+        """조회 결과 기록 ("hit" 또는 실시간 계산 사유)"""
+        with self._stats_lock:
+            if reason == "hit":
+                self.hits += 1
+            else:
+                self.misses[reason] = self.misses.get(reason, 0) + 1
+
+    def get_stats(self) -> Dict:
+        matrix = self._matrix
+        misses = sum(self.misses.values())
+        total = self.hits + misses
+        return {
+            "enabled": self.enabled,
+            "path": str(self.path),
+            "loaded": matrix is not None,
+            "patients": len(matrix) if matrix is not None else 0,
+            "top_m": matrix.top_m if matrix is not None else 0,
+            "model_version": matrix.model_tag if matrix is not None else None,
+            "built_at": matrix.built_at if matrix is not None else None,
+            "hits": self.hits,
+            "misses": dict(self.misses),
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "rescored_caregivers": self.rescored_caregivers,
+            "rescored_patients": self.rescored_patients,
+        }
+
+
+def default_score_matrix_path() -> Path:
+    return Path(__file__).parent.parent.parent.parent / "models" / "score_matrix.npz"
+
+
+# 전역 인스턴스 (프로세스 공유)
+_score_matrix_store: Optional[ScoreMatrixStore] = None
+_score_matrix_store_lock = threading.Lock()
+
+
+def get_score_matrix_store() -> ScoreMatrixStore:
+    """ScoreMatrixStore 싱글톤 인스턴스 반환"""
+    global _score_matrix_store
+
+    if _score_matrix_store is None:
+        with _score_matrix_store_lock:
+            if _score_matrix_store is None:
+                from app.core.config import get_settings
+
+                settings = get_settings()
+                _score_matrix_store = ScoreMatrixStore(
+                    path=Path(settings.SCORE_MATRIX_PATH) if settings.SCORE_MATRIX_PATH else default_score_matrix_path(),
+                    enabled=settings.SCORE_MATRIX_ENABLED,
+                )
+
+    return _score_matrix_store
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    야간 배치 진입점
+
+    python -m app.services.matching.score_matrix [--top-m 200] [--workers 0] [--output 경로]
+    """
+    from app.core.config import get_settings
+    from app.core.database import SessionLocal
+    from .model_registry import get_model_registry
+
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="활성 환자별 상위 간병인 점수 사전 계산")
+    parser.add_argument("--top-m", type=int, default=settings.SCORE_MATRIX_TOP_M)
+    parser.add_argument("--workers", type=int, default=settings.SCORE_MATRIX_WORKERS)
+    parser.add_argument("--output", default=settings.SCORE_MATRIX_PATH or str(default_score_matrix_path()))
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        matrix = build_score_matrix(db, get_model_registry(), top_m=args.top_m, workers=args.workers)
+    finally:
+        db.close()
+
+    path = matrix.save(Path(args.output))
+    print(f"✅ {path} ({path.stat().st_size / 1024:.1f} KB, 환자 {len(matrix)}명, 모델 {matrix.model_tag})")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,174 @@
+# ========================================
+# 늘봄케어 매칭 모델 - 워커 간 메모리 공유 (preload)
+# ========================================
+# 파일: shared_memory.py
+# 설명: gunicorn --preload 마스터에서 모델/데이터를 미리 로드하고, 워커별 RSS/공유 메모리를 보고
+
+import gc
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# preload를 실행한 프로세스 (gunicorn 마스터) PID
+_preload_pid: Optional[int] = None
+
+
+def preload_shared_models():
+    """
+    매칭 모델과 전처리 데이터를 현재 프로세스에 로드하고 GC 추적 대상에서 고정
+
+    gunicorn --preload로 실행하면 마스터 프로세스에서 한 번만 로드되고, fork된 워커는
+    XGBoost booster와 DataFrame/numpy 배열 페이지를 copy-on-write로 공유합니다.
+    gc.freeze()는 이후 GC가 이 객체들의 헤더를 건드려 페이지가 복사되는 것을 막습니다.
+
+    fork 이전에는 예측을 실행하지 않습니다 (OpenMP 스레드 풀이 생성된 뒤 fork하면
+    워커에서 교착될 수 있음). 합성 예측 워밍업은 워커 시작 시 ModelWarmup이 실행합니다.
+    """
+    global _preload_pid
+
+    start = time.perf_counter()
+    logger.info("📦 매칭 모델 preload 시작 (fork 전 로드)...")
+
+    from .model_registry import get_model_registry
+    from .nuelbom_predictor import get_nuelbom_predictor
+    from .region_index import get_region_index
+    from .specialty_vocab import get_specialty_vocabulary
+
+    # 레지스트리 로드 시 합성 예측 생략 (워커 워밍업의 nuelbom_predictor 단계에서 확인)
+    registry = None
+    try:
+        registry = get_model_registry()
+        registry.validate_predict = False
+    except Exception as e:
+        logger.warning(f"⚠️ preload: 모델 레지스트리 생성 실패: {e}")
+
+    try:
+        predictor = get_nuelbom_predictor()
+        if predictor.regressor is None:
+            logger.warning("⚠️ preload: XGBoost 모델 로드 실패 - 워커에서 다시 시도합니다")
+
+        get_region_index()
+        get_specialty_vocabulary()
+
+        try:
+            from app.services.enhanced_matching_service import EnhancedMatchingService
+
+            EnhancedMatchingService.initialize()
+        except Exception as e:
+            logger.warning(f"⚠️ preload: XGBoost V2 서비스 로드 실패: {e}")
+    finally:
+        # fork 이후 워커에서 새로 로드/교체하는 버전은 다시 합성 예측으로 확인
+        if registry is not None:
+            registry.validate_predict = True
+
+    gc.collect()
+    gc.freeze()
+    _preload_pid = os.getpid()
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    rss_mb = _read_memory(os.getpid()).get("rss_mb")
+    logger.info(f"✅ 매칭 모델 preload 완료 ({elapsed_ms:.0f}ms, RSS {rss_mb}MB, 고정 객체 {gc.get_freeze_count()}개)")
+
+
+def get_memory_stats() -> Dict:
+    """
+    현재 워커의 메모리 사용량 및 preload 공유 현황
+
+    preload된 마스터에서 fork된 워커이면 같은 마스터의 다른 워커 메모리도 함께 보고합니다.
+    공유 절감량(shared_savings_mb)은 RSS - PSS, 즉 다른 프로세스와 나눠 쓰는 만큼
+    이 워커의 몫에서 빠진 메모리입니다. (/proc/<pid>/smaps_rollup이 있는 Linux에서만 제공)
+    """
+    pid = os.getpid()
+    inherited = _preload_pid is not None and _preload_pid != pid
+
+    stats = {
+        "pid": pid,
+        "preload": {
+            "enabled": _preload_pid is not None,
+            "master_pid": _preload_pid,
+            "inherited_from_master": inherited,
+            "frozen_objects": gc.get_freeze_count(),
+        },
+        "worker": _read_memory(pid),
+    }
+
+    if inherited:
+        workers = [_read_memory(child) for child in _child_pids(_preload_pid)]
+        workers = [w for w in workers if w]
+        stats["workers"] = workers
+        stats["totals"] = {
+            "workers": len(workers),
+            "rss_mb": round(sum(w.get("rss_mb", 0) for w in workers), 1),
+            "pss_mb": round(sum(w.get("pss_mb", 0) for w in workers), 1),
+            "shared_savings_mb": round(sum(w.get("shared_savings_mb", 0) for w in workers), 1),
+        }
+
+    return stats
+
+
+def _read_memory(pid: int) -> Dict:
+    """/proc/<pid>/smaps_rollup → RSS/PSS/공유/전용 메모리 (MB), 없으면 최대 RSS만"""
+    rollup = Path(f"/proc/{pid}/smaps_rollup")
+    try:
+        fields = {}
+        for line in rollup.read_text().splitlines():
+            parts = line.split()
+            if len(parts) >= 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    except OSError:
+        return _read_max_rss(pid)
+
+    def mb(*names: str) -> float:
+        return round(sum(fields.get(name, 0) for name in names) / 1024, 1)
+
+    return {
+        "pid": pid,
+        "rss_mb": mb("Rss"),
+        "pss_mb": mb("Pss"),
+        "shared_mb": mb("Shared_Clean", "Shared_Dirty"),
+        "private_mb": mb("Private_Clean", "Private_Dirty"),
+        "shared_savings_mb": round(mb("Rss") - mb("Pss"), 1),
+    }
+
+
+def _read_max_rss(pid: int) -> Dict:
+    """smaps_rollup이 없는 환경 (macOS 등): 현재 프로세스의 최대 RSS"""
+    if pid != os.getpid():
+        return {}
+
+    try:
+        import resource
+        import sys
+    except ImportError:
+        return {"pid": pid}
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 byte 단위
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {"pid": pid, "max_rss_mb": round(max_rss / divisor, 1)}
+
+
+def _child_pids(parent_pid: int) -> List[int]:
+    """parent_pid의 자식 프로세스 PID (/proc/<pid>/stat의 ppid 기준)"""
+    proc = Path("/proc")
+    if not proc.is_dir():
+        return []
+
+    children = []
+    for entry in proc.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # "pid (comm) state ppid ..." - comm에 공백/괄호가 있을 수 있어 마지막 ')' 이후를 파싱
+        fields = stat[stat.rfind(")") + 2:].split()
+        if len(fields) > 1 and int(fields[1]) == parent_pid:
+            children.append(int(entry.name))
+    return sorted(children)
@@ -0,0 +1,264 @@
+# ========================================
+# 늘봄케어 매칭 모델 - 전문분야/질병 어휘 (비트셋)
+# ========================================
+# 파일: specialty_vocab.py
+# 설명: 전문분야·질병 이름을 비트 위치로 변환하고 비트마스크로 일치율 계산
+
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+WORD_BITS = 64
+
+# numpy < 2.0 호환용 바이트 popcount 테이블
+_BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """
+    uint64 배열의 원소별 비트 개수
+
+    Args:
+        words: uint64 배열
+
+    Returns:
+        np.ndarray: 같은 shape의 비트 개수 배열
+    """
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words)
+    counts = _BYTE_POPCOUNT[words.view(np.uint8)]
+    return counts.reshape(words.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+def _as_name_list(names) -> List[str]:
+    """리스트/튜플이 아닌 값(문자열, None 등)은 빈 리스트로 처리"""
+    return list(names) if isinstance(names, (list, tuple)) else []
+
+
+class SpecialtyVocabulary:
+    """
+    전문분야/질병 어휘
+
+    전문분야와 질병 이름을 같은 비트 위치로 등록하여,
+    간병인의 전문분야를 비트마스크(uint64 word 배열)로 저장합니다.
+
+    일치율 = popcount(환자 마스크 & 간병인 마스크) / popcount(환자 마스크)
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        """
+        Args:
+            names: 미리 등록할 전문분야/질병 이름들
+        """
+        self._lock = threading.Lock()
+        self._bits: Dict[str, int] = {}
+        self._names: List[str] = []
+
+        self.register_many(names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def num_words(self) -> int:
+        """마스크 하나에 필요한 uint64 word 수"""
+        return max(1, (len(self._names) + WORD_BITS - 1) // WORD_BITS)
+
+    def register_many(self, names: Iterable[str]) -> np.ndarray:
+        """
+        이름들을 등록하고 비트 위치 배열 반환
+
+        Args:
+            names: 전문분야/질병 이름들
+
+        Returns:
+            np.ndarray: 비트 위치 배열 (int64)
+        """
+        names = [str(name) for name in names]
+        new_names = [name for name in dict.fromkeys(names) if name not in self._bits]
+
+        if new_names:
+            with self._lock:
+                for name in new_names:
+                    if name not in self._bits:
+                        self._bits[name] = len(self._names)
+                        self._names.append(name)
+
+        bits = self._bits
+        return np.fromiter((bits[name] for name in names), dtype=np.int64, count=len(names))
+
+    def get_name(self, bit: int) -> str:
+        """비트 위치 → 이름"""
+        return self._names[bit]
+
+    def encode(self, names: Sequence[str]) -> int:
+        """
+        이름 리스트 → 비트마스크 (Python int)
+
+        Args:
+            names: 전문분야/질병 리스트
+
+        Returns:
+            int: 비트마스크
+        """
+        mask = 0
+        for bit in self.register_many(_as_name_list(names)).tolist():
+            mask |= 1 << bit
+        return mask
+
+    def encode_many(self, names_lists: Sequence[Sequence[str]]) -> np.ndarray:
+        """
+        간병인 N명의 전문분야 리스트 → (N, W) uint64 비트마스크 행렬
+
+        Args:
+            names_lists: 간병인별 전문분야 리스트 (길이 N)
+
+        Returns:
+            np.ndarray: (N, num_words) uint64 비트마스크
+        """
+        names_lists = [_as_name_list(names) for names in names_lists]
+        n = len(names_lists)
+
+        lengths = np.fromiter((len(names) for names in names_lists), dtype=np.int64, count=n)
+        bits = self.register_many(name for names in names_lists for name in names)
+        rows = np.repeat(np.arange(n), lengths)
+
+        masks = np.zeros((n, self.num_words), dtype=np.uint64)
+        np.bitwise_or.at(
+            masks,
+            (rows, bits // WORD_BITS),
+            np.left_shift(np.uint64(1), (bits % WORD_BITS).astype(np.uint64))
+        )
+        return masks
+
+    def align(self, masks: np.ndarray, num_words: int) -> np.ndarray:
+        """어휘가 늘어난 뒤에도 이전 마스크를 쓸 수 있도록 word 수를 맞춤 (0으로 채움)"""
+        masks = np.asarray(masks, dtype=np.uint64)
+        if masks.ndim == 1:
+            masks = masks.reshape(1, -1)
+        if masks.shape[1] >= num_words:
+            return masks[:, :num_words]
+        padded = np.zeros((masks.shape[0], num_words), dtype=np.uint64)
+        padded[:, :masks.shape[1]] = masks
+        return padded
+
+    def match_ratio(
+        self,
+        patient_diseases: Sequence[str],
+        caregiver_specialties: Sequence[str]
+    ) -> float:
+        """
+        전문분야 일치율 (단일 쌍)
+
+        Args:
+            patient_diseases: 환자 질병 리스트
+            caregiver_specialties: 간병인 전문분야 리스트
+
+        Returns:
+            float: 일치율 (0~1)
+        """
+        if not patient_diseases or not caregiver_specialties:
+            return 0.0
+
+        patient_mask = self.encode(patient_diseases)
+        caregiver_mask = self.encode(caregiver_specialties)
+
+        if patient_mask.bit_count() == len(patient_diseases):
+            return (patient_mask & caregiver_mask).bit_count() / len(patient_diseases)
+
+        # 환자 질병에 중복이 있는 경우 중복 횟수만큼 반영
+        bits = self.register_many(patient_diseases).tolist()
+        matched = sum(1 for bit in bits if (caregiver_mask >> bit) & 1)
+        return matched / len(patient_diseases)
+
+    def match_ratios(
+        self,
+        patient_diseases: Sequence[str],
+        caregiver_masks: np.ndarray
+    ) -> np.ndarray:
+        """
+        간병인 N명에 대한 전문분야 일치율 (전체 풀 일괄 계산)
+
+        Args:
+            patient_diseases: 환자 질병 리스트
+            caregiver_masks: (N, W) uint64 간병인 전문분야 마스크
+
+        Returns:
+            np.ndarray: (N,) 일치율 (0~1)
+        """
+        caregiver_masks = np.asarray(caregiver_masks, dtype=np.uint64)
+        n = caregiver_masks.shape[0] if caregiver_masks.ndim > 1 else len(caregiver_masks)
+        patient_diseases = _as_name_list(patient_diseases)
+        if n == 0 or not patient_diseases:
+            return np.zeros(n, dtype=np.float64)
+
+        bits = self.register_many(patient_diseases)
+        num_words = self.num_words
+        caregiver_masks = self.align(caregiver_masks, num_words)
+
+        unique_bits, counts = np.unique(bits, return_counts=True)
+        if np.all(counts == 1):
+            patient_words = self._words_from_bits(unique_bits, num_words)
+            matched = popcount(caregiver_masks & patient_words).sum(axis=1)
+        else:
+            # 환자 질병에 중복이 있는 경우 중복 횟수만큼 반영
+            words = caregiver_masks[:, unique_bits // WORD_BITS]
+            shifts = (unique_bits % WORD_BITS).astype(np.uint64)
+            present = (np.right_shift(words, shifts) & np.uint64(1)).astype(np.int64)
+            matched = present @ counts
+
+        return matched / len(patient_diseases)
+
+    def any_match(
+        self,
+        patient_diseases: Sequence[str],
+        caregiver_masks: np.ndarray
+    ) -> np.ndarray:
+        """
+        "환자 질병 중 하나 이상을 전문분야로 가진 간병인" 마스크
+
+        Args:
+            patient_diseases: 환자 질병 리스트
+            caregiver_masks: (N, W) uint64 간병인 전문분야 마스크
+
+        Returns:
+            np.ndarray: (N,) bool 마스크
+        """
+        bits = self.register_many(_as_name_list(patient_diseases))
+        num_words = self.num_words
+        caregiver_masks = self.align(caregiver_masks, num_words)
+        patient_words = self._words_from_bits(bits, num_words)
+        return np.any(caregiver_masks & patient_words, axis=1)
+
+    @staticmethod
+    def _words_from_bits(bits: np.ndarray, num_words: int) -> np.ndarray:
+        """비트 위치 배열 → (W,) uint64 마스크"""
+        words = np.zeros(num_words, dtype=np.uint64)
+        np.bitwise_or.at(
+            words,
+            bits // WORD_BITS,
+            np.left_shift(np.uint64(1), (bits % WORD_BITS).astype(np.uint64))
+        )
+        return words
+
+
+# 전역 인스턴스 (프로세스 공유)
+_specialty_vocab: Optional[SpecialtyVocabulary] = None
+_specialty_vocab_lock = threading.Lock()
+
+
+def get_specialty_vocabulary() -> SpecialtyVocabulary:
+    """SpecialtyVocabulary 싱글톤 인스턴스 반환"""
+    global _specialty_vocab
+
+    if _specialty_vocab is None:
+        with _specialty_vocab_lock:
+            if _specialty_vocab is None:
+                _specialty_vocab = SpecialtyVocabulary()
+
+    return _specialty_vocab
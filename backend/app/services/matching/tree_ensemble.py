@@ -0,0 +1,221 @@
+# ========================================
+# 늘봄케어 매칭 모델 - 트리 앙상블 추론 (NumPy)
+# ========================================
+# 파일: tree_ensemble.py
+# 설명: XGBoost JSON 부스터를 평탄한 NumPy 배열로 변환하여 xgboost 없이 점수 계산
+
+import json
+from pathlib import Path
+from typing import Dict, List, Union
+
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 예측값 = base_score + Σ 리프 값 (변환 없음)인 목적 함수
+IDENTITY_OBJECTIVES = {
+    "reg:squarederror",
+    "reg:linear",
+    "reg:absoluteerror",
+    "reg:pseudohubererror",
+}
+
+# 한 번에 순회하는 최대 행 수 (노드 인덱스 행렬 메모리 제한)
+_ROW_CHUNK = 16384
+
+
+class TreeEnsembleModel:
+    """
+    XGBoost gbtree 회귀 모델의 NumPy 추론 엔진
+
+    모든 트리의 노드를 하나의 배열(분기 특성, 임계값, 왼쪽/오른쪽 자식, 결측 기본 방향,
+    리프 값)로 이어 붙이고, 전체 행 × 전체 트리를 최대 깊이만큼 한 번에 순회합니다.
+    xgboost와 같이 float32로 비교(x < 임계값이면 왼쪽, NaN은 default_left)하고
+    base_score부터 트리 순서대로 float32로 누적하므로 XGBRegressor.predict와 같은 값을 냅니다.
+    """
+
+    def __init__(
+        self,
+        split_feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        default_left: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        base_score: float,
+        num_feature: int,
+        feature_names: List[str] = None
+    ):
+        """
+        Args:
+            split_feature: (노드 수,) 분기 특성 인덱스 (리프는 0)
+            threshold: (노드 수,) float32 분기 임계값
+            left / right: (노드 수,) 전역 자식 노드 인덱스 (리프는 자기 자신)
+            default_left: (노드 수,) 결측값이면 왼쪽으로 가는지 여부
+            value: (노드 수,) float32 리프 값 (분기 노드는 0)
+            roots: (트리 수,) 각 트리의 루트 노드 인덱스
+            max_depth: 전체 트리 중 최대 깊이
+            base_score: 초기 예측값
+            num_feature: 입력 특성 수
+            feature_names: 특성 이름 (모델에 저장된 경우)
+        """
+        self.split_feature = split_feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        # children[2 * node + (오른쪽이면 1)] → 다음 노드
+        self.children = np.stack([left, right], axis=1).ravel()
+        self.default_left = default_left
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.base_score = np.float32(base_score)
+        self.num_feature = num_feature
+        self.feature_names = feature_names or []
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @classmethod
+    def from_json(cls, path: Union[str, Path]) -> "TreeEnsembleModel":
+        """XGBoost save_model(*.json) 파일에서 생성"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def from_xgboost(cls, model) -> "TreeEnsembleModel":
+        """학습된 XGBRegressor(또는 Booster)에서 생성"""
+        booster = model.get_booster() if hasattr(model, "get_booster") else model
+        return cls.from_dict(json.loads(bytes(booster.save_raw(raw_format="json"))))
+
+    @classmethod
+    def from_dict(cls, model: Dict) -> "TreeEnsembleModel":
+        """XGBoost JSON 모델 dict에서 생성"""
+        learner = model["learner"]
+
+        objective = learner["objective"]["name"]
+        if objective not in IDENTITY_OBJECTIVES:
+            raise ValueError(f"지원하지 않는 목적 함수입니다: {objective}")
+
+        booster = learner["gradient_booster"]
+        if booster["name"] != "gbtree":
+            raise ValueError(f"지원하지 않는 부스터입니다: {booster['name']}")
+
+        params = learner["learner_model_param"]
+        if int(params.get("num_target", 1)) > 1 or int(params.get("num_class", 0)) > 1:
+            raise ValueError("다중 출력 모델은 지원하지 않습니다.")
+
+        # xgboost 2.x는 "[5.7012066E1]", 이전 버전은 "5.7012066E1" 형식
+        base_score = float(str(params["base_score"]).strip("[]"))
+        num_feature = int(params["num_feature"])
+
+        split_feature, threshold, left, right, default_left, value = [], [], [], [], [], []
+        roots = []
+        max_depth = 0
+        offset = 0
+
+        for tree in booster["model"]["trees"]:
+            if any(int(t) != 0 for t in tree.get("split_type", [])):
+                raise ValueError("범주형 분기가 있는 트리는 지원하지 않습니다.")
+
+            tree_left = np.asarray(tree["left_children"], dtype=np.int64)
+            tree_right = np.asarray(tree["right_children"], dtype=np.int64)
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+            is_leaf = tree_left == -1
+            node_ids = np.arange(len(tree_left), dtype=np.int64)
+
+            # 리프는 자기 자신을 가리키게 하여 최대 깊이만큼 순회해도 리프에 머무름
+            left.append(np.where(is_leaf, node_ids, tree_left) + offset)
+            right.append(np.where(is_leaf, node_ids, tree_right) + offset)
+            split_feature.append(np.where(is_leaf, 0, tree["split_indices"]).astype(np.int64))
+            threshold.append(np.where(is_leaf, np.float32(0), conditions).astype(np.float32))
+            default_left.append(np.asarray(tree["default_left"], dtype=bool))
+            # 리프 노드의 split_conditions에 리프 값이 저장됨
+            value.append(np.where(is_leaf, conditions, np.float32(0)).astype(np.float32))
+
+            roots.append(offset)
+            max_depth = max(max_depth, _tree_depth(tree_left, tree_right))
+            offset += len(tree_left)
+
+        index_dtype = np.int32 if offset < np.iinfo(np.int32).max else np.int64
+
+        return cls(
+            split_feature=np.concatenate(split_feature).astype(index_dtype),
+            threshold=np.concatenate(threshold),
+            left=np.concatenate(left).astype(index_dtype),
+            right=np.concatenate(right).astype(index_dtype),
+            default_left=np.concatenate(default_left),
+            value=np.concatenate(value),
+            roots=np.asarray(roots, dtype=index_dtype),
+            max_depth=max_depth,
+            base_score=base_score,
+            num_feature=num_feature,
+            feature_names=learner.get("feature_names") or [],
+        )
+
+    def predict(self, X) -> np.ndarray:
+        """
+        점수 예측
+
+        Args:
+            X: (N, num_feature) 특성 행렬 (numpy 배열 또는 DataFrame, 모델 학습 시 컬럼 순서)
+
+        Returns:
+            np.ndarray: (N,) float32 예측값
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.num_feature:
+            raise ValueError(f"특성 수가 맞지 않습니다: {X.shape[1]} (모델: {self.num_feature})")
+
+        out = np.empty(X.shape[0], dtype=np.float32)
+        for start in range(0, X.shape[0], _ROW_CHUNK):
+            stop = min(start + _ROW_CHUNK, X.shape[0])
+            out[start:stop] = self._predict_chunk(X[start:stop])
+        return out
+
+    def _predict_chunk(self, X: np.ndarray) -> np.ndarray:
+        """(n, num_feature) float32 행렬 → (n,) float32 예측값"""
+        n = X.shape[0]
+        flat_X = np.ascontiguousarray(X).ravel()
+        has_missing = bool(np.isnan(flat_X).any())
+
+        # (트리 수, n) 현재 노드 인덱스 / 각 행의 flat_X 시작 위치
+        nodes = np.repeat(self.roots[:, None], n, axis=1)
+        row_offsets = np.arange(n, dtype=self.roots.dtype) * self.num_feature
+
+        # 인덱스는 항상 유효하므로 범위 검사 없이(mode="clip") 조회
+        for _ in range(self.max_depth):
+            feature = np.take(self.split_feature, nodes, mode="clip")
+            fvalue = np.take(flat_X, feature + row_offsets, mode="clip")
+            go_right = fvalue >= np.take(self.threshold, nodes, mode="clip")
+            if has_missing:
+                # NaN 비교는 항상 False이므로 결측값은 default_left 방향으로 보냄
+                missing = np.isnan(fvalue)
+                go_right |= missing & ~np.take(self.default_left, nodes, mode="clip")
+            nodes = np.take(self.children, nodes * 2 + go_right, mode="clip")
+
+        leaf_values = np.take(self.value, nodes, mode="clip")
+
+        # xgboost와 같은 순서로 float32 누적 (트리 순서, 쌍별 합산 사용 안 함)
+        out = np.full(n, self.base_score, dtype=np.float32)
+        for tree_values in leaf_values:
+            out += tree_values
+        return out
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    """트리의 최대 깊이 (루트 = 0, 리프까지의 간선 수)"""
+    depth = 0
+    frontier = [0]
+    while True:
+        children = [c for node in frontier for c in (left[node], right[node]) if c != -1]
+        if not children:
+            return depth
+        frontier = children
+        depth += 1
@@ -0,0 +1,239 @@
+# ========================================
+# 늘봄케어 매칭 모델 - 워밍업 / 준비 상태
+# ========================================
+# 파일: warmup.py
+# 설명: 워커 시작 시 모델·데이터·캐시를 미리 로드하고 합성 예측을 실행 (/ready 응답 기준)
+
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 워밍업 합성 예측에 쓰는 성격 점수
+_WARMUP_PERSONALITY = {
+    "empathy_score": 70.0,
+    "activity_score": 50.0,
+    "patience_score": 70.0,
+    "independence_score": 50.0,
+}
+
+
+class ModelWarmup:
+    """
+    매칭 모델 워밍업 및 준비 상태
+
+    첫 요청이 모델 역직렬화, load_data의 CSV 로드, Azure OpenAI 클라이언트 생성 비용을
+    내지 않도록 워커 시작 시 백그라운드 스레드에서 미리 실행합니다.
+    모든 단계가 끝나면(실패한 단계 포함) 완료로 표시하되, 필수 단계(CRITICAL_STEPS)가
+    실패했으면 준비되지 않은 상태로 남깁니다 (/ready 503).
+    """
+
+    # 실패하면 요청을 처리할 수 없는 단계 (나머지 단계는 실패해도 요청 시 지연 로드)
+    CRITICAL_STEPS = ("nuelbom_predictor",)
+
+    def __init__(self):
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.steps: Dict[str, Dict] = {}
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+
+    @property
+    def is_finished(self) -> bool:
+        """워밍업 종료 여부 (실패한 단계 포함)"""
+        return self._ready.is_set()
+
+    @property
+    def is_ready(self) -> bool:
+        """워밍업이 끝나고 필수 단계가 모두 성공했는지 여부"""
+        return self.is_finished and not self.critical_failures
+
+    @property
+    def critical_failures(self) -> Dict[str, str]:
+        """실패한 필수 단계 → 에러 메시지"""
+        return {
+            name: self.steps[name].get("error", "")
+            for name in self.CRITICAL_STEPS
+            if self.steps.get(name, {}).get("status") == "failed"
+        }
+
+    def start(self):
+        """백그라운드 스레드에서 워밍업 시작 (이미 실행 중이거나 완료되었으면 무시)"""
+        if self.is_finished or (self._thread is not None and self._thread.is_alive()):
+            return
+
+        self._thread = threading.Thread(target=self.run, name="model-warmup", daemon=True)
+        self._thread.start()
+
+    def mark_ready(self):
+        """워밍업 없이 준비 완료로 표시 (워밍업 비활성화 시)"""
+        self._ready.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """워밍업 종료까지 대기 (timeout 초과 시 False)"""
+        return self._ready.wait(timeout)
+
+    def run(self):
+        """워밍업 실행: 모델 로드 → 간병인 저장소/조회 테이블 → 합성 예측"""
+        self.started_at = datetime.utcnow()
+        start = time.perf_counter()
+        logger.info("🔥 매칭 모델 워밍업 시작...")
+
+        try:
+            predictor = None
+            with self._step("nuelbom_predictor"):
+                from .nuelbom_predictor import get_nuelbom_predictor
+
+                predictor = get_nuelbom_predictor()
+                if predictor.regressor is None:
+                    raise RuntimeError("XGBoost 모델이 로드되지 않았습니다.")
+                if predictor.model_registry is not None:
+                    # preload(fork 전)에서 생략한 합성 예측 확인
+                    predictor.model_registry.validate(predictor.model_registry.current())
+
+            with self._step("model_experiment"):
+                from .model_registry import get_model_registry
+
+                # 섀도 평가 / A/B 후보 버전 (설정된 경우)
+                experiment = get_model_registry().experiment
+                if experiment is not None:
+                    experiment.preload()
+
+            snapshot = None
+            with self._step("caregiver_store"):
+                from app.core.database import SessionLocal
+                from .caregiver_store import get_caregiver_store
+
+                db = SessionLocal()
+                try:
+                    snapshot = get_caregiver_store().get_snapshot(db)
+                finally:
+                    db.close()
+
+            with self._step("lookup_tables"):
+                from .region_index import get_region_index
+                from .specialty_vocab import get_specialty_vocabulary
+
+                get_region_index()
+                get_specialty_vocabulary()
+                if snapshot is not None:
+                    snapshot.certification_index
+
+            with self._step("comment_cache"):
+                from .comment_cache import get_comment_cache
+
+                get_comment_cache()
+
+            if predictor is not None and predictor.regressor is not None:
+                with self._step("synthetic_prediction"):
+                    self._warm_up_predictor(predictor, snapshot)
+
+            with self._step("xgboost_v2_service"):
+                self._warm_up_xgboost_v2_service()
+
+        finally:
+            self.finished_at = datetime.utcnow()
+            self._ready.set()
+
+            failed = [name for name, step in self.steps.items() if step["status"] == "failed"]
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            critical = self.critical_failures
+            if critical:
+                logger.error(
+                    f"❌ 매칭 모델 워밍업 완료 ({elapsed_ms:.0f}ms) - 필수 단계 실패로 준비 안 됨: {', '.join(critical)}"
+                )
+            elif failed:
+                logger.warning(f"⚠️ 매칭 모델 워밍업 완료 ({elapsed_ms:.0f}ms) - 실패 단계: {', '.join(failed)}")
+            else:
+                logger.info(f"✅ 매칭 모델 워밍업 완료 ({elapsed_ms:.0f}ms)")
+
+    def _warm_up_predictor(self, predictor, snapshot):
+        """NuelbomMatchingPredictor 합성 예측 (AI 코멘트 호출 없이 특성 생성 → 점수 → top-k)"""
+        if snapshot is not None and len(snapshot) > 0:
+            predictor.recommend_caregivers_from_store(
+                patient_id=0,
+                patient_personality=_WARMUP_PERSONALITY,
+                snapshot=snapshot,
+                candidate_indices=np.arange(min(len(snapshot), 32)),
+                top_n=5,
+                ai_comments=False,
+            )
+            return
+
+        predictor.recommend_caregivers_with_db_personality(
+            patient_id=0,
+            patient_personality=_WARMUP_PERSONALITY,
+            caregivers_with_personality=[{
+                "caregiver_id": 0,
+                "caregiver_name": "워밍업",
+                "experience_years": 5,
+                **_WARMUP_PERSONALITY,
+                "specialties": [],
+            }],
+            top_n=1,
+            ai_comments=False,
+        )
+
+    def _warm_up_xgboost_v2_service(self):
+        """EnhancedMatchingService의 XGBoost V2 모델 로드 및 합성 예측"""
+        from app.services.enhanced_matching_service import EnhancedMatchingService
+
+        EnhancedMatchingService.initialize()
+        if EnhancedMatchingService.xgboost_service is None:
+            raise RuntimeError("XGBoost V2 서비스 초기화 실패 (Legacy 매칭 모드)")
+
+        EnhancedMatchingService.xgboost_service.predict_compatibility(
+            _WARMUP_PERSONALITY,
+            _WARMUP_PERSONALITY,
+            {"diseases": [], "region_code": "", "care_level": "3등급"},
+            {"specialties": [], "service_region": "", "experience_years": 5},
+        )
+
+    @contextmanager
+    def _step(self, name: str):
+        """워밍업 단계 실행 및 결과 기록 (실패해도 다음 단계 계속)"""
+        start = time.perf_counter()
+        step = {"status": "ok"}
+        try:
+            yield
+        except Exception as e:
+            logger.warning(f"⚠️ 워밍업 단계 실패 ({name}): {e}")
+            step = {"status": "failed", "error": str(e)}
+        finally:
+            step["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            self.steps[name] = step
+
+    def get_status(self) -> Dict:
+        """준비 상태"""
+        return {
+            "ready": self.is_ready,
+            "finished": self.is_finished,
+            "critical_failures": self.critical_failures,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "steps": dict(self.steps),
+        }
+
+
+# 전역 인스턴스 (프로세스 공유)
+_model_warmup: Optional[ModelWarmup] = None
+_model_warmup_lock = threading.Lock()
+
+
+def get_model_warmup() -> ModelWarmup:
+    """ModelWarmup 싱글톤 인스턴스 반환"""
+    global _model_warmup
+
+    if _model_warmup is None:
+        with _model_warmup_lock:
+            if _model_warmup is None:
+                _model_warmup = ModelWarmup()
+
+    return _model_warmup
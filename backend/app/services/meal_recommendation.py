@@ -6,11 +6,13 @@ Azure OpenAI + 식약처 API 통합 버전
 
 import os
 import json
+import asyncio
 import requests
 import pandas as pd
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Optional
-from openai import AzureOpenAI
+
+from app.services.llm_gateway import LLMGateway, get_llm_gateway
 
 # ============================================
 # 1. 설정
@@ -19,11 +21,8 @@ from openai import AzureOpenAI
 class MealRecommendationConfig:
     """시스템 설정"""
     
-    # Azure OpenAI
-    AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT")
-    AZURE_OPENAI_KEY = os.getenv("AZURE_OPENAI_KEY")
+    # Azure OpenAI (접속 정보/연결 풀은 공용 LLM 게이트웨이 설정 사용)
     AZURE_OPENAI_DEPLOYMENT = os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o")
-    AZURE_OPENAI_API_VERSION = "2024-08-01-preview"
     
     # 식약처 API (선택)
     MFDS_API_KEY = os.getenv("MFDS_API_KEY", "")
@@ -326,15 +325,11 @@ class PatientDietaryAnalyzer:
 class AIMealGenerator:
     """Azure OpenAI 기반 식단 생성기"""
     
-    def __init__(self, config: MealRecommendationConfig):
+    def __init__(self, config: MealRecommendationConfig, gateway: Optional[LLMGateway] = None):
         self.config = config
-        self.client = AzureOpenAI(
-            azure_endpoint=config.AZURE_OPENAI_ENDPOINT,
-            api_key=config.AZURE_OPENAI_KEY,
-            api_version=config.AZURE_OPENAI_API_VERSION
-        )
+        self.gateway = gateway or get_llm_gateway()
     
-    def generate_meal_plan(
+    async def generate_meal_plan(
         self,
         patient_constraints: Dict,
         meal_date: str,
@@ -356,9 +351,8 @@ class AIMealGenerator:
         prompt = self._create_prompt(patient_constraints, meal_type)
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.config.AZURE_OPENAI_DEPLOYMENT,
-                messages=[
+            result = await self.gateway.acomplete(
+                [
                     {
                         "role": "system",
                         "content": "당신은 한국의 전문 영양사이며 노인 영양 관리 전문가입니다. 제공된 제약사항을 절대 준수하며, 맛있고 건강한 한식 메뉴를 추천합니다."
@@ -368,12 +362,14 @@ class AIMealGenerator:
                         "content": prompt
                     }
                 ],
+                caller="meal_plan",
+                deployment=self.config.AZURE_OPENAI_DEPLOYMENT,
                 temperature=0.7,
                 max_tokens=1500,
                 response_format={"type": "json_object"}
             )
             
-            meal_plan = json.loads(response.choices[0].message.content)
+            meal_plan = json.loads(result.content)
             
             # 결과 포맷팅
             return {
@@ -492,7 +488,7 @@ class MealRecommendationService:
         self.analyzer = PatientDietaryAnalyzer()
         self.generator = AIMealGenerator(config)
     
-    def recommend_meal(
+    async def recommend_meal(
         self,
         patient_id: int,
         patient_data: Dict,
@@ -519,7 +515,7 @@ class MealRecommendationService:
         )
         
         # 2. AI 식단 생성
-        meal_plan = self.generator.generate_meal_plan(
+        meal_plan = await self.generator.generate_meal_plan(
             patient_constraints=constraints,
             meal_date=meal_date,
             meal_type=meal_type
@@ -536,8 +532,6 @@ def test_meal_recommendation():
     
     # 설정 (실제로는 환경변수에서 가져옴)
     config = MealRecommendationConfig()
-    config.AZURE_OPENAI_ENDPOINT = "https://your-resource.openai.azure.com/"
-    config.AZURE_OPENAI_KEY = "your-api-key"
     config.AZURE_OPENAI_DEPLOYMENT = "gpt-4o"
     
     # 서비스 초기화
@@ -559,7 +553,7 @@ def test_meal_recommendation():
     }
     
     # 식단 추천
-    meal_plan = service.recommend_meal(
+    meal_plan = asyncio.run(service.recommend_meal(
         patient_id=1,
         patient_data=patient_data,
         health_conditions=health_conditions,
@@ -567,7 +561,7 @@ def test_meal_recommendation():
         dietary_prefs=dietary_prefs,
         meal_date="2025-01-15",
         meal_type="lunch"
-    )
+    ))
     
     if meal_plan:
         print("✅ 식단 생성 성공!")
@@ -22,10 +22,10 @@ import json
 import numpy as np
 from pathlib import Path
 from typing import List, Dict, Optional
-from xgboost import XGBRegressor
 import warnings
 
-from app.services.feature_engineering import FeatureEngineer
+from app.services.feature_engineering import PERSONALITY_TYPES, FeatureEngineer
+from app.services.matching.model_registry import get_model_registry
 
 warnings.filterwarnings('ignore')
 
@@ -38,7 +38,7 @@ class XGBoostMatchingService:
 
     # 싱글톤 패턴: 모델을 메모리에 한 번만 로드
     _instance = None
-    _model = None
+    _registry = None
     _feature_engineer = None
     _feature_columns = [
         'personality_diff_empathy',
@@ -60,40 +60,25 @@ class XGBoostMatchingService:
             cls._instance._initialize_model()
         return cls._instance
 
+    @property
+    def _model(self):
+        """활성 모델 (모델 레지스트리에서 교체되면 다음 호출부터 새 모델)"""
+        return self._registry.current().model if self._registry is not None else None
+
     def _initialize_model(self):
-        """XGBoost V2 모델 및 FeatureEngineer 로드"""
+        """모델 레지스트리의 활성 버전 및 FeatureEngineer 로드"""
         try:
             # FeatureEngineer 초기화
             self._feature_engineer = FeatureEngineer()
             logger.info("✅ FeatureEngineer 초기화 완료")
-            
-            # 모델 경로 찾기 (V2 모델 사용)
-            current_dir = Path(__file__).parent
-            model_path = current_dir.parent.parent / "models" / "xgboost_v2.json"
-
-            # 대체 경로들
-            alternative_paths = [
-                Path("/Users/sangwon/Project/Sesac_class/neulbom-merge/neulbomcare-test03/backend/models/xgboost_v2.json"),
-                current_dir.parent.parent.parent / "Match_Algorithm_System" / "match_ML_v3" / "models" / "xgboost.json",  # 폴백
-            ]
-
-            model_file = None
-            for path in [model_path] + alternative_paths:
-                if path.exists():
-                    model_file = path
-                    logger.info(f"✅ XGBoost V2 모델 찾음: {path}")
-                    break
-
-            if not model_file:
-                raise FileNotFoundError(
-                    f"XGBoost V2 모델을 찾을 수 없습니다. 확인된 경로: {model_path}\n"
-                    f"대체 경로: {alternative_paths}"
-                )
 
-            # 모델 로드
-            self._model = XGBRegressor()
-            self._model.load_model(str(model_file))
-            logger.info(f"✅ XGBoost V2 모델 로드 완료: {model_file}")
+            # 모델 레지스트리 (models/xgboost_<버전>.json, 특성 순서 검증 포함)
+            self._registry = get_model_registry()
+            served = self._registry.current()
+            if served.feature_columns != self._feature_columns:
+                raise ValueError(f"모델 {served.tag}의 특성 순서가 V2 서비스와 다릅니다")
+
+            logger.info(f"✅ XGBoost V2 모델 로드 완료: {served.tag} (추론 백엔드: {served.backend})")
             logger.info(f"   - 특성 개수: {len(self._feature_columns)}개")
             logger.info(f"   - 알고리즘: V2 (전문분야, 지역, 프로필 포함)")
 
@@ -144,12 +129,7 @@ class XGBoostMatchingService:
         engineer = FeatureEngineer()
         
         # 데이터 준비
-        patient_full_data = {
-            "personality": patient_personality,
-            "diseases": patient_data.get("diseases", []) if patient_data else [],
-            "region_code": patient_data.get("region_code", "") if patient_data else "",
-            "care_level": patient_data.get("care_level", "3등급") if patient_data else "3등급"
-        }
+        patient_full_data = XGBoostMatchingService._patient_full_data(patient_personality, patient_data)
         
         caregiver_full_data = {
             "personality": caregiver_personality,
@@ -321,11 +301,15 @@ class XGBoostMatchingService:
         self,
         patient_personality: Dict[str, float],
         caregivers: List[Dict],
-        patient_data: Optional[Dict] = None
+        patient_data: Optional[Dict] = None,
+        patient_id: Optional[int] = None
     ) -> List[Dict]:
         """
         여러 간병인에 대한 일괄 예측 (V2)
 
+        (N, 10) Feature 행렬을 한 번 생성하여 한 번의 predict 호출로 점수를 계산하고,
+        등급과 분석 메시지도 같은 행렬에서 도출합니다.
+
         Args:
             patient_personality: 환자 성격 정보
             caregivers: 간병인 정보 리스트
@@ -340,6 +324,7 @@ class XGBoostMatchingService:
                     ...
                 ]
             patient_data: 환자 추가 정보 (질병, 지역, 요양등급)
+            patient_id: 환자 ID (모델 A/B 분할 기준, 없으면 활성 버전)
 
         Returns:
             예측 결과 리스트
@@ -348,66 +333,135 @@ class XGBoostMatchingService:
                         "caregiver_id": 1,
                         "score": 85.3,
                         "grade": "A",
-                        "analysis": "공감 능력이 잘 맞습니다 | 전문분야가 잘 맞습니다 | ..."
+                        "analysis": "공감 능력이 잘 맞습니다 | 전문분야가 잘 맞습니다 | ...",
+                        "model_version": "v2@1a2b3c4d5e6f"
                     },
                     ...
                 ]
         """
-        results = []
-
-        for caregiver_info in caregivers:
+        results: List[Optional[Dict]] = [None] * len(caregivers)
+        row_indices: List[int] = []
+        personality_rows: List[List[float]] = []
+        specialties: List = []
+        regions: List = []
+        experience: List[float] = []
+
+        # 1. 간병인별 입력 컬럼 추출 (값이 잘못된 간병인만 개별 에러 처리)
+        for i, caregiver_info in enumerate(caregivers):
             caregiver_id = caregiver_info.get('caregiver_id')
-            caregiver_personality = caregiver_info.get('personality', {})
-            
-            # 간병인 추가 데이터
-            caregiver_data = {
-                "specialties": caregiver_info.get('specialties', []),
-                "service_region": caregiver_info.get('service_region', ''),
-                "experience_years": caregiver_info.get('experience_years', 0)
-            }
-
             try:
-                # 호환도 예측
-                score = self.predict_compatibility(
-                    patient_personality,
-                    caregiver_personality,
-                    patient_data,
-                    caregiver_data
+                personality = caregiver_info.get('personality', {})
+                caregiver_data = self._caregiver_data_from_info(caregiver_info)
+                scores = [float(personality.get(f"{ptype}_score", 50)) for ptype in PERSONALITY_TYPES]
+                years = float(caregiver_data["experience_years"])
+            except Exception as e:
+                logger.error(f"❌ 간병인 {caregiver_id} 예측 실패: {e}")
+                results[i] = self._failed_prediction(caregiver_id, e)
+                continue
+
+            row_indices.append(i)
+            personality_rows.append(scores)
+            specialties.append(caregiver_data["specialties"])
+            regions.append(caregiver_data["service_region"])
+            experience.append(years)
+
+        if row_indices:
+            # 2. (N, 10) Feature 행렬을 컬럼 단위로 한 번에 생성 후 한 번의 predict 호출
+            #    (create_features_for_pair와 같은 값, test_feature_matrix_parity.py)
+            try:
+                feature_matrix = self._feature_engineer.create_feature_matrix(
+                    self._patient_full_data(patient_personality, patient_data),
+                    np.array(personality_rows, dtype=np.float64),
+                    specialties,
+                    regions,
+                    experience,
                 )
-
-                # Feature 정보 (분석용)
-                features = self.generate_features(
-                    patient_personality,
-                    caregiver_personality,
-                    patient_data,
-                    caregiver_data
+            except Exception as e:
+                # 환자 데이터 오류는 모든 간병인에 공통
+                logger.error(f"❌ Feature 행렬 생성 실패: {e}")
+                for i in row_indices:
+                    results[i] = self._failed_prediction(caregivers[i].get('caregiver_id'), e)
+                return results
+
+            # 요청 중 모델이 교체되어도 같은 모델/버전으로 계산 (A/B 실험이 있으면 환자별 분할)
+            experiment = self._registry.experiment
+            if experiment is not None and patient_id is not None:
+                served = experiment.assign(patient_id)
+            else:
+                served = self._registry.current()
+            try:
+                predictions = served.predict(feature_matrix)
+            except Exception as e:
+                # 일괄 예측 실패 시 간병인별 예측으로 폴백 (에러 격리)
+                logger.warning(f"⚠️ 일괄 예측 실패, 개별 예측으로 전환: {e}")
+                predictions = None
+
+            # 섀도 평가 (별도 스레드에 예약만 하고 기다리지 않음)
+            if predictions is not None and experiment is not None:
+                experiment.submit_shadow(
+                    feature_matrix, predictions, served, self._feature_columns, patient_id=patient_id
                 )
 
-                # 등급 판정
-                grade = self.get_grade_from_score(score)
+            # 3. 동일한 행렬에서 점수/등급/분석 도출
+            for row, i in enumerate(row_indices):
+                caregiver_info = caregivers[i]
+                caregiver_id = caregiver_info.get('caregiver_id')
+                try:
+                    if predictions is None:
+                        # 배정된 모델로 한 행씩 예측 (점수와 model_version이 같은 모델을 가리키도록)
+                        prediction = served.predict(feature_matrix[row:row + 1])[0]
+                    else:
+                        prediction = predictions[row]
+                    score = max(0, min(100, float(prediction)))
+
+                    # float32 행렬 값 → 분석 기준값(0.7 등) 비교가 개별 계산과 같도록 반올림
+                    features = {
+                        col: round(value, 6) for col, value in zip(self._feature_columns, feature_matrix[row].tolist())
+                    }
+
+                    results[i] = {
+                        "caregiver_id": caregiver_id,
+                        "score": round(score, 1),
+                        "grade": self.get_grade_from_score(score),
+                        "analysis": self.get_analysis_from_features(features),
+                        "model_version": served.tag,
+                        "features": features  # 디버깅용
+                    }
+                except Exception as e:
+                    logger.error(f"❌ 간병인 {caregiver_id} 예측 실패: {e}")
+                    results[i] = self._failed_prediction(caregiver_id, e)
 
-                # 분석 메시지
-                analysis = self.get_analysis_from_features(features)
+        return results
 
-                results.append({
-                    "caregiver_id": caregiver_id,
-                    "score": round(score, 1),
-                    "grade": grade,
-                    "analysis": analysis,
-                    "features": features  # 디버깅용
-                })
+    @staticmethod
+    def _patient_full_data(patient_personality: Dict[str, float], patient_data: Optional[Dict]) -> Dict:
+        """FeatureEngineer 입력 형태의 환자 데이터 (질병/지역/요양등급 기본값 적용)"""
+        return {
+            "personality": patient_personality,
+            "diseases": patient_data.get("diseases", []) if patient_data else [],
+            "region_code": patient_data.get("region_code", "") if patient_data else "",
+            "care_level": patient_data.get("care_level", "3등급") if patient_data else "3등급"
+        }
 
-            except Exception as e:
-                logger.error(f"❌ 간병인 {caregiver_id} 예측 실패: {e}")
-                results.append({
-                    "caregiver_id": caregiver_id,
-                    "score": 0,
-                    "grade": "C",
-                    "analysis": "예측 실패",
-                    "error": str(e)
-                })
+    @staticmethod
+    def _caregiver_data_from_info(caregiver_info: Dict) -> Dict:
+        """batch_predict 입력에서 간병인 추가 데이터 추출"""
+        return {
+            "specialties": caregiver_info.get('specialties', []),
+            "service_region": caregiver_info.get('service_region', ''),
+            "experience_years": caregiver_info.get('experience_years', 0)
+        }
 
-        return results
+    @staticmethod
+    def _failed_prediction(caregiver_id, error: Exception) -> Dict:
+        """예측 실패 결과"""
+        return {
+            "caregiver_id": caregiver_id,
+            "score": 0,
+            "grade": "C",
+            "analysis": "예측 실패",
+            "error": str(error)
+        }
 
 
 # 글로벌 서비스 인스턴스 - Lazy로드로 변경 (startup 오류 방지)
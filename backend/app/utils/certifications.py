@@ -0,0 +1,24 @@
+"""
+간병인 자격증 문자열 정규화 유틸리티
+파일 위치: backend/app/utils/certifications.py
+
+caregivers.certifications는 "요양보호사 1급|물리치료사" 처럼 파이프로 구분된 문자열입니다.
+저장 시점에 목록(caregivers.certification_list)으로 정규화하여 인덱스 조회에 사용합니다.
+"""
+from typing import List, Optional
+
+
+CERTIFICATION_SEPARATOR = "|"
+
+
+def split_certifications(certifications: Optional[str]) -> List[str]:
+    """
+    파이프로 구분된 자격증 문자열 → 자격증 목록
+
+    앞뒤 공백과 빈 항목은 제거하고, 원래 순서를 유지합니다.
+    예: "요양보호사 1급| 물리치료사 |" → ["요양보호사 1급", "물리치료사"]
+    """
+    if not certifications:
+        return []
+
+    return [cert.strip() for cert in str(certifications).split(CERTIFICATION_SEPARATOR) if cert.strip()]
@@ -1,11 +1,23 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.core.config import get_settings
 from app.core.database import engine, Base
 from app.routes import auth, profile, matching, care_execution, review, guardians, patients, dashboard, xgboost_matching, personality, care_plans, ocr, meal_plans, care_reports
+from app.services.matching.caregiver_store import get_caregiver_store
+from app.services.matching.warmup import get_model_warmup
+from app.services.matching.shared_memory import preload_shared_models
+from app.services.matching.model_registry import get_model_registry
+from app.services.matching.score_invalidation import start_score_invalidation, stop_score_invalidation
+from app.services.llm_gateway import close_llm_gateway
+from app.services.care_plan_jobs import get_care_plan_job_queue
 
 settings = get_settings()
 
+# gunicorn --preload: 마스터 프로세스에서 매칭 모델/데이터를 로드 (fork된 워커가 copy-on-write로 공유)
+if settings.MODEL_PRELOAD:
+    preload_shared_models()
+
 app = FastAPI(
     title="BluedonuLab API",
     description="환자-간병인 매칭 시스템 API",
@@ -61,6 +73,70 @@ app.include_router(care_reports.router)
 #     Base.metadata.create_all(bind=engine)
 
 
+@app.on_event("startup")
+def start_caregiver_store():
+    """간병인 특성 저장소 로드 및 주기적 증분 갱신 시작 (백그라운드)"""
+    get_caregiver_store().start_background_refresh(settings.CAREGIVER_STORE_REFRESH_SECONDS)
+
+
+@app.on_event("startup")
+def start_model_warmup():
+    """매칭 모델 로드, 캐시 생성, 합성 예측 워밍업 (백그라운드, 완료 전까지 /ready는 503)"""
+    if settings.MODEL_WARMUP_ENABLED:
+        get_model_warmup().start()
+    else:
+        get_model_warmup().mark_ready()
+
+
+@app.on_event("startup")
+def start_model_registry_watch():
+    """ACTIVE_VERSION / 활성 모델 파일 변경 감시 시작 (워커마다 같은 버전으로 전환)"""
+    get_model_registry().start_watch(settings.MATCHING_MODEL_WATCH_SECONDS)
+
+
+@app.on_event("startup")
+def start_score_invalidation_tracking():
+    """성향/프로필 변경 추적(아웃박스 기록) 및 바뀐 환자/간병인 점수 증분 재계산 시작"""
+    if settings.SCORE_INVALIDATION_ENABLED:
+        start_score_invalidation()
+
+
+@app.on_event("startup")
+async def start_care_plan_jobs():
+    """케어 플랜 생성 작업 워커 시작 (앱 이벤트 루프의 태스크)"""
+    get_care_plan_job_queue().start()
+
+
+@app.on_event("shutdown")
+def stop_caregiver_store():
+    """간병인 특성 저장소 갱신 중지"""
+    get_caregiver_store().stop_background_refresh()
+
+
+@app.on_event("shutdown")
+def stop_model_registry_watch():
+    """모델 파일 감시 중지"""
+    get_model_registry().stop_watch()
+
+
+@app.on_event("shutdown")
+def stop_score_invalidation_tracking():
+    """아웃박스 폴링 중지"""
+    stop_score_invalidation()
+
+
+@app.on_event("shutdown")
+async def stop_care_plan_jobs():
+    """케어 플랜 생성 작업 워커 중지 (실행 중인 작업은 실패로 기록)"""
+    await get_care_plan_job_queue().stop()
+
+
+@app.on_event("shutdown")
+def stop_llm_gateway():
+    """Azure OpenAI 연결 풀 종료"""
+    close_llm_gateway()
+
+
 @app.get("/")
 def read_root():
     return {"message": "BluedonuLab API"}
@@ -71,6 +147,16 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/ready")
+def readiness_check():
+    """워밍업 완료 시 200, 진행 중이거나 필수 단계(모델 로드)가 실패했으면 503 (트래픽 라우팅 기준)"""
+    warmup = get_model_warmup()
+    status = warmup.get_status()
+    if not warmup.is_ready:
+        return JSONResponse(status_code=503, content=status)
+    return status
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,43 @@
+-- ============================================================================
+-- Migration: Add updated_at indexes for the in-memory caregiver feature store
+-- ============================================================================
+-- Author: Database Migration
+-- Date: 2026-10-16
+-- Purpose: The matching service keeps caregiver features in memory and refreshes
+--          them incrementally with "updated_at >= watermark" queries. These
+--          indexes keep each refresh from scanning the whole table.
+--
+-- IMPORTANT: Run each step separately in DBeaver (do NOT run all at once)
+-- ============================================================================
+
+-- STEP 1: caregivers.updated_at
+CREATE INDEX IF NOT EXISTS idx_caregivers_updated_at
+ON caregivers(updated_at);
+
+-- STEP 2: caregiver_personality.updated_at
+CREATE INDEX IF NOT EXISTS idx_caregiver_personality_updated_at
+ON caregiver_personality(updated_at);
+
+-- STEP 3: users.updated_at (caregiver name / profile image)
+CREATE INDEX IF NOT EXISTS idx_users_updated_at
+ON users(updated_at);
+
+-- ============================================================================
+-- VERIFICATION QUERIES (Run these to verify success)
+-- ============================================================================
+
+SELECT indexname
+FROM pg_indexes
+WHERE indexname IN (
+    'idx_caregivers_updated_at',
+    'idx_caregiver_personality_updated_at',
+    'idx_users_updated_at'
+);
+
+-- ============================================================================
+-- ROLLBACK script (if needed - run only if you want to undo):
+-- ============================================================================
+-- DROP INDEX IF EXISTS idx_users_updated_at;
+-- DROP INDEX IF EXISTS idx_caregiver_personality_updated_at;
+-- DROP INDEX IF EXISTS idx_caregivers_updated_at;
+-- ============================================================================
@@ -0,0 +1,51 @@
+-- ============================================================================
+-- Migration: Add normalized certification_list to caregivers
+-- ============================================================================
+-- Author: Database Migration
+-- Date: 2026-10-16
+-- Purpose: caregivers.certifications is a pipe-delimited string
+--          ("요양보호사 1급|물리치료사"). Filtering it with ILIKE '%keyword%'
+--          scans the whole table. certification_list keeps the same values as
+--          a trimmed TEXT[] (filled by the application on write) and is
+--          covered by a GIN index for array lookups.
+--
+-- IMPORTANT: Run each step separately in DBeaver (do NOT run all at once)
+-- ============================================================================
+
+-- STEP 1: Add column
+ALTER TABLE caregivers
+ADD COLUMN IF NOT EXISTS certification_list TEXT[];
+
+COMMENT ON COLUMN caregivers.certification_list IS '정규화된 자격증 배열 (certifications를 | 기준으로 분리, GIN 인덱스)';
+
+-- STEP 2: Backfill existing rows
+UPDATE caregivers
+SET certification_list = ARRAY(
+    SELECT btrim(cert)
+    FROM unnest(string_to_array(certifications, '|')) WITH ORDINALITY AS t(cert, ord)
+    WHERE btrim(cert) <> ''
+    ORDER BY ord
+)
+WHERE certifications IS NOT NULL;
+
+-- STEP 3: GIN index
+CREATE INDEX IF NOT EXISTS idx_caregivers_certification_list
+ON caregivers USING GIN (certification_list);
+
+-- ============================================================================
+-- VERIFICATION QUERIES (Run these to verify success)
+-- ============================================================================
+
+SELECT caregiver_id, certifications, certification_list
+FROM caregivers
+LIMIT 10;
+
+-- Exact certification lookup (uses idx_caregivers_certification_list)
+-- SELECT caregiver_id FROM caregivers WHERE certification_list @> ARRAY['요양보호사 1급'];
+
+-- ============================================================================
+-- ROLLBACK script (if needed - run only if you want to undo):
+-- ============================================================================
+-- DROP INDEX IF EXISTS idx_caregivers_certification_list;
+-- ALTER TABLE caregivers DROP COLUMN IF EXISTS certification_list;
+-- ============================================================================
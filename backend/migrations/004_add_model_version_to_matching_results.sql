@@ -0,0 +1,34 @@
+-- ============================================================================
+-- Migration: Add model_version to matching_results
+-- ============================================================================
+-- Author: Database Migration
+-- Date: 2026-10-16
+-- Purpose: Matching models are now served from a versioned registry and can be
+--          swapped without a restart. Each recommendation records the model
+--          version that produced its score ("<version>@<sha256 prefix>", e.g.
+--          "v2@1a2b3c4d5e6f") so results can be traced back to a model.
+--          Rows written before this migration keep NULL.
+--
+-- IMPORTANT: Run each step separately in DBeaver (do NOT run all at once)
+-- ============================================================================
+
+-- STEP 1: Add column
+ALTER TABLE matching_results
+ADD COLUMN IF NOT EXISTS model_version VARCHAR(100);
+
+COMMENT ON COLUMN matching_results.model_version IS '점수를 계산한 매칭 모델 버전 (버전@모델 해시)';
+
+-- ============================================================================
+-- VERIFICATION QUERIES (Run these to verify success)
+-- ============================================================================
+
+SELECT model_version, COUNT(*)
+FROM matching_results
+GROUP BY model_version
+ORDER BY COUNT(*) DESC;
+
+-- ============================================================================
+-- ROLLBACK script (if needed - run only if you want to undo):
+-- ============================================================================
+-- ALTER TABLE matching_results DROP COLUMN IF EXISTS model_version;
+-- ============================================================================
@@ -0,0 +1,45 @@
+-- ============================================================================
+-- Migration: Create score_invalidations (matching score change outbox)
+-- ============================================================================
+-- Author: Database Migration
+-- Date: 2026-10-16
+-- Purpose: When a patient/caregiver personality row, a caregiver's scoring
+--          fields (experience, certifications, specialties, region) or a
+--          patient's region/diseases change, the API writes one row here in the
+--          same transaction. Every worker polls this table and rescores only
+--          the affected patients/caregivers in its recommendation cache and
+--          precomputed score matrix instead of discarding them.
+--          Rows older than SCORE_INVALIDATION_RETENTION_HOURS are deleted by
+--          the workers.
+--
+-- IMPORTANT: Run each step separately in DBeaver (do NOT run all at once)
+-- ============================================================================
+
+-- STEP 1: Create table
+CREATE TABLE IF NOT EXISTS score_invalidations (
+    invalidation_id BIGSERIAL PRIMARY KEY,
+    entity_type VARCHAR(20) NOT NULL,
+    entity_id BIGINT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    CONSTRAINT check_invalidation_entity_type CHECK (entity_type IN ('patient', 'caregiver'))
+);
+
+COMMENT ON TABLE score_invalidations IS '매칭 점수 무효화 아웃박스 (성향/프로필 변경 기록)';
+
+-- STEP 2: Index for polling / retention cleanup
+CREATE INDEX IF NOT EXISTS idx_score_invalidations_created
+ON score_invalidations(created_at);
+
+-- ============================================================================
+-- VERIFICATION QUERIES (Run these to verify success)
+-- ============================================================================
+
+SELECT entity_type, COUNT(*), MAX(created_at)
+FROM score_invalidations
+GROUP BY entity_type;
+
+-- ============================================================================
+-- ROLLBACK script (if needed - run only if you want to undo):
+-- ============================================================================
+-- DROP TABLE IF EXISTS score_invalidations;
+-- ============================================================================
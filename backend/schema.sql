@@ -103,6 +103,7 @@ CREATE INDEX idx_users_email ON users(email) WHERE email IS NOT NULL;
 CREATE INDEX idx_users_phone ON users(phone_number) WHERE phone_number IS NOT NULL;
 CREATE INDEX idx_users_type ON users(user_type);
 CREATE INDEX idx_users_active ON users(is_active) WHERE is_active = TRUE;
+CREATE INDEX idx_users_updated_at ON users(updated_at);
 
 COMMENT ON TABLE users IS '통합 사용자 테이블 (보호자 + 간병인)';
 COMMENT ON COLUMN users.user_type IS '보호자(guardian) 또는 간병인(caregiver)';
@@ -231,6 +232,7 @@ CREATE TABLE caregivers (
 
     experience_years INTEGER DEFAULT 0,
     certifications VARCHAR(255),
+    certification_list TEXT[],
     specialties TEXT[],
 
     service_region VARCHAR(50),
@@ -252,9 +254,12 @@ CREATE TABLE caregivers (
 CREATE INDEX idx_caregivers_user ON caregivers(user_id);
 CREATE INDEX idx_caregivers_region ON caregivers(service_region);
 CREATE INDEX idx_caregivers_rating ON caregivers(avg_rating DESC);
+CREATE INDEX idx_caregivers_updated_at ON caregivers(updated_at);
+CREATE INDEX idx_caregivers_certification_list ON caregivers USING GIN (certification_list);
 
 COMMENT ON TABLE caregivers IS '간병인 상세 정보 (화면 11)';
 COMMENT ON COLUMN caregivers.certifications IS '자격증 (요양보호사, 간호사 등)';
+COMMENT ON COLUMN caregivers.certification_list IS '정규화된 자격증 배열 (certifications를 | 기준으로 분리, GIN 인덱스)';
 COMMENT ON COLUMN caregivers.specialties IS '전문 분야 배열 (예: {치매, 파킨슨, 당뇨})';
 COMMENT ON COLUMN caregivers.hourly_rate IS '간병인 시급 (원 단위, 예: 20000)';
 COMMENT ON COLUMN caregivers.service_region IS '활동 가능 지역';
@@ -304,6 +309,7 @@ CREATE TABLE caregiver_personality (
 );
 
 CREATE INDEX idx_caregiver_personality ON caregiver_personality(caregiver_id);
+CREATE INDEX idx_caregiver_personality_updated_at ON caregiver_personality(updated_at);
 
 COMMENT ON TABLE caregiver_personality IS '[AI 매칭] 간병인 성향';
 
@@ -413,6 +419,7 @@ CREATE TABLE matching_results (
     total_score FLOAT NOT NULL,
     grade grade_enum NOT NULL,
     ai_comment TEXT,
+    model_version VARCHAR(100),
 
     status matching_status_enum DEFAULT 'recommended',
 
@@ -438,8 +445,23 @@ CREATE INDEX idx_matching_score ON matching_results(total_score DESC);
 COMMENT ON TABLE matching_results IS '[AI 매칭] Azure OpenAI 매칭 추천 결과 (화면 10)';
 COMMENT ON COLUMN matching_results.total_score IS '적합도 점수 (0~100)';
 COMMENT ON COLUMN matching_results.grade IS '매칭 등급 (A+, A, B+, B, C)';
+COMMENT ON COLUMN matching_results.model_version IS '점수를 계산한 매칭 모델 버전 (버전@모델 해시)';
 COMMENT ON COLUMN matching_results.ai_comment IS 'Azure OpenAI가 생성한 추천 사유';
 
+-- [13-1. Score Invalidations] 매칭 점수 무효화 아웃박스
+CREATE TABLE score_invalidations (
+    invalidation_id BIGSERIAL PRIMARY KEY,
+    entity_type VARCHAR(20) NOT NULL,
+    entity_id BIGINT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+
+    CONSTRAINT check_invalidation_entity_type CHECK (entity_type IN ('patient', 'caregiver'))
+);
+
+CREATE INDEX idx_score_invalidations_created ON score_invalidations(created_at);
+
+COMMENT ON TABLE score_invalidations IS '매칭 점수 무효화 아웃박스 (성향/프로필 변경 기록)';
+
 -- ============================================
 -- 8. 간병인 리뷰
 -- ============================================
@@ -30,10 +30,25 @@ echo "FRONTEND_URL: $FRONTEND_URL"
 # 데이터베이스 연결 테스트 (선택사항)
 # python -c "from app.core.database import engine; engine.connect()" || echo "⚠️  DB connection failed"
 
+# 매칭 모델 preload (마스터에서 한 번 로드, 워커는 fork 후 copy-on-write로 공유)
+PRELOAD_ARGS=""
+case "${MODEL_PRELOAD,,}" in
+    true|1|yes|on) PRELOAD_ARGS="--preload" ;;
+esac
+echo "MODEL_PRELOAD: ${MODEL_PRELOAD:-False}"
+
+# 워커 수 (gunicorn도 WEB_CONCURRENCY를 읽음)
+export WEB_CONCURRENCY="${WEB_CONCURRENCY:-4}"
+echo "WEB_CONCURRENCY: $WEB_CONCURRENCY"
+
+# 케어 플랜 작업 큐: 워커가 여러 개이면 어느 워커로 폴링해도 같은 작업을 보도록 sqlite 공유 큐 사용
+export CARE_PLAN_JOB_BACKEND="${CARE_PLAN_JOB_BACKEND:-sqlite}"
+echo "CARE_PLAN_JOB_BACKEND: $CARE_PLAN_JOB_BACKEND"
+
 # Gunicorn + Uvicorn Worker로 FastAPI 실행
 echo "🎯 Starting Gunicorn with Uvicorn workers..."
-exec gunicorn main:app \
-    --workers 4 \
+exec gunicorn main:app $PRELOAD_ARGS \
+    --workers "$WEB_CONCURRENCY" \
     --worker-class uvicorn.workers.UvicornWorker \
     --bind 0.0.0.0:8000 \
     --timeout 120 \
@@ -3,11 +3,12 @@
 import React, { useEffect, useState } from 'react'
 import { useRouter } from 'next/navigation'
 import Image from 'next/image'
-import { apiPost } from '@/utils/api'
+import { apiEventSource, apiGet, apiPost } from '@/utils/api'
 
 export default function CarePlanCreate1Page() {
   const router = useRouter()
   const [progress, setProgress] = useState(0)
+  const [daysReady, setDaysReady] = useState(0)
 
   useEffect(() => {
     const generatePlan = async () => {
@@ -84,8 +85,8 @@ export default function CarePlanCreate1Page() {
         console.log("AI 케어 플랜 생성 시작...")
         console.log("[케어 플랜 생성] 날짜 정보:", careRequirements.care_start_date, "~", careRequirements.care_end_date)
 
-        // AI 생성 요청 (날짜 포함)
-        await apiPost('/api/care-plans/generate', {
+        // AI 생성 요청 (날짜 포함) - 작업 ID를 바로 받고 완료될 때까지 SSE 구독 (실패 시 상태 폴링)
+        const job = await apiPost<{ job_id: string; stream_url: string }>('/api/care-plans/generate', {
           patient_id: patientId ? parseInt(patientId) : 1,
           caregiver_id: caregiverId,
           patient_personality: patientPersonality,
@@ -94,6 +95,36 @@ export default function CarePlanCreate1Page() {
           care_end_date: careRequirements.care_end_date || null
         })
 
+        const deadline = Date.now() + 3 * 60 * 1000
+        let status = await new Promise<string>((resolve) => {
+          const source = apiEventSource(job.stream_url)
+          const timeout = setTimeout(() => { source.close(); resolve('timeout') }, deadline - Date.now())
+          const finish = (result: string) => { clearTimeout(timeout); source.close(); resolve(result) }
+          // 하루 일정이 저장될 때마다 day 이벤트 (첫째 날부터 순서대로)
+          source.addEventListener('day', (event) => {
+            const day = JSON.parse((event as MessageEvent).data)
+            console.log(`[케어 플랜 작업] ${day.index + 1}일차 저장 (${day.care_date})`)
+            setDaysReady(day.index + 1)
+          })
+          source.addEventListener('done', () => finish('succeeded'))
+          source.addEventListener('failed', (event) => {
+            console.error("케어 플랜 생성 작업 실패:", JSON.parse((event as MessageEvent).data).error)
+            finish('failed')
+          })
+          source.onerror = () => finish('queued')  // 연결 실패/끊김 → 폴링으로 계속
+        })
+        while (status !== 'succeeded' && status !== 'failed' && Date.now() < deadline) {
+          await new Promise((resolve) => setTimeout(resolve, 1000))
+          const current = await apiGet<{ status: string; stage: string | null; error: string | null }>(
+            `/api/care-plans/jobs/${job.job_id}`
+          )
+          status = current.status
+          console.log(`[케어 플랜 작업] ${status}${current.stage ? ` (${current.stage})` : ''}`)
+          if (status === 'failed') {
+            console.error("케어 플랜 생성 작업 실패:", current.error)
+          }
+        }
+
         console.log("AI 케어 플랜 생성 완료!")
       } catch (err) {
         console.error("케어 플랜 생성 실패:", err)
@@ -167,7 +198,7 @@ export default function CarePlanCreate1Page() {
           생성하고 있어요
         </h2>
         <p className="text-sm text-[#828282] font-medium">
-          곧 완료됩니다
+          {daysReady > 0 ? `${daysReady}일차 일정까지 완성되었어요` : '곧 완료됩니다'}
           <span className="inline-block after:content-['.'] after:animate-[dots_1.5s_infinite]"></span>
         </p>
       </div>
@@ -81,6 +81,11 @@ export async function apiPost<T>(url: string, body: any, options?: { includeAuth
     }
 }
 
+// Server-Sent Events 구독 (EventSource는 헤더를 못 보내므로 인증이 필요 없는 엔드포인트용)
+export function apiEventSource(url: string): EventSource {
+    return new EventSource(`${BASE_URL}${url}`);
+}
+
 export async function apiGet<T>(url: string): Promise<T> {
     const headers: any = {
         'Content-Type': 'application/json',
@@ -0,0 +1,332 @@
+"""
+케어 플랜 템플릿 캐시 검증
+돌봄 프로필 정규화 키, 이름/약물 자리표시자 변환과 재개인화, 개인 정보가 남은 템플릿 저장 거부,
+TTL/LRU, 워커(프로세스) 간 공유, 첫 요청만 LLM 호출 후 같은 프로필은 캐시 사용(일반/스트리밍 생성), 적중률 확인
+(가짜 설정/LLM 게이트웨이)
+"""
+
+import asyncio
+import json
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import time
+import types
+from pathlib import Path
+from types import SimpleNamespace
+
+# 백엔드 경로 추가
+backend_path = Path(__file__).parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from app.services import care_plan_cache
+from app.services.care_plan_cache import CarePlanTemplateCache, identifying_text, personalize, to_template
+
+failed = False
+
+PATIENT = {
+    "id": 1,
+    "name": "김영희",
+    "age": 78,
+    "condition": "3등급",
+    "special_conditions": "당뇨, 고혈압",
+    "health_conditions": ["당뇨", "고혈압"],
+    "medications": ["메트포르민", "암로디핀"],
+}
+CAREGIVER = {"name": "박철수", "experience_years": 5}
+REQUIREMENTS = {"care_type": "time", "time_slots": ["morning", "afternoon"]}
+
+
+def check(condition: bool, message: str):
+    global failed
+    failed |= not condition
+    print(f"{'✅' if condition else '❌'} {message}")
+
+
+def make_plan(patient_name: str, caregiver_name: str, days: int = 2) -> dict:
+    """LLM이 만든 것 같은 케어 플랜 dict"""
+    return {
+        "patient_name": patient_name,
+        "caregiver_name": caregiver_name,
+        "summary": {"total_activities": 3 * days},
+        "weekly_schedule": [
+            {
+                "day": day,
+                "activities": [
+                    {"time": "09:00", "title": "아침 식사", "assignee": f"👨‍⚕️ 간병인 {caregiver_name}",
+                     "note": f"{patient_name}님 메트포르민 복용 전 식사"},
+                    {"time": "09:30", "title": "약 복용 확인", "assignee": f"👨‍⚕️ 간병인 {caregiver_name}",
+                     "note": "⚠️ 메트포르민, 암로디핀"},
+                    {"time": "10:00", "title": "산책", "assignee": "👩 가족", "note": ""},
+                ],
+            }
+            for day in ["월요일", "화요일", "수요일"][:days]
+        ],
+        "caregiver_feedback": {
+            "overall_comment": f"{caregiver_name} 간병인이 {patient_name}님 혈당을 매일 확인하세요.",
+            "activity_reviews": [],
+        },
+    }
+
+
+def profile_key():
+    print("\n1️⃣ 돌봄 프로필 키...")
+    key = CarePlanTemplateCache.make_key(PATIENT, REQUIREMENTS, ["morning", "afternoon"], 7, model="gpt-4o")
+
+    other_patient = {**PATIENT, "id": 2, "name": "이순자", "age": 81, "medications": ["아스피린"],
+                     "health_conditions": [" 고혈압", "당뇨"], "special_conditions": "고혈압,당뇨"}
+    check(CarePlanTemplateCache.make_key(other_patient, REQUIREMENTS, ["afternoon", "morning"], 7, model="gpt-4o")
+          == key, "이름/나이/약물/질환 순서/시간대 순서가 달라도 같은 키")
+
+    changed = [
+        ({**PATIENT, "condition": "2등급"}, REQUIREMENTS, ["morning", "afternoon"], 7, "gpt-4o", "요양등급"),
+        ({**PATIENT, "health_conditions": ["당뇨"], "special_conditions": "당뇨"}, REQUIREMENTS,
+         ["morning", "afternoon"], 7, "gpt-4o", "질환"),
+        (PATIENT, REQUIREMENTS, ["morning"], 7, "gpt-4o", "시간대"),
+        (PATIENT, REQUIREMENTS, ["morning", "afternoon"], 3, "gpt-4o", "기간"),
+        (PATIENT, {"care_type": "live-in"}, ["morning", "afternoon"], 7, "gpt-4o", "돌봄 유형"),
+        (PATIENT, REQUIREMENTS, ["morning", "afternoon"], 7, "gpt-4o-mini", "배포 모델"),
+    ]
+    for patient, requirements, slots, days, model, label in changed:
+        check(CarePlanTemplateCache.make_key(patient, requirements, slots, days, model=model) != key,
+              f"{label}이(가) 다르면 다른 키")
+
+
+def template_roundtrip():
+    print("\n2️⃣ 템플릿 변환 / 재개인화...")
+    plan = make_plan("김영희", "박철수")
+    template = to_template(plan, PATIENT, CAREGIVER)
+    text = json.dumps(template, ensure_ascii=False)
+    check("김영희" not in text and "박철수" not in text and "메트포르민" not in text
+          and "암로디핀" not in text, "템플릿에 원래 환자/간병인 이름, 약물 이름이 남지 않음")
+    check(plan["patient_name"] == "김영희" and "메트포르민" in plan["weekly_schedule"][0]["activities"][1]["note"],
+          "원본 플랜은 변경하지 않음")
+
+    other_patient = {**PATIENT, "name": "이순자", "medications": ["아스피린", "리피토", "자누비아", "노바스크"]}
+    personalized = personalize(template, other_patient, {"name": "최민수"})
+    day = personalized["weekly_schedule"][0]
+    check(personalized["patient_name"] == "이순자" and personalized["caregiver_name"] == "최민수"
+          and day["activities"][0]["assignee"] == "👨‍⚕️ 간병인 최민수"
+          and personalized["caregiver_feedback"]["overall_comment"].startswith("최민수 간병인이 이순자님"),
+          "이름 재개인화 (요약/담당자/피드백)")
+    check(day["activities"][1]["note"] == "⚠️ 아스피린, 리피토, 자누비아 외 1개"
+          and day["activities"][0]["note"] == "이순자님 처방 약 복용 전 식사",
+          f"복약 활동 메모는 요청 환자의 약물로 ({day['activities'][1]['note']})")
+    check([a["time"] for a in day["activities"]] == ["09:00", "09:30", "10:00"]
+          and [d["day"] for d in personalized["weekly_schedule"]] == ["월요일", "화요일"],
+          "시간/요일 구성은 템플릿 그대로")
+    check(personalize(template, {"name": "", "medications": []}, {})["weekly_schedule"][0]["activities"][1]["note"]
+          == "⚠️ 처방된 약물 확인 필요" and "{{" not in json.dumps(
+              personalize(template, {}, {}), ensure_ascii=False), "정보가 없어도 자리표시자가 남지 않음")
+
+    generic = to_template(make_plan("환자", "간병인"), {"name": "환자"}, {})
+    check(generic["weekly_schedule"][0]["activities"][0]["assignee"] == "👨‍⚕️ 간병인 간병인",
+          "기본값 이름(환자/간병인)은 일반 단어라 치환하지 않음")
+
+    check(identifying_text(template, PATIENT, CAREGIVER) == [], "이름/약물만 있던 플랜은 개인 정보 없음")
+    leaks = {
+        "78세 고령이므로 천천히 이동": "나이",
+        "활동성(45)이 낮아 짧은 산책": "성격 점수",
+        "경력 5년의 간병인이 담당": "간병인 경력",
+        "보호자 연락처 010-1234-5678": "연락처",
+        "결과를 family@example.com으로 공유": "이메일",
+    }
+    for note, label in leaks.items():
+        leaky = json.loads(json.dumps(template))
+        leaky["weekly_schedule"][1]["activities"][2]["note"] = note
+        check(identifying_text(leaky, PATIENT, CAREGIVER) == [label], f"자유 텍스트의 {label} 발견 ({note})")
+    check(identifying_text(make_plan("김영희", "박철수"), PATIENT, CAREGIVER) == ["환자 이름", "간병인 이름", "약물 이름"],
+          "치환 전 이름/약물 이름 발견")
+    check(identifying_text(to_template(make_plan("환자", "간병인"), {}, {}), {}, {}) == []
+          and identifying_text({"note": "스트레칭 3세트, 09:30 혈압 측정"}, PATIENT, CAREGIVER) == [],
+          "기본값 이름, 횟수/시간은 개인 정보 아님")
+
+
+def _put_from_child(path: str, key: str):
+    cache = CarePlanTemplateCache(path)
+    cache.put(key, {"from": "child"})
+
+
+def ttl_lru_shared(work_dir: Path):
+    print("\n3️⃣ TTL / LRU / 워커 간 공유...")
+    cache = CarePlanTemplateCache(str(work_dir / "templates.sqlite3"), max_entries=2, ttl_seconds=0.2)
+    cache.put("a", {"v": 1})
+    check(cache.get("a") == {"v": 1} and cache.get("b") is None, "저장/조회, 없는 키는 None")
+    time.sleep(0.3)
+    check(cache.get("a") is None, "TTL이 지나면 만료")
+
+    cache = CarePlanTemplateCache(str(work_dir / "lru.sqlite3"), max_entries=2, ttl_seconds=60)
+    cache.put("a", {"v": 1})
+    time.sleep(0.01)
+    cache.put("b", {"v": 2})
+    time.sleep(0.01)
+    cache.get("a")
+    time.sleep(0.01)
+    cache.put("c", {"v": 3})
+    check(cache.get("b") is None and cache.get("a") == {"v": 1} and cache.get("c") == {"v": 3},
+          "최대 항목 수 초과 시 가장 오래 사용하지 않은 항목 제거")
+    stats = cache.get_stats()
+    check(stats["entries"] == 2 and stats["hits"] == 3 and stats["misses"] == 1 and stats["hit_rate"] == 0.75,
+          f"통계 (entries={stats['entries']}, hit_rate={stats['hit_rate']})")
+
+    shared_path = str(work_dir / "shared.sqlite3")
+    parent = CarePlanTemplateCache(shared_path)
+    process = multiprocessing.get_context("spawn").Process(target=_put_from_child, args=(shared_path, "shared"))
+    process.start()
+    process.join(30)
+    check(parent.get("shared") == {"from": "child"}, "다른 프로세스가 저장한 템플릿 조회")
+
+    broken = CarePlanTemplateCache(str(work_dir))  # 디렉터리 경로 → 열기 실패
+    broken.put("a", {"v": 1})
+    check(not broken.is_available and broken.get("a") is None, "캐시를 열 수 없으면 캐시 없이 동작")
+
+
+class FakeGateway:
+    """LLM 호출 수를 세는 가짜 게이트웨이 (환자 이름이 들어간 플랜 JSON 응답)"""
+
+    is_available = True
+
+    def __init__(self):
+        self.calls = 0
+        self.prompts = []
+        self.leak = ""  # 피드백에 덧붙일 개인 정보 (지시를 어기는 응답)
+
+    def _response(self, messages) -> str:
+        self.calls += 1
+        prompt = messages[-1]["content"]
+        self.prompts.append(prompt)
+        patient_name = prompt.split("- 이름: ")[1].split("\n")[0]
+        caregiver_name = prompt.split("- 이름: ")[2].split("\n")[0]
+        plan = make_plan(patient_name, caregiver_name)
+        plan["caregiver_feedback"]["overall_comment"] += self.leak
+        return json.dumps(plan, ensure_ascii=False)
+
+    async def acomplete(self, messages, **kwargs):
+        await asyncio.sleep(0.05)
+        return SimpleNamespace(content=self._response(messages), latency_ms=50, attempts=1,
+                               prompt_tokens=100, completion_tokens=200)
+
+    async def astream(self, messages, **kwargs):
+        text = self._response(messages)
+        for i in range(0, len(text), 40):
+            await asyncio.sleep(0.001)
+            yield text[i:i + 40]
+
+
+async def service_integration(work_dir: Path):
+    print("\n4️⃣ 케어 플랜 생성 서비스 연동...")
+    settings = SimpleNamespace(
+        AZURE_OPENAI_DEPLOYMENT="gpt-4o", AZURE_OPENAI_TIMEOUT=30, AZURE_OPENAI_API_KEY="key",
+        AZURE_OPENAI_ENDPOINT="https://example.invalid",
+        CARE_PLAN_CACHE_ENABLED=True, CARE_PLAN_CACHE_PATH=str(work_dir / "service.sqlite3"),
+        CARE_PLAN_CACHE_MAX_ENTRIES=100, CARE_PLAN_CACHE_TTL_SECONDS=3600,
+    )
+    config = types.ModuleType("app.core.config")
+    config.get_settings = lambda: settings
+    saved_config = sys.modules.get("app.core.config")
+    sys.modules["app.core.config"] = config
+    try:
+        from app.services import care_plan_generation_service as service_module
+
+        gateway = FakeGateway()
+        service_module.get_llm_gateway = lambda: gateway
+        service = service_module.CarePlanGenerationService()
+        check(service.template_cache is care_plan_cache.get_care_plan_cache(), "설정으로 싱글톤 캐시 생성")
+
+        async def generate(patient, caregiver, **kwargs):
+            return await service.generate_care_plan(patient, caregiver, {}, REQUIREMENTS,
+                                                    start_date="2026-01-05", end_date="2026-01-06", **kwargs)
+
+        first = await generate(PATIENT, CAREGIVER)
+        check(gateway.calls == 1 and first.patient_name == "김영희", "첫 요청(콜드 프로필)은 LLM 호출")
+        check("김영희" not in gateway.prompts[-1] and "박철수" not in gateway.prompts[-1]
+              and "78" not in gateway.prompts[-1] and "{{patient_name}}" in gateway.prompts[-1],
+              "템플릿 프롬프트에는 이름 대신 자리표시자, 나이 없음")
+        check(first.weekly_schedule[0].activities[0].assignee == "👨‍⚕️ 간병인 박철수"
+              and first.weekly_schedule[0].activities[1].note == "⚠️ 메트포르민, 암로디핀"
+              and "{{" not in first.model_dump_json(), "첫 요청 응답도 요청 환자/간병인으로 채움")
+
+        other_patient = {**PATIENT, "id": 2, "name": "이순자", "medications": ["아스피린"]}
+        start = time.perf_counter()
+        second = await generate(other_patient, {"name": "최민수"})
+        elapsed = time.perf_counter() - start
+        check(gateway.calls == 1, f"같은 프로필은 LLM 호출 없이 캐시 사용 ({elapsed * 1000:.1f}ms)")
+        activities = second.weekly_schedule[0].activities
+        check(second.patient_name == "이순자" and activities[0].assignee == "👨‍⚕️ 간병인 최민수"
+              and activities[1].note == "⚠️ 아스피린", "캐시 플랜을 요청 환자/간병인으로 재개인화")
+
+        await generate({**PATIENT, "condition": "1등급"}, CAREGIVER)
+        check(gateway.calls == 2, "다른 프로필은 다시 LLM 호출")
+
+        streamed = []
+        async for kind, value in service.stream_care_plan(
+                {**PATIENT, "name": "정미자"}, {"name": "한지민"}, {}, REQUIREMENTS,
+                start_date="2026-01-05", end_date="2026-01-06"):
+            streamed.append((kind, value))
+        check(gateway.calls == 2 and [kind for kind, _ in streamed] == ["day", "day", "plan"]
+              and streamed[-1][1].patient_name == "정미자", "스트리밍 생성도 캐시 사용 (하루 일정 → 전체 플랜)")
+
+        streamed = [item async for item in service.stream_care_plan(
+            PATIENT, CAREGIVER, {}, {**REQUIREMENTS, "care_type": "live-in"}, days=2)]
+        check(gateway.calls == 3 and len(streamed) == 3 and streamed[-1][1].patient_name == "김영희",
+              "콜드 프로필 스트리밍은 LLM 호출")
+        streamed = [item async for item in service.stream_care_plan(
+            other_patient, CAREGIVER, {}, {**REQUIREMENTS, "care_type": "live-in"}, days=2)]
+        check(gateway.calls == 3 and streamed[-1][1].patient_name == "이순자", "스트리밍 LLM 결과도 템플릿으로 저장되어 다음 요청이 사용")
+
+        stats = service.template_cache.get_stats()
+        check(stats["hits"] == 3 and stats["misses"] == 3 and stats["hit_rate"] == 0.5,
+              f"적중률 집계 (hits={stats['hits']}, misses={stats['misses']})")
+
+        # 지시를 어기고 개인 정보를 쓴 응답은 요청 환자에게만 반환하고 템플릿으로 저장하지 않음
+        gateway.leak = " 78세이므로 낙상에 주의하세요."
+        leaky_profile = {**PATIENT, "condition": "4등급"}
+        leaky = await generate(leaky_profile, CAREGIVER)
+        check(gateway.calls == 4 and "78세" in leaky.caregiver_feedback.overall_comment, "개인 정보가 있는 응답도 요청 환자에게는 반환")
+        gateway.leak = ""
+        await generate({**leaky_profile, "name": "이순자", "age": 81}, {"name": "최민수"})
+        check(gateway.calls == 5, "개인 정보가 있던 플랜은 템플릿으로 저장하지 않아 다음 환자는 LLM 호출")
+
+        def broken_get(key):
+            raise RuntimeError("디스크 오류")
+
+        service.template_cache.get = broken_get
+        plan = await generate(other_patient, {"name": "최민수"})
+        check(gateway.calls == 6 and plan.patient_name == "이순자", "캐시 오류 시 LLM으로 생성")
+    finally:
+        care_plan_cache._care_plan_cache = None
+        sys.modules.pop("app.services.care_plan_generation_service", None)
+        if saved_config is None:
+            sys.modules.pop("app.core.config", None)
+        else:
+            sys.modules["app.core.config"] = saved_config
+
+
+def main():
+    print("=" * 70)
+    print("🧪 케어 플랜 템플릿 캐시 검증")
+    print("=" * 70)
+
+    profile_key()
+    template_roundtrip()
+
+    work_dir = Path(tempfile.mkdtemp(prefix="care_plan_cache_"))
+    try:
+        ttl_lru_shared(work_dir)
+        asyncio.run(service_integration(work_dir))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("\n" + "=" * 70)
+    if failed:
+        print("❌ 검증 실패")
+        print("=" * 70)
+        sys.exit(1)
+
+    print("🎉 같은 돌봄 프로필의 케어 플랜은 LLM 호출 없이 재사용됩니다!")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
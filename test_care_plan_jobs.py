@@ -0,0 +1,395 @@
+"""
+케어 플랜 백그라운드 작업 큐 검증
+작업 등록 즉시 반환, 워커 동시 실행 수, 상태 폴링/구독, 실패 기록, 대기열 제한,
+SQLite 백엔드로 워커(프로세스) 간 작업 공유, 응답 없는 작업 실패 처리,
+케어 플랜/추천 식단 LLM 동시 생성, 스트리밍 응답의 하루 단위 파싱/저장 확인
+(가짜 생성 서비스, DB 저장 대체)
+"""
+
+import asyncio
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# 백엔드 경로 추가
+backend_path = Path(__file__).parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from app.services import care_plan_jobs
+from app.services.care_plan_jobs import activity_category, run_care_plan_job
+from app.services.json_stream import JSONArrayStreamParser
+from app.services.job_queue import (
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    Job,
+    JobQueue,
+    JobQueueFullError,
+    MemoryJobBackend,
+    SQLiteJobBackend,
+)
+
+failed = False
+
+
+def check(condition: bool, message: str):
+    global failed
+    failed |= not condition
+    print(f"{'✅' if condition else '❌'} {message}")
+
+
+class FakeHandler:
+    """LLM 생성 + 저장을 흉내 내는 작업 (payload의 delay만큼 대기, fail이면 예외)"""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.executed = []
+
+    async def __call__(self, job, progress):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await progress("generating")
+            await asyncio.sleep(job.payload.get("delay", 0.05))
+            await progress("saving")
+            if job.payload.get("fail"):
+                raise ValueError("일정 저장 실패")
+            self.executed.append(job.job_id)
+            return {"success": True, "patient_id": job.payload["patient_id"]}
+        finally:
+            self.active -= 1
+
+
+async def wait_done(queue: JobQueue, job_id: str, timeout: float = 5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = await queue.get(job_id)
+        if job is not None and job.is_done:
+            return job
+        await asyncio.sleep(0.02)
+    return await queue.get(job_id)
+
+
+async def memory_backend():
+    print("\n1️⃣ memory 백엔드...")
+    handler = FakeHandler()
+    queue = JobQueue(MemoryJobBackend(), handler, "care_plan", workers=2, max_queued=5)
+    queue.start()
+
+    start = time.perf_counter()
+    job = await queue.submit({"patient_id": 1, "delay": 0.3})
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    check(job.status == JOB_QUEUED and elapsed_ms < 50, f"등록 즉시 반환 ({elapsed_ms:.1f}ms, 생성 0.3초)")
+
+    stages = []
+    async for state in queue.watch(job.job_id, poll_interval=0.01):
+        stages.append((state.status, state.stage))
+    check(stages[-1] == (JOB_SUCCEEDED, "saving") and (JOB_RUNNING, "generating") in stages,
+          f"구독: {' → '.join(f'{s}/{g}' for s, g in stages)}")
+    done = await queue.get(job.job_id)
+    check(done.result == {"success": True, "patient_id": 1} and done.finished_at >= done.started_at,
+          "완료 결과 조회")
+
+    jobs = [await queue.submit({"patient_id": i, "delay": 0.1}) for i in range(4)]
+    results = [await wait_done(queue, j.job_id) for j in jobs]
+    check(all(r.status == JOB_SUCCEEDED for r in results) and handler.peak == 2, f"워커 2개 (최대 동시 실행 {handler.peak})")
+
+    bad = await queue.submit({"patient_id": 9, "fail": True})
+    bad = await wait_done(queue, bad.job_id)
+    check(bad.status == JOB_FAILED and "일정 저장 실패" in bad.error, f"예외 → failed ({bad.error})")
+
+    # 대기열 제한 (워커가 모두 실행 중일 때 대기 작업 최대 5건)
+    slow = [await queue.submit({"patient_id": i, "delay": 0.5}) for i in range(2)]
+    await asyncio.sleep(0.05)
+    slow += [await queue.submit({"patient_id": i, "delay": 0.5}) for i in range(5)]
+    try:
+        await queue.submit({"patient_id": 99})
+        check(False, "대기 작업 초과 시 JobQueueFullError")
+    except JobQueueFullError:
+        check(True, "대기 작업 초과 시 JobQueueFullError (503)")
+
+    status = await queue.get_status()
+    check(status["backend"] == "memory" and status["failed"] == 1, f"상태: {status['jobs']}")
+
+    await queue.stop()
+    interrupted = await queue.get(slow[0].job_id)
+    check(interrupted.status == JOB_FAILED and "중단" in interrupted.error, "종료 시 실행 중 작업은 failed로 기록")
+    check(await queue.get("unknown") is None, "없는 작업 → None (404)")
+
+    # 만료
+    removed = await queue.backend.purge(time.time() + 1, 0)
+    check(removed >= 6 and await queue.get(job.job_id) is None, f"완료 작업 만료 삭제 {removed}건")
+
+
+async def sqlite_backend(work_dir: Path):
+    print("\n2️⃣ sqlite 백엔드 (워커 간 공유)...")
+    path = str(work_dir / "jobs.sqlite3")
+
+    # 워커 A: 요청만 받는 프로세스 (작업 태스크 없음), 워커 B: 작업 실행
+    handler_a, handler_b = FakeHandler(), FakeHandler()
+    queue_a = JobQueue(SQLiteJobBackend(path, poll_interval=0.05), handler_a, "care_plan", workers=1)
+    queue_b = JobQueue(SQLiteJobBackend(path, poll_interval=0.05), handler_b, "care_plan", workers=2)
+    queue_b.start()
+
+    jobs = [await queue_a.submit({"patient_id": i, "delay": 0.05}) for i in range(5)]
+    results = [await wait_done(queue_a, j.job_id) for j in jobs]
+    check(all(r.status == JOB_SUCCEEDED for r in results) and len(handler_b.executed) == 5 and not handler_a.executed,
+          "워커 A에서 등록한 작업을 워커 B가 실행, A에서 결과 조회")
+    check(results[3].result == {"success": True, "patient_id": 3}, "결과 JSON 저장/복원")
+
+    # 두 워커가 같이 실행해도 작업은 한 번씩만
+    queue_a.start()
+    jobs = [await queue_a.submit({"patient_id": i, "delay": 0.02}) for i in range(20)]
+    await asyncio.gather(*(wait_done(queue_a, j.job_id) for j in jobs))
+    executed = handler_a.executed + handler_b.executed
+    check(len(executed) == 25 and len(set(executed)) == 25,
+          f"작업 중복 실행 없음 (A {len(handler_a.executed)}건, B {len(handler_b.executed) - 5}건)")
+
+    # 응답 없는 running 작업 (실행 중 워커 종료)
+    orphan = await queue_a.submit({"patient_id": 77, "delay": 10})
+    for _ in range(100):
+        if (await queue_a.get(orphan.job_id)).status == JOB_RUNNING:
+            break
+        await asyncio.sleep(0.02)
+    await queue_a.stop()
+    await queue_b.stop()
+    stuck = SQLiteJobBackend(path)
+    job = await stuck.load(orphan.job_id)
+    job.status, job.error, job.finished_at = JOB_RUNNING, None, None
+    await stuck.save(job)
+    await stuck.purge(0, time.time() + 1)
+    job = await stuck.load(orphan.job_id)
+    check(job.status == JOB_FAILED and "응답" in job.error, "갱신 없는 running 작업 → failed")
+
+    counts = await stuck.counts()
+    check(counts.get(JOB_SUCCEEDED) == 25, f"상태별 작업 수 {counts}")
+    stuck.close()
+
+
+class FakeServices:
+    """케어 플랜/식단 생성 서비스와 DB 저장을 대신하는 가짜 (호출 시각 기록)"""
+
+    def __init__(self, plan_delay=0.3, meal_delay=0.3, save_delay=0.1, meal_fail=False, save_fail=False,
+                 stream=False, days=2, fail_on_day=None):
+        self.plan_delay, self.meal_delay, self.save_delay = plan_delay, meal_delay, save_delay
+        self.meal_fail, self.save_fail = meal_fail, save_fail
+        self.stream, self.fail_on_day = stream, fail_on_day
+        self.days = [
+            SimpleNamespace(day=name, activities=[], model_dump=lambda name=name: {"day": name, "activities": []})
+            for name in ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"][:days]
+        ]
+        self.events = []
+        self.saved_meals = []
+        self.saved_days = []
+        self.stream_closed = False
+        fakes = self
+
+        class CarePlanGenerationService:
+            async def generate_care_plan(self, **kwargs):
+                fakes.events.append(("plan_start", time.perf_counter()))
+                await asyncio.sleep(fakes.plan_delay)
+                return SimpleNamespace(weekly_schedule=fakes.days, model_dump=lambda: {"days": len(fakes.days)})
+
+            async def stream_care_plan(self, **kwargs):
+                """plan_delay 동안 하루 일정을 고르게 반환"""
+                fakes.events.append(("plan_start", time.perf_counter()))
+                try:
+                    for day in fakes.days:
+                        await asyncio.sleep(fakes.plan_delay / len(fakes.days))
+                        yield "day", day
+                    yield "plan", SimpleNamespace(weekly_schedule=fakes.days, model_dump=lambda: {"days": len(fakes.days)})
+                finally:
+                    fakes.stream_closed = True
+
+        class MealRecommendationService:
+            def __init__(self, config):
+                pass
+
+            async def recommend_meal(self, **kwargs):
+                fakes.events.append(("meal_start", time.perf_counter()))
+                await asyncio.sleep(fakes.meal_delay)
+                if fakes.meal_fail:
+                    raise RuntimeError("식단 LLM 오류")
+                return {"menu_name": "현미밥", "patient_data": kwargs["patient_data"]}
+
+        self.modules = {
+            "app.services.care_plan_generation_service": SimpleNamespace(
+                CarePlanGenerationService=CarePlanGenerationService),
+            "app.services.meal_recommendation": SimpleNamespace(
+                MealRecommendationConfig=lambda: None, MealRecommendationService=MealRecommendationService),
+        }
+
+    def in_session(self, fn, *args):
+        if fn is care_plan_jobs.clear_pending_schedules:
+            self.events.append(("clear", time.perf_counter()))
+            return None
+        if fn is care_plan_jobs.save_care_plan_day:
+            patient_id, matching_id, care_date, day = args
+            if day.day == self.fail_on_day:
+                raise care_plan_jobs.CarePlanSaveError("일정 저장 실패")
+            self.saved_days.append((care_date.isoformat(), day.day, time.perf_counter()))
+            return 100 + len(self.saved_days)
+        if fn is care_plan_jobs.save_care_plan:
+            time.sleep(self.save_delay)
+            if self.save_fail:
+                raise care_plan_jobs.CarePlanSaveError("일정 저장 실패")
+            return [101 + i for i in range(len(self.days))]
+        self.saved_meals.append(args[-1]["menu_name"])
+        return {"plan_id": 7, "menu_name": args[-1]["menu_name"]}
+
+    async def run(self):
+        saved = {name: sys.modules.get(name) for name in self.modules}
+        original_in_session = care_plan_jobs._in_session
+        sys.modules.update(self.modules)
+        care_plan_jobs._in_session = self.in_session
+        stages = []
+        self.partials = []
+
+        async def progress(stage, partial=None):
+            stages.append(stage)
+            if partial is not None:
+                self.partials.append((len(partial["days"]), time.perf_counter()))
+
+        job = Job.create("care_plan", {
+            "patient_id": 1,
+            "matching_id": 3,
+            "stream": self.stream,
+            "generation": {"start_date": "2026-01-05"},
+            "meal": {"patient_data": {"name": "환자"}, "health_conditions": [], "medications": [], "dietary_prefs": {}},
+        })
+        try:
+            start = self.start = time.perf_counter()
+            try:
+                result = await run_care_plan_job(job, progress)
+            except Exception as e:
+                result = e
+            elapsed = time.perf_counter() - start
+            await asyncio.sleep(self.meal_delay)  # 취소된 식단 작업이 저장까지 가지 않는지 확인
+            return result, stages, elapsed
+        finally:
+            care_plan_jobs._in_session = original_in_session
+            for name, module in saved.items():
+                if module is None:
+                    sys.modules.pop(name, None)
+                else:
+                    sys.modules[name] = module
+
+
+async def concurrent_generation():
+    print("\n3️⃣ 케어 플랜/추천 식단 동시 생성...")
+    fakes = FakeServices(plan_delay=0.3, meal_delay=0.3, save_delay=0.1)
+    result, stages, elapsed = await fakes.run()
+    starts = dict(fakes.events)
+    check(abs(starts["plan_start"] - starts["meal_start"]) < 0.05, "두 LLM 호출 동시 시작")
+    check(elapsed < 0.55, f"소요 {elapsed * 1000:.0f}ms (순차 실행 시 ≥ 700ms)")
+    check(result["saved_schedule_ids"] == [101, 102] and result["meal_plan"]["menu_name"] == "현미밥"
+          and result["message"] == "케어 플랜과 추천 식단이 생성되었습니다.", "결과 합류 (일정 + 추천 식단)")
+    check(stages == ["generating", "saving"], f"식단이 먼저 끝나면 meal_plan 단계 생략 ({stages})")
+
+    fakes = FakeServices(plan_delay=0.1, meal_delay=0.5, save_delay=0.05)
+    result, stages, elapsed = await fakes.run()
+    check(stages == ["generating", "saving", "meal_plan"] and 0.45 < elapsed < 0.7,
+          f"식단이 더 오래 걸리면 meal_plan 단계에서 대기 ({elapsed * 1000:.0f}ms)")
+
+    fakes = FakeServices(plan_delay=0.1, meal_delay=0.1, meal_fail=True)
+    result, stages, elapsed = await fakes.run()
+    check(result["saved_schedule_ids"] == [101, 102] and "meal_plan" not in result
+          and result["message"] == "케어 플랜이 생성되었습니다.", "식단 실패 → 케어 플랜만 반환")
+
+    fakes = FakeServices(plan_delay=0.1, meal_delay=0.3, save_delay=0.0, save_fail=True)
+    result, stages, elapsed = await fakes.run()
+    check(isinstance(result, care_plan_jobs.CarePlanSaveError) and not fakes.saved_meals,
+          "일정 저장 실패 → 작업 실패, 진행 중인 식단 생성 취소 (저장 안 함)")
+
+
+def stream_parser():
+    print("\n4️⃣ 스트리밍 JSON 파서...")
+    text = (
+        '```json\n{"patient_name": "홍 {길동}", "summary": {"weekly_schedule": []},\n'
+        ' "weekly_schedule": [\n'
+        '  {"day": "월요일", "activities": [{"time": "09:00", "title": "약 복용 \\"아침\\" {식후}", "note": "]}"}]},\n'
+        '  {"day": "화요일", "activities": []},\n'
+        '  {"day": "수요일", "activities": [{"time": "10:00", "title": "산책"}]}\n'
+        ' ],\n "caregiver_feedback": {"overall_comment": "[끝]", "activity_reviews": [{"day": "x"}]}}\n```'
+    )
+    parser = JSONArrayStreamParser("weekly_schedule")
+    items, positions = [], []
+    for i, char in enumerate(text):
+        for item in parser.feed(char):
+            items.append(item)
+            positions.append(i)
+    check([item["day"] for item in items] == ["월요일", "화요일", "수요일"], "한 글자씩 넣어도 항목 3개 (중첩 객체의 같은 키 무시)")
+    check(items[0]["activities"][0]["title"] == '약 복용 "아침" {식후}' and items[0]["activities"][0]["note"] == "]}",
+          "문자열 안 괄호/이스케이프 처리")
+    check(positions[0] == text.index("}]},") + 2 and parser.done, "객체가 닫히는 즉시 반환, 배열 종료 감지")
+
+    parser = JSONArrayStreamParser("weekly_schedule")
+    broken = parser.feed('{"weekly_schedule": [{"day": "월요일", "activities": [1,]}, {"day": "화요일", "activities": []}]}')
+    check([item["day"] for item in broken] == ["화요일"], "파싱 실패 항목(잘못된 JSON)은 건너뜀")
+
+
+async def streaming_generation():
+    print("\n5️⃣ 스트리밍 생성 + 하루 단위 저장...")
+    fakes = FakeServices(stream=True, days=3, plan_delay=0.6, meal_delay=0.2)
+    result, stages, elapsed = await fakes.run()
+    first_saved = fakes.saved_days[0][2] - fakes.start
+    check(first_saved < 0.35 and elapsed >= 0.6, f"첫째 날 저장 {first_saved * 1000:.0f}ms (전체 생성 {elapsed * 1000:.0f}ms)")
+    check(dict(fakes.events)["clear"] < fakes.saved_days[0][2], "저장 전 기존 pending_review 일정 삭제")
+    check([d[:2] for d in fakes.saved_days] == [("2026-01-05", "월요일"), ("2026-01-06", "화요일"), ("2026-01-07", "수요일")],
+          "날짜 순서대로 저장")
+    check([n for n, _ in fakes.partials] == [1, 2, 3], "저장할 때마다 중간 결과(days) 갱신")
+    check(result["saved_schedule_ids"] == [101, 102, 103] and [d["schedule_id"] for d in result["days"]] == [101, 102, 103]
+          and result["days"][2] == {"index": 2, "care_date": "2026-01-07", "schedule_id": 103,
+                                    "day": {"day": "수요일", "activities": []}}, "최종 결과 days / saved_schedule_ids")
+    check(result["meal_plan"]["menu_name"] == "현미밥" and "saving" not in stages, "추천 식단 합류 (별도 saving 단계 없음)")
+
+    fakes = FakeServices(stream=True, days=3, plan_delay=0.3, meal_delay=0.5, fail_on_day="화요일")
+    result, stages, elapsed = await fakes.run()
+    check(isinstance(result, care_plan_jobs.CarePlanSaveError) and [d[1] for d in fakes.saved_days] == ["월요일"]
+          and fakes.stream_closed and not fakes.saved_meals,
+          "하루 저장 실패 → 작업 실패, 생성 스트림 종료, 식단 취소 (앞선 날은 유지)")
+
+    fakes = FakeServices(stream=False, days=2, plan_delay=0.1, meal_delay=0.05)
+    result, stages, elapsed = await fakes.run()
+    check([d["care_date"] for d in result["days"]] == ["2026-01-05", "2026-01-06"] and not fakes.saved_days,
+          "스트리밍 끔 → 한 번에 저장, days도 같은 형식")
+
+
+def main():
+    print("=" * 70)
+    print("🧪 케어 플랜 백그라운드 작업 큐 검증")
+    print("=" * 70)
+
+    check(activity_category("점심 약 복용") == "medication" and activity_category("저녁 식사 준비") == "meal"
+          and activity_category("야간 체크 (1차)") == "vital_check" and activity_category("산책") == "other",
+          "활동 제목 → CareLog 카테고리")
+
+    asyncio.run(memory_backend())
+
+    work_dir = Path(tempfile.mkdtemp(prefix="care_plan_jobs_"))
+    try:
+        asyncio.run(sqlite_backend(work_dir))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    asyncio.run(concurrent_generation())
+    stream_parser()
+    asyncio.run(streaming_generation())
+
+    print("\n" + "=" * 70)
+    if failed:
+        print("❌ 검증 실패")
+        print("=" * 70)
+        sys.exit(1)
+
+    print("🎉 케어 플랜 생성이 요청 경로 밖의 작업 큐에서 실행됩니다!")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
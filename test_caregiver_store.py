@@ -0,0 +1,182 @@
+"""
+간병인 특성 저장소 증분 갱신 검증
+SQLite에 간병인을 만들고 수정/추가/삭제한 뒤 refresh로 다시 읽은 스냅샷이
+updated_at 워터마크 이후 변경만 반영하는지, 삭제된 간병인을 제외하는지,
+변경이 있을 때만 버전이 올라가는지 확인
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 백엔드 경로 추가
+backend_path = Path(__file__).parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+# 설정 검증용 기본값 (실제 DB는 아래에서 만드는 SQLite 엔진 사용)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("KAKAO_REST_API_KEY", "test")
+os.environ.setdefault("KAKAO_REDIRECT_URI", "http://localhost/callback")
+os.environ.setdefault("FRONTEND_URL", "http://localhost")
+
+failed = False
+
+# 기준 시각 (updated_at을 직접 지정해 워터마크 경계를 고정)
+T0 = datetime(2026, 1, 1, 9, 0, 0)
+T1 = T0 + timedelta(minutes=10)
+
+
+def check(condition: bool, message: str):
+    global failed
+    failed |= not condition
+    print(f"{'✅' if condition else '❌'} {message}")
+
+
+def make_engine():
+    """PostgreSQL 모델을 그대로 쓰는 SQLite 엔진 (ARRAY는 JSON 문자열로 저장)"""
+    from sqlalchemy import ARRAY, BigInteger, create_engine
+    from sqlalchemy.ext.compiler import compiles
+
+    # BIGINT 기본 키는 SQLite에서 자동 증가하지 않으므로 INTEGER로 생성
+    @compiles(BigInteger, "sqlite")
+    def _bigint(type_, compiler, **kw):
+        return "INTEGER"
+
+    @compiles(ARRAY, "sqlite")
+    def _array(type_, compiler, **kw):
+        return "TEXT_ARRAY"
+
+    sqlite3.register_adapter(list, lambda value: json.dumps(value, ensure_ascii=False))
+    sqlite3.register_converter("TEXT_ARRAY", json.loads)
+    return create_engine("sqlite://", connect_args={"detect_types": sqlite3.PARSE_DECLTYPES})
+
+
+def main():
+    from sqlalchemy import text
+    from sqlalchemy.orm import Session
+
+    import app.models  # noqa: F401 (관계 매핑 전체 로드)
+    from app.models.care_details import CaregiverPersonality
+    from app.models.profile import Caregiver
+    from app.models.user import User
+    from app.services.matching.caregiver_store import CaregiverFeatureStore
+
+    print("=" * 70)
+    print("🧪 간병인 특성 저장소 증분 갱신 검증")
+    print("=" * 70)
+
+    engine = make_engine()
+    for model in (User, Caregiver, CaregiverPersonality):
+        model.__table__.create(engine)
+
+    db = Session(engine)
+
+    def add_caregiver(i: int, updated_at: datetime) -> Caregiver:
+        user = User(name=f"간병인{i}", email=f"cg{i}@example.com", user_type="caregiver", updated_at=updated_at)
+        db.add(user)
+        db.flush()
+        caregiver = Caregiver(
+            caregiver_id=i,
+            user_id=user.user_id,
+            experience_years=i,
+            certifications="요양보호사 1급",
+            specialties=["치매", "파킨슨"][: i % 3],
+            service_region="SEOUL_GANGNAM",
+            hourly_rate=15000 + i * 1000,
+            avg_rating=4.0,
+            updated_at=updated_at,
+        )
+        caregiver.personality = CaregiverPersonality(
+            empathy_score=50, activity_score=50, patience_score=50, independence_score=50,
+            updated_at=updated_at,
+        )
+        db.add(caregiver)
+        return caregiver
+
+    # 간병인 i는 T0 - (10 - i)시간에 마지막으로 수정됨 (워터마크 = 간병인 5의 시각)
+    for i in range(1, 6):
+        add_caregiver(i, T0 - timedelta(hours=10 - i))
+    db.commit()
+
+    store = CaregiverFeatureStore(watermark_overlap=60)
+    notifications = []
+    store.add_change_listener(
+        lambda snapshot, changed, removed: notifications.append((snapshot.version, changed, removed))
+    )
+
+    # 1. 최초 전체 로드
+    print("\n1️⃣ 최초 로드...")
+    first = store.refresh(db)
+    check(sorted(first.positions) == [1, 2, 3, 4, 5], f"간병인 {len(first)}명 로드")
+    check(first.version == store.version == 1, f"버전 {first.version}")
+    check(store._caregiver_watermark == T0 - timedelta(hours=5), f"간병인 워터마크 {store._caregiver_watermark}")
+    row = first.to_caregiver_dict(first.positions[2])
+    check(
+        row["experience_years"] == 2 and row["specialties"] == ["치매", "파킨슨"]
+        and row["certification_list"] == ["요양보호사 1급"],
+        "컬럼 값 (경력/전문분야/자격증 목록)"
+    )
+
+    # 2. 수정/추가/삭제 후 증분 갱신
+    print("\n2️⃣ 증분 갱신...")
+    caregivers = {cg.caregiver_id: cg for cg in db.query(Caregiver).all()}
+    caregivers[2].experience_years = 12
+    caregivers[2].updated_at = T1
+    caregivers[3].personality.patience_score = 90
+    caregivers[3].personality.updated_at = T1
+    caregivers[5].user.name = "간병인5-개명"
+    caregivers[5].user.updated_at = T1
+    db.query(CaregiverPersonality).filter(CaregiverPersonality.caregiver_id == 4).delete()
+    db.query(Caregiver).filter(Caregiver.caregiver_id == 4).delete()
+    # updated_at을 바꾸지 않은 변경은 증분 갱신 대상이 아님 (아웃박스 refresh_ids로 반영)
+    db.execute(text("UPDATE caregivers SET hourly_rate = 99000 WHERE caregiver_id = 1"))
+    add_caregiver(6, T1)
+    db.commit()
+
+    second = store.refresh(db)
+    check(sorted(second.positions) == [1, 2, 3, 5, 6], f"삭제 반영 + 추가 ({sorted(second.positions)})")
+    check(second.version == store.version == 2, f"버전 1 → {second.version}")
+    check(notifications[-1] == (2, {2, 3, 5, 6}, {4}),
+          f"리스너: 변경 {sorted(notifications[-1][1])}, 삭제 {sorted(notifications[-1][2])}")
+    check(second.experience_years[second.positions[2]] == 12, "간병인 테이블 변경 (경력 12년)")
+    check(second.to_caregiver_dict(second.positions[3])["patience_score"] == 90.0, "성격 테이블 변경 (인내심 90)")
+    check(second.names[second.positions[5]] == "간병인5-개명", "사용자 테이블 변경 (이름)")
+    check(second.hourly_rates[second.positions[1]] == 16000, "updated_at이 워터마크 이전인 행은 조회하지 않음")
+    check(
+        sorted(first.positions) == [1, 2, 3, 4, 5] and first.experience_years[first.positions[2]] == 2,
+        "이전 스냅샷은 그대로 (요청 처리 중 스냅샷 불변)"
+    )
+    check(store._caregiver_watermark == T1 and store._user_watermark == T1, "워터마크 T1로 이동")
+
+    # 3. 변경 없음 → 같은 스냅샷, 버전 유지 (overlap 구간 재조회는 걸러짐)
+    print("\n3️⃣ 변경 없는 갱신...")
+    store.refresh_interval = 0
+    third = store.get_snapshot(db)
+    check(third is second and store.version == 2, "같은 스냅샷, 버전 2 유지")
+    check(len(notifications) == 1, "리스너 호출 없음")
+
+    # 4. 지정 ID 갱신 (점수 무효화 아웃박스 경로)
+    print("\n4️⃣ 지정 ID 갱신...")
+    fourth = store.refresh_ids(db, {1, 4})
+    check(fourth.hourly_rates[fourth.positions[1]] == 99000, "워터마크와 무관하게 간병인 1 반영")
+    check(fourth.version == 3 and notifications[-1] == (3, {1}, set()), f"버전 {fourth.version}, 변경 {{1}}")
+    check(store.refresh_ids(db, {1}) is fourth and store.version == 3, "다시 조회해도 바뀐 것이 없으면 버전 유지")
+
+    db.close()
+
+    print("\n" + "=" * 70)
+    if failed:
+        print("❌ 검증 실패")
+        print("=" * 70)
+        sys.exit(1)
+
+    print("🎉 간병인 특성 저장소가 변경분만 반영합니다!")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
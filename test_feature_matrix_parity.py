@@ -0,0 +1,192 @@
+"""
+XGBoost V2 일괄 예측 Feature 행렬 검증
+batch_predict가 create_feature_matrix로 만든 특성/점수가
+간병인별 create_features_for_pair / predict_compatibility 결과와 같은지,
+일괄 predict 실패 시 같은 모델로 행별 예측하는지 확인
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# 백엔드 경로 추가
+backend_path = Path(__file__).parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from app.services.feature_engineering import FeatureEngineer
+from app.services.xgboost_matching_service import XGBoostMatchingService
+
+failed = False
+
+
+def check(condition: bool, message: str):
+    global failed
+    failed |= not condition
+    print(f"{'✅' if condition else '❌'} {message}")
+
+
+def make_caregivers(n: int, rng: np.random.Generator):
+    specialties = ["치매", "파킨슨", "뇌졸중", "고혈압", "당뇨"]
+    regions = ["SEOUL_GANGNAM", "SEOUL_SEOCHO", "BUSAN_HAEUNDAE", "", "GYEONGGI_SEONGNAM"]
+    return [
+        {
+            "caregiver_id": 100 + i,
+            "personality": {
+                "empathy_score": float(rng.uniform(0, 100)),
+                "activity_score": float(rng.uniform(0, 100)),
+                "patience_score": float(rng.uniform(0, 100)),
+                "independence_score": float(rng.uniform(0, 100)),
+            },
+            "specialties": list(rng.choice(specialties, int(rng.integers(0, 4)), replace=False)),
+            "service_region": regions[i % len(regions)],
+            "experience_years": float(rng.integers(0, 30)) + (0.3 if i % 4 == 0 else 0.0),
+        }
+        for i in range(n)
+    ]
+
+
+def expected_result(service: XGBoostMatchingService, patient_personality, patient_data, caregiver):
+    """간병인 1명씩 계산한 기준값"""
+    caregiver_data = service._caregiver_data_from_info(caregiver)
+    features = service.generate_features(
+        patient_personality, caregiver.get("personality", {}), patient_data, caregiver_data
+    )
+    score = service.predict_compatibility(
+        patient_personality, caregiver.get("personality", {}), patient_data, caregiver_data
+    )
+    return features, round(score, 1), service.get_analysis_from_features(features)
+
+
+def compare(service, patient_personality, patient_data, caregivers, label: str):
+    results = service.batch_predict(patient_personality, caregivers, patient_data)
+    feature_mismatch = score_mismatch = analysis_mismatch = 0
+    for caregiver, result in zip(caregivers, results):
+        features, score, analysis = expected_result(service, patient_personality, patient_data, caregiver)
+        actual = result.get("features", {})
+        if set(actual) != set(features) or any(
+            abs(actual[col] - features[col]) > 1e-4 for col in features
+        ):
+            feature_mismatch += 1
+        if result["score"] != score:
+            score_mismatch += 1
+        if result["analysis"] != analysis:
+            analysis_mismatch += 1
+    check(
+        len(results) == len(caregivers) and feature_mismatch == 0,
+        f"{label}: 특성 {len(caregivers)}건 일치 (불일치 {feature_mismatch})"
+    )
+    check(score_mismatch == 0, f"{label}: 점수 일치 (불일치 {score_mismatch})")
+    check(analysis_mismatch == 0, f"{label}: 분석 메시지 일치 (불일치 {analysis_mismatch})")
+    return results
+
+
+def main():
+    print("=" * 70)
+    print("🧪 XGBoost V2 일괄 예측 Feature 행렬 검증")
+    print("=" * 70)
+
+    service = XGBoostMatchingService()
+    rng = np.random.default_rng(7)
+
+    patient_personality = {
+        "empathy_score": 75.0,
+        "activity_score": 55.0,
+        "patience_score": 80.0,
+        "independence_score": 45.0,
+    }
+    patient_data = {
+        "diseases": ["치매", "고혈압"],
+        "region_code": "SEOUL_GANGNAM",
+        "care_level": "3등급",
+    }
+
+    # 1. 임의 간병인
+    print("\n1️⃣ 임의 간병인 200명...")
+    compare(service, patient_personality, patient_data, make_caregivers(200, rng), "임의 간병인")
+
+    # 2. 경계 입력 (문자열 전문분야, 성격 점수 누락, 지역 없음)
+    print("\n2️⃣ 경계 입력...")
+    edge_caregivers = [
+        {"caregiver_id": 1, "personality": {"empathy_score": 80.0}, "specialties": "치매"},
+        {"caregiver_id": 2, "personality": {}, "service_region": "SEOUL_GANGNAM", "experience_years": 3},
+        {"caregiver_id": 3, "specialties": ["치매", "고혈압"], "service_region": "SEOUL_SEOCHO"},
+    ]
+    compare(service, patient_personality, patient_data, edge_caregivers, "경계 입력")
+    compare(service, patient_personality, None, edge_caregivers, "환자 추가 정보 없음")
+    compare(
+        service,
+        {"empathy_score": 60.0},
+        {"diseases": "치매", "region_code": "", "care_level": "인지지원"},
+        make_caregivers(20, rng),
+        "환자 성격 누락 + 문자열 질병"
+    )
+
+    # 3. 잘못된 간병인은 해당 행만 실패 처리, 나머지는 기준값과 동일
+    print("\n3️⃣ 잘못된 간병인 격리...")
+    caregivers = make_caregivers(10, rng)
+    caregivers[4] = dict(caregivers[4], experience_years="경력 많음")
+    results = service.batch_predict(patient_personality, caregivers, patient_data)
+    check(
+        results[4]["caregiver_id"] == caregivers[4]["caregiver_id"] and "error" in results[4],
+        "잘못된 경력 값 간병인만 예측 실패"
+    )
+    valid = [c for i, c in enumerate(caregivers) if i != 4]
+    valid_results = [r for i, r in enumerate(results) if i != 4]
+    check(
+        all("error" not in r for r in valid_results)
+        and [r["score"] for r in valid_results]
+        == [expected_result(service, patient_personality, patient_data, c)[1] for c in valid],
+        "나머지 간병인 점수는 개별 계산과 동일"
+    )
+
+    # 4. 일괄 predict 실패 시 배정된 모델로 행별 예측 (활성 모델 점수에 다른 태그를 붙이지 않음)
+    print("\n4️⃣ 일괄 예측 실패 폴백...")
+    from app.services.matching.model_registry import ServedModel
+
+    class RowOnlyModel:
+        """여러 행 predict는 실패, 한 행은 활성 모델과 다른 고정 점수"""
+
+        def predict(self, X):
+            if len(X) > 1:
+                raise RuntimeError("batch predict failed")
+            return np.array([42.0], dtype=np.float32)
+
+    active = service._registry.current()
+    fallback_model = ServedModel(
+        "v2-fallback", RowOnlyModel(), active.feature_columns, {}, {}, "0" * 64, "test"
+    )
+    original_current = service._registry.current
+    service._registry.current = lambda: fallback_model
+    try:
+        results = service.batch_predict(patient_personality, make_caregivers(5, rng), patient_data)
+    finally:
+        service._registry.current = original_current
+    check(
+        all(r["score"] == 42.0 and r["model_version"] == fallback_model.tag for r in results),
+        "폴백 점수와 model_version이 모두 배정된 모델 기준"
+    )
+
+    # 5. 행렬 모양
+    print("\n5️⃣ 행렬 모양...")
+    matrix = FeatureEngineer().create_feature_matrix(
+        service._patient_full_data(patient_personality, patient_data),
+        np.zeros((3, 4)), [[], ["치매"], []], ["", "SEOUL_GANGNAM", ""], [0, 1, 2]
+    )
+    check(
+        matrix.shape == (3, 10) and matrix.dtype == np.float32 and matrix.flags.c_contiguous,
+        f"(N, 10) float32 C-contiguous 행렬 ({matrix.shape}, {matrix.dtype})"
+    )
+
+    print("\n" + "=" * 70)
+    if failed:
+        print("❌ 검증 실패")
+        print("=" * 70)
+        sys.exit(1)
+
+    print("🎉 일괄 예측 Feature 행렬이 간병인별 계산과 같습니다!")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
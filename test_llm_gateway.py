@@ -0,0 +1,322 @@
+"""
+Azure OpenAI 공용 게이트웨이 검증
+배포별 동시 호출 제한, 지터 재시도, 호출 지표, 취소, 동기/async/스트리밍 호출 경로와
+AI 코멘트 생성기 이전(기한 초과 시 규칙 기반 코멘트) 확인 (가짜 비동기 클라이언트 사용)
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# 백엔드 경로 추가
+backend_path = Path(__file__).parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from app.services.llm_gateway import (
+    LLMGateway,
+    LLMUnavailableError,
+    is_retryable,
+    parse_deployment_limits,
+)
+from app.services.matching.ai_comment import AICommentGenerator
+
+print("=" * 70)
+print("🧪 Azure OpenAI 공용 게이트웨이 검증")
+print("=" * 70)
+
+failed = False
+
+
+def check(condition: bool, message: str):
+    global failed
+    failed |= not condition
+    print(f"{'✅' if condition else '❌'} {message}")
+
+
+def wait_until(condition, timeout: float = 5.0) -> bool:
+    """게이트웨이 이벤트 루프 스레드의 처리가 끝날 때까지 조건을 폴링 (timeout 초과 시 False)"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class FakeStatusError(Exception):
+    def __init__(self, status_code: int, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+class FakeClient:
+    """chat.completions.create만 흉내 내는 비동기 클라이언트"""
+
+    def __init__(self, delay: float = 0.02, failures=None, delays=None):
+        self.delay = delay
+        self.failures = list(failures or [])  # 앞에서부터 한 번씩 발생시킬 오류
+        self.delays = delays or {}  # 프롬프트 내용 → 지연 시간
+        self.active = {}
+        self.peak = {}
+        self.calls = 0
+        self.closed = False
+        self.streams_closed = 0
+        self.last_piece_at = None  # 스트림 마지막 조각을 만든 시각
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, model, messages, timeout=None, stream=False, **params):
+        if stream:
+            return await self._stream(model, messages)
+        self.calls += 1
+        self.active[model] = self.active.get(model, 0) + 1
+        self.peak[model] = max(self.peak.get(model, 0), self.active[model])
+        try:
+            await asyncio.sleep(self.delays.get(messages[-1]["content"], self.delay))
+            if self.failures:
+                raise self.failures.pop(0)
+            content = json.dumps({"model": model, "echo": messages[-1]["content"]})
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+                usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5),
+            )
+        finally:
+            self.active[model] -= 1
+
+    async def close(self):
+        self.closed = True
+
+    async def _stream(self, model, messages):
+        """스트리밍 응답: 빈 choices 조각(콘텐츠 필터) + 단어별 조각, 조각마다 delay 간격"""
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.failures:
+            raise self.failures.pop(0)
+        words = messages[-1]["content"].split(" ")
+        client = self
+
+        class Stream:
+            def __init__(self):
+                self.closed = False
+                client.active[model] = client.active.get(model, 0) + 1
+                client.peak[model] = max(client.peak.get(model, 0), client.active[model])
+
+            async def __aiter__(self):
+                yield SimpleNamespace(choices=[], usage=None)
+                for i, word in enumerate(words):
+                    await asyncio.sleep(client.delay)
+                    text = word if i == 0 else " " + word
+                    if i == len(words) - 1:
+                        client.last_piece_at = time.perf_counter()
+                    yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))], usage=None)
+
+            async def close(self):
+                self.closed = True
+                client.active[model] -= 1
+                client.streams_closed += 1
+
+        return Stream()
+
+
+def make_gateway(client: FakeClient, **kwargs) -> LLMGateway:
+    options = dict(deployment="gpt-4o", max_concurrency=3, retry_base_seconds=0.01, retry_max_seconds=0.05)
+    options.update(kwargs)
+    return LLMGateway(client_factory=lambda: client, **options)
+
+
+def ask(text: str):
+    return [{"role": "user", "content": text}]
+
+
+# 1. 설정 파싱 / 재시도 판정
+print("\n1️⃣ 설정 파싱 / 재시도 판정...")
+check(parse_deployment_limits("gpt-4o=8, gpt-4o-mini=16,bad,x=abc") == {"gpt-4o": 8, "gpt-4o-mini": 16},
+      "배포별 제한 파싱 (잘못된 항목 무시)")
+check(is_retryable(FakeStatusError(429)) and is_retryable(FakeStatusError(503))
+      and not is_retryable(FakeStatusError(400)) and not is_retryable(ValueError()),
+      "429/5xx만 재시도 (400, 파싱 오류는 재시도 안 함)")
+check(not LLMGateway().is_available, "키/엔드포인트 미설정 → 사용 불가")
+try:
+    LLMGateway().submit(ask("x"), caller="test")
+    check(False, "미설정 게이트웨이 호출 시 LLMUnavailableError")
+except LLMUnavailableError:
+    check(True, "미설정 게이트웨이 호출 시 LLMUnavailableError")
+
+# 2. 배포별 동시 호출 제한
+print("\n2️⃣ 배포별 동시 호출 제한...")
+client = FakeClient(delay=0.05)
+gateway = make_gateway(client, deployment_limits={"gpt-4o-mini": 5})
+futures = [gateway.submit(ask(f"q{i}"), caller="test") for i in range(12)]
+futures += [gateway.submit(ask(f"m{i}"), caller="test", deployment="gpt-4o-mini") for i in range(12)]
+results = [f.result(5) for f in futures]
+check(client.peak == {"gpt-4o": 3, "gpt-4o-mini": 5}, f"최대 동시 호출 {client.peak} (기본 3, gpt-4o-mini 5)")
+check([json.loads(r.content)["echo"] for r in results[:12]] == [f"q{i}" for i in range(12)], "요청 순서대로 결과 반환")
+check(results[0].deployment == "gpt-4o" and results[-1].deployment == "gpt-4o-mini", "배포 이름 전달")
+
+# 3. 지표
+print("\n3️⃣ 호출 지표...")
+stats = gateway.get_stats()
+caller = stats["callers"]["test"]
+check(caller["calls"] == 24 and caller["errors"] == 0, f"호출 {caller['calls']}건, 오류 {caller['errors']}건")
+check(caller["prompt_tokens"] == 240 and caller["completion_tokens"] == 120, "토큰 사용량 합계")
+check(caller["p50_ms"] >= 45 and caller["p95_ms"] >= caller["p50_ms"], f"지연 시간 p50 {caller['p50_ms']}ms / p95 {caller['p95_ms']}ms")
+check(all(d["in_flight"] == 0 and d["waiting"] == 0 for d in stats["deployments"].values())
+      and stats["deployments"]["gpt-4o-mini"]["limit"] == 5, "완료 후 진행/대기 0")
+
+# 4. 재시도
+print("\n4️⃣ 재시도...")
+client = FakeClient(delay=0.0, failures=[FakeStatusError(429), FakeStatusError(502)])
+gateway = make_gateway(client, max_retries=2)
+result = gateway.complete(ask("retry"), caller="retry")
+check(result.attempts == 3 and client.calls == 3, f"429 → 502 → 성공 (시도 {result.attempts}회)")
+check(gateway.get_stats()["callers"]["retry"]["retries"] == 2, "재시도 횟수 기록")
+
+client = FakeClient(delay=0.0, failures=[FakeStatusError(429)] * 5)
+gateway = make_gateway(client, max_retries=2)
+try:
+    gateway.complete(ask("x"), caller="retry")
+    check(False, "재시도 횟수 초과 시 오류 전달")
+except FakeStatusError:
+    check(client.calls == 3 and gateway.get_stats()["callers"]["retry"]["errors"] == 1,
+          f"재시도 횟수 초과 시 오류 전달 (호출 {client.calls}회)")
+
+client = FakeClient(delay=0.0, failures=[FakeStatusError(400)])
+gateway = make_gateway(client, max_retries=2)
+try:
+    gateway.complete(ask("x"), caller="bad")
+    check(False, "400은 재시도 없이 실패")
+except FakeStatusError:
+    check(client.calls == 1, "400은 재시도 없이 실패")
+
+backoff = make_gateway(FakeClient(), retry_base_seconds=0.5, retry_max_seconds=2.0)
+delays = [backoff._backoff(3, FakeStatusError(500)) for _ in range(200)]
+check(min(delays) >= 0 and max(delays) <= 2.0 and len(set(delays)) > 100, "지터 백오프 (0~min(상한, 기본값×2^n) 무작위)")
+check(backoff._backoff(1, FakeStatusError(429, {"retry-after-ms": "1500"})) == 1.5
+      and backoff._backoff(1, FakeStatusError(429, {"retry-after": "30"})) == 2.0,
+      "retry-after 헤더 반영 (상한 적용)")
+
+# 5. async 호출 / 취소 / 종료
+print("\n5️⃣ async 호출 / 취소 / 종료...")
+client = FakeClient(delay=0.02)
+gateway = make_gateway(client)
+
+
+async def from_other_loop():
+    return await asyncio.gather(*(gateway.acomplete(ask(f"a{i}"), caller="async") for i in range(6)))
+
+
+results = asyncio.run(from_other_loop())
+check(len(results) == 6 and client.peak["gpt-4o"] == 3, "다른 이벤트 루프에서 await (같은 연결 풀, 제한 유지)")
+
+slow = FakeClient(delay=5.0)
+gateway = make_gateway(slow)
+future = gateway.submit(ask("slow"), caller="cancel")
+started = wait_until(lambda: slow.active.get("gpt-4o") == 1)
+future.cancel()
+cancelled = wait_until(
+    lambda: gateway.get_stats()["deployments"]["gpt-4o"]["in_flight"] == 0
+    and gateway.get_stats()["callers"]["cancel"]["errors"] == 1
+)
+check(started and cancelled and slow.active["gpt-4o"] == 0, "Future 취소 → 진행 중인 호출 취소")
+gateway.close()
+check(slow.closed and gateway._loop is None, "close() → 클라이언트/이벤트 루프 종료")
+
+fast = FakeClient(delay=0.0)
+gateway._client_factory = lambda: fast
+check(json.loads(gateway.complete(ask("again"), caller="cancel").content)["echo"] == "again" and gateway._loop is not None,
+      "종료 후 다시 호출하면 새 클라이언트로 재시작")
+gateway.close()
+
+# 6. AI 코멘트 생성기
+print("\n6️⃣ AI 코멘트 생성기...")
+requests = [
+    {
+        "patient_info": {"name": "환자", "care_level": 3, "diseases": ["치매"]},
+        "caregiver_info": {"name": f"간병인{i}", "experience_years": i, "certifications": [], "specialties": []},
+        "matching_score": 80.0 + i,
+        "grade": "A",
+        "features": {"specialty_match_ratio": 0.5, "region_match_score": 1.0},
+    }
+    for i in range(6)
+]
+client = FakeClient(delay=0.05)
+gateway = make_gateway(client, max_concurrency=8)
+generator = AICommentGenerator(gateway=gateway, max_concurrency=2)
+start = time.perf_counter()
+comments = generator.generate_comments(requests, deadline_seconds=5)
+elapsed = time.perf_counter() - start
+check(all(c["source"] == "azure_openai" for c in comments) and client.peak["gpt-4o"] == 2,
+      f"코멘트 6건, 생성기 동시 호출 {client.peak['gpt-4o']}건 ({elapsed * 1000:.0f}ms)")
+check(gateway.get_stats()["callers"]["ai_comment"]["calls"] == 6, "호출자 ai_comment 지표")
+
+prompts = [generator._create_prompt(**r) for r in requests]
+client = FakeClient(delay=0.01, delays={prompts[4]: 3.0, prompts[5]: 3.0})
+gateway = make_gateway(client, max_concurrency=8)
+generator = AICommentGenerator(gateway=gateway, max_concurrency=6)
+start = time.perf_counter()
+comments = generator.generate_comments(requests, deadline_seconds=0.3)
+elapsed = time.perf_counter() - start
+sources = [c["source"] for c in comments]
+check(sources == ["azure_openai"] * 4 + ["rule_based"] * 2 and elapsed < 1.0,
+      f"기한 초과 2건 → 규칙 기반 ({elapsed * 1000:.0f}ms)")
+check(wait_until(lambda: gateway.get_stats()["deployments"]["gpt-4o"]["in_flight"] == 0, timeout=1.0)
+      and client.active["gpt-4o"] == 0,
+      "기한 초과 호출은 취소되어 연결을 점유하지 않음")
+
+check(generator.generate_comment(**requests[0])["source"] == "azure_openai", "단건 동기 호출")
+unavailable = AICommentGenerator(gateway=LLMGateway())
+check(not unavailable.is_available and unavailable.generate_comment(**requests[0])["source"] == "rule_based",
+      "게이트웨이 미설정 → 규칙 기반 코멘트")
+
+# 7. 스트리밍
+print("\n7️⃣ 스트리밍...")
+client = FakeClient(delay=0.02, failures=[FakeStatusError(429)])
+gateway = make_gateway(client, max_retries=2)
+
+
+async def collect(text: str, stop_after: int = None):
+    received = []
+    stream = gateway.astream(ask(text), caller="stream")
+    try:
+        async for piece in stream:
+            received.append((piece, time.perf_counter()))
+            if stop_after is not None and len(received) >= stop_after:
+                break
+    finally:
+        await stream.aclose()
+    return received
+
+
+start = time.perf_counter()
+received = asyncio.run(collect("월요일 화요일 수요일 목요일 금요일"))
+pieces = [piece for piece, _ in received]
+check("".join(pieces) == "월요일 화요일 수요일 목요일 금요일" and len(pieces) == 5, f"조각 {len(pieces)}개 순서대로 수신")
+first_ms = (received[0][1] - start) * 1000
+total_ms = (received[-1][1] - start) * 1000
+check(received[0][1] < client.last_piece_at,
+      f"마지막 조각 생성 전에 첫 조각 수신 (첫 조각 {first_ms:.0f}ms / 전체 {total_ms:.0f}ms)")
+stats = gateway.get_stats()
+check(stats["callers"]["stream"]["calls"] == 1 and stats["callers"]["stream"]["retries"] == 1 and client.calls == 2,
+      "첫 조각 전 429는 재시도")
+check(client.streams_closed == 1 and stats["deployments"]["gpt-4o"]["in_flight"] == 0, "다 읽으면 스트림 닫고 슬롯 반환")
+
+received = asyncio.run(collect("a b c d e f g h i j", stop_after=2))
+released = wait_until(
+    lambda: client.streams_closed == 2
+    and gateway.get_stats()["deployments"]["gpt-4o"]["in_flight"] == 0
+    and gateway.get_stats()["callers"]["stream"]["errors"] == 1
+)
+check(len(received) == 2 and released, "중간에 멈추면 호출 취소, 스트림 닫힘")
+gateway.close()
+
+print("\n" + "=" * 70)
+if failed:
+    print("❌ 검증 실패")
+    print("=" * 70)
+    sys.exit(1)
+
+print("🎉 모든 Azure OpenAI 호출이 공용 게이트웨이의 연결 풀과 제한을 공유합니다!")
+print("=" * 70)
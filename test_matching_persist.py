@@ -0,0 +1,204 @@
+"""
+매칭 결과 일괄 저장 검증
+추천 엔드포인트의 저장 경로(_save_matching → bulk_create_matching_results)를 SQLite에서 실행하여
+정상 행은 일괄 저장되는지, 잘못된 행이 있으면 SAVEPOINT 안에서 행별로 다시 저장하여
+나머지 행과 매칭 요청은 커밋되는지, 반환된 matching_id가 입력 순서와 맞는지 확인
+"""
+
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+# 백엔드 경로 추가
+backend_path = Path(__file__).parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+# 설정 검증용 기본값 (실제 DB는 아래에서 만드는 SQLite 엔진 사용)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("KAKAO_REST_API_KEY", "test")
+os.environ.setdefault("KAKAO_REDIRECT_URI", "http://localhost/callback")
+os.environ.setdefault("FRONTEND_URL", "http://localhost")
+
+failed = False
+
+
+def check(condition: bool, message: str):
+    global failed
+    failed |= not condition
+    print(f"{'✅' if condition else '❌'} {message}")
+
+
+def make_engine():
+    """PostgreSQL 모델을 그대로 쓰는 SQLite 엔진 (SAVEPOINT가 동작하도록 트랜잭션을 직접 시작)"""
+    from sqlalchemy import BigInteger, create_engine, event
+    from sqlalchemy.dialects.postgresql import JSONB
+    from sqlalchemy.ext.compiler import compiles
+
+    # BIGINT 기본 키는 SQLite에서 자동 증가하지 않으므로 INTEGER로, JSONB는 JSON으로 생성
+    @compiles(BigInteger, "sqlite")
+    def _bigint(type_, compiler, **kw):
+        return "INTEGER"
+
+    @compiles(JSONB, "sqlite")
+    def _jsonb(type_, compiler, **kw):
+        return "JSON"
+
+    engine = create_engine("sqlite://")
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        # 매칭 요청 CHECK 제약에 쓰이는 PostgreSQL JSONB 함수
+        dbapi_connection.create_function(
+            "jsonb_typeof", 1, lambda value: "array" if json.loads(value).__class__ is list else "object"
+        )
+        dbapi_connection.create_function("jsonb_array_length", 1, lambda value: len(json.loads(value)))
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    return engine
+
+
+def main():
+    from sqlalchemy import text
+    from sqlalchemy.orm import Session
+
+    from app.crud.matching import bulk_create_matching_results
+    from app.models.matching import MatchingRequest, MatchingResult
+    from app.routes.xgboost_matching import XGBoostMatchingRequest, _save_matching
+
+    print("=" * 70)
+    print("🧪 매칭 결과 일괄 저장 검증")
+    print("=" * 70)
+
+    engine = make_engine()
+    MatchingRequest.__table__.create(engine)
+    MatchingResult.__table__.create(engine)
+
+    crud_logs = []
+
+    class CrudLogHandler(logging.Handler):
+        def emit(self, record):
+            crud_logs.append(record.getMessage())
+
+    logging.getLogger("app.crud.matching").addHandler(CrudLogHandler())
+
+    def fallback_logs():
+        """(일괄 저장 실패 경고 수, 행별 저장 실패 간병인 ID)"""
+        bulk_failures = sum(1 for m in crud_logs if m.startswith("[매칭 결과 일괄 저장 실패]"))
+        row_failures = [m.split("caregiver_id=")[1].split(":")[0] for m in crud_logs if "caregiver_id=" in m]
+        return bulk_failures, row_failures
+
+    def make_rows(request_id: int, caregiver_ids, bad=()):
+        return [
+            {
+                "request_id": request_id,
+                "caregiver_id": caregiver_id,
+                "status": "recommended",
+                "total_score": None if caregiver_id in bad else 70.0 + caregiver_id,
+                "grade": "A",
+                "ai_comment": f"간병인 {caregiver_id} 분석",
+                "model_version": "v2@test",
+            }
+            for caregiver_id in caregiver_ids
+        ]
+
+    def saved(db: Session, ids):
+        """matching_id → (caregiver_id, total_score)"""
+        rows = db.execute(
+            text("SELECT matching_id, caregiver_id, total_score FROM matching_results WHERE matching_id IN "
+                 f"({', '.join(str(i) for i in ids) or 'NULL'})")
+        ).all()
+        return {row[0]: (row[1], row[2]) for row in rows}
+
+    # 1. 정상 행만 있으면 일괄 저장
+    print("\n1️⃣ 일괄 저장...")
+    with Session(engine) as db:
+        rows = make_rows(1, [11, 12, 13, 14, 15])
+        ids = bulk_create_matching_results(db, rows)
+        db.commit()
+
+        stored = saved(db, ids)
+        check(fallback_logs() == (0, []), "일괄 저장 성공 (행별 재시도 없음)")
+        check(None not in ids and len(set(ids)) == len(rows), f"matching_id {ids}")
+        check(
+            [stored[i] for i in ids] == [(r["caregiver_id"], r["total_score"]) for r in rows],
+            "반환 ID 순서 = 입력 행 순서"
+        )
+        check(bulk_create_matching_results(db, []) == [], "빈 입력은 저장 없이 빈 목록")
+
+    # 2. 잘못된 행 1건 → 행별 저장으로 재시도, 나머지는 커밋
+    print("\n2️⃣ 잘못된 행 격리...")
+    with Session(engine) as db:
+        rows = make_rows(2, [21, 22, 23, 24, 25], bad={23})
+        crud_logs.clear()
+        ids = bulk_create_matching_results(db, rows)
+        db.commit()
+
+    with Session(engine) as db:
+        stored = saved(db, [i for i in ids if i is not None])
+        check(fallback_logs() == (1, ["23"]), f"일괄 저장 실패 후 행별 저장, 간병인 23만 실패 {fallback_logs()}")
+        check(ids[2] is None and all(i is not None for k, i in enumerate(ids) if k != 2),
+              f"실패한 행만 None ({ids})")
+        check(
+            [stored[i] for i in ids if i is not None]
+            == [(r["caregiver_id"], r["total_score"]) for r in rows if r["caregiver_id"] != 23],
+            "나머지 4건 커밋, 반환 ID가 입력 행과 일치"
+        )
+        total = db.execute(text("SELECT COUNT(*) FROM matching_results WHERE request_id = 2")).scalar()
+        check(total == 4, f"요청 2의 저장 행 {total}건 (실패 행 없음)")
+
+    # 3. 엔드포인트 저장 경로 (매칭 요청과 결과를 한 트랜잭션으로)
+    print("\n3️⃣ _save_matching...")
+    request = XGBoostMatchingRequest(
+        patient_id=7,
+        patient_personality={
+            "empathy_score": 70, "activity_score": 50, "patience_score": 80, "independence_score": 40
+        },
+        preferred_days=["Monday", "Wednesday"],
+        preferred_time_slots=["morning"],
+    )
+    matches = [
+        {
+            "caregiver_id": caregiver_id,
+            "match_score": None if caregiver_id == 32 else 90.0 - caregiver_id,
+            "grade": "B",
+            "personality_analysis": f"간병인 {caregiver_id} 분석",
+            "model_version": "v2@test",
+        }
+        for caregiver_id in (31, 32, 33)
+    ]
+    with Session(engine) as db:
+        crud_logs.clear()
+        result = _save_matching(db, request, [dict(m) for m in matches])
+
+    with Session(engine) as db:
+        request_rows = db.execute(
+            text("SELECT request_id FROM matching_requests WHERE patient_id = 7")
+        ).scalars().all()
+        stored = saved(db, [m["matching_id"] for m in result])
+        check(len(request_rows) == 1, "매칭 요청 1건 커밋 (결과 행 실패와 무관)")
+        check([m["caregiver_id"] for m in result] == [31, 33], "저장에 실패한 간병인은 응답에서 제외")
+        check(
+            all(stored[m["matching_id"]] == (m["caregiver_id"], m["match_score"]) for m in result),
+            "응답의 matching_id가 저장된 간병인/점수와 일치"
+        )
+        check(fallback_logs() == (1, ["32"]), f"일괄 실패 후 행별 저장, 간병인 32만 실패 {fallback_logs()}")
+
+    print("\n" + "=" * 70)
+    if failed:
+        print("❌ 검증 실패")
+        print("=" * 70)
+        sys.exit(1)
+
+    print("🎉 매칭 결과 저장이 잘못된 행만 제외하고 커밋됩니다!")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
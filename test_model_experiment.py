@@ -0,0 +1,188 @@
+"""
+매칭 모델 섀도 평가 / A/B 트래픽 분할 검증
+환자별 고정 분할, 섀도 평가 지표, 대기 작업 제한(요청 경로를 막지 않음) 확인
+"""
+
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 백엔드 경로 추가
+backend_path = Path(__file__).parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from xgboost import XGBRegressor
+
+from app.services.matching.feature_engineering import FeatureEngineer
+from app.services.matching.model_experiment import ModelExperiment, rank_correlation, top_k_overlap
+from app.services.matching.model_registry import ModelRegistry
+
+MODELS_DIR = backend_path / "models"
+
+print("=" * 70)
+print("🧪 매칭 모델 섀도 평가 / A/B 분할 검증")
+print("=" * 70)
+
+failed = False
+
+
+def check(condition: bool, message: str):
+    global failed
+    failed |= not condition
+    print(f"{'✅' if condition else '❌'} {message}")
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+# 임시 디렉토리에 v2 + 재학습한 v3 준비
+work_dir = Path(tempfile.mkdtemp(prefix="model_experiment_"))
+for path in MODELS_DIR.glob("*.json"):
+    shutil.copy(path, work_dir / path.name)
+
+expected_features = FeatureEngineer().feature_columns
+X = np.random.default_rng(0).uniform(0, 100, (500, len(expected_features))).astype(np.float32)
+
+reference = XGBRegressor()
+reference.load_model(str(MODELS_DIR / "xgboost_v2.json"))
+candidate = XGBRegressor(n_estimators=30, max_depth=3, random_state=0)
+candidate.fit(X, reference.predict(X) + np.random.default_rng(1).normal(0, 3, len(X)))
+candidate.get_booster().feature_names = expected_features
+candidate.save_model(str(work_dir / "xgboost_v3.json"))
+shutil.copy(work_dir / "feature_columns_v2.json", work_dir / "feature_columns_v3.json")
+
+registry = ModelRegistry(work_dir, "v2", expected_features)
+
+# 1. 지표 함수
+print("\n1️⃣ 지표 함수...")
+a = np.array([1.0, 2.0, 3.0, 4.0])
+check(rank_correlation(a, a * 10) == 1.0 and rank_correlation(a, -a) == -1.0, "순위 상관: 같은 순서 1, 역순 -1")
+check(rank_correlation(a, np.ones(4)) is None and rank_correlation(a[:1], a[:1]) is None, "상수/1명 → None")
+check(top_k_overlap(a, np.array([4.0, 3.0, 2.0, 1.0]), 2) == 0.0 and top_k_overlap(a, a, 2) == 1.0, "상위 N명 일치율")
+
+# 2. A/B 분할
+print("\n2️⃣ A/B 분할...")
+experiment = ModelExperiment(registry, ab_version="v3", ab_percent=20)
+registry.experiment = experiment
+patients = range(1, 5001)
+arms = [experiment.assign(pid).version for pid in patients]
+share = arms.count("v3") / len(arms)
+check(abs(share - 0.2) < 0.02, f"후보 버전 비율 {share * 100:.1f}% (설정 20%)")
+check(arms == [experiment.assign(pid).version for pid in patients], "같은 환자는 항상 같은 버전")
+check(experiment.assign(None).version == "v2", "환자 ID 없으면 활성 버전")
+
+candidate_patient = next(pid for pid, arm in zip(patients, arms) if arm == "v3")
+served = experiment.assign(candidate_patient)
+check(np.array_equal(served.predict(X), candidate.predict(X)), f"후보 환자 {candidate_patient} → {served.tag} 예측값")
+
+registry.activate("v3")
+check(experiment.assign(1).version == "v3" and experiment.assign(candidate_patient).version == "v3",
+      "후보 버전이 활성화되면 모든 환자가 활성 버전")
+registry.activate("v2")
+
+broken = ModelExperiment(registry, ab_version="v9", ab_percent=100)
+check(broken.assign(1).version == "v2" and "v9" in broken.get_status()["load_errors"],
+      "후보 버전 로드 실패 → 활성 버전으로 계속 서비스")
+print(f"   요청 수: {experiment.get_status()['ab_test']['requests']}")
+
+# 3. 섀도 평가
+print("\n3️⃣ 섀도 평가...")
+shadow_experiment = ModelExperiment(registry, shadow_version="v3", shadow_max_pending=2)
+active = registry.current()
+scores = active.predict(X[:50])
+check(not shadow_experiment.submit_shadow(X[:50], scores, active, expected_features, 1),
+      "첫 요청은 섀도 스레드에서 모델만 로드 (요청 경로에서 로드하지 않음)")
+check(wait_for(lambda: "v3" in shadow_experiment._models), "섀도 모델 로드 완료")
+
+for pid in range(10):
+    while not shadow_experiment.submit_shadow(X[:50], scores, active, expected_features, pid):
+        time.sleep(0.01)
+check(wait_for(lambda: shadow_experiment.get_status()["shadow"]["comparisons"] == 10), "섀도 평가 10건 완료")
+
+shadow_status = shadow_experiment.get_status()["shadow"]
+expected_delta = float(np.abs(candidate.predict(X[:50]) - scores).mean())
+check(abs(shadow_status["mean_abs_delta"] - expected_delta) < 1e-3,
+      f"평균 점수 차이 {shadow_status['mean_abs_delta']} (직접 계산 {expected_delta:.4f})")
+print(f"   순위 상관 {shadow_status['mean_rank_correlation']}, 상위 5명 일치 {shadow_status['mean_top_k_overlap']}")
+check(not shadow_experiment.submit_shadow(X[:50], scores, shadow_experiment._models["v3"], expected_features),
+      "섀도 버전으로 응답한 요청은 비교하지 않음")
+check(not shadow_experiment.submit_shadow(X[:50, :3], scores, active, expected_features[:3]),
+      "특성 순서가 다르면 건너뜀")
+
+# 4. 대기 작업 제한 (섀도 모델이 느려도 요청 경로는 기다리지 않음)
+print("\n4️⃣ 대기 작업 제한...")
+release = threading.Event()
+shadow_model = shadow_experiment._models["v3"]
+original_predict = shadow_model.model.predict
+
+
+def slow_predict(matrix):
+    release.wait(10)
+    return original_predict(matrix)
+
+
+shadow_model.model.predict = slow_predict
+dropped_before = shadow_experiment.get_status()["shadow"]["dropped"]
+start = time.perf_counter()
+accepted = sum(shadow_experiment.submit_shadow(X[:50], scores, active, expected_features, i) for i in range(100))
+elapsed_ms = (time.perf_counter() - start) * 1000
+dropped = shadow_experiment.get_status()["shadow"]["dropped"] - dropped_before
+check(accepted == 2 and dropped == 98, f"최대 대기 2건만 예약, {dropped}건 버림")
+check(elapsed_ms < 100, f"예약 100회 {elapsed_ms:.1f}ms (섀도 계산을 기다리지 않음)")
+release.set()
+check(wait_for(lambda: shadow_experiment.get_status()["shadow"]["comparisons"] == 12), "버리지 않은 2건 완료")
+shadow_model.model.predict = original_predict
+
+# 5. XGBoostMatchingService 연동 (레지스트리 실험 적용)
+print("\n5️⃣ XGBoostMatchingService 연동...")
+from app.services.xgboost_matching_service import XGBoostMatchingService
+from app.services.matching import model_registry
+
+model_registry._model_registry = registry
+registry.experiment = ModelExperiment(registry, shadow_version="v3", ab_version="v3", ab_percent=20)
+XGBoostMatchingService._instance = None
+service = XGBoostMatchingService()
+
+caregivers = [
+    {
+        "caregiver_id": i,
+        "personality": {"empathy_score": 10.0 * (i % 10), "activity_score": 50.0,
+                        "patience_score": 70.0, "independence_score": 5.0 * i},
+        "experience_years": i % 15,
+    }
+    for i in range(20)
+]
+personality = {"empathy_score": 75.0, "activity_score": 55.0, "patience_score": 80.0, "independence_score": 45.0}
+control_patient = next(pid for pid, arm in zip(patients, arms) if arm == "v2")
+
+tags = {
+    pid: {r["model_version"] for r in service.batch_predict(personality, caregivers, patient_id=pid)}
+    for pid in (control_patient, candidate_patient)
+}
+check(tags[control_patient] == {registry.current().tag}, f"대조군 환자 → {tags[control_patient]}")
+check(tags[candidate_patient] == {registry.experiment._models['v3'].tag}, f"후보 환자 → {tags[candidate_patient]}")
+
+service.batch_predict(personality, caregivers, patient_id=control_patient)
+check(wait_for(lambda: registry.experiment.get_status()["shadow"]["comparisons"] >= 1), "대조군 요청 섀도 평가 기록")
+
+shutil.rmtree(work_dir, ignore_errors=True)
+
+print("\n" + "=" * 70)
+if failed:
+    print("❌ 검증 실패")
+    print("=" * 70)
+    sys.exit(1)
+
+print("🎉 섀도 평가와 A/B 분할이 요청 경로에 영향 없이 동작합니다!")
+print("=" * 70)
@@ -0,0 +1,201 @@
+"""
+매칭 모델 레지스트리 검증
+버전 로드·검증, ACTIVE_VERSION 포인터, 파일 변경 감시, 처리 중 요청의 이전 버전 유지,
+preload(fork 전) 로드에서 합성 예측 생략 확인
+"""
+
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 백엔드 경로 추가
+backend_path = Path(__file__).parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from xgboost import XGBRegressor
+
+from app.services.matching.feature_engineering import FeatureEngineer
+from app.services.matching.model_registry import ACTIVE_VERSION_FILE, ModelRegistry
+
+MODELS_DIR = backend_path / "models"
+
+print("=" * 70)
+print("🧪 매칭 모델 레지스트리 검증")
+print("=" * 70)
+
+failed = False
+
+
+def check(condition: bool, message: str):
+    global failed
+    failed |= not condition
+    print(f"{'✅' if condition else '❌'} {message}")
+
+
+def expect_error(func, message: str):
+    try:
+        func()
+    except (FileNotFoundError, ValueError) as e:
+        check(True, f"{message} → {type(e).__name__}: {str(e)[:80]}")
+    else:
+        check(False, f"{message} → 예외 없음")
+
+
+# 임시 디렉토리에 모델 복사 (ACTIVE_VERSION 파일을 저장소에 남기지 않도록)
+work_dir = Path(tempfile.mkdtemp(prefix="model_registry_"))
+for path in MODELS_DIR.glob("*.json"):
+    shutil.copy(path, work_dir / path.name)
+
+expected_features = FeatureEngineer().feature_columns
+registry = ModelRegistry(work_dir, default_version="v2", expected_features=expected_features)
+
+X = np.random.default_rng(0).uniform(0, 100, (100, len(expected_features))).astype(np.float32)
+
+# 1. 기본 버전 로드
+print("\n1️⃣ 기본 버전 로드...")
+served = registry.current()
+reference = XGBRegressor()
+reference.load_model(str(MODELS_DIR / "xgboost_v2.json"))
+check(served.version == "v2" and served.tag.startswith("v2@"), f"활성 버전 {served.tag}")
+check(served.feature_columns == expected_features, "특성 순서 = FeatureEngineer")
+check(np.array_equal(served.predict(X), reference.predict(X)), "예측값 = XGBRegressor(xgboost_v2.json)")
+print(f"   버전 목록: {[v['version'] for v in registry.list_versions()]}")
+
+# 2. 검증 실패 버전은 활성화 거부 (기존 버전 유지)
+print("\n2️⃣ 검증 실패 버전...")
+expect_error(lambda: registry.activate("xgboost"), "V1 모델 (13개 특성, 메타데이터 없음)")
+expect_error(lambda: registry.activate("v9"), "존재하지 않는 버전")
+expect_error(lambda: registry.activate("../v2"), "경로가 포함된 버전 이름")
+
+shutil.copy(work_dir / "xgboost_v2.json", work_dir / "xgboost_v2swap.json")
+swapped_columns = list(expected_features)
+swapped_columns[0], swapped_columns[1] = swapped_columns[1], swapped_columns[0]
+(work_dir / "feature_columns_v2swap.json").write_text(str(swapped_columns).replace("'", '"'))
+expect_error(lambda: registry.activate("v2swap"), "특성 순서가 다른 메타데이터")
+check(registry.current() is served, f"기존 버전 유지 (last_error: {registry.get_status()['last_error'][:40]}...)")
+
+# 3. 새 버전 활성화 (다른 하이퍼파라미터로 같은 특성 재학습)
+print("\n3️⃣ 새 버전 활성화...")
+retrained = XGBRegressor(n_estimators=20, max_depth=3, random_state=0)
+retrained.fit(X, reference.predict(X) + 5)
+retrained.get_booster().feature_names = expected_features
+retrained.save_model(str(work_dir / "xgboost_v3.json"))
+shutil.copy(work_dir / "feature_columns_v2.json", work_dir / "feature_columns_v3.json")
+
+in_flight = registry.current()
+new_served = registry.activate("v3", persist=True)
+check(registry.current().version == "v3", f"활성 버전 {registry.current().tag}")
+check(in_flight.version == "v2" and np.array_equal(in_flight.predict(X), reference.predict(X)),
+      "교체 전에 잡은 모델은 이전 버전으로 계속 예측")
+check((work_dir / ACTIVE_VERSION_FILE).read_text().strip() == "v3", f"{ACTIVE_VERSION_FILE} = v3")
+
+# 4. 다른 워커 (ACTIVE_VERSION 파일로 같은 버전 시작 / 감시로 전환)
+print("\n4️⃣ 다른 워커...")
+other = ModelRegistry(work_dir, default_version="v2", expected_features=expected_features)
+check(other.current().version == "v3", "새 워커는 ACTIVE_VERSION 버전으로 시작")
+
+registry.activate("v2", persist=True)
+check(other.check_for_changes() and other.current().version == "v2", "check_for_changes → v2로 전환")
+check(not other.check_for_changes(), "변경 없으면 교체 안 함")
+
+# 같은 버전 파일 덮어쓰기 → 감시 스레드가 재로드
+other.start_watch(0.1)
+shutil.copy(work_dir / "xgboost_v3.json", work_dir / "xgboost_v2.json")
+deadline = time.time() + 5
+while time.time() < deadline and other.current().digest == served.digest:
+    time.sleep(0.05)
+other.stop_watch()
+check(other.current().digest == new_served.digest, f"파일 변경 감시로 재로드 ({other.current().tag})")
+
+# 깨진 파일은 한 번만 실패 기록하고 기존 모델 유지
+(work_dir / "xgboost_v2.json").write_text("{")
+before = other.current()
+check(not other.check_for_changes() and other.current() is before, "깨진 모델 파일 → 기존 버전 유지")
+check(not other.check_for_changes(), "같은 파일 상태로 재시도하지 않음")
+shutil.copy(MODELS_DIR / "xgboost_v2.json", work_dir / "xgboost_v2.json")
+
+# 5. 교체 중 동시 예측 (예외 없이 항상 두 버전 중 하나의 값)
+print("\n5️⃣ 교체 중 동시 예측...")
+registry.activate("v2")
+expected_outputs = {
+    "v2": reference.predict(X[:10]),
+    "v3": retrained.predict(X[:10]),
+}
+errors = []
+stop = threading.Event()
+
+
+def predict_loop():
+    while not stop.is_set():
+        current = registry.current()
+        try:
+            if not np.array_equal(current.predict(X[:10]), expected_outputs[current.version]):
+                errors.append(f"{current.tag} 예측값 불일치")
+        except Exception as e:
+            errors.append(str(e))
+
+
+threads = [threading.Thread(target=predict_loop) for _ in range(4)]
+for t in threads:
+    t.start()
+for i in range(10):
+    registry.activate("v3" if i % 2 == 0 else "v2")
+stop.set()
+for t in threads:
+    t.join()
+check(not errors, f"교체 {registry.get_status()['swaps']}회 중 예측 오류 {len(errors)}건")
+
+# 6. 추론 백엔드
+print("\n6️⃣ 추론 백엔드...")
+for backend, tolerance in (("numpy", 0.0), ("onnx", 1e-3)):
+    backend_registry = ModelRegistry(work_dir, "v2", expected_features, inference_backend=backend)
+    current = backend_registry.activate("v2")
+    max_diff = float(np.abs(current.predict(X) - reference.predict(X)).max())
+    check(current.backend == backend and max_diff <= tolerance, f"{backend}: 최대 차이 {max_diff:.2e}")
+
+# 7. preload(fork 전) 로드: 합성 예측 생략 → 워커에서 확인
+print("\n7️⃣ preload 로드 (fork 전 예측 없음)...")
+
+
+class CountingRegistry(ModelRegistry):
+    """추론 모델의 predict 호출 수 기록"""
+
+    predictions = 0
+
+    def _build_model(self, model_dict, raw, num_feature):
+        model, backend = super()._build_model(model_dict, raw, num_feature)
+        original = model.predict
+
+        def predict(X):
+            CountingRegistry.predictions += 1
+            return original(X)
+
+        model.predict = predict
+        return model, backend
+
+
+preload_registry = CountingRegistry(work_dir, "v2", expected_features, validate_predict=False)
+preloaded = preload_registry.current()
+check(CountingRegistry.predictions == 0 and not preloaded.validated, "validate_predict=False → 로드 중 예측 없음")
+preload_registry.validate(preloaded)
+preload_registry.validate(preloaded)
+check(CountingRegistry.predictions == 1 and preloaded.validated, "워커에서 validate() 1회만 예측")
+preload_registry.validate_predict = True
+check(preload_registry.activate("v2").validated and CountingRegistry.predictions == 2,
+      "preload 이후 교체하는 버전은 로드 시 확인")
+
+shutil.rmtree(work_dir, ignore_errors=True)
+
+print("\n" + "=" * 70)
+if failed:
+    print("❌ 검증 실패")
+    print("=" * 70)
+    sys.exit(1)
+
+print("🎉 모델 레지스트리가 검증된 버전만 무중단으로 교체합니다!")
+print("=" * 70)
@@ -0,0 +1,233 @@
+"""
+매칭 모델 ONNX 추론 백엔드 검증
+skl2onnx 변환 모델(onnxruntime)과 XGBoost 원본의 예측값 비교 + 배치 크기별 지연 시간/메모리 비교
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 백엔드 경로 추가
+backend_path = Path(__file__).parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+import joblib
+from xgboost import XGBClassifier, XGBRegressor
+
+from app.services.matching.onnx_inference import (
+    PARITY_TOLERANCE,
+    OnnxModel,
+    check_parity,
+    export_matching_models,
+    save_onnx,
+)
+
+MODEL_PATH = backend_path / "models" / "xgboost_v2.json"
+BATCH_SIZES = (1, 10, 100, 10000)
+
+
+def make_features(n: int, seed: int = 42) -> np.ndarray:
+    """V2 특성 10개의 실제 값 범위로 합성 특성 행렬 생성"""
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.uniform(0, 100, (n, 4)),                               # personality_diff_*
+        rng.choice([0, 0.25, 0.5, 2 / 3, 0.75, 1.0], n),           # specialty_match_ratio
+        rng.choice([0, 0.5, 0.75, 1.0], n),                        # region_match_score
+        rng.integers(0, 30, n),                                    # caregiver_experience
+        rng.integers(0, 8, n),                                     # caregiver_specialties_count
+        rng.integers(1, 8, n),                                     # patient_care_level
+        rng.integers(0, 6, n),                                     # patient_disease_count
+    ]).astype(np.float32)
+
+
+def read_memory_kb() -> dict:
+    """/proc/self/status → 현재 RSS / 최대 RSS (KB)"""
+    fields = {}
+    for line in Path("/proc/self/status").read_text().splitlines():
+        name, _, value = line.partition(":")
+        if name in ("VmRSS", "VmHWM"):
+            fields[name] = int(value.split()[0])
+    return fields
+
+
+def measure_memory(backend: str, onnx_path: str, threads: int):
+    """
+    별도 프로세스에서 한 백엔드만 로드하여 메모리 측정 (JSON 출력)
+    load_mb: 모델 로드로 늘어난 RSS, predict_peak_mb: batch=10000 예측 중 최대 RSS 증가량
+    """
+    X = make_features(10000)
+    before = read_memory_kb()
+
+    if backend == "xgboost":
+        model = XGBRegressor(n_jobs=threads or None)
+        model.load_model(str(MODEL_PATH))
+    else:
+        model = OnnxModel(Path(onnx_path), intra_op_num_threads=threads)
+    model.predict(X[:1])
+    loaded = read_memory_kb()
+
+    for _ in range(5):
+        model.predict(X)
+    after = read_memory_kb()
+
+    print(json.dumps({
+        "load_mb": round((loaded["VmRSS"] - before["VmRSS"]) / 1024, 1),
+        "predict_peak_mb": round((after["VmHWM"] - loaded["VmRSS"]) / 1024, 1),
+    }))
+
+
+if len(sys.argv) > 1 and sys.argv[1] == "--memory":
+    measure_memory(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+    sys.exit(0)
+
+
+print("=" * 70)
+print("🧪 매칭 모델 ONNX 추론 백엔드 검증")
+print("=" * 70)
+
+failed = False
+work_dir = Path(tempfile.mkdtemp(prefix="onnx_inference_"))
+
+# 1. 회귀 모델 변환
+print("\n1️⃣ 회귀 모델 ONNX 변환...")
+xgb_model = XGBRegressor()
+xgb_model.load_model(str(MODEL_PATH))
+onnx_path = save_onnx(xgb_model, work_dir / "xgboost_v2.onnx")
+onnx_model = OnnxModel(onnx_path, intra_op_num_threads=1)
+print(f"✅ {onnx_path.name} ({onnx_path.stat().st_size / 1024:.1f} KB, 입력 특성 {onnx_model.n_features_in_}개)")
+
+# 2. 회귀 모델 parity (기본 / 결측값 / 단일 행)
+print("\n2️⃣ 회귀 모델 예측값 비교...")
+X = make_features(20000)
+X_missing = X.copy()
+X_missing[np.random.default_rng(7).random(X.shape) < 0.05] = np.nan
+
+for name, matrix in [("기본", X), ("결측값 포함", X_missing), ("단일 행", X[:1])]:
+    parity = check_parity(xgb_model, onnx_model, matrix)
+    mark = "✅" if parity["passed"] else "❌"
+    failed |= not parity["passed"]
+    print(
+        f"{mark} {name}: {parity['rows']}건, 최대 차이 {parity['max_abs_diff']:.2e}, "
+        f"평균 차이 {parity['mean_abs_diff']:.2e} (허용 {PARITY_TOLERANCE})"
+    )
+
+# 노출 점수(소수 첫째 자리) 기준 일치율
+rounded_equal = np.mean(np.round(xgb_model.predict(X), 1) == np.round(onnx_model.predict(X), 1))
+print(f"   노출 점수(소수 첫째 자리) 일치율: {rounded_equal * 100:.3f}%")
+
+# 3. 분류 모델 (success_probability) - 저장소에 분류 모델이 없으므로 합성 라벨로 학습
+print("\n3️⃣ 분류 모델 변환 및 확률 비교...")
+labels = (xgb_model.predict(X) >= 70).astype(int)
+classifier = XGBClassifier(n_estimators=50, max_depth=4, random_state=42)
+classifier.fit(X, labels)
+
+onnx_classifier = OnnxModel.from_estimator(classifier)
+parity = check_parity(classifier, onnx_classifier, X_missing, proba=True)
+mark = "✅" if parity["passed"] else "❌"
+failed |= not parity["passed"]
+print(f"{mark} predict_proba: {parity['rows']}건, 최대 차이 {parity['max_abs_diff']:.2e}")
+
+if not np.array_equal(classifier.predict(X), onnx_classifier.predict(X)):
+    failed = True
+    print("❌ predict 클래스 불일치")
+else:
+    print("✅ predict 클래스 일치")
+
+# 4. export_matching_models (pkl → onnx 파일)
+print("\n4️⃣ export_matching_models (pkl → onnx)...")
+joblib.dump(xgb_model, work_dir / "xgboost_regressor.pkl")
+joblib.dump(classifier, work_dir / "xgboost_classifier.pkl")
+exported = export_matching_models(work_dir, "xgboost")
+for kind, info in exported.items():
+    mark = "✅" if info["parity"]["passed"] else "❌"
+    failed |= not info["parity"]["passed"]
+    print(f"{mark} {kind}: {Path(info['path']).name} (최대 차이 {info['parity']['max_abs_diff']:.2e})")
+
+# 5. 서비스 연동 (모델 레지스트리 inference_backend=onnx)
+print("\n5️⃣ XGBoostMatchingService 연동...")
+from app.services.xgboost_matching_service import XGBoostMatchingService
+from app.services.matching import model_registry
+from app.services.matching.model_registry import ModelRegistry
+
+rng = np.random.default_rng(3)
+caregivers = [
+    {
+        "caregiver_id": i,
+        "personality": {
+            "empathy_score": float(rng.uniform(0, 100)),
+            "activity_score": float(rng.uniform(0, 100)),
+            "patience_score": float(rng.uniform(0, 100)),
+            "independence_score": float(rng.uniform(0, 100)),
+        },
+        "specialties": ["치매", "파킨슨"][: i % 3],
+        "service_region": "SEOUL_GANGNAM" if i % 2 else "SEOUL_SEOCHO",
+        "experience_years": i % 15,
+    }
+    for i in range(50)
+]
+patient_personality = {"empathy_score": 75.0, "activity_score": 55.0, "patience_score": 80.0, "independence_score": 45.0}
+patient_data = {"diseases": ["치매", "고혈압"], "region_code": "SEOUL_GANGNAM", "care_level": "3등급"}
+
+scores = {}
+for backend in ("xgboost", "onnx"):
+    # 서비스는 모델 레지스트리 싱글톤을 사용하므로 백엔드별 레지스트리로 교체
+    model_registry._model_registry = ModelRegistry(MODEL_PATH.parent, "v2", inference_backend=backend)
+    XGBoostMatchingService._instance = None
+    service = XGBoostMatchingService()
+    scores[backend] = np.array([r["score"] for r in service.batch_predict(patient_personality, caregivers, patient_data)])
+
+max_diff = float(np.abs(scores["xgboost"] - scores["onnx"]).max())
+if type(service._model).__name__ != "OnnxModel" or max_diff > 0.1:
+    failed = True
+    print(f"❌ batch_predict 점수 불일치 (최대 차이 {max_diff}, 백엔드: {type(service._model).__name__})")
+else:
+    print(f"✅ batch_predict 점수 일치 ({len(caregivers)}명, 최대 차이 {max_diff}, 백엔드: OnnxModel)")
+
+# 6. 지연 시간 비교 (참고용)
+print(f"\n6️⃣ 배치 크기별 지연 시간 (ms, 평균, CPU {os.cpu_count()}개, intra=0은 onnxruntime 기본 스레드 수)...")
+models = {
+    "xgboost": xgb_model,
+    "onnx(intra=1)": onnx_model,
+    "onnx(intra=0)": OnnxModel(onnx_path, intra_op_num_threads=0),
+}
+print("   " + " " * 12 + " | ".join(f"{name:>14}" for name in models))
+for batch_size in BATCH_SIZES:
+    batch = X[:batch_size]
+    repeat = 200 if batch_size <= 100 else 10
+    timings = []
+    for model in models.values():
+        model.predict(batch)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            model.predict(batch)
+        timings.append((time.perf_counter() - start) / repeat * 1000)
+    print(f"   batch={batch_size:>5}: " + " | ".join(f"{t:14.3f}" for t in timings))
+
+# 7. 메모리 비교 (백엔드별 별도 프로세스)
+print("\n7️⃣ 메모리 (MB, 별도 프로세스)...")
+if Path("/proc/self/status").exists():
+    for backend, threads in (("xgboost", 0), ("onnx", 1), ("onnx", 0)):
+        output = subprocess.run(
+            [sys.executable, __file__, "--memory", backend, str(onnx_path), str(threads)],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip().splitlines()[-1]
+        memory = json.loads(output)
+        label = f"{backend}(intra={threads})" if backend == "onnx" else backend
+        print(f"   {label:>16}: 모델 로드 +{memory['load_mb']:6.1f} | batch=10000 예측 최대 +{memory['predict_peak_mb']:6.1f}")
+else:
+    print("   ⚠️ /proc/self/status 없음 - 건너뜀")
+
+print("\n" + "=" * 70)
+if failed:
+    print("❌ 검증 실패")
+    print("=" * 70)
+    sys.exit(1)
+
+print("🎉 ONNX 백엔드 예측값이 xgboost와 허용 오차 이내로 일치합니다!")
+print("=" * 70)
@@ -0,0 +1,103 @@
+"""
+지역 인덱스 검증
+조회(score / scores_for / match_mask)가 지역 코드를 등록하지 않는지,
+미등록 코드 점수가 점수 행렬 규칙과 같은지, 등록 수 상한을 확인
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 백엔드 경로 추가
+backend_path = Path(__file__).parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from app.services.matching.region_index import UNKNOWN_REGION_ID, RegionIndex
+
+failed = False
+
+
+def check(condition: bool, message: str):
+    global failed
+    failed |= not condition
+    print(f"{'✅' if condition else '❌'} {message}")
+
+
+CAREGIVER_REGIONS = [
+    "SEOUL_GANGNAM", "SEOUL_SEOCHO", "SEOUL_MAPO", "GYEONGGI_SEONGNAM", "GYEONGGI_SUWON",
+    "INCHEON_NAMDONG", "BUSAN_HAEUNDAE", "BUSAN_SUYEONG", "DAEGU_SUSEONG", "", None,
+]
+PATIENT_REGIONS = CAREGIVER_REGIONS + [
+    "SEOUL_JONGNO", "BUSAN_JUNG", "INCHEON", "JEJU_SEOGWIPO", "GWANGJU_BUK", "SEOUL",
+]
+
+
+def main():
+    print("=" * 70)
+    print("🧪 지역 인덱스 검증")
+    print("=" * 70)
+
+    # 1. 미등록 코드 점수 = 모든 코드를 등록한 점수 행렬과 같은 값
+    print("\n1️⃣ 미등록 환자 지역 점수...")
+    index = RegionIndex(CAREGIVER_REGIONS)
+    reference = RegionIndex(PATIENT_REGIONS)
+    size = len(index)
+
+    pair_mismatch = [
+        (p, c) for p in PATIENT_REGIONS for c in PATIENT_REGIONS
+        if index.score(p, c) != reference.score(p, c) or RegionIndex.pair_score(p, c) != reference.score(p, c)
+    ]
+    check(not pair_mismatch, f"단일 쌍 점수 {len(PATIENT_REGIONS) ** 2}건 일치 (불일치 {pair_mismatch[:3]})")
+
+    caregiver_ids = index.register_many(CAREGIVER_REGIONS)
+    reference_ids = reference.register_many(CAREGIVER_REGIONS)
+    row_mismatch = [
+        p for p in PATIENT_REGIONS
+        if not np.array_equal(index.scores_for(p, caregiver_ids), reference.scores_for(p, reference_ids))
+        or not np.array_equal(index.match_mask(p, caregiver_ids), reference.match_mask(p, reference_ids))
+        or not np.array_equal(
+            index.scores_for_codes(p, PATIENT_REGIONS),
+            np.array([reference.score(p, c) for c in PATIENT_REGIONS])
+        )
+    ]
+    check(not row_mismatch, f"환자 1명 × 간병인 N명 점수/지역 필터 일치 (불일치 {row_mismatch})")
+    check(len(index) == size, f"조회 후에도 등록 코드 수 그대로 ({len(index) - 1}개)")
+
+    # 2. 요청마다 다른 지역 코드를 보내도 인덱스가 커지지 않음
+    print("\n2️⃣ 임의 지역 코드 조회...")
+    bogus = [f"BOGUS{i}_REGION{i}" for i in range(3000)]
+    start = time.perf_counter()
+    for code in bogus:
+        index.score(code, "SEOUL_GANGNAM")
+        index.match_mask(code, caregiver_ids)
+    index.scores_for_codes("SEOUL_GANGNAM", bogus)
+    elapsed = time.perf_counter() - start
+    check(len(index) == size and index._scores.shape == (size, size),
+          f"3000개 조회 후 점수 행렬 {index._scores.shape} ({elapsed * 1000:.0f}ms)")
+    check(index.get_id("BOGUS1_REGION1") is None and index.get_id("") == UNKNOWN_REGION_ID,
+          "미등록 코드 ID는 None, 코드 없음은 UNKNOWN_REGION_ID")
+
+    # 3. 등록 수 상한 (초과분은 지역 정보 없음)
+    print("\n3️⃣ 등록 수 상한...")
+    capped = RegionIndex(max_codes=5)
+    ids = capped.register_many(CAREGIVER_REGIONS)
+    check(len(capped) == 6 and capped._scores.shape == (6, 6), f"등록 {len(capped) - 1}개 / 상한 5개")
+    check(ids[:5].tolist() == [1, 2, 3, 4, 5] and (ids[5:] == UNKNOWN_REGION_ID).all(),
+          "상한 초과 코드는 UNKNOWN_REGION_ID")
+    check(capped.score("BUSAN_JUNG", "BUSAN_HAEUNDAE") == 0.75,
+          "등록하지 못한 코드도 단일 쌍 점수는 규칙대로 계산")
+
+    print("\n" + "=" * 70)
+    if failed:
+        print("❌ 검증 실패")
+        print("=" * 70)
+        sys.exit(1)
+
+    print("🎉 지역 코드 조회가 인덱스를 키우지 않습니다!")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""
+점수 증분 무효화 검증
+세션 변경 추적(점수 관련 컬럼만), 간병인 변경 시 추천 캐시 항목별 유지/삭제,
+사전 계산 점수의 간병인 열/환자 행 증분 재계산이 실시간 계산과 같은지 확인,
+아웃박스 간병인 ID로 저장소를 정확히 upsert/삭제하는지,
+아웃박스 테이블이 없으면 변경 추적을 설치하지 않는지 확인
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+# 백엔드 경로 추가
+backend_path = Path(__file__).parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+MODELS_DIR = backend_path / "models"
+
+failed = False
+
+
+def check(condition: bool, message: str):
+    global failed
+    failed |= not condition
+    print(f"{'✅' if condition else '❌'} {message}")
+
+
+def make_rows(n: int, rng: np.random.Generator):
+    return [
+        {
+            "caregiver_id": 1000 + i,
+            "caregiver_name": f"간병인{i}",
+            "profile_image_url": "",
+            "certifications": "요양보호사 1급",
+            "specialties": ["치매", "파킨슨", "뇌졸중"][: i % 4],
+            "service_region": "SEOUL_GANGNAM",
+            "empathy_score": float(rng.integers(0, 11) * 10),
+            "activity_score": float(rng.integers(0, 11) * 10),
+            "patience_score": float(rng.integers(0, 11) * 10),
+            "independence_score": float(rng.integers(0, 11) * 10),
+            "experience_years": int(rng.integers(0, 20)),
+            "hourly_rate": 15000,
+            "avg_rating": 4.5,
+        }
+        for i in range(n)
+    ]
+
+
+def main():
+    from sqlalchemy import Column, Float, Integer, String, create_engine, event
+    from sqlalchemy.orm import Session, declarative_base
+
+    from app.services.matching import model_registry, recommendation_cache, score_matrix
+    from app.services.matching.caregiver_store import CaregiverFeatureStore, CaregiverSnapshot
+    from app.services.matching.feature_engineering import FeatureEngineer, PERSONALITY_TYPES
+    from app.services.matching.model_registry import ModelRegistry
+    from app.services.matching.recommendation_cache import CacheDependency, RecommendationCache
+    from app.services.matching.retrieval import select_top_k
+    from app.services.matching.score_invalidation import on_caregivers_changed, scoring_changes
+    from app.services.matching.score_matrix import ScoreMatrixStore, compute_score_matrix
+
+    print("=" * 70)
+    print("🧪 점수 증분 무효화 검증")
+    print("=" * 70)
+
+    # 1. 세션 변경 추적 (같은 이름의 매핑 클래스로 SQLite에서 확인)
+    print("\n1️⃣ 세션 변경 추적...")
+    Base = declarative_base()
+
+    class CaregiverPersonality(Base):
+        __tablename__ = "caregiver_personality"
+        personality_id = Column(Integer, primary_key=True)
+        caregiver_id = Column(Integer)
+        empathy_score = Column(Float)
+        activity_score = Column(Float)
+        patience_score = Column(Float)
+        independence_score = Column(Float)
+
+    class Caregiver(Base):
+        __tablename__ = "caregivers"
+        caregiver_id = Column(Integer, primary_key=True)
+        experience_years = Column(Integer)
+        certifications = Column(String)
+        certification_list = Column(String)
+        specialties = Column(String)
+        service_region = Column(String)
+        hourly_rate = Column(Integer)
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    recorded = []
+    session = Session(engine)
+    event.listen(session, "after_flush", lambda s, ctx: recorded.append(scoring_changes(s)))
+
+    session.add(Caregiver(caregiver_id=1, experience_years=3, hourly_rate=15000))
+    session.add(CaregiverPersonality(caregiver_id=1, empathy_score=50, activity_score=50,
+                                     patience_score=50, independence_score=50))
+    session.commit()
+    check(recorded[-1] == {("caregiver", 1)}, f"신규 간병인/성향 → {recorded[-1]}")
+
+    caregiver = session.get(Caregiver, 1)
+    caregiver.hourly_rate = 20000
+    session.commit()
+    check(recorded[-1] == set(), "시급 변경 (점수와 무관) → 기록 없음")
+
+    caregiver.experience_years = 4
+    session.commit()
+    check(recorded[-1] == {("caregiver", 1)}, "경력 변경 → 간병인 1")
+
+    personality = session.query(CaregiverPersonality).one()
+    personality.patience_score = 80
+    session.commit()
+    check(recorded[-1] == {("caregiver", 1)}, "성향 점수 변경 → 간병인 1")
+
+    session.delete(caregiver)
+    session.commit()
+    check(recorded[-1] == {("caregiver", 1)}, "간병인 삭제 → 간병인 1")
+    session.close()
+
+    # 공통 준비: 스냅샷, 모델, 싱글톤 교체
+    rng = np.random.default_rng(0)
+    rows = make_rows(500, rng)
+    snapshot = CaregiverSnapshot.from_rows(rows, version=1)
+
+    registry = ModelRegistry(MODELS_DIR, "v2", FeatureEngineer().feature_columns)
+    model_registry._model_registry = registry
+    served = registry.current()
+    engineer = FeatureEngineer()
+
+    patient_personality = rng.integers(0, 11, (60, len(PERSONALITY_TYPES))) * 10.0
+
+    def personality_dict(values):
+        return {f"{ptype}_score": float(v) for ptype, v in zip(PERSONALITY_TYPES, values)}
+
+    def live_top_k(values, snap: CaregiverSnapshot, k: int):
+        candidates = np.arange(len(snap))
+        X = engineer.create_feature_matrix_from_db_data(
+            patient_personality=personality_dict(values),
+            caregiver_personality=snap.personality,
+            caregiver_specialties_count=snap.specialty_counts,
+            caregiver_experience=snap.experience_years,
+        )
+        predicted = np.asarray(served.predict(X), dtype=np.float64)
+        order = select_top_k(np.round(predicted, 1), k)
+        return candidates[order], predicted[order]
+
+    def cached_value(values, snap, k):
+        positions, scores = live_top_k(values, snap, k)
+        return [
+            {"caregiver_id": int(snap.caregiver_ids[p]), "match_score": round(float(s), 1)}
+            for p, s in zip(positions.tolist(), scores.tolist())
+        ]
+
+    # 2. 추천 캐시: 간병인 변경 시 영향받는 항목만 삭제
+    print("\n2️⃣ 추천 캐시 증분 무효화...")
+    work_dir = Path(tempfile.mkdtemp(prefix="score_invalidation_"))
+    cache = RecommendationCache(max_entries=1000, ttl_seconds=600)
+    recommendation_cache._recommendation_cache = cache
+    matrix = compute_score_matrix(registry, snapshot, np.arange(1, 61), patient_personality, top_m=30, workers=1)
+    store = ScoreMatrixStore(matrix.save(work_dir / "score_matrix.npz"))
+    matrix = store.get()
+    score_matrix._score_matrix_store = store
+
+    k = 5
+    versions = (served.tag, snapshot.version)
+    keys = []
+    for i, values in enumerate(patient_personality):
+        key = cache.make_key({"patient": i}, served.tag)
+        value = cached_value(values, snapshot, k)
+        cache.put(key, value, versions, CacheDependency(
+            patient_id=i + 1,
+            patient_personality=personality_dict(values),
+            model_version=served.tag,
+            caregiver_ids=frozenset(item["caregiver_id"] for item in value),
+            kth_score=value[-1]["match_score"],
+        ))
+        keys.append(key)
+
+    # 간병인 5명 수정 (성향/경력), 1명 삭제, 1명 추가
+    changed_rows = [
+        dict(rows[j], empathy_score=float(rng.integers(0, 11) * 10), experience_years=int(rng.integers(0, 20)))
+        for j in (3, 77, 150, 260, 444)
+    ]
+    added_row = dict(rows[10], caregiver_id=9999, patience_score=100.0)
+    removed_id = int(snapshot.caregiver_ids[200])
+    alive = set(snapshot.caregiver_ids.tolist()) - {removed_id} | {9999}
+    new_snapshot = snapshot.with_changes(changed_rows + [added_row], alive_ids=alive, version=2)
+
+    start = time.perf_counter()
+    on_caregivers_changed(new_snapshot, {row["caregiver_id"] for row in changed_rows} | {9999}, {removed_id})
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    new_versions = (served.tag, new_snapshot.version)
+    kept = stale = 0
+    for i, (key, values) in enumerate(zip(keys, patient_personality)):
+        value = cache.get(key, new_versions)
+        if value is None:
+            continue
+        kept += 1
+        if value != cached_value(values, new_snapshot, k):
+            stale += 1
+    stats = cache.get_stats()
+    check(0 < kept < len(keys), f"유지 {kept}건 / 삭제 {stats['invalidated']}건 ({elapsed_ms:.1f}ms)")
+    check(stale == 0, f"유지한 항목 = 새 스냅샷 실시간 결과 (불일치 {stale}건)")
+
+    cache.invalidate_patients([1, 2])
+    check(cache.get(keys[0], new_versions) is None and cache.get(keys[1], new_versions) is None,
+          "환자 정보 변경 → 해당 환자 항목 삭제")
+
+    # 증분 처리 없이 저장소 버전이 바뀌면 전체 삭제 (기존 동작 유지)
+    cache.get(keys[2], (served.tag, new_snapshot.version + 1))
+    check(len(cache) == 0, "리스너 없이 저장소 버전 변경 → 전체 삭제")
+
+    # 3. 사전 계산 점수: 간병인 열 증분 재계산
+    print("\n3️⃣ 사전 계산 점수 - 간병인 열...")
+    updated = store._matrix
+    check(updated is not matrix and store.rescored_caregivers == 6,
+          f"바뀐/추가된 간병인 {store.rescored_caregivers}명만 재계산")
+    candidates = np.arange(len(new_snapshot))
+
+    def compare(m, snap, personalities, label):
+        hits = mismatches = 0
+        reasons = {}
+        for i, values in enumerate(personalities):
+            for top_k in (5, 10):
+                result, reason = m.lookup(i + 1, personality_dict(values), served.tag, snap, candidates, top_k)
+                reasons[reason] = reasons.get(reason, 0) + 1
+                if result is None:
+                    continue
+                hits += 1
+                expected_positions, expected_scores = live_top_k(values, snap, top_k)
+                if not (np.array_equal(result[0], expected_positions)
+                        and np.allclose(result[1], expected_scores, atol=1e-4)):
+                    mismatches += 1
+        check(mismatches == 0 and hits > 0, f"{label}: {reasons}, 불일치 {mismatches}건")
+
+    before = {reason for i, values in enumerate(patient_personality)
+              for _, reason in [matrix.lookup(i + 1, personality_dict(values), served.tag, new_snapshot, candidates, 5)]}
+    check(before == {"caregivers"}, f"재계산 전: 모든 환자 실시간 계산 ({before})")
+    compare(updated, new_snapshot, patient_personality, "재계산 후")
+
+    # 4. 사전 계산 점수: 환자 행 증분 재계산 (성향 변경 / 신규 환자)
+    print("\n4️⃣ 사전 계산 점수 - 환자 행...")
+    new_personality = patient_personality.copy()
+    new_personality[[0, 5, 9]] = rng.integers(0, 11, (3, len(PERSONALITY_TYPES))) * 10.0
+    missed = [updated.lookup(pid, personality_dict(new_personality[pid - 1]), served.tag, new_snapshot, candidates, 5)[1]
+              for pid in (1, 6, 10)]
+    check(set(missed) <= {"personality"}, f"성향 변경 → 재계산 전 {missed}")
+
+    extra = rng.integers(0, 11, (1, len(PERSONALITY_TYPES))) * 10.0
+    store.rescore_patients([1, 6, 10, 61], np.vstack([new_personality[[0, 5, 9]], extra]), new_snapshot, served)
+    rescored = store._matrix
+    all_personality = np.vstack([new_personality, extra])
+    check(len(rescored) == 61 and store.rescored_patients == 4, f"환자 4명 재계산 (신규 1명 추가, 총 {len(rescored)}명)")
+    compare(rescored, new_snapshot, all_personality, "환자 재계산 후")
+
+    check(store.apply_caregiver_changes(new_snapshot, served) == 0, "변경 없으면 재계산 없음")
+
+    # 다른 모델 버전으로는 행렬을 고치지 않음 (조회 시 "model"로 실시간 계산)
+    other = SimpleNamespace(tag="v3@000000000000", model=served.model, feature_columns=served.feature_columns)
+    third = new_snapshot.with_changes([dict(rows[20], experience_years=30)], version=3)
+    check(store.apply_caregiver_changes(third, other) == 0 and store._matrix is rescored,
+          "모델 버전이 다르면 재계산하지 않음")
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+    # 5. 아웃박스 간병인 ID로 저장소 반영 (updated_at 워터마크와 무관)
+    print("\n5️⃣ 간병인 저장소 - 아웃박스 ID 반영...")
+    caregiver_store = CaregiverFeatureStore()
+    caregiver_store._snapshot = snapshot
+    caregiver_store._version = snapshot.version
+    notified = []
+    caregiver_store.add_change_listener(lambda snap, changed, removed: notified.append((changed, removed)))
+
+    db_rows = snapshot.to_rows([3, 4])  # DB에서 다시 조회한 행 (_to_row와 같은 형태)
+    late_row = dict(db_rows[0], patience_score=0.0, experience_years=25)  # 워터마크 이후 늦게 커밋된 변경
+    deleted_id = int(snapshot.caregiver_ids[5])
+    refreshed = caregiver_store.apply_rows(
+        [late_row, db_rows[1]], {late_row["caregiver_id"], db_rows[1]["caregiver_id"], deleted_id, 123456}
+    )
+    i = refreshed.positions[late_row["caregiver_id"]]
+    check(refreshed.experience_years[i] == 25 and refreshed.personality[i].tolist()[2] == 0.0
+          and deleted_id not in refreshed.positions and len(refreshed) == len(snapshot) - 1,
+          "요청한 ID만 upsert, 조회되지 않은 ID는 삭제")
+    check(notified == [({late_row["caregiver_id"]}, {deleted_id})] and refreshed.version == snapshot.version + 1,
+          f"실제로 바뀐 간병인만 리스너에 전달 ({notified})")
+    check(caregiver_store.apply_rows([late_row], {late_row["caregiver_id"]}) is refreshed and len(notified) == 1,
+          "같은 내용을 다시 반영하면 스냅샷 유지")
+
+    # 6. 아웃박스 테이블이 없으면 변경 추적을 설치하지 않음 (flush마다 INSERT 실패 방지)
+    print("\n6️⃣ 아웃박스 테이블 확인...")
+    # app.models는 앱 설정(DB 엔진)을 읽으므로 테스트용 SQLite 설정으로 import
+    for name, value in {
+        "DATABASE_URL": "sqlite://",
+        "SECRET_KEY": "test-secret",
+        "KAKAO_REST_API_KEY": "test",
+        "KAKAO_REDIRECT_URI": "http://localhost/callback",
+        "FRONTEND_URL": "http://localhost",
+    }.items():
+        os.environ.setdefault(name, value)
+    from app.models.matching import ScoreInvalidation
+    from app.services.matching import score_invalidation
+
+    outbox_engine = create_engine("sqlite://")
+    check(not score_invalidation.outbox_table_exists(outbox_engine), "마이그레이션 전 → 테이블 없음")
+    ScoreInvalidation.__table__.create(outbox_engine)
+    check(score_invalidation.outbox_table_exists(outbox_engine), "테이블 생성 후 → 있음")
+
+    original_exists = score_invalidation.outbox_table_exists
+    score_invalidation.outbox_table_exists = lambda bind=None: False
+    try:
+        started = score_invalidation.start_score_invalidation()
+    finally:
+        score_invalidation.outbox_table_exists = original_exists
+    check(not started and not score_invalidation._tracking_installed
+          and not event.contains(Session, "after_flush", score_invalidation._record_scoring_changes),
+          "테이블 없음 → 시작 안 함, Session flush 훅 미설치")
+
+    print("\n" + "=" * 70)
+    if failed:
+        print("❌ 검증 실패")
+        print("=" * 70)
+        sys.exit(1)
+
+    print("🎉 바뀐 환자/간병인만 다시 계산하고 나머지 점수는 그대로 사용합니다!")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+사전 계산 점수 행렬 검증
+멀티프로세스 배치 계산 결과가 실시간 추천(전체 후보 점수 → 상위 k명)과 같은지,
+입력이 바뀐 경우 실시간 계산으로 넘기는지, 저장/재로드를 확인
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 백엔드 경로 추가
+backend_path = Path(__file__).parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+MODELS_DIR = backend_path / "models"
+
+failed = False
+
+
+def check(condition: bool, message: str):
+    global failed
+    failed |= not condition
+    print(f"{'✅' if condition else '❌'} {message}")
+
+
+def make_rows(n: int, rng: np.random.Generator):
+    return [
+        {
+            "caregiver_id": 1000 + i,
+            "caregiver_name": f"간병인{i}",
+            "profile_image_url": "",
+            "certifications": "요양보호사 1급" if i % 3 else "간호조무사",
+            "specialties": ["치매", "파킨슨", "뇌졸중"][: i % 4],
+            "service_region": "SEOUL_GANGNAM" if i % 2 else "SEOUL_SEOCHO",
+            # 반올림 동점이 생기도록 10 단위 성격 점수
+            "empathy_score": float(rng.integers(0, 11) * 10),
+            "activity_score": float(rng.integers(0, 11) * 10),
+            "patience_score": float(rng.integers(0, 11) * 10),
+            "independence_score": float(rng.integers(0, 11) * 10),
+            "experience_years": int(rng.integers(0, 20)),
+            "hourly_rate": 15000,
+            "avg_rating": 4.5,
+        }
+        for i in range(n)
+    ]
+
+
+def main():
+    from app.services.matching import model_registry
+    from app.services.matching.caregiver_store import CaregiverSnapshot
+    from app.services.matching.feature_engineering import FeatureEngineer, PERSONALITY_TYPES
+    from app.services.matching.model_registry import ModelRegistry
+    from app.services.matching.nuelbom_predictor import NuelbomMatchingPredictor
+    from app.services.matching.retrieval import select_top_k
+    from app.services.matching.score_matrix import ScoreMatrix, ScoreMatrixStore, compute_score_matrix
+
+    print("=" * 70)
+    print("🧪 사전 계산 점수 행렬 검증")
+    print("=" * 70)
+
+    rng = np.random.default_rng(0)
+    rows = make_rows(600, rng)
+    snapshot = CaregiverSnapshot.from_rows(rows, version=1)
+
+    registry = ModelRegistry(MODELS_DIR, "v2", FeatureEngineer().feature_columns)
+    model_registry._model_registry = registry
+    served = registry.current()
+
+    patient_ids = np.arange(1, 101, dtype=np.int64)
+    patient_personality = rng.integers(0, 11, (len(patient_ids), len(PERSONALITY_TYPES))) * 10.0
+
+    def personality_dict(i: int):
+        return {f"{ptype}_score": float(v) for ptype, v in zip(PERSONALITY_TYPES, patient_personality[i])}
+
+    engineer = FeatureEngineer()
+
+    def live_top_k(i: int, snap: CaregiverSnapshot, candidates: np.ndarray, k: int):
+        """실시간 추천과 같은 계산 (후보 전체 점수 → 반올림 점수 상위 k, 동점은 후보 순서)"""
+        X = engineer.create_feature_matrix_from_db_data(
+            patient_personality=personality_dict(i),
+            caregiver_personality=snap.personality[candidates],
+            caregiver_specialties_count=snap.specialty_counts[candidates],
+            caregiver_experience=snap.experience_years[candidates],
+        )
+        predicted = np.asarray(served.predict(X), dtype=np.float64)
+        order = select_top_k(np.round(predicted, 1), k)
+        return candidates[order], predicted[order]
+
+    # 1. 멀티프로세스 배치 계산
+    print("\n1️⃣ 배치 계산 (프로세스 2개)...")
+    start = time.perf_counter()
+    matrix = compute_score_matrix(registry, snapshot, patient_ids, patient_personality, top_m=40, workers=2)
+    elapsed = time.perf_counter() - start
+    check(len(matrix) == 100 and matrix.top_m == 40 and matrix.model_tag == served.tag,
+          f"환자 {len(matrix)}명 × 상위 {matrix.top_m}명 ({elapsed:.1f}초, 모델 {matrix.model_tag})")
+
+    all_indices = np.arange(len(snapshot))
+    full_match = all(
+        np.array_equal(snapshot.caregiver_ids[live_top_k(i, snapshot, all_indices, 40)[0]], matrix.caregiver_ids[i])
+        for i in range(len(patient_ids))
+    )
+    check(full_match, "환자별 상위 40명 = 실시간 계산 순서")
+
+    # 2. 필터별 실시간 계산과 비교
+    print("\n2️⃣ 후보 필터별 일치...")
+    filters = {
+        "전체": all_indices,
+        "요양보호사": np.flatnonzero(np.array(["요양보호사" in r["certifications"] for r in rows])),
+        "강남": np.flatnonzero(np.array([r["service_region"] == "SEOUL_GANGNAM" for r in rows])),
+        "치매": np.flatnonzero(np.array(["치매" in r["specialties"] for r in rows])),
+        "소수 후보": np.arange(0, len(snapshot), 97),
+    }
+    for name, candidates in filters.items():
+        hits = mismatches = 0
+        for i, pid in enumerate(patient_ids.tolist()):
+            for k in (5, 10):
+                result, reason = matrix.lookup(pid, personality_dict(i), served.tag, snapshot, candidates, k)
+                if result is None:
+                    continue
+                hits += 1
+                expected_positions, expected_scores = live_top_k(i, snapshot, candidates, k)
+                if not (np.array_equal(result[0], expected_positions)
+                        and np.allclose(result[1], expected_scores, atol=1e-4)):
+                    mismatches += 1
+        check(mismatches == 0, f"{name} ({len(candidates)}명): 사전 계산 사용 {hits}/200건, 불일치 {mismatches}건")
+
+    # 3. 실시간 계산으로 넘기는 경우
+    print("\n3️⃣ 실시간 계산 사유...")
+    candidates = filters["전체"]
+    check(matrix.lookup(999, personality_dict(0), served.tag, snapshot, candidates, 5)[1] == "patient", "계산에 없는 환자")
+    changed = dict(personality_dict(0), empathy_score=personality_dict(0)["empathy_score"] + 1)
+    check(matrix.lookup(1, changed, served.tag, snapshot, candidates, 5)[1] == "personality", "환자 성격 점수 변경")
+    check(matrix.lookup(1, personality_dict(0), "v3@000000000000", snapshot, candidates, 5)[1] == "model",
+          "다른 모델 버전 (A/B 후보 또는 교체)")
+
+    # 상위 간병인의 경력 변경 → 그 간병인이 후보이면 실시간, 후보가 아니면 사용
+    top_position = snapshot.positions[int(matrix.caregiver_ids[0, 0])]
+    edited_row = dict(rows[top_position], experience_years=rows[top_position]["experience_years"] + 1)
+    edited = snapshot.with_changes([edited_row], version=2)
+    check(matrix.lookup(1, personality_dict(0), served.tag, edited, candidates, 5)[1] == "caregivers",
+          "후보 간병인 점수 입력 변경")
+    others = candidates[candidates != top_position]
+    check(matrix.lookup(1, personality_dict(0), served.tag, edited, others, 5)[1] in ("hit", "boundary"),
+          "바뀐 간병인이 후보가 아니면 사전 계산 사용 가능")
+
+    # 이름 등 점수와 무관한 변경은 그대로 사용
+    renamed = snapshot.with_changes([dict(rows[top_position], caregiver_name="새이름")], version=3)
+    result, reason = matrix.lookup(1, personality_dict(0), served.tag, renamed, candidates, 5)
+    check(reason == "hit", "점수와 무관한 정보 변경은 사전 계산 사용")
+
+    # 삭제된 간병인은 스냅샷 행 번호가 바뀌어도 제외하고 실시간과 같은 순서
+    alive = set(snapshot.caregiver_ids.tolist()) - {int(matrix.caregiver_ids[0, 0]), int(matrix.caregiver_ids[0, 3])}
+    removed = snapshot.with_changes([], alive_ids=alive, version=5)
+    result, reason = matrix.lookup(1, personality_dict(0), served.tag, removed, np.arange(len(removed)), 10)
+    expected_positions, _ = live_top_k(0, removed, np.arange(len(removed)), 10)
+    check(reason == "hit" and np.array_equal(result[0], expected_positions), "삭제된 간병인 제외 후 실시간과 같은 순서")
+
+    added = snapshot.with_changes([dict(rows[0], caregiver_id=99999)], version=4)
+    check(matrix.lookup(1, personality_dict(0), served.tag, added, np.arange(len(added)), 5)[1] == "caregivers",
+          "계산 이후 추가된 간병인")
+
+    # 후보가 적으면 상위 M명 밖에서 k명을 채워야 하므로 실시간
+    sparse = filters["소수 후보"]
+    reasons = {matrix.lookup(pid, personality_dict(i), served.tag, snapshot, sparse, 5)[1]
+               for i, pid in enumerate(patient_ids.tolist())}
+    check("boundary" in reasons, f"상위 {matrix.top_m}명 안에 후보가 부족 → boundary ({sorted(reasons)})")
+
+    # 4. 저장/로드와 파일 교체 감지
+    print("\n4️⃣ 저장 / 재로드...")
+    work_dir = Path(tempfile.mkdtemp(prefix="score_matrix_"))
+    try:
+        path = matrix.save(work_dir / "score_matrix.npz")
+        loaded = ScoreMatrix.load(path)
+        check(loaded.model_tag == matrix.model_tag and np.array_equal(loaded.caregiver_ids, matrix.caregiver_ids)
+              and np.array_equal(loaded.scores, matrix.scores), f"저장/로드 일치 ({path.stat().st_size / 1024:.1f} KB)")
+
+        store = ScoreMatrixStore(work_dir / "score_matrix.npz")
+        first = store.get()
+        check(first is not None and store.get() is first, "파일이 그대로면 다시 로드하지 않음")
+
+        smaller = compute_score_matrix(registry, snapshot, patient_ids[:10], patient_personality[:10], top_m=20, workers=1)
+        time.sleep(0.01)
+        smaller.save(work_dir / "score_matrix.npz")
+        check(len(store.get()) == 10 and store.get().top_m == 20, "야간 배치가 파일을 교체하면 새 행렬 로드")
+
+        store.record("hit")
+        store.record("personality")
+        stats = store.get_stats()
+        check(stats["hits"] == 1 and stats["misses"] == {"personality": 1} and stats["hit_rate"] == 0.5,
+              f"적중률 통계 {stats['hit_rate']}")
+
+        (work_dir / "score_matrix.npz").unlink()
+        check(store.get() is None, "파일이 없으면 실시간 계산")
+        check(ScoreMatrixStore(work_dir / "score_matrix.npz", enabled=False).get() is None, "비활성화")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    # 5. 사전 계산 점수로 만든 추천 결과 = 실시간 추천 결과
+    print("\n5️⃣ 추천 결과 비교...")
+    predictor = NuelbomMatchingPredictor(use_azure_openai=False)
+    predictor.model_registry = registry
+    predictor.engineer = engineer
+    candidates = filters["요양보호사"]
+    (positions, scores), reason = matrix.lookup(1, personality_dict(0), served.tag, snapshot, candidates, 5)
+    from_scores = predictor.recommend_caregivers_from_scores(
+        1, personality_dict(0), snapshot, positions, scores, served.tag, ai_comments=False
+    )
+    live = predictor.recommend_caregivers_from_store(
+        1, personality_dict(0), snapshot, candidates, top_n=5, ai_comments=False
+    )
+
+    check(len(live) == 5 and from_scores == live, "추천 항목 전체 동일 (간병인·점수·모델 버전·코멘트 요청)")
+
+    print("\n" + "=" * 70)
+    if failed:
+        print("❌ 검증 실패")
+        print("=" * 70)
+        sys.exit(1)
+
+    print("🎉 사전 계산 점수가 실시간 추천과 같은 결과일 때만 사용됩니다!")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
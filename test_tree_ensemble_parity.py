@@ -0,0 +1,140 @@
+"""
+XGBoost V2 numpy 추론 백엔드 검증
+TreeEnsembleModel 예측값이 XGBRegressor.predict와 비트 단위로 같은지 확인
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 백엔드 경로 추가
+backend_path = Path(__file__).parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from xgboost import XGBRegressor
+
+from app.services.matching.tree_ensemble import TreeEnsembleModel
+
+MODEL_PATH = backend_path / "models" / "xgboost_v2.json"
+
+print("=" * 70)
+print("🧪 XGBoost V2 numpy 추론 백엔드 검증")
+print("=" * 70)
+
+# 1. 모델 로드
+print("\n1️⃣ 모델 로드...")
+xgb_model = XGBRegressor()
+xgb_model.load_model(str(MODEL_PATH))
+tree_model = TreeEnsembleModel.from_json(MODEL_PATH)
+print(f"✅ 트리 {tree_model.n_trees}개, 노드 {len(tree_model.value)}개, 최대 깊이 {tree_model.max_depth}")
+
+# 2. 테스트 특성 행렬 (V2 특성 10개의 실제 값 범위)
+print("\n2️⃣ 테스트 데이터 준비...")
+rng = np.random.default_rng(42)
+n = 20000
+X = np.column_stack([
+    rng.uniform(0, 100, (n, 4)),                               # personality_diff_*
+    rng.choice([0, 0.25, 0.5, 2 / 3, 0.75, 1.0], n),           # specialty_match_ratio
+    rng.choice([0, 0.5, 0.75, 1.0], n),                        # region_match_score
+    rng.integers(0, 30, n),                                    # caregiver_experience
+    rng.integers(0, 8, n),                                     # caregiver_specialties_count
+    rng.integers(1, 8, n),                                     # patient_care_level
+    rng.integers(0, 6, n),                                     # patient_disease_count
+]).astype(np.float32)
+
+# 분기 임계값과 정확히 같은 값 (x < 임계값 비교 경계)
+internal = tree_model.left != np.arange(len(tree_model.left))
+thresholds = tree_model.threshold[internal]
+features = tree_model.split_feature[internal]
+for k in range(len(thresholds)):
+    X[k % n, features[k]] = thresholds[k]
+
+# 결측값 (default_left 방향)
+X_missing = X.copy()
+X_missing[rng.random(X.shape) < 0.05] = np.nan
+
+print(f"   {n}행 (임계값 경계 {len(thresholds)}건, 결측값 포함 행렬 별도)")
+
+# 3. 비트 단위 비교
+print("\n3️⃣ 예측값 비교...")
+failed = False
+for name, matrix in [("기본", X), ("결측값 포함", X_missing), ("단일 행", X[:1])]:
+    expected = np.asarray(xgb_model.predict(matrix), dtype=np.float32)
+    actual = tree_model.predict(matrix)
+    mismatches = int(np.count_nonzero(expected.view(np.uint32) != actual.view(np.uint32)))
+    if mismatches:
+        failed = True
+        print(f"❌ {name}: {mismatches}/{len(expected)}건 불일치 (최대 차이 {np.nanmax(np.abs(expected - actual))})")
+    else:
+        print(f"✅ {name}: {len(expected)}건 모두 일치")
+
+# 부스터에서 직접 변환한 모델도 같은 값
+from_booster = TreeEnsembleModel.from_xgboost(xgb_model)
+if not np.array_equal(from_booster.predict(X).view(np.uint32), tree_model.predict(X).view(np.uint32)):
+    failed = True
+    print("❌ from_xgboost 변환 결과 불일치")
+else:
+    print("✅ from_xgboost 변환 결과 일치")
+
+# 4. 서비스 연동 (모델 레지스트리 inference_backend=numpy)
+print("\n4️⃣ XGBoostMatchingService 연동...")
+from app.services.xgboost_matching_service import XGBoostMatchingService
+from app.services.matching import model_registry
+from app.services.matching.model_registry import ModelRegistry
+
+caregivers = [
+    {
+        "caregiver_id": i,
+        "personality": {
+            "empathy_score": float(rng.uniform(0, 100)),
+            "activity_score": float(rng.uniform(0, 100)),
+            "patience_score": float(rng.uniform(0, 100)),
+            "independence_score": float(rng.uniform(0, 100)),
+        },
+        "specialties": ["치매", "파킨슨"][: i % 3],
+        "service_region": "SEOUL_GANGNAM" if i % 2 else "SEOUL_SEOCHO",
+        "experience_years": i % 15,
+    }
+    for i in range(50)
+]
+patient_personality = {"empathy_score": 75.0, "activity_score": 55.0, "patience_score": 80.0, "independence_score": 45.0}
+patient_data = {"diseases": ["치매", "고혈압"], "region_code": "SEOUL_GANGNAM", "care_level": "3등급"}
+
+scores = {}
+for backend in ("xgboost", "numpy"):
+    # 서비스는 모델 레지스트리 싱글톤을 사용하므로 백엔드별 레지스트리로 교체
+    model_registry._model_registry = ModelRegistry(MODEL_PATH.parent, "v2", inference_backend=backend)
+    XGBoostMatchingService._instance = None
+    service = XGBoostMatchingService()
+    scores[backend] = [r["score"] for r in service.batch_predict(patient_personality, caregivers, patient_data)]
+
+if scores["xgboost"] != scores["numpy"]:
+    failed = True
+    print("❌ batch_predict 점수 불일치")
+else:
+    print(f"✅ batch_predict 점수 일치 ({len(caregivers)}명, 백엔드: {type(service._model).__name__})")
+
+# 5. 지연 시간 비교 (참고용)
+print("\n5️⃣ 배치 크기별 지연 시간 (ms, 평균)...")
+for batch_size in (1, 10, 100, 10000):
+    batch = X[:batch_size]
+    repeat = 50 if batch_size <= 100 else 5
+    timings = []
+    for model in (xgb_model, tree_model):
+        model.predict(batch)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            model.predict(batch)
+        timings.append((time.perf_counter() - start) / repeat * 1000)
+    print(f"   batch={batch_size:>5}: xgboost {timings[0]:8.3f} | numpy {timings[1]:8.3f}")
+
+print("\n" + "=" * 70)
+if failed:
+    print("❌ 검증 실패")
+    print("=" * 70)
+    sys.exit(1)
+
+print("🎉 numpy 백엔드 예측값이 xgboost와 비트 단위로 일치합니다!")
+print("=" * 70)